@@ -0,0 +1,69 @@
+"""
+Benchmark `ModernGLRenderer` against the PyOpenGL `OpenGLRenderer` headlessly.
+
+Both renderers draw the same frames into a framebuffer of a standalone moderngl context created
+through EGL (works without a GPU with Mesa's llvmpipe).  Prints the average CPU time per
+`render()` call.
+
+    python example/benchmark_moderngl.py [--frames N]
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import moderngl
+from slimgui import imgui
+from slimgui.integrations.moderngl import ModernGLRenderer
+from slimgui.integrations.opengl import OpenGLRenderer
+
+from benchmark_opengl import FB_WIDTH, FB_HEIGHT, build_frame
+
+def benchmark(name: str, ctx: moderngl.Context, make_renderer, frames: int, vtx_offset: bool):
+    imgui_ctx = imgui.create_context()
+    imgui.set_current_context(imgui_ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = FB_WIDTH, FB_HEIGHT
+    if vtx_offset:
+        io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    renderer = make_renderer()
+
+    # Warm up: create textures, let windows appear.
+    for _ in range(3):
+        renderer.render(build_frame())
+    ctx.finish()
+
+    render_seconds = 0.0
+    for _ in range(frames):
+        draw_data = build_frame()
+        t0 = time.perf_counter()
+        renderer.render(draw_data)
+        render_seconds += time.perf_counter() - t0
+    ctx.finish()
+
+    draw_data = imgui.get_draw_data()
+    print(f"{name:40s} {1000 * render_seconds / frames:8.3f} ms/frame  ({draw_data.cmd_lists_count} draw lists, {draw_data.total_vtx_count} vertices)")
+    renderer.shutdown()
+    imgui.destroy_context(imgui_ctx)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=500, help="number of timed frames per configuration")
+    args = parser.parse_args()
+
+    ctx = moderngl.create_standalone_context(require=330, backend="egl")
+    fbo = ctx.simple_framebuffer((FB_WIDTH, FB_HEIGHT))
+    fbo.use()
+    print(f"{ctx.info['GL_RENDERER']}, {args.frames} frames")
+    benchmark("OpenGLRenderer (PyOpenGL)", ctx, OpenGLRenderer, args.frames, vtx_offset=True)
+    benchmark("OpenGLRenderer (PyOpenGL) single upload", ctx, lambda: OpenGLRenderer(buffer_upload="single"), args.frames, vtx_offset=True)
+    benchmark("ModernGLRenderer", ctx, lambda: ModernGLRenderer(ctx), args.frames, vtx_offset=False)
+    fbo.release()
+    ctx.release()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark the OpenGL renderer configurations (and the CPU `SoftwareRenderer`) headlessly.
+
+Renders the ImGui demo window into an offscreen framebuffer through Mesa's surfaceless EGL
+platform (works without a GPU with llvmpipe) and prints the average CPU time per `render()` call.
+
+    python example/benchmark_opengl.py [--frames N]
+"""
+import argparse
+import ctypes
+import os
+import time
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import OpenGL.EGL as egl
+import OpenGL.GL as gl
+from slimgui import imgui
+from slimgui.integrations.opengl import OpenGLRenderer
+from slimgui.integrations.opengl_native import NativeOpenGLRenderer
+from slimgui.integrations.software import SoftwareRenderer
+
+FB_WIDTH, FB_HEIGHT = 1280, 720
+
+def create_headless_context():
+    display = egl.eglGetDisplay(egl.EGL_DEFAULT_DISPLAY)
+    if not egl.eglInitialize(display, ctypes.c_int32(), ctypes.c_int32()):
+        raise RuntimeError("EGL not available")
+    egl.eglBindAPI(egl.EGL_OPENGL_API)
+    ctx_attribs = [
+        egl.EGL_CONTEXT_MAJOR_VERSION, 3,
+        egl.EGL_CONTEXT_MINOR_VERSION, 3,
+        egl.EGL_CONTEXT_OPENGL_PROFILE_MASK, egl.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+        egl.EGL_NONE,
+    ]
+    context = egl.eglCreateContext(display, None, egl.EGL_NO_CONTEXT, ctx_attribs)
+    if context == egl.EGL_NO_CONTEXT or not egl.eglMakeCurrent(display, egl.EGL_NO_SURFACE, egl.EGL_NO_SURFACE, context):
+        raise RuntimeError("Could not create a surfaceless EGL context")
+    fbo = gl.glGenFramebuffers(1)
+    gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, fbo)
+    rbo = gl.glGenRenderbuffers(1)
+    gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, rbo)
+    gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, FB_WIDTH, FB_HEIGHT)
+    gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_RENDERBUFFER, rbo)
+
+def build_frame() -> imgui.DrawData:
+    imgui.new_frame()
+    imgui.show_demo_window()
+    # A grid of widget-heavy windows, each one a separate draw list.
+    for i in range(8):
+        imgui.set_next_window_pos(((i % 4) * FB_WIDTH / 4, (i // 4) * FB_HEIGHT / 2))
+        imgui.set_next_window_size((FB_WIDTH / 4, FB_HEIGHT / 2))
+        imgui.begin(f"Window {i}")
+        for j in range(20):
+            imgui.text(f"Line {j}: the quick brown fox jumps over the lazy dog")
+            imgui.button(f"Button {j}")
+            imgui.same_line()
+            imgui.progress_bar(j / 20)
+        imgui.end()
+    imgui.render()
+    return imgui.get_draw_data()
+
+def benchmark_state_backup(frames: int):
+    """Time GL state save + restore alone: the former PyOpenGL round trips vs. `render.GLStateSaver`."""
+    from slimgui.integrations.opengl import get_common_gl_state, restore_common_gl_state
+    from slimgui.integrations.opengl_native import STATE_POLICIES, pyopengl_get_proc_address
+    from slimgui.slimgui_ext import render
+
+    def pyopengl_backup():
+        state = get_common_gl_state()
+        last_program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
+        last_active_texture = gl.glGetIntegerv(gl.GL_ACTIVE_TEXTURE)
+        last_array_buffer = gl.glGetIntegerv(gl.GL_ARRAY_BUFFER_BINDING)
+        last_element_array_buffer = gl.glGetIntegerv(gl.GL_ELEMENT_ARRAY_BUFFER_BINDING)
+        last_vertex_array = gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING)
+        restore_common_gl_state(state)
+        gl.glUseProgram(last_program)
+        gl.glActiveTexture(last_active_texture)
+        gl.glBindVertexArray(last_vertex_array)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, last_array_buffer)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, last_element_array_buffer)
+
+    def time_it(name: str, func):
+        t0 = time.perf_counter()
+        for _ in range(frames):
+            func()
+        print(f"{name:40s} {1e6 * (time.perf_counter() - t0) / frames:8.1f} us/frame")
+
+    time_it("state backup: PyOpenGL glGet*", pyopengl_backup)
+    saver = render.GLStateSaver(pyopengl_get_proc_address)
+    for name, policy in STATE_POLICIES.items():
+        def native_backup():
+            saver.save(policy)
+            saver.restore()
+        time_it(f"state backup: GLStateSaver {name}", native_backup)
+
+def benchmark(name: str, make_renderer, frames: int):
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = FB_WIDTH, FB_HEIGHT
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    renderer = make_renderer()
+
+    # Warm up: create textures, let windows appear.
+    for _ in range(3):
+        renderer.render(build_frame())
+    gl.glFinish()
+
+    render_seconds = 0.0
+    for _ in range(frames):
+        draw_data = build_frame()
+        t0 = time.perf_counter()
+        renderer.render(draw_data)
+        render_seconds += time.perf_counter() - t0
+    gl.glFinish()
+
+    draw_data = imgui.get_draw_data()
+    print(f"{name:40s} {1000 * render_seconds / frames:8.3f} ms/frame  ({draw_data.cmd_lists_count} draw lists, {draw_data.total_vtx_count} vertices)")
+    renderer.shutdown()
+    imgui.destroy_context(ctx)
+
+CONFIGURATIONS = {
+    "OpenGLRenderer state_backup=full": lambda: OpenGLRenderer(state_backup="full"),
+    "OpenGLRenderer state_backup=minimal": lambda: OpenGLRenderer(state_backup="minimal"),
+    "OpenGLRenderer state_backup=none": lambda: OpenGLRenderer(state_backup="none"),
+    "NativeOpenGLRenderer state_backup=full": lambda: NativeOpenGLRenderer(state_backup="full"),
+    "NativeOpenGLRenderer state_backup=minimal": lambda: NativeOpenGLRenderer(state_backup="minimal"),
+    "NativeOpenGLRenderer state_backup=none": lambda: NativeOpenGLRenderer(state_backup="none"),
+    "SoftwareRenderer num_threads=1": lambda: SoftwareRenderer(num_threads=1),
+    "SoftwareRenderer (all cores)": lambda: SoftwareRenderer(),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=500, help="number of timed frames per configuration")
+    args = parser.parse_args()
+
+    create_headless_context()
+    print(f"{gl.glGetString(gl.GL_RENDERER).decode()}, {args.frames} frames")
+    benchmark_state_backup(args.frames)
+    for name, make_renderer in CONFIGURATIONS.items():
+        benchmark(name, make_renderer, args.frames)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure the bandwidth and latency of `slimgui.integrations.remote` over loopback sockets.
+
+The server builds the UI in this process, a `RemoteClient` drawing with the CPU `SoftwareRenderer`
+runs in a child process.  Prints bytes per frame and the round-trip latency (frame sent to client's
+acknowledgement after rendering it) for a static UI and for a UI whose text changes every frame.
+
+    python example/benchmark_remote.py [--frames N]
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import tempfile
+
+from slimgui import imgui
+from slimgui.integrations.remote import RemoteClient, RemoteServer
+from slimgui.integrations.software import SoftwareRenderer
+
+DISPLAY_SIZE = (1280, 720)
+
+def run_client(address):
+    ctx = imgui.create_context()
+    imgui.get_io().ini_filename = None
+    client = RemoteClient(address, SoftwareRenderer())
+    while client.connected:
+        client.update(timeout=1.0)
+    client.renderer.shutdown()
+    imgui.destroy_context(ctx)
+
+def build_frame(frame: int, animate: bool):
+    imgui.new_frame()
+    imgui.show_demo_window()
+    for i in range(4):
+        imgui.set_next_window_pos((i * DISPLAY_SIZE[0] / 4, DISPLAY_SIZE[1] / 2))
+        imgui.set_next_window_size((DISPLAY_SIZE[0] / 4, DISPLAY_SIZE[1] / 2))
+        imgui.begin(f"Window {i}")
+        for j in range(20):
+            imgui.text(f"Line {j}: {frame if animate and i == 0 else 0}")
+            imgui.same_line()
+            imgui.progress_bar(j / 20)
+        imgui.end()
+    imgui.render()
+
+def run_frames(server: RemoteServer, frames: int, animate: bool, frame_offset: int) -> list:
+    for i in range(frames):
+        server.new_frame()
+        build_frame(frame_offset + i, animate)
+        server.render(imgui.get_draw_data())
+        # Wait for the acknowledgement so that every frame has a latency sample.
+        while server.client is not None and server.stats[-1].latency is None:
+            server.process_events(timeout=1.0)
+    return list(server.stats)[-frames:]
+
+def report(name: str, stats: list):
+    sizes = [s.bytes for s in stats]
+    latencies = sorted(s.latency * 1000 for s in stats if s.latency is not None)
+    print(
+        f"  {name:<8} {statistics.mean(sizes):>10.0f} B/frame (max {max(sizes):>7})"
+        f"  latency median {statistics.median(latencies):6.2f} ms, p95 {latencies[int(len(latencies) * 0.95) - 1]:6.2f} ms"
+    )
+
+def benchmark(label: str, address, frames: int):
+    ctx = imgui.create_context()
+    imgui.get_io().ini_filename = None
+    server = RemoteServer(address, display_size=DISPLAY_SIZE, stats_history=frames)
+    client = multiprocessing.Process(target=run_client, args=(server.address,))
+    client.start()
+    if not server.wait_for_client(timeout=10.0):
+        raise RuntimeError("Client didn't connect")
+
+    print(f"{label}:")
+    first = run_frames(server, 1, animate=False, frame_offset=0)
+    print(f"  first frame {first[0].bytes} bytes (font atlas and all draw lists)")
+    run_frames(server, 10, animate=False, frame_offset=0) # let windows settle
+    report("static", run_frames(server, frames, animate=False, frame_offset=0))
+    report("animated", run_frames(server, frames, animate=True, frame_offset=0))
+
+    server.shutdown()
+    client.join()
+    imgui.destroy_context(ctx)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    benchmark("TCP loopback", ("127.0.0.1", 0), args.frames)
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmark("Unix socket", os.path.join(tmp, "slimgui.sock"), args.frames)
+
+if __name__ == "__main__":
+    main()
@@ -1,145 +1,14 @@
 """
-Very much beta quality Pyglet example.  Probably buggy but should be a useful starting point.
-
-Display scale (display_size, display_fb_scale) are probably a bit wonky.  Not sure how it
-should be implemented on Pyglet.
-
-Provided as-is.  Will make superficial attempts to keep it up to date but no promises.
+Standalone pyglet example, see `slimgui.integrations.pyglet.PygletRenderer`.
 """
 
 import os
 import pyglet
-from pyglet.window import key, mouse
 import requests
 
 from slimgui import imgui
 
-from slimgui.integrations.glfw import OpenGLRenderer
-
-#------------------------------------------------------------------------
-
-REVERSE_KEY_MAP = {
-    key.TAB: imgui.Key.KEY_TAB,
-    key.LEFT: imgui.Key.KEY_LEFT_ARROW,
-    key.RIGHT: imgui.Key.KEY_RIGHT_ARROW,
-    key.UP: imgui.Key.KEY_UP_ARROW,
-    key.DOWN: imgui.Key.KEY_DOWN_ARROW,
-    key.PAGEUP: imgui.Key.KEY_PAGE_UP,
-    key.PAGEDOWN: imgui.Key.KEY_PAGE_DOWN,
-    key.HOME: imgui.Key.KEY_HOME,
-    key.END: imgui.Key.KEY_END,
-    key.INSERT: imgui.Key.KEY_INSERT,
-    key.DELETE: imgui.Key.KEY_DELETE,
-    key.BACKSPACE: imgui.Key.KEY_BACKSPACE,
-    key.SPACE: imgui.Key.KEY_SPACE,
-    key.RETURN: imgui.Key.KEY_ENTER,
-    key.ESCAPE: imgui.Key.KEY_ESCAPE,
-    key.NUM_ENTER: imgui.Key.KEY_KEYPAD_ENTER,
-    key.A: imgui.Key.KEY_A,
-    key.C: imgui.Key.KEY_C,
-    key.V: imgui.Key.KEY_V,
-    key.X: imgui.Key.KEY_X,
-    key.Y: imgui.Key.KEY_Y,
-    key.Z: imgui.Key.KEY_Z,
-}
-
-class PygletRenderer:
-    def __init__(self, window):
-        self.renderer = OpenGLRenderer()
-        self.window = window
-
-        self.io = imgui.get_io()
-
-        window_size = window.get_size()
-        self.io.display_size = window_size
-        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
-        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
-
-        self._window = window
-        window.push_handlers(
-            self.on_mouse_motion,
-            self.on_key_press,
-            self.on_key_release,
-            self.on_text,
-            self.on_mouse_drag,
-            self.on_mouse_press,
-            self.on_mouse_release,
-            self.on_mouse_scroll,
-            self.on_resize,
-        )
-
-    def _on_mods_change(self, mods, key_pressed = 0):
-        self.io.add_key_event(imgui.Key.MOD_CTRL, (mods & key.MOD_CTRL) != 0 or key_pressed in (key.LCTRL, key.RCTRL))
-        self.io.add_key_event(imgui.Key.MOD_SUPER, (mods & key.MOD_COMMAND) != 0 or key_pressed in (key.LCOMMAND, key.RCOMMAND))
-        self.io.add_key_event(imgui.Key.MOD_ALT, (mods & key.MOD_ALT) != 0 or key_pressed in (key.LALT, key.RALT))
-        self.io.add_key_event(imgui.Key.MOD_SHIFT, (mods & key.MOD_SHIFT) != 0 or key_pressed in (key.LSHIFT, key.RSHIFT))
-
-    def on_mouse_motion(self, x, y, dx, dy):
-        self.io.add_mouse_pos_event(x, self.io.display_size[1] - y)
-
-    def on_key_press(self, key_pressed, mods):
-        if key_pressed in REVERSE_KEY_MAP:
-            self.io.add_key_event(REVERSE_KEY_MAP[key_pressed], True)
-        self._on_mods_change(mods, key_pressed)
-
-    def on_key_release(self, key_released, mods):
-        if key_released in REVERSE_KEY_MAP:
-            self.io.add_key_event(REVERSE_KEY_MAP[key_released], False)
-        self._on_mods_change(mods)
-
-    def on_text(self, text):
-        for char in text:
-            self.io.add_input_character(ord(char))
-
-    def on_mouse_drag(self, x, y, dx, dy, button, modifiers):
-        self.io.add_mouse_pos_event(x, self.io.display_size[1] - y)
-        if button == mouse.LEFT:
-            self.io.add_mouse_button_event(0, True)
-        if button == mouse.MIDDLE:
-            self.io.add_mouse_button_event(1, True)
-        if button == mouse.RIGHT:
-            self.io.add_mouse_button_event(2, True)
-
-    def on_mouse_press(self, x, y, button, modifiers):
-        if button == mouse.LEFT:
-            self.io.add_mouse_button_event(0, True)
-        if button == mouse.MIDDLE:
-            self.io.add_mouse_button_event(1, True)
-        if button == mouse.RIGHT:
-            self.io.add_mouse_button_event(2, True)
-
-    def on_mouse_release(self, x, y, button, modifiers):
-        if button == mouse.LEFT:
-            self.io.add_mouse_button_event(0, False)
-        if button == mouse.MIDDLE:
-            self.io.add_mouse_button_event(1, False)
-        if button == mouse.RIGHT:
-            self.io.add_mouse_button_event(2, False)
-
-    def on_mouse_scroll(self, x, y, mods, scroll):
-        self.io.add_mouse_wheel_event(0, scroll)
-
-    def on_resize(self, width, height):
-        self.io.display_size = width, height
-
-    def new_frame(self):
-        current_time = pyglet.clock.tick()
-
-        if self._gui_time:
-            self.io.delta_time = current_time - self._gui_time
-        else:
-            self.io.delta_time = 1. / 60.
-
-        if self.io.delta_time <= 0.0:
-            self.io.delta_time = 1./ 1000.
-
-        self._gui_time = current_time
-
-    def shutdown(self):
-        self.renderer.shutdown()
-
-    def render(self, draw_data: imgui.DrawData):
-        self.renderer.render(draw_data)
+from slimgui.integrations.pyglet import PygletRenderer
 
 #------------------------------------------------------------------------
 
@@ -176,6 +45,7 @@ def main():
     def draw(_dt):
         nonlocal count, input_text
 
+        renderer.new_frame()
         imgui.new_frame()
         imgui.push_font(font, 30)
 
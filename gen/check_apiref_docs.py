@@ -372,6 +372,9 @@ def _merge_runtime_classes(module_name: str, classes: dict[str, ClassDoc]) -> No
         for method_name in dir(cls):
             if method_name.startswith("_"):
                 continue
+            # Inherited members are documented with the base class, as in the .pyi files.
+            if method_name not in cls.__dict__:
+                continue
             obj = inspect.getattr_static(cls, method_name)
             bound = getattr(cls, method_name, None)
             is_property = isinstance(obj, property)
@@ -779,6 +782,8 @@ def _render_class_properties_block(class_name: str, class_doc: ClassDoc) -> str:
     for name, func in class_doc.properties.items():
         prop_type = _property_type_from_signature(func.signatures[0]).replace("|", "\\|")
         description = (_normalize_docstring(func.docstring) or "").replace("|", "\\|")
+        # Table cells can't span lines.
+        description = " ".join(line.strip() for line in description.splitlines() if line.strip())
         if include_defaults:
             default = constructor_defaults.get(name, "").replace("|", "\\|")
             parts.append(f"| `{name}` | `{prop_type}` | `{default}` | {description} |")
@@ -0,0 +1,252 @@
+#include <algorithm>
+#include <math.h>
+#include <string.h>
+
+#include "damage_tracker.h"
+#include "draw_hash.h"
+#include "draw_scale.h"
+
+static int64_t rect_area(const DamageRect& r) {
+    return (int64_t)(r.x1 - r.x0) * (r.y1 - r.y0);
+}
+
+static bool rects_overlap(const DamageRect& a, const DamageRect& b) {
+    return a.x0 < b.x1 && b.x0 < a.x1 && a.y0 < b.y1 && b.y0 < a.y1;
+}
+
+static DamageRect rect_union(const DamageRect& a, const DamageRect& b) {
+    return { std::min(a.x0, b.x0), std::min(a.y0, b.y0), std::max(a.x1, b.x1), std::max(a.y1, b.y1) };
+}
+
+DamageTracker::DamageTracker(int max_rects_) : max_rects(std::max(1, max_rects_)) {}
+
+void DamageTracker::reset() {
+    has_prev = false;
+    prev_lists.clear();
+    history.clear();
+}
+
+void DamageTracker::buildList(const ImDrawList* draw_list, List& out) const {
+    thread_local std::vector<ImDrawIdx> rebased;
+    const float clip_off_x = display_pos.x, clip_off_y = display_pos.y;
+    auto to_pixels = [&](float x0, float y0, float x1, float y1) -> DamageRect {
+        DamageRect r = {
+            (int)floorf((x0 - clip_off_x) * fb_scale.x), (int)floorf((y0 - clip_off_y) * fb_scale.y),
+            (int)ceilf((x1 - clip_off_x) * fb_scale.x), (int)ceilf((y1 - clip_off_y) * fb_scale.y),
+        };
+        r.x0 = std::max(r.x0, 0);
+        r.y0 = std::max(r.y0, 0);
+        r.x1 = std::min(r.x1, fb_width);
+        r.y1 = std::min(r.y1, fb_height);
+        return r;
+    };
+
+    // Clip rectangles in display coordinates.
+    const ImVec2 clip_scale = out.clip_scale;
+    auto clip_rect = [&](const ImDrawCmd& cmd) {
+        return ImVec4(cmd.ClipRect.x / clip_scale.x, cmd.ClipRect.y / clip_scale.y, cmd.ClipRect.z / clip_scale.x, cmd.ClipRect.w / clip_scale.y);
+    };
+
+    out.key = draw_list;
+    out.cmds.resize(draw_list->CmdBuffer.Size);
+    for (int i = 0; i < draw_list->CmdBuffer.Size; i++) {
+        const ImDrawCmd& cmd = draw_list->CmdBuffer[i];
+        Cmd& c = out.cmds[i];
+        c.is_volatile = false;
+        c.bounds = { 0, 0, 0, 0 };
+        if (cmd.UserCallback != nullptr) {
+            if (cmd.UserCallback == ImDrawCallback_ResetRenderState) {
+                c.hash = draw_hash::xxh64_value((uintptr_t)cmd.UserCallback, 0);
+            } else {
+                c.hash = cmd.UserCallbackDataSize > 0
+                    ? draw_hash::xxh64(cmd.UserCallbackData, cmd.UserCallbackDataSize, (uint64_t)(uintptr_t)cmd.UserCallback)
+                    : draw_hash::xxh64_value(cmd.UserCallbackData, (uint64_t)(uintptr_t)cmd.UserCallback);
+                ImVec4 clip = clip_rect(cmd);
+                c.bounds = to_pixels(clip.x, clip.y, clip.z, clip.w);
+                c.is_volatile = true;
+            }
+            continue;
+        }
+        if (cmd.ElemCount == 0) {
+            c.hash = 0;
+            continue;
+        }
+
+        // Hash the command's triangles independently of where they are in the
+        // list's buffers, so that commands don't change when geometry is
+        // added or removed before them.
+        const ImDrawIdx* idx = draw_list->IdxBuffer.Data + cmd.IdxOffset;
+        ImDrawIdx min_idx = idx[0], max_idx = idx[0];
+        for (unsigned int j = 1; j < cmd.ElemCount; j++) {
+            min_idx = std::min(min_idx, idx[j]);
+            max_idx = std::max(max_idx, idx[j]);
+        }
+        rebased.resize(cmd.ElemCount);
+        for (unsigned int j = 0; j < cmd.ElemCount; j++)
+            rebased[j] = (ImDrawIdx)(idx[j] - min_idx);
+        const ImDrawVert* vtx = draw_list->VtxBuffer.Data + cmd.VtxOffset + min_idx;
+        int vtx_count = (int)max_idx - (int)min_idx + 1;
+
+        // ImGui's textures are identified by UniqueID rather than their backend ID, which is only set
+        // once the renderer has created the texture.
+        struct {
+            ImVec4 clip_rect;
+            uint64_t tex_id;
+        } key;
+        memset(&key, 0, sizeof(key));
+        ImVec4 clip = clip_rect(cmd);
+        key.clip_rect = clip;
+        key.tex_id = cmd.TexRef._TexData ? ((uint64_t)1 << 63) | (uint32_t)cmd.TexRef._TexData->UniqueID : (uint64_t)cmd.TexRef._TexID;
+        uint64_t h = draw_hash::xxh64_value(key, 0);
+        h = draw_hash::xxh64(rebased.data(), rebased.size() * sizeof(ImDrawIdx), h);
+        c.hash = draw_hash::xxh64(vtx, vtx_count * sizeof(ImDrawVert), h);
+
+        ImVec2 bmin = vtx[0].pos, bmax = vtx[0].pos;
+        for (int j = 1; j < vtx_count; j++) {
+            bmin.x = std::min(bmin.x, vtx[j].pos.x);
+            bmin.y = std::min(bmin.y, vtx[j].pos.y);
+            bmax.x = std::max(bmax.x, vtx[j].pos.x);
+            bmax.y = std::max(bmax.y, vtx[j].pos.y);
+        }
+        c.bounds = to_pixels(
+            std::max(bmin.x, clip.x), std::max(bmin.y, clip.y),
+            std::min(bmax.x, clip.z), std::min(bmax.y, clip.w));
+    }
+}
+
+// Commands that match at the start and end of both lists are unchanged,
+// everything in between is damaged in both its old and new location.
+void DamageTracker::diffCmds(const std::vector<Cmd>& prev, const std::vector<Cmd>& cur, std::vector<DamageRect>& damage) const {
+    auto same = [](const Cmd& a, const Cmd& b) {
+        return !a.is_volatile && !b.is_volatile && a.hash == b.hash && a.bounds == b.bounds;
+    };
+    size_t prefix = 0;
+    size_t n = std::min(prev.size(), cur.size());
+    while (prefix < n && same(prev[prefix], cur[prefix]))
+        prefix++;
+    size_t suffix = 0;
+    while (suffix < n - prefix && same(prev[prev.size() - 1 - suffix], cur[cur.size() - 1 - suffix]))
+        suffix++;
+    for (size_t i = prefix; i < prev.size() - suffix; i++)
+        if (!prev[i].bounds.empty())
+            damage.push_back(prev[i].bounds);
+    for (size_t i = prefix; i < cur.size() - suffix; i++)
+        if (!cur[i].bounds.empty())
+            damage.push_back(cur[i].bounds);
+}
+
+std::vector<DamageRect> DamageTracker::mergeRects(std::vector<DamageRect> rects) const {
+    rects.erase(std::remove_if(rects.begin(), rects.end(), [](const DamageRect& r) { return r.empty(); }), rects.end());
+    if (rects.size() > 256) {
+        // Not worth merging pairwise, the result would be coarse anyway.
+        DamageRect bounds = rects[0];
+        for (const DamageRect& r : rects)
+            bounds = rect_union(bounds, r);
+        return { bounds };
+    }
+    for (;;) {
+        // Merge overlapping rectangles, and ones whose bounding box has no
+        // extra area (e.g., aligned neighbors), until the set is stable.
+        bool merged = true;
+        while (merged) {
+            merged = false;
+            for (size_t i = 0; i < rects.size() && !merged; i++) {
+                for (size_t j = i + 1; j < rects.size(); j++) {
+                    DamageRect u = rect_union(rects[i], rects[j]);
+                    if (rects_overlap(rects[i], rects[j]) || rect_area(u) <= rect_area(rects[i]) + rect_area(rects[j])) {
+                        rects[i] = u;
+                        rects.erase(rects.begin() + j);
+                        merged = true;
+                        break;
+                    }
+                }
+            }
+        }
+        if ((int)rects.size() <= max_rects)
+            return rects;
+        // Too many rectangles, merge the pair that adds the least area.
+        size_t best_i = 0, best_j = 1;
+        int64_t best_waste = INT64_MAX;
+        for (size_t i = 0; i < rects.size(); i++) {
+            for (size_t j = i + 1; j < rects.size(); j++) {
+                int64_t waste = rect_area(rect_union(rects[i], rects[j])) - rect_area(rects[i]) - rect_area(rects[j]);
+                if (waste < best_waste) {
+                    best_waste = waste;
+                    best_i = i;
+                    best_j = j;
+                }
+            }
+        }
+        rects[best_i] = rect_union(rects[best_i], rects[best_j]);
+        rects.erase(rects.begin() + best_j);
+    }
+}
+
+std::vector<DamageRect> DamageTracker::update(const ImDrawData* draw_data, int buffer_age) {
+    int width = std::max(0, (int)(draw_data->DisplaySize.x * draw_data->FramebufferScale.x));
+    int height = std::max(0, (int)(draw_data->DisplaySize.y * draw_data->FramebufferScale.y));
+    bool full = !has_prev || width != fb_width || height != fb_height ||
+        draw_data->DisplayPos.x != display_pos.x || draw_data->DisplayPos.y != display_pos.y ||
+        draw_data->FramebufferScale.x != fb_scale.x || draw_data->FramebufferScale.y != fb_scale.y;
+    display_pos = draw_data->DisplayPos;
+    fb_scale = draw_data->FramebufferScale;
+    fb_width = width;
+    fb_height = height;
+    has_prev = true;
+
+    std::vector<List> lists(draw_data->CmdLists.Size);
+    bool same_lists = !full && prev_lists.size() == lists.size();
+    for (int i = 0; i < draw_data->CmdLists.Size; i++) {
+        const ImDrawList* draw_list = draw_data->CmdLists[i];
+        lists[i].key = draw_list;
+        lists[i].clip_scale = clip_rect_scale(draw_data, draw_list);
+        lists[i].hash = hash_draw_list(draw_list);
+        same_lists = same_lists && prev_lists[i].key == draw_list;
+    }
+
+    std::vector<DamageRect> damage;
+    if (full) {
+        for (List& list : lists)
+            buildList(list.key, list);
+        damage.push_back({ 0, 0, fb_width, fb_height });
+    } else if (same_lists) {
+        for (size_t i = 0; i < lists.size(); i++) {
+            List& list = lists[i];
+            List& prev = prev_lists[i];
+            if (list.hash == prev.hash) {
+                list.cmds = std::move(prev.cmds);
+                for (const Cmd& c : list.cmds)
+                    if (c.is_volatile && !c.bounds.empty())
+                        damage.push_back(c.bounds);
+            } else {
+                buildList(list.key, list);
+                diffCmds(prev.cmds, list.cmds, damage);
+            }
+        }
+    } else {
+        // Lists were added, removed or reordered: diff the commands of the whole frame in draw order.
+        std::vector<Cmd> prev_cmds, cur_cmds;
+        for (const List& prev : prev_lists)
+            prev_cmds.insert(prev_cmds.end(), prev.cmds.begin(), prev.cmds.end());
+        for (List& list : lists) {
+            buildList(list.key, list);
+            cur_cmds.insert(cur_cmds.end(), list.cmds.begin(), list.cmds.end());
+        }
+        diffCmds(prev_cmds, cur_cmds, damage);
+    }
+    prev_lists = std::move(lists);
+
+    damage = mergeRects(std::move(damage));
+    history.push_front(damage);
+    if ((int)history.size() > MaxBufferAge)
+        history.pop_back();
+
+    if (buffer_age <= 0 || buffer_age > (int)history.size())
+        return mergeRects({ { 0, 0, fb_width, fb_height } });
+    if (buffer_age == 1)
+        return damage;
+    std::vector<DamageRect> accumulated;
+    for (int i = 0; i < buffer_age; i++)
+        accumulated.insert(accumulated.end(), history[i].begin(), history[i].end());
+    return mergeRects(std::move(accumulated));
+}
@@ -0,0 +1,74 @@
+// Damage (dirty rectangle) computation between consecutive ImGui frames.
+//
+// Every draw command gets a content hash (its triangles' vertices with
+// rebased indices, texture and clip rectangle) and pixel bounds (bounding box
+// of its vertices clipped to its clip rectangle).  Consecutive frames are
+// diffed per draw list, draw lists with an unchanged `hash_draw_list()` are
+// skipped entirely.  The bounds of all commands that were added, removed or
+// changed are merged into a small set of disjoint rectangles.  Redrawing the
+// whole frame clipped to these rectangles gives the same pixels as redrawing
+// everything.
+//
+// Doesn't touch any graphics API, so it works headlessly.
+#pragma once
+
+#include <stdint.h>
+#include <deque>
+#include <vector>
+
+#include "imgui.h"
+
+struct DamageRect {
+    int x0, y0, x1, y1; // framebuffer pixels, top-left origin, exclusive max
+
+    bool empty() const { return x0 >= x1 || y0 >= y1; }
+    bool operator==(const DamageRect& o) const { return x0 == o.x0 && y0 == o.y0 && x1 == o.x1 && y1 == o.y1; }
+};
+
+class DamageTracker {
+public:
+    explicit DamageTracker(int max_rects = 16);
+
+    // Diff `draw_data` against the previous frame passed to `update()`.
+    //
+    // Returns the regions that need to be redrawn in a framebuffer that holds
+    // the frame rendered `buffer_age` frames ago (1 = the previous frame, as
+    // in `EGL_EXT_buffer_age`).  `buffer_age == 0` (unknown contents), the
+    // first frame and changes to the display size or framebuffer scale
+    // damage the whole framebuffer.  Rectangles don't overlap.  Clip
+    // rectangles that a renderer already scaled to framebuffer pixels with
+    // `DrawData.scale_clip_rects()` are taken into account.
+    std::vector<DamageRect> update(const ImDrawData* draw_data, int buffer_age = 1);
+
+    // Forget the previous frames, the next `update()` damages everything.
+    void reset();
+
+    int maxRects() const { return max_rects; }
+
+    // Longest `buffer_age` that's tracked, older buffers are fully damaged.
+    static constexpr int MaxBufferAge = 4;
+
+private:
+    struct Cmd {
+        uint64_t hash;
+        DamageRect bounds;
+        bool is_volatile; // user callback, may draw something different every frame
+    };
+    struct List {
+        const ImDrawList* key;
+        ImVec2 clip_scale; // see clip_rect_scale()
+        uint64_t hash;
+        std::vector<Cmd> cmds;
+    };
+
+    void buildList(const ImDrawList* draw_list, List& out) const;
+    void diffCmds(const std::vector<Cmd>& prev, const std::vector<Cmd>& cur, std::vector<DamageRect>& damage) const;
+    std::vector<DamageRect> mergeRects(std::vector<DamageRect> rects) const;
+
+    int max_rects;
+    bool has_prev = false;
+    ImVec2 display_pos, fb_scale;
+    int fb_width = 0, fb_height = 0;
+    std::vector<List> prev_lists;
+    std::deque<std::vector<DamageRect>> history; // damage of the last frames, newest first
+};
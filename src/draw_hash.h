@@ -0,0 +1,137 @@
+// Content hashes of Dear ImGui draw lists and draw data.
+//
+// Used to detect frames (or individual draw lists) that render exactly the
+// same pixels as a previous one.  The hash covers the vertex and index
+// buffers and every draw command's clip rectangle, resolved texture ID,
+// offsets, element count and callback (function and user data).  Texture
+// IDs are read from `ImTextureData` when set, so hash draw data after the
+// renderer has processed texture creation requests.
+#pragma once
+
+#include <stdint.h>
+#include <string.h>
+#include <vector>
+
+#include "imgui.h"
+
+// XXH64 (https://github.com/Cyan4973/xxHash), processes 32 bytes per round.
+namespace draw_hash {
+
+constexpr uint64_t P1 = 0x9E3779B185EBCA87ull;
+constexpr uint64_t P2 = 0xC2B2AE3D27D4EB4Full;
+constexpr uint64_t P3 = 0x165667B19E3779F9ull;
+constexpr uint64_t P4 = 0x85EBCA77C2B2AE63ull;
+constexpr uint64_t P5 = 0x27D4EB2F165667C5ull;
+
+inline uint64_t rotl(uint64_t x, int r) { return (x << r) | (x >> (64 - r)); }
+
+inline uint64_t read64(const uint8_t* p) { uint64_t v; memcpy(&v, p, sizeof(v)); return v; }
+inline uint32_t read32(const uint8_t* p) { uint32_t v; memcpy(&v, p, sizeof(v)); return v; }
+
+inline uint64_t round(uint64_t acc, uint64_t input) {
+    acc += input * P2;
+    acc = rotl(acc, 31);
+    return acc * P1;
+}
+
+inline uint64_t merge_round(uint64_t acc, uint64_t val) {
+    acc ^= round(0, val);
+    return acc * P1 + P4;
+}
+
+inline uint64_t xxh64(const void* data, size_t len, uint64_t seed) {
+    const uint8_t* p = (const uint8_t*)data;
+    const uint8_t* end = p + len;
+    uint64_t h;
+    if (len >= 32) {
+        uint64_t v1 = seed + P1 + P2, v2 = seed + P2, v3 = seed, v4 = seed - P1;
+        const uint8_t* limit = end - 32;
+        do {
+            v1 = round(v1, read64(p));
+            v2 = round(v2, read64(p + 8));
+            v3 = round(v3, read64(p + 16));
+            v4 = round(v4, read64(p + 24));
+            p += 32;
+        } while (p <= limit);
+        h = rotl(v1, 1) + rotl(v2, 7) + rotl(v3, 12) + rotl(v4, 18);
+        h = merge_round(h, v1);
+        h = merge_round(h, v2);
+        h = merge_round(h, v3);
+        h = merge_round(h, v4);
+    } else {
+        h = seed + P5;
+    }
+    h += (uint64_t)len;
+    for (; p + 8 <= end; p += 8) {
+        h ^= round(0, read64(p));
+        h = rotl(h, 27) * P1 + P4;
+    }
+    if (p + 4 <= end) {
+        h ^= (uint64_t)read32(p) * P1;
+        h = rotl(h, 23) * P2 + P3;
+        p += 4;
+    }
+    for (; p < end; p++) {
+        h ^= (*p) * P5;
+        h = rotl(h, 11) * P1;
+    }
+    h ^= h >> 33;
+    h *= P2;
+    h ^= h >> 29;
+    h *= P3;
+    h ^= h >> 32;
+    return h;
+}
+
+template<typename T>
+inline uint64_t xxh64_value(const T& v, uint64_t seed) { return xxh64(&v, sizeof(v), seed); }
+
+} // namespace draw_hash
+
+inline uint64_t hash_draw_list(const ImDrawList* draw_list, uint64_t seed = 0) {
+    // Draw commands are hashed field by field: `ImDrawCmd` has padding and
+    // its `TexRef` may hold either a texture ID or an `ImTextureData` pointer.
+    struct CmdKey {
+        ImVec4 clip_rect;
+        uint64_t tex_id;
+        uint64_t callback;
+        uint32_t vtx_offset, idx_offset, elem_count, callback_data_size;
+    };
+    thread_local std::vector<CmdKey> keys;
+    keys.resize(draw_list->CmdBuffer.Size);
+    uint64_t h = seed;
+    for (int i = 0; i < draw_list->CmdBuffer.Size; i++) {
+        const ImDrawCmd& cmd = draw_list->CmdBuffer[i];
+        CmdKey& key = keys[i];
+        memset(&key, 0, sizeof(key));
+        key.clip_rect = cmd.ClipRect;
+        key.tex_id = (uint64_t)(cmd.TexRef._TexData ? cmd.TexRef._TexData->TexID : cmd.TexRef._TexID);
+        key.callback = (uint64_t)(uintptr_t)cmd.UserCallback;
+        key.vtx_offset = cmd.VtxOffset;
+        key.idx_offset = cmd.IdxOffset;
+        key.elem_count = cmd.ElemCount;
+        key.callback_data_size = (uint32_t)cmd.UserCallbackDataSize;
+        if (cmd.UserCallback != nullptr) {
+            // Callback data is either copied into the draw list or a raw pointer.
+            h = cmd.UserCallbackDataSize > 0
+                ? draw_hash::xxh64(cmd.UserCallbackData, cmd.UserCallbackDataSize, h)
+                : draw_hash::xxh64_value(cmd.UserCallbackData, h);
+        }
+    }
+    h = draw_hash::xxh64(keys.data(), keys.size() * sizeof(CmdKey), h);
+    h = draw_hash::xxh64(draw_list->VtxBuffer.Data, draw_list->VtxBuffer.size_in_bytes(), h);
+    h = draw_hash::xxh64(draw_list->IdxBuffer.Data, draw_list->IdxBuffer.size_in_bytes(), h);
+    return h;
+}
+
+inline uint64_t hash_draw_data(const ImDrawData* draw_data) {
+    const float display[6] = {
+        draw_data->DisplayPos.x, draw_data->DisplayPos.y,
+        draw_data->DisplaySize.x, draw_data->DisplaySize.y,
+        draw_data->FramebufferScale.x, draw_data->FramebufferScale.y,
+    };
+    uint64_t h = draw_hash::xxh64(display, sizeof(display), (uint64_t)draw_data->CmdLists.Size);
+    for (const ImDrawList* draw_list : draw_data->CmdLists)
+        h = hash_draw_list(draw_list, h);
+    return h;
+}
@@ -0,0 +1,94 @@
+#include <algorithm>
+#include <float.h>
+
+#include "draw_merge.h"
+
+namespace {
+
+struct Bounds {
+    float x0 = FLT_MAX, y0 = FLT_MAX, x1 = -FLT_MAX, y1 = -FLT_MAX;
+};
+
+Bounds geometry_bounds(const ImDrawList* draw_list, const ImDrawCmd& cmd) {
+    Bounds b;
+    const ImDrawVert* vtx = draw_list->VtxBuffer.Data + cmd.VtxOffset;
+    const ImDrawIdx* idx = draw_list->IdxBuffer.Data + cmd.IdxOffset;
+    for (unsigned int i = 0; i < cmd.ElemCount; i++) {
+        const ImVec2& p = vtx[idx[i]].pos;
+        b.x0 = std::min(b.x0, p.x);
+        b.y0 = std::min(b.y0, p.y);
+        b.x1 = std::max(b.x1, p.x);
+        b.y1 = std::max(b.y1, p.y);
+    }
+    return b;
+}
+
+// True if clipping `cmd`'s geometry with any rectangle containing its clip rectangle draws the same pixels.
+bool geometry_inside_clip_rect(const ImDrawList* draw_list, const ImDrawCmd& cmd) {
+    Bounds b = geometry_bounds(draw_list, cmd);
+    const ImVec4& r = cmd.ClipRect;
+    return b.x0 >= r.x + 1.0f && b.y0 >= r.y + 1.0f && b.x1 <= r.z - 1.0f && b.y1 <= r.w - 1.0f;
+}
+
+bool same_clip_rect(const ImVec4& a, const ImVec4& b) {
+    return a.x == b.x && a.y == b.y && a.z == b.z && a.w == b.w;
+}
+
+bool same_texture(const ImTextureRef& a, const ImTextureRef& b) {
+    return a._TexData == b._TexData && a._TexID == b._TexID;
+}
+
+bool can_concatenate(const ImDrawCmd& a, const ImDrawCmd& b) {
+    return a.UserCallback == nullptr && b.UserCallback == nullptr &&
+        same_texture(a.TexRef, b.TexRef) && a.VtxOffset == b.VtxOffset && a.IdxOffset + a.ElemCount == b.IdxOffset;
+}
+
+} // namespace
+
+int merge_draw_commands(ImDrawList* draw_list) {
+    ImVector<ImDrawCmd>& cmds = draw_list->CmdBuffer;
+    int out = 0;
+    // Whether the geometry of the command being merged into (cmds[out - 1]) is known to lie inside its
+    // clip rectangle: 1 yes, 0 no, -1 not computed yet.
+    int run_inside = -1;
+    for (int i = 0; i < cmds.Size; i++) {
+        const ImDrawCmd cmd = cmds[i];
+        if (cmd.UserCallback == nullptr && cmd.ElemCount == 0)
+            continue;
+        if (out > 0 && can_concatenate(cmds[out - 1], cmd)) {
+            ImDrawCmd& run = cmds[out - 1];
+            if (same_clip_rect(run.ClipRect, cmd.ClipRect)) {
+                run.ElemCount += cmd.ElemCount;
+                if (run_inside == 1)
+                    run_inside = -1;
+                continue;
+            }
+            ImVec4 merged(std::min(run.ClipRect.x, cmd.ClipRect.x), std::min(run.ClipRect.y, cmd.ClipRect.y),
+                          std::max(run.ClipRect.z, cmd.ClipRect.z), std::max(run.ClipRect.w, cmd.ClipRect.w));
+            bool run_ok = same_clip_rect(run.ClipRect, merged);
+            if (!run_ok) {
+                if (run_inside < 0)
+                    run_inside = geometry_inside_clip_rect(draw_list, run) ? 1 : 0;
+                run_ok = run_inside == 1;
+            }
+            if (run_ok && (same_clip_rect(cmd.ClipRect, merged) || geometry_inside_clip_rect(draw_list, cmd))) {
+                run.ClipRect = merged;
+                run.ElemCount += cmd.ElemCount;
+                run_inside = -1;
+                continue;
+            }
+        }
+        cmds[out++] = cmd;
+        run_inside = -1;
+    }
+    int removed = cmds.Size - out;
+    cmds.shrink(out);
+    return removed;
+}
+
+int merge_draw_commands(ImDrawData* draw_data) {
+    int removed = 0;
+    for (ImDrawList* draw_list : draw_data->CmdLists)
+        removed += merge_draw_commands(draw_list);
+    return removed;
+}
@@ -0,0 +1,26 @@
+// In-place merging of adjacent draw commands.
+//
+// Dear ImGui starts a new command whenever the clip rectangle or texture
+// changes, so windows with many pushed clip rectangles (tables, plots,
+// clipped text) produce runs of small commands.  Adjacent commands that use
+// the same texture and vertex offset and whose index ranges are contiguous
+// are merged into one:
+//
+// - commands with identical clip rectangles always;
+// - commands with different clip rectangles when the union (bounding box)
+//   of the rectangles doesn't change what's drawn: geometry clipped by its
+//   own rectangle must lie at least one unit inside it, so that scissor
+//   rounding in backends can't reveal any extra pixels (assuming a
+//   framebuffer scale of at least 1).
+//
+// Commands without elements are dropped.  Callbacks (including render state
+// resets) are kept and never merged across.
+#pragma once
+
+#include "imgui.h"
+
+// Returns the number of commands removed from `draw_list`.
+int merge_draw_commands(ImDrawList* draw_list);
+
+// Returns the number of commands removed from all of `draw_data`'s lists.
+int merge_draw_commands(ImDrawData* draw_data);
@@ -0,0 +1,724 @@
+#include <string.h>
+#include <algorithm>
+#include <iterator>
+#include <stdexcept>
+
+#include "draw_recording.h"
+#include "draw_hash.h"
+
+using namespace draw_recording;
+
+// Command flags: texture reference kind and callback kind.
+enum CmdFlags : uint8_t {
+    CmdFlag_RawTexID = 1 << 0,          // texture is a user texture ID, not an ImTextureData
+    CmdFlag_ResetRenderState = 1 << 1,  // ImDrawCallback_ResetRenderState
+    CmdFlag_UserCallback = 1 << 2,      // user callback, dropped on replay
+};
+
+// How a frame record stores each of its draw lists.
+enum ListEncoding : uint8_t {
+    List_Reference = 0, // same hash as a list of the previous frame
+    List_Full = 1,
+    List_Delta = 2,     // differences to a list of the previous frame, followed by its hash
+};
+
+constexpr size_t HeaderSize = sizeof(Magic) + 3 * sizeof(uint32_t);
+constexpr size_t RecordHeaderSize = 1 + sizeof(uint32_t);
+
+// Unchanged runs shorter than this are cheaper to store as part of a literal run.
+constexpr size_t MinCopyRun = 8;
+
+//-----------------------------------------------------------------------------
+// Encoding
+
+template<typename T>
+static void put(std::string& out, const T& v) {
+    out.append((const char*)&v, sizeof(v));
+}
+
+static void put_varint(std::string& out, uint64_t v) {
+    while (v >= 0x80) {
+        out.push_back((char)(v | 0x80));
+        v >>= 7;
+    }
+    out.push_back((char)v);
+}
+
+// Write `data` as differences to `base`: the size of a suffix that's equal to
+// the end of `base` (which keeps an insertion or removal from changing all the
+// bytes after it), then alternating runs of bytes that are equal to `base` at
+// the same offset and literal bytes, [varint copy size][varint literal size]
+// [literal bytes]..., until the bytes before the suffix are covered.
+static void put_delta(std::string& out, const char* data, size_t size, const std::string& base) {
+    size_t common = std::min(size, base.size());
+    size_t prefix = 0;
+    while (prefix < common && data[prefix] == base[prefix])
+        prefix++;
+    size_t suffix = 0;
+    if (size != base.size())
+        while (suffix < common - prefix && data[size - suffix - 1] == base[base.size() - suffix - 1])
+            suffix++;
+    put_varint(out, suffix);
+    size -= suffix;
+    common = std::min(size, base.size());
+    size_t pos = 0;
+    while (pos < size) {
+        size_t copy = 0;
+        while (pos + copy < common && data[pos + copy] == base[pos + copy])
+            copy++;
+        size_t literal_begin = pos + copy, literal_end = literal_begin;
+        while (literal_end < size) {
+            size_t run = 0;
+            while (run < MinCopyRun && literal_end + run < common && data[literal_end + run] == base[literal_end + run])
+                run++;
+            if (run == MinCopyRun)
+                break;
+            literal_end += std::max<size_t>(run, 1);
+        }
+        literal_end = std::min(literal_end, size);
+        put_varint(out, copy);
+        put_varint(out, literal_end - literal_begin);
+        out.append(data + literal_begin, literal_end - literal_begin);
+        pos = literal_end;
+    }
+}
+
+static size_t begin_record(std::string& out, RecordType type) {
+    out.push_back((char)type);
+    size_t pos = out.size();
+    put(out, (uint32_t)0);
+    return pos;
+}
+
+static void end_record(std::string& out, size_t pos) {
+    uint32_t size = (uint32_t)(out.size() - pos - sizeof(uint32_t));
+    memcpy(&out[pos], &size, sizeof(size));
+}
+
+// Draw list hash for references between frames.  Also covers the textures'
+// unique IDs, as texture IDs are 0 for textures the renderer hasn't created yet.
+static uint64_t list_hash(const ImDrawList* draw_list) {
+    uint64_t h = 0;
+    for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+        int unique_id = cmd.TexRef._TexData ? cmd.TexRef._TexData->UniqueID : -1;
+        h = draw_hash::xxh64_value(unique_id, h);
+    }
+    return hash_draw_list(draw_list, h);
+}
+
+static void write_display(const ImDrawData* draw_data, std::string& out) {
+    put(out, draw_data->DisplayPos);
+    put(out, draw_data->DisplaySize);
+    put(out, draw_data->FramebufferScale);
+}
+
+void DrawDataRecorder::recordTextures(const ImDrawData* draw_data, std::string& out) {
+    ImVector<ImTextureData*> textures;
+    if (draw_data->Textures != nullptr)
+        textures = *draw_data->Textures;
+    for (const ImDrawList* draw_list : draw_data->CmdLists)
+        for (const ImDrawCmd& cmd : draw_list->CmdBuffer)
+            if (cmd.TexRef._TexData != nullptr && !textures.contains(cmd.TexRef._TexData))
+                textures.push_back(cmd.TexRef._TexData);
+
+    for (ImTextureData* tex : textures) {
+        bool known = known_textures.count(tex->UniqueID) != 0;
+        if (tex->Status == ImTextureStatus_WantDestroy || tex->Status == ImTextureStatus_Destroyed) {
+            // Renderers destroy textures once they've been unused for a frame.
+            if (known && (tex->Status == ImTextureStatus_Destroyed || tex->UnusedFrames > 0)) {
+                size_t pos = begin_record(out, Record_TextureDestroy);
+                put_varint(out, (uint64_t)tex->UniqueID);
+                end_record(out, pos);
+                known_textures.erase(tex->UniqueID);
+            }
+        } else if (tex->Pixels != nullptr && (tex->Status == ImTextureStatus_WantCreate || !known)) {
+            // Textures that existed before the recording started are created in full too.
+            size_t pos = begin_record(out, Record_TextureCreate);
+            put_varint(out, (uint64_t)tex->UniqueID);
+            put(out, (uint8_t)tex->Format);
+            put_varint(out, (uint64_t)tex->Width);
+            put_varint(out, (uint64_t)tex->Height);
+            out.append((const char*)tex->Pixels, (size_t)tex->GetSizeInBytes());
+            end_record(out, pos);
+            known_textures.insert(tex->UniqueID);
+        } else if (tex->Status == ImTextureStatus_WantUpdates && known) {
+            size_t pos = begin_record(out, Record_TextureUpdate);
+            put_varint(out, (uint64_t)tex->UniqueID);
+            put_varint(out, (uint64_t)tex->Updates.Size);
+            for (const ImTextureRect& r : tex->Updates) {
+                put_varint(out, r.x);
+                put_varint(out, r.y);
+                put_varint(out, r.w);
+                put_varint(out, r.h);
+                for (int y = 0; y < r.h; y++)
+                    out.append((const char*)tex->GetPixelsAt(r.x, r.y + y), (size_t)r.w * tex->BytesPerPixel);
+            }
+            end_record(out, pos);
+        }
+    }
+}
+
+static void put_commands(std::string& out, const ImDrawList* draw_list) {
+    for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+        uint8_t flags = 0;
+        if (cmd.TexRef._TexData == nullptr)
+            flags |= CmdFlag_RawTexID;
+        if (cmd.UserCallback == ImDrawCallback_ResetRenderState)
+            flags |= CmdFlag_ResetRenderState;
+        else if (cmd.UserCallback != nullptr)
+            flags |= CmdFlag_UserCallback;
+        put(out, flags);
+        put(out, cmd.ClipRect);
+        if (flags & CmdFlag_RawTexID)
+            put(out, (uint64_t)cmd.TexRef._TexID);
+        else
+            put_varint(out, (uint64_t)cmd.TexRef._TexData->UniqueID);
+        put_varint(out, cmd.VtxOffset);
+        put_varint(out, cmd.IdxOffset);
+        put_varint(out, cmd.ElemCount);
+    }
+}
+
+void DrawDataRecorder::writeList(const ImDrawList* draw_list, const ListCopy* base, std::string& out) {
+    const char* owner_name = draw_list->_OwnerName ? draw_list->_OwnerName : "";
+    const char* vtx = (const char*)draw_list->VtxBuffer.Data;
+    const char* idx = (const char*)draw_list->IdxBuffer.Data;
+    size_t vtx_size = (size_t)draw_list->VtxBuffer.size_in_bytes(), idx_size = (size_t)draw_list->IdxBuffer.size_in_bytes();
+    // Deltas take the owner name from their base.
+    if (base == nullptr) {
+        put_varint(out, strlen(owner_name));
+        out.append(owner_name);
+    }
+    put_varint(out, (uint64_t)draw_list->VtxBuffer.Size);
+    put_varint(out, (uint64_t)draw_list->IdxBuffer.Size);
+    put_varint(out, (uint64_t)draw_list->CmdBuffer.Size);
+    if (base != nullptr) {
+        put_delta(out, vtx, vtx_size, base->vtx);
+        put_delta(out, idx, idx_size, base->idx);
+        put_varint(out, commands.size());
+        put_delta(out, commands.data(), commands.size(), base->commands);
+    } else {
+        out.append(vtx, vtx_size);
+        out.append(idx, idx_size);
+        out.append(commands);
+    }
+}
+
+std::string DrawDataRecorder::record(const ImDrawData* draw_data, double time) {
+    std::string out;
+    if (!header_written) {
+        out.append(Magic, sizeof(Magic));
+        put(out, Version);
+        put(out, (uint32_t)sizeof(ImDrawVert));
+        put(out, (uint32_t)sizeof(ImDrawIdx));
+        header_written = true;
+    }
+    recordTextures(draw_data, out);
+    // Textures the reader has from before a keyframe that are gone now.
+    for (int unique_id : stale_textures) {
+        if (known_textures.count(unique_id) != 0)
+            continue;
+        size_t pos = begin_record(out, Record_TextureDestroy);
+        put_varint(out, (uint64_t)unique_id);
+        end_record(out, pos);
+    }
+    stale_textures.clear();
+
+    std::vector<uint64_t> hashes;
+    hashes.reserve(draw_data->CmdLists.Size);
+    for (const ImDrawList* draw_list : draw_data->CmdLists)
+        hashes.push_back(list_hash(draw_list));
+    std::string display;
+    write_display(draw_data, display);
+    uint64_t frame_hash = draw_hash::xxh64(display.data(), display.size(), (uint64_t)hashes.size());
+    frame_hash = draw_hash::xxh64(hashes.data(), hashes.size() * sizeof(uint64_t), frame_hash);
+
+    if (frame_count > 0 && frame_hash == prev_frame_hash && !is_keyframe) {
+        size_t pos = begin_record(out, Record_RepeatFrame);
+        put(out, time);
+        end_record(out, pos);
+        lists_referenced += hashes.size();
+        for (auto& [owner, copy] : lists_by_owner)
+            copy.frame = frame_count;
+    } else {
+        size_t pos = begin_record(out, Record_Frame);
+        put(out, time);
+        out.append(display);
+        put_varint(out, hashes.size());
+        cur_lists.clear();
+        for (int i = 0; i < draw_data->CmdLists.Size; i++) {
+            const ImDrawList* draw_list = draw_data->CmdLists[i];
+            uint64_t h = hashes[i];
+            ListCopy& copy = lists_by_owner[draw_list->_OwnerName ? draw_list->_OwnerName : ""];
+            bool is_reference = prev_lists.count(h) != 0 || cur_lists.count(h) != 0;
+            bool update_copy = copy.frame != frame_count && (copy.frame < 0 || copy.hash != h);
+            if (!is_reference || update_copy) {
+                commands.clear();
+                put_commands(commands, draw_list);
+            }
+            put(out, h);
+            if (is_reference) {
+                put(out, (uint8_t)List_Reference);
+                lists_referenced++;
+            } else if (copy.frame == frame_count - 1 && prev_lists.count(copy.hash) != 0) {
+                // The owner's list of the previous frame, which the reader still has.
+                put(out, (uint8_t)List_Delta);
+                put(out, copy.hash);
+                writeList(draw_list, &copy, out);
+                lists_delta++;
+            } else {
+                put(out, (uint8_t)List_Full);
+                writeList(draw_list, nullptr, out);
+                lists_written++;
+            }
+            cur_lists.insert(h);
+            if (update_copy) {
+                copy.vtx.assign((const char*)draw_list->VtxBuffer.Data, (size_t)draw_list->VtxBuffer.size_in_bytes());
+                copy.idx.assign((const char*)draw_list->IdxBuffer.Data, (size_t)draw_list->IdxBuffer.size_in_bytes());
+                copy.commands.assign(commands);
+                copy.hash = h;
+            }
+            copy.frame = frame_count;
+        }
+        end_record(out, pos);
+        prev_lists.swap(cur_lists);
+        // Forget owners that didn't draw in this frame.
+        for (auto it = lists_by_owner.begin(); it != lists_by_owner.end(); )
+            it = it->second.frame == frame_count ? std::next(it) : lists_by_owner.erase(it);
+    }
+    prev_frame_hash = frame_hash;
+    is_keyframe = false;
+    frame_count++;
+    bytes_written += out.size();
+    return out;
+}
+
+void DrawDataRecorder::keyframe() {
+    is_keyframe = true;
+    prev_lists.clear();
+    lists_by_owner.clear();
+    stale_textures.insert(known_textures.begin(), known_textures.end());
+    known_textures.clear();
+}
+
+//-----------------------------------------------------------------------------
+// Decoding
+
+namespace {
+
+struct Decoder {
+    const uint8_t* p;
+    const uint8_t* end;
+
+    void need(size_t size) const {
+        if ((size_t)(end - p) < size)
+            throw std::invalid_argument("DrawDataReader: truncated record");
+    }
+
+    template<typename T>
+    T get() {
+        T v;
+        need(sizeof(v));
+        memcpy(&v, p, sizeof(v));
+        p += sizeof(v);
+        return v;
+    }
+
+    uint64_t varint() {
+        uint64_t v = 0;
+        for (int shift = 0; shift < 64; shift += 7) {
+            uint8_t b = get<uint8_t>();
+            v |= (uint64_t)(b & 0x7f) << shift;
+            if ((b & 0x80) == 0)
+                return v;
+        }
+        throw std::invalid_argument("DrawDataReader: malformed varint");
+    }
+
+    const uint8_t* bytes(size_t size) {
+        need(size);
+        const uint8_t* data = p;
+        p += size;
+        return data;
+    }
+};
+
+template<typename T>
+void read_vector(Decoder& d, ImVector<T>& v, uint64_t count) {
+    if (count > (uint64_t)(d.end - d.p) / sizeof(T))
+        throw std::invalid_argument("DrawDataReader: truncated record");
+    v.resize((int)count);
+    if (count > 0)
+        memcpy(v.Data, d.bytes(count * sizeof(T)), count * sizeof(T));
+}
+
+// Read `size` bytes written by `put_delta()` against `base`.
+void read_delta(Decoder& d, uint8_t* dst, size_t size, const uint8_t* base, size_t base_size) {
+    uint64_t suffix = d.varint();
+    if (suffix > std::min(size, base_size))
+        throw std::invalid_argument("DrawDataReader: malformed draw list delta");
+    size -= suffix;
+    memcpy(dst + size, base + base_size - suffix, suffix);
+    size_t common = std::min(size, base_size);
+    size_t pos = 0;
+    while (pos < size) {
+        uint64_t copy = d.varint(), literal = d.varint();
+        if (copy + literal == 0 || copy > common - std::min(pos, common) || literal > size - pos - copy)
+            throw std::invalid_argument("DrawDataReader: malformed draw list delta");
+        memcpy(dst + pos, base + pos, copy);
+        pos += copy;
+        memcpy(dst + pos, d.bytes(literal), literal);
+        pos += literal;
+    }
+}
+
+// Bytes past the end of the base are literals, so a delta can't be larger than
+// the base plus the rest of the record.
+void check_delta_size(const Decoder& d, uint64_t size, size_t base_size) {
+    if (size > base_size + (uint64_t)(d.end - d.p))
+        throw std::invalid_argument("DrawDataReader: truncated record");
+}
+
+template<typename T>
+void read_vector_delta(Decoder& d, ImVector<T>& v, uint64_t count, const ImVector<T>& base) {
+    check_delta_size(d, count * sizeof(T), (size_t)base.size_in_bytes());
+    v.resize((int)count);
+    read_delta(d, (uint8_t*)v.Data, (size_t)count * sizeof(T), (const uint8_t*)base.Data, (size_t)base.size_in_bytes());
+}
+
+} // namespace
+
+DrawDataReader::DrawDataReader() {
+    frame.Clear();
+}
+
+DrawDataReader::~DrawDataReader() {
+    for (auto& [hash, list] : prev_lists)
+        IM_DELETE(list.draw_list);
+    for (ImDrawList* draw_list : free_lists)
+        IM_DELETE(draw_list);
+    for (ImTextureData* tex : live_textures)
+        if (textures_by_id.count(tex->UniqueID) == 0 || textures_by_id[tex->UniqueID] != tex)
+            IM_DELETE(tex);
+    for (auto& [id, tex] : textures_by_id)
+        IM_DELETE(tex);
+}
+
+void DrawDataReader::feed(const void* data, size_t size) {
+    // Drop consumed bytes once they make up most of the buffer.
+    if (read_pos > 0 && read_pos >= buffer.size() / 2) {
+        buffer.erase(buffer.begin(), buffer.begin() + read_pos);
+        read_pos = 0;
+    }
+    buffer.insert(buffer.end(), (const uint8_t*)data, (const uint8_t*)data + size);
+}
+
+ImTextureData* DrawDataReader::texture(int unique_id) {
+    auto it = textures_by_id.find(unique_id);
+    if (it == textures_by_id.end() || it->second->Pixels == nullptr)
+        throw std::invalid_argument("DrawDataReader: reference to unknown texture");
+    return it->second;
+}
+
+void DrawDataReader::beginFrame() {
+    // Forget textures the renderer has destroyed and updates it has processed.
+    for (int i = 0; i < live_textures.Size; ) {
+        ImTextureData* tex = live_textures[i];
+        if (tex->Status == ImTextureStatus_Destroyed) {
+            live_textures.erase(live_textures.Data + i);
+            if (textures_by_id[tex->UniqueID] == tex)
+                tex->DestroyPixels();
+            else
+                IM_DELETE(tex); // replaced by a newer texture with the same ID
+            continue;
+        }
+        if (tex->Status == ImTextureStatus_OK) {
+            tex->Updates.resize(0);
+            tex->UpdateRect.x = tex->UpdateRect.y = (unsigned short)~0;
+            tex->UpdateRect.w = tex->UpdateRect.h = 0;
+        }
+        i++;
+    }
+}
+
+static void request_destroy(ImTextureData* tex) {
+    tex->WantDestroyNextFrame = true; // makes SetStatus(Destroyed) stick although pixels are kept
+    tex->UnusedFrames = 1;
+    tex->Status = ImTextureStatus_WantDestroy;
+}
+
+void DrawDataReader::applyTextureCreate(const uint8_t* p, const uint8_t* end) {
+    Decoder d{ p, end };
+    int unique_id = (int)d.varint();
+    ImTextureFormat format = (ImTextureFormat)d.get<uint8_t>();
+    uint64_t width = d.varint(), height = d.varint();
+    if ((format != ImTextureFormat_RGBA32 && format != ImTextureFormat_Alpha8) || width == 0 || height == 0 || width > 0xffff || height > 0xffff)
+        throw std::invalid_argument("DrawDataReader: invalid texture");
+    const uint8_t* pixels = d.bytes(width * height * (format == ImTextureFormat_RGBA32 ? 4 : 1));
+
+    ImTextureData* tex = nullptr;
+    auto it = textures_by_id.find(unique_id);
+    if (it != textures_by_id.end()) {
+        tex = it->second;
+        if (tex->Status == ImTextureStatus_WantCreate) {
+            tex->Status = ImTextureStatus_Destroyed; // never seen by the renderer
+        } else if (tex->Status != ImTextureStatus_Destroyed) {
+            // Still exists in the renderer: destroy it and create a new one in its place.
+            request_destroy(tex);
+            tex = nullptr;
+        }
+    }
+    if (tex == nullptr) {
+        tex = IM_NEW(ImTextureData)();
+        tex->UniqueID = unique_id;
+        textures_by_id[unique_id] = tex;
+    }
+    if (!live_textures.contains(tex))
+        live_textures.push_back(tex);
+    tex->WantDestroyNextFrame = false;
+    tex->UnusedFrames = 0;
+    tex->Create(format, (int)width, (int)height);
+    tex->RefCount = 1;
+    tex->TexID = ImTextureID_Invalid;
+    memcpy(tex->Pixels, pixels, (size_t)tex->GetSizeInBytes());
+    tex->UsedRect.w = (unsigned short)width;
+    tex->UsedRect.h = (unsigned short)height;
+}
+
+void DrawDataReader::applyTextureUpdate(const uint8_t* p, const uint8_t* end) {
+    Decoder d{ p, end };
+    ImTextureData* tex = texture((int)d.varint());
+    uint64_t count = d.varint();
+    for (uint64_t i = 0; i < count; i++) {
+        uint64_t x = d.varint(), y = d.varint(), w = d.varint(), h = d.varint();
+        if (x + w > (uint64_t)tex->Width || y + h > (uint64_t)tex->Height)
+            throw std::invalid_argument("DrawDataReader: texture update out of bounds");
+        size_t row_size = (size_t)w * tex->BytesPerPixel;
+        const uint8_t* src = d.bytes(row_size * h);
+        for (uint64_t row = 0; row < h; row++)
+            memcpy(tex->GetPixelsAt((int)x, (int)(y + row)), src + row * row_size, row_size);
+
+        ImTextureRect r = { (unsigned short)x, (unsigned short)y, (unsigned short)w, (unsigned short)h };
+        tex->Updates.push_back(r);
+        int x1 = std::max(tex->UpdateRect.w == 0 ? 0 : tex->UpdateRect.x + tex->UpdateRect.w, r.x + r.w);
+        int y1 = std::max(tex->UpdateRect.h == 0 ? 0 : tex->UpdateRect.y + tex->UpdateRect.h, r.y + r.h);
+        tex->UpdateRect.x = std::min(tex->UpdateRect.x, r.x);
+        tex->UpdateRect.y = std::min(tex->UpdateRect.y, r.y);
+        tex->UpdateRect.w = (unsigned short)(x1 - tex->UpdateRect.x);
+        tex->UpdateRect.h = (unsigned short)(y1 - tex->UpdateRect.y);
+    }
+    // Textures waiting to be created are uploaded with the updated pixels.
+    if (tex->Status == ImTextureStatus_OK)
+        tex->Status = ImTextureStatus_WantUpdates;
+}
+
+void DrawDataReader::applyTextureDestroy(const uint8_t* p, const uint8_t* end) {
+    Decoder d{ p, end };
+    auto it = textures_by_id.find((int)d.varint());
+    if (it == textures_by_id.end())
+        return;
+    ImTextureData* tex = it->second;
+    if (tex->Status == ImTextureStatus_WantCreate)
+        tex->Status = ImTextureStatus_Destroyed;
+    else if (tex->Status != ImTextureStatus_Destroyed)
+        request_destroy(tex);
+}
+
+void DrawDataReader::readList(const uint8_t*& p, const uint8_t* end, List& list, const List* base) {
+    Decoder d{ p, end };
+    if (base != nullptr) {
+        list.owner_name = base->owner_name;
+    } else {
+        uint64_t name_size = d.varint();
+        list.owner_name.assign((const char*)d.bytes(name_size), name_size);
+    }
+    uint64_t vtx_count = d.varint(), idx_count = d.varint(), cmd_count = d.varint();
+
+    ImDrawList* draw_list = list.draw_list;
+    // Commands are decoded from `c`: the record for full lists, the reconstructed
+    // commands for deltas.
+    Decoder c = d;
+    if (base != nullptr) {
+        read_vector_delta(d, draw_list->VtxBuffer, vtx_count, base->draw_list->VtxBuffer);
+        read_vector_delta(d, draw_list->IdxBuffer, idx_count, base->draw_list->IdxBuffer);
+        uint64_t commands_size = d.varint();
+        check_delta_size(d, commands_size, base->commands.size());
+        list.commands.resize(commands_size);
+        read_delta(d, (uint8_t*)list.commands.data(), commands_size, (const uint8_t*)base->commands.data(), base->commands.size());
+        c = Decoder{ (const uint8_t*)list.commands.data(), (const uint8_t*)list.commands.data() + list.commands.size() };
+    } else {
+        read_vector(d, draw_list->VtxBuffer, vtx_count);
+        read_vector(d, draw_list->IdxBuffer, idx_count);
+        c = d;
+    }
+    draw_list->_OwnerName = list.owner_name.empty() ? nullptr : list.owner_name.c_str();
+    draw_list->CmdBuffer.resize(0);
+    list.clip_rects.clear();
+    const uint8_t* commands_begin = c.p;
+    for (uint64_t i = 0; i < cmd_count; i++) {
+        ImDrawCmd cmd;
+        uint8_t flags = c.get<uint8_t>();
+        cmd.ClipRect = c.get<ImVec4>();
+        if (flags & CmdFlag_RawTexID)
+            cmd.TexRef._TexID = (ImTextureID)c.get<uint64_t>();
+        else
+            cmd.TexRef._TexData = texture((int)c.varint());
+        cmd.VtxOffset = (unsigned int)c.varint();
+        cmd.IdxOffset = (unsigned int)c.varint();
+        cmd.ElemCount = (unsigned int)c.varint();
+        if ((uint64_t)cmd.IdxOffset + cmd.ElemCount > idx_count || cmd.VtxOffset > vtx_count)
+            throw std::invalid_argument("DrawDataReader: draw command out of bounds");
+        if (flags & CmdFlag_UserCallback)
+            continue;
+        if (flags & CmdFlag_ResetRenderState)
+            cmd.UserCallback = ImDrawCallback_ResetRenderState;
+        draw_list->CmdBuffer.push_back(cmd);
+        list.clip_rects.push_back(cmd.ClipRect);
+    }
+    if (base == nullptr) {
+        list.commands.assign((const char*)commands_begin, (size_t)(c.p - commands_begin));
+        d.p = c.p;
+    }
+    p = d.p;
+}
+
+void DrawDataReader::readFrameRecord(const uint8_t* p, const uint8_t* end) {
+    Decoder d{ p, end };
+    frame_time = d.get<double>();
+    ImVec2 display_pos = d.get<ImVec2>();
+    ImVec2 display_size = d.get<ImVec2>();
+    ImVec2 fb_scale = d.get<ImVec2>();
+    uint64_t count = d.varint();
+    if (count > (uint64_t)(end - d.p))
+        throw std::invalid_argument("DrawDataReader: truncated record");
+
+    std::unordered_map<uint64_t, List> lists;
+    frame.CmdLists.resize(0);
+    for (uint64_t i = 0; i < count; i++) {
+        uint64_t hash = d.get<uint64_t>();
+        uint8_t encoding = d.get<uint8_t>();
+        if (encoding > List_Delta)
+            throw std::invalid_argument("DrawDataReader: unknown draw list encoding");
+        const List* base = nullptr;
+        if (encoding == List_Delta) {
+            // The base is a list of the previous frame, possibly already referenced by this frame.
+            uint64_t base_hash = d.get<uint64_t>();
+            auto prev = prev_lists.find(base_hash);
+            auto cur = lists.find(base_hash);
+            if (prev != prev_lists.end())
+                base = &prev->second;
+            else if (cur != lists.end())
+                base = &cur->second;
+            else
+                throw std::invalid_argument("DrawDataReader: delta against unknown draw list");
+        }
+        auto it = lists.find(hash);
+        if (encoding != List_Reference) {
+            List list;
+            if (!free_lists.empty()) {
+                list.draw_list = free_lists.back();
+                free_lists.pop_back();
+            } else {
+                list.draw_list = IM_NEW(ImDrawList)(nullptr);
+            }
+            try {
+                readList(d.p, d.end, list, base);
+            } catch (...) {
+                free_lists.push_back(list.draw_list);
+                throw;
+            }
+            if (it != lists.end()) {
+                free_lists.push_back(list.draw_list);
+            } else {
+                it = lists.emplace(hash, std::move(list)).first;
+                // The owner name string may have moved.
+                it->second.draw_list->_OwnerName = it->second.owner_name.empty() ? nullptr : it->second.owner_name.c_str();
+            }
+        } else if (it == lists.end()) {
+            auto prev = prev_lists.find(hash);
+            if (prev == prev_lists.end())
+                throw std::invalid_argument("DrawDataReader: reference to unknown draw list");
+            it = lists.emplace(hash, std::move(prev->second)).first;
+            prev_lists.erase(prev);
+            it->second.draw_list->_OwnerName = it->second.owner_name.empty() ? nullptr : it->second.owner_name.c_str();
+        }
+        frame.CmdLists.push_back(it->second.draw_list);
+    }
+    for (auto& [hash, list] : prev_lists)
+        free_lists.push_back(list.draw_list);
+    prev_lists = std::move(lists);
+
+    frame.Valid = true;
+    frame.DisplayPos = display_pos;
+    frame.DisplaySize = display_size;
+    frame.FramebufferScale = fb_scale;
+}
+
+ImDrawData* DrawDataReader::readFrame() {
+    if (!header_read) {
+        if (buffer.size() - read_pos < HeaderSize)
+            return nullptr;
+        Decoder d{ buffer.data() + read_pos, buffer.data() + buffer.size() };
+        if (memcmp(d.bytes(sizeof(Magic)), Magic, sizeof(Magic)) != 0)
+            throw std::invalid_argument("DrawDataReader: not a draw data recording");
+        uint32_t version = d.get<uint32_t>();
+        if (version < 1 || version > Version)
+            throw std::invalid_argument("DrawDataReader: unsupported recording version");
+        if (d.get<uint32_t>() != sizeof(ImDrawVert) || d.get<uint32_t>() != sizeof(ImDrawIdx))
+            throw std::invalid_argument("DrawDataReader: recording has a different vertex or index size");
+        read_pos += HeaderSize;
+        header_read = true;
+    }
+    for (;;) {
+        size_t available = buffer.size() - read_pos;
+        if (available < RecordHeaderSize)
+            return nullptr;
+        const uint8_t* record = buffer.data() + read_pos;
+        uint32_t size;
+        memcpy(&size, record + 1, sizeof(size));
+        if (available - RecordHeaderSize < size)
+            return nullptr;
+        const uint8_t* p = record + RecordHeaderSize;
+        const uint8_t* end = p + size;
+        read_pos += RecordHeaderSize + size;
+
+        if (!frame_started) {
+            beginFrame();
+            frame_started = true;
+        }
+        switch (record[0]) {
+        case Record_TextureCreate:
+            applyTextureCreate(p, end);
+            break;
+        case Record_TextureUpdate:
+            applyTextureUpdate(p, end);
+            break;
+        case Record_TextureDestroy:
+            applyTextureDestroy(p, end);
+            break;
+        case Record_Frame:
+        case Record_RepeatFrame:
+            if (record[0] == Record_Frame)
+                readFrameRecord(p, end);
+            else
+                frame_time = Decoder{ p, end }.get<double>();
+            frame_started = false;
+            frame_count++;
+            // Renderers may have scaled the clip rectangles of reused lists in place.
+            frame.TotalVtxCount = frame.TotalIdxCount = 0;
+            for (auto& [hash, list] : prev_lists) {
+                for (int i = 0; i < list.draw_list->CmdBuffer.Size; i++)
+                    list.draw_list->CmdBuffer[i].ClipRect = list.clip_rects[i];
+            }
+            for (ImDrawList* draw_list : frame.CmdLists) {
+                frame.TotalVtxCount += draw_list->VtxBuffer.Size;
+                frame.TotalIdxCount += draw_list->IdxBuffer.Size;
+            }
+            frame.CmdListsCount = frame.CmdLists.Size;
+            frame.Textures = &live_textures;
+            return &frame;
+        default:
+            break; // unknown records are skipped
+        }
+    }
+}
@@ -0,0 +1,133 @@
+// Compact binary recording of ImGui frames.
+//
+// A recording is a header followed by length-prefixed records: texture
+// creations, updates and destructions, then the frame that uses them.  Draw
+// lists whose content hash matches a list of the previous frame are written
+// as an 8-byte reference to it, so mostly static UIs cost a few bytes per
+// draw list per frame.  Frames identical to the previous one are a single
+// small record.  A changed draw list whose owner (window) had a list in the
+// previous frame is written as a delta against that list: runs of vertex and
+// index bytes that are unchanged at the same offset are skipped, so a
+// blinking cursor or a ticking counter costs tens of bytes.  Other lists are
+// written as raw vertex/index arrays.  Commands are varint encoded.
+//
+// The reader rebuilds `ImDrawData` with its own `ImTextureData` objects
+// carrying the recorded texture requests, so any renderer backend can draw
+// the frames.  User callbacks can't be recorded and are dropped, render
+// state reset callbacks are kept.
+#pragma once
+
+#include <stdint.h>
+#include <string>
+#include <unordered_map>
+#include <unordered_set>
+#include <vector>
+
+#include "imgui.h"
+
+namespace draw_recording {
+
+constexpr char Magic[8] = { 'S', 'L', 'I', 'M', 'D', 'R', 'A', 'W' };
+constexpr uint32_t Version = 2; // 2: delta encoded draw lists
+
+enum RecordType : uint8_t {
+    Record_TextureCreate = 1,
+    Record_TextureUpdate = 2,
+    Record_TextureDestroy = 3,
+    Record_Frame = 4,
+    Record_RepeatFrame = 5, // same draw lists and display rectangle as the previous frame
+};
+
+} // namespace draw_recording
+
+class DrawDataRecorder {
+public:
+    // Serialize `draw_data`.  Call after ImGui::Render() and before the
+    // renderer processes the frame's texture requests.  The first call also
+    // returns the stream header.
+    std::string record(const ImDrawData* draw_data, double time);
+
+    // Make the next frame self-contained: its textures and draw lists are
+    // written in full and textures that are gone are destroyed, so a reader
+    // that has read the stream so far can continue after frames that weren't
+    // recorded.
+    void keyframe();
+
+    int frameCount() const { return frame_count; }
+    uint64_t bytesWritten() const { return bytes_written; }
+    // Draw lists written in full, as deltas and as references to the previous frame's lists.
+    uint64_t listsWritten() const { return lists_written; }
+    uint64_t listsDelta() const { return lists_delta; }
+    uint64_t listsReferenced() const { return lists_referenced; }
+
+private:
+    // The buffers of the last list recorded for an owner, the base of deltas.
+    struct ListCopy {
+        uint64_t hash = 0;
+        int frame = -1;
+        std::string vtx, idx, commands;
+    };
+
+    void recordTextures(const ImDrawData* draw_data, std::string& out);
+    void writeList(const ImDrawList* draw_list, const ListCopy* base, std::string& out);
+
+    bool header_written = false;
+    bool is_keyframe = false;
+    int frame_count = 0;
+    uint64_t bytes_written = 0, lists_written = 0, lists_delta = 0, lists_referenced = 0;
+    uint64_t prev_frame_hash = 0;
+    std::unordered_set<uint64_t> prev_lists, cur_lists;
+    std::unordered_map<std::string, ListCopy> lists_by_owner;
+    std::string commands; // serialized commands of the list being written
+    std::unordered_set<int> known_textures; // ImTextureData::UniqueID of textures created in the stream
+    std::unordered_set<int> stale_textures; // textures known before keyframe()
+};
+
+class DrawDataReader {
+public:
+    DrawDataReader();
+    ~DrawDataReader();
+    DrawDataReader(const DrawDataReader&) = delete;
+    DrawDataReader& operator=(const DrawDataReader&) = delete;
+
+    // Append recorded bytes, e.g., a chunk read from a file or socket.
+    void feed(const void* data, size_t size);
+
+    // Decode the next complete frame, nullptr if more data is needed.  The
+    // returned draw data is valid until the next call.  Throws
+    // std::invalid_argument on malformed data.
+    ImDrawData* readFrame();
+
+    double time() const { return frame_time; }
+    int frameCount() const { return frame_count; }
+    const ImVector<ImTextureData*>& textures() const { return live_textures; }
+
+private:
+    struct List {
+        ImDrawList* draw_list;
+        std::string owner_name;
+        std::vector<ImVec4> clip_rects; // as recorded, renderers may scale them in place
+        std::string commands;           // serialized commands, the base of deltas
+    };
+
+    void beginFrame();
+    void applyTextureCreate(const uint8_t* p, const uint8_t* end);
+    void applyTextureUpdate(const uint8_t* p, const uint8_t* end);
+    void applyTextureDestroy(const uint8_t* p, const uint8_t* end);
+    void readFrameRecord(const uint8_t* p, const uint8_t* end);
+    void readList(const uint8_t*& p, const uint8_t* end, List& list, const List* base);
+    ImTextureData* texture(int unique_id);
+
+    std::vector<uint8_t> buffer;
+    size_t read_pos = 0;
+    bool header_read = false;
+    bool frame_started = false;
+    int frame_count = 0;
+    double frame_time = 0.0;
+
+    ImDrawData frame;
+    std::unordered_map<uint64_t, List> prev_lists; // the previous frame's lists by hash
+    std::vector<ImDrawList*> free_lists;
+    std::unordered_map<int, ImTextureData*> textures_by_id;
+    ImVector<ImTextureData*> live_textures;
+};
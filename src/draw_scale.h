@@ -0,0 +1,29 @@
+// Draw lists whose clip rectangles were scaled in place.
+//
+// Renderers written in Python call `DrawData.scale_clip_rects()` to turn the
+// clip rectangles into framebuffer pixels before drawing.  The draw data is
+// modified in place, so code that reads the clip rectangles after the
+// renderer (damage tracking, statistics) would scale them a second time.
+// `DrawData.scale_clip_rects()` marks the scaled draw lists so that such
+// code can take the scale into account.
+#pragma once
+
+#include "imgui.h"
+
+// Not one of ImGui's ImDrawListFlags_.  ImGui resets `ImDrawList::Flags` when
+// it reuses a draw list for the next frame, which clears the mark.
+constexpr ImDrawListFlags DrawListFlags_ClipRectsScaled = 1 << 30;
+
+// `ImDrawData::ScaleClipRects()` that marks the draw lists as scaled.  The
+// scale is expected to be `draw_data->FramebufferScale`.
+inline void scale_clip_rects(ImDrawData* draw_data, const ImVec2& fb_scale) {
+    draw_data->ScaleClipRects(fb_scale);
+    for (ImDrawList* draw_list : draw_data->CmdLists)
+        draw_list->Flags |= DrawListFlags_ClipRectsScaled;
+}
+
+// Scale that was applied to the clip rectangles of `draw_list`, (1, 1) if they
+// are still in display coordinates.
+inline ImVec2 clip_rect_scale(const ImDrawData* draw_data, const ImDrawList* draw_list) {
+    return (draw_list->Flags & DrawListFlags_ClipRectsScaled) ? draw_data->FramebufferScale : ImVec2(1.0f, 1.0f);
+}
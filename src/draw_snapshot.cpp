@@ -0,0 +1,91 @@
+#include <string.h>
+
+#include "draw_snapshot.h"
+
+struct DrawSnapshotStorage {
+    ImVector<ImDrawList*> cmd_lists;
+    ImVector<ImTextureData*> textures;
+    std::vector<ImDrawList*> lists; // grows only, entries are reused by later snapshots
+    std::vector<std::string> owner_names;
+};
+
+// Storage is only ever allocated on the thread that takes snapshots.  Released
+// storage (possibly on a render thread) is put back into the free list without
+// freeing anything.
+static std::mutex pool_mutex;
+static std::vector<DrawSnapshotStorage*> free_storage;
+
+static DrawSnapshotStorage* acquire_storage() {
+    std::lock_guard<std::mutex> lock(pool_mutex);
+    if (free_storage.empty())
+        return new DrawSnapshotStorage();
+    DrawSnapshotStorage* storage = free_storage.back();
+    free_storage.pop_back();
+    return storage;
+}
+
+static void release_storage(DrawSnapshotStorage* storage) {
+    std::lock_guard<std::mutex> lock(pool_mutex);
+    free_storage.push_back(storage);
+}
+
+// Like ImVector::operator=, but keeps `dst`'s allocation when it's large enough.
+template<typename T>
+static void copy_vector(ImVector<T>& dst, const ImVector<T>& src) {
+    dst.resize(src.Size);
+    if (src.Size > 0)
+        memcpy(dst.Data, src.Data, (size_t)src.size_in_bytes());
+}
+
+static void copy_draw_list(ImDrawList* dst, const ImDrawList* src, std::string& owner_name) {
+    copy_vector(dst->CmdBuffer, src->CmdBuffer);
+    copy_vector(dst->IdxBuffer, src->IdxBuffer);
+    copy_vector(dst->VtxBuffer, src->VtxBuffer);
+    copy_vector(dst->_CallbacksDataBuf, src->_CallbacksDataBuf);
+    dst->Flags = src->Flags;
+    // Callback data stored in the draw list points into its own buffer.
+    for (ImDrawCmd& cmd : dst->CmdBuffer)
+        if (cmd.UserCallback != nullptr && cmd.UserCallbackDataSize > 0 && cmd.UserCallbackDataOffset >= 0)
+            cmd.UserCallbackData = dst->_CallbacksDataBuf.Data + cmd.UserCallbackDataOffset;
+    // The owner name points into the window, which may go away before the snapshot.
+    owner_name.assign(src->_OwnerName ? src->_OwnerName : "");
+    dst->_OwnerName = src->_OwnerName ? owner_name.c_str() : nullptr;
+}
+
+DrawDataSnapshot::DrawDataSnapshot(const ImDrawData* src) : storage(acquire_storage()) {
+    DrawSnapshotStorage& s = *storage;
+    int count = src->CmdLists.Size;
+    while ((int)s.lists.size() < count)
+        s.lists.push_back(IM_NEW(ImDrawList)(nullptr));
+    if ((int)s.owner_names.size() < count)
+        s.owner_names.resize(count);
+
+    s.cmd_lists.resize(count);
+    for (int i = 0; i < count; i++) {
+        copy_draw_list(s.lists[i], src->CmdLists[i], s.owner_names[i]);
+        s.cmd_lists[i] = s.lists[i];
+    }
+    s.textures.resize(0);
+    if (src->Textures != nullptr)
+        for (ImTextureData* tex : *src->Textures)
+            if (tex->Status != ImTextureStatus_OK)
+                s.textures.push_back(tex);
+
+    Valid = src->Valid;
+    CmdListsCount = count;
+    TotalIdxCount = src->TotalIdxCount;
+    TotalVtxCount = src->TotalVtxCount;
+    DisplayPos = src->DisplayPos;
+    DisplaySize = src->DisplaySize;
+    FramebufferScale = src->FramebufferScale;
+    OwnerViewport = nullptr;
+    // Borrow the storage's vectors, they're swapped back in the destructor.
+    CmdLists.swap(s.cmd_lists);
+    Textures = s.textures.Size > 0 ? &s.textures : nullptr;
+}
+
+DrawDataSnapshot::~DrawDataSnapshot() {
+    CmdLists.swap(storage->cmd_lists);
+    Textures = nullptr;
+    release_storage(storage);
+}
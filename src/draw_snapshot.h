@@ -0,0 +1,30 @@
+// Deep copies of ImDrawData for rendering on another thread.
+//
+// ImGui reuses the draw lists returned by ImGui::GetDrawData() when the next
+// frame is built.  A snapshot copies them (commands, vertices, indices and
+// callback data) into storage that's recycled when the snapshot is destroyed,
+// so steady state frames don't allocate.
+#pragma once
+
+#include <mutex>
+#include <string>
+#include <vector>
+
+#include "imgui.h"
+
+struct DrawSnapshotStorage;
+
+struct DrawDataSnapshot : ImDrawData {
+    // Copy `src`.  Only the textures that had pending requests (status other
+    // than OK) at snapshot time are listed in `Textures`, nullptr if none.
+    explicit DrawDataSnapshot(const ImDrawData* src);
+    ~DrawDataSnapshot();
+
+    DrawDataSnapshot(const DrawDataSnapshot&) = delete;
+    DrawDataSnapshot& operator=(const DrawDataSnapshot&) = delete;
+
+    bool hasTextureRequests() const { return Textures != nullptr; }
+
+private:
+    DrawSnapshotStorage* storage;
+};
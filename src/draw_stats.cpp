@@ -0,0 +1,66 @@
+#include <algorithm>
+
+#include "draw_scale.h"
+#include "draw_stats.h"
+
+namespace {
+
+// Textures are referenced either through ImTextureData or a raw backend ID.
+struct TextureKey {
+    const ImTextureData* tex_data;
+    ImTextureID tex_id;
+    bool operator==(const TextureKey& o) const { return tex_data == o.tex_data && tex_id == o.tex_id; }
+};
+
+// Frames reference a handful of textures, a linear search beats hashing.
+void add_unique(std::vector<TextureKey>& keys, const TextureKey& key) {
+    if (std::find(keys.begin(), keys.end(), key) == keys.end())
+        keys.push_back(key);
+}
+
+} // namespace
+
+DrawDataStats draw_data_stats(const ImDrawData* draw_data) {
+    DrawDataStats stats;
+    stats.lists.resize(draw_data->CmdLists.Size);
+    const ImVec2 display_min = draw_data->DisplayPos;
+    const ImVec2 display_max(display_min.x + draw_data->DisplaySize.x, display_min.y + draw_data->DisplaySize.y);
+
+    std::vector<TextureKey> frame_textures, list_textures;
+    for (int i = 0; i < draw_data->CmdLists.Size; i++) {
+        const ImDrawList* draw_list = draw_data->CmdLists[i];
+        DrawListStats& s = stats.lists[i];
+        s.owner_name = draw_list->_OwnerName ? draw_list->_OwnerName : "";
+        s.vtx_count = draw_list->VtxBuffer.Size;
+        s.idx_count = draw_list->IdxBuffer.Size;
+        s.cmd_count = draw_list->CmdBuffer.Size;
+
+        // Areas are in display coordinates, also when a renderer already scaled the clip rectangles.
+        const ImVec2 clip_scale = clip_rect_scale(draw_data, draw_list);
+        list_textures.clear();
+        for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+            if (cmd.UserCallback != nullptr) {
+                s.callback_count++;
+                continue;
+            }
+            if (cmd.ElemCount == 0)
+                continue;
+            TextureKey key = { cmd.TexRef._TexData, cmd.TexRef._TexData ? ImTextureID_Invalid : cmd.TexRef._TexID };
+            add_unique(list_textures, key);
+            add_unique(frame_textures, key);
+            float w = std::min(cmd.ClipRect.z / clip_scale.x, display_max.x) - std::max(cmd.ClipRect.x / clip_scale.x, display_min.x);
+            float h = std::min(cmd.ClipRect.w / clip_scale.y, display_max.y) - std::max(cmd.ClipRect.y / clip_scale.y, display_min.y);
+            if (w > 0.0f && h > 0.0f)
+                s.clip_rect_area += (double)w * h;
+        }
+        s.texture_count = (int)list_textures.size();
+
+        stats.total.vtx_count += s.vtx_count;
+        stats.total.idx_count += s.idx_count;
+        stats.total.cmd_count += s.cmd_count;
+        stats.total.callback_count += s.callback_count;
+        stats.total.clip_rect_area += s.clip_rect_area;
+    }
+    stats.total.texture_count = (int)frame_textures.size();
+    return stats;
+}
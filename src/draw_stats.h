@@ -0,0 +1,30 @@
+// Per-draw list statistics of a frame's draw data.
+//
+// Breaks `ImGuiIO::MetricsRenderVertices` and friends down by draw list and
+// owner window, to find out which window produced the geometry of a slow
+// frame.  Computed on demand with a single pass over the draw commands.
+#pragma once
+
+#include <string>
+#include <vector>
+
+#include "imgui.h"
+
+struct DrawListStats {
+    std::string owner_name; // owner window name, "##Foreground" etc. for viewport lists, may be empty
+    int vtx_count = 0;
+    int idx_count = 0;
+    int cmd_count = 0;
+    int callback_count = 0; // including render state resets
+    int texture_count = 0;  // distinct textures referenced by drawing commands
+    // Sum of the drawing commands' clip rectangles clamped to the display
+    // rectangle.  Overlapping rectangles are counted once per command.
+    double clip_rect_area = 0.0;
+};
+
+struct DrawDataStats {
+    DrawListStats total; // owner_name is empty, texture_count is over the whole frame
+    std::vector<DrawListStats> lists; // in `ImDrawData::CmdLists` order
+};
+
+DrawDataStats draw_data_stats(const ImDrawData* draw_data);
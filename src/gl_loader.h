@@ -0,0 +1,175 @@
+// Minimal OpenGL 3.3 core function loader used by the native renderers.
+//
+// The extension doesn't link against any OpenGL library.  Instead, function
+// pointers are resolved at runtime through a `get_proc_address` style loader
+// function supplied from Python (e.g., `glfw.get_proc_address`).
+#pragma once
+
+#include <stddef.h>
+#include <stdint.h>
+
+#if defined(_WIN32)
+#define SLIMGUI_APIENTRY __stdcall
+#else
+#define SLIMGUI_APIENTRY
+#endif
+
+typedef unsigned int GLenum;
+typedef unsigned int GLuint;
+typedef int GLint;
+typedef int GLsizei;
+typedef unsigned char GLboolean;
+typedef unsigned int GLbitfield;
+typedef float GLfloat;
+typedef char GLchar;
+typedef ptrdiff_t GLsizeiptr;
+typedef ptrdiff_t GLintptr;
+typedef void GLvoid;
+
+#define GL_FALSE                          0
+#define GL_TRUE                           1
+#define GL_ONE                            1
+#define GL_TRIANGLES                      0x0004
+#define GL_SRC_ALPHA                      0x0302
+#define GL_ONE_MINUS_SRC_ALPHA            0x0303
+#define GL_FRONT_AND_BACK                 0x0408
+#define GL_CULL_FACE                      0x0B44
+#define GL_DEPTH_TEST                     0x0B71
+#define GL_STENCIL_TEST                   0x0B90
+#define GL_VIEWPORT                       0x0BA2
+#define GL_BLEND                          0x0BE2
+#define GL_POLYGON_MODE                   0x0B40
+#define GL_SCISSOR_BOX                    0x0C10
+#define GL_SCISSOR_TEST                   0x0C11
+#define GL_UNPACK_ROW_LENGTH              0x0CF2
+#define GL_UNPACK_ALIGNMENT               0x0CF5
+#define GL_MAX_TEXTURE_SIZE               0x0D33
+#define GL_TEXTURE_2D                     0x0DE1
+#define GL_UNSIGNED_BYTE                  0x1401
+#define GL_UNSIGNED_SHORT                 0x1403
+#define GL_UNSIGNED_INT                   0x1405
+#define GL_FLOAT                          0x1406
+#define GL_RED                            0x1903
+#define GL_RGBA                           0x1908
+#define GL_FILL                           0x1B02
+#define GL_LINEAR                         0x2601
+#define GL_TEXTURE_MAG_FILTER             0x2800
+#define GL_TEXTURE_MIN_FILTER             0x2801
+#define GL_TEXTURE_WRAP_S                 0x2802
+#define GL_TEXTURE_WRAP_T                 0x2803
+#define GL_FUNC_ADD                       0x8006
+#define GL_BLEND_EQUATION_RGB             0x8009
+#define GL_TEXTURE_BINDING_2D             0x8069
+#define GL_BLEND_DST_RGB                  0x80C8
+#define GL_BLEND_SRC_RGB                  0x80C9
+#define GL_BLEND_DST_ALPHA                0x80CA
+#define GL_BLEND_SRC_ALPHA                0x80CB
+#define GL_RGBA8                          0x8058
+#define GL_CLAMP_TO_EDGE                  0x812F
+#define GL_R8                             0x8229
+#define GL_TEXTURE0                       0x84C0
+#define GL_ACTIVE_TEXTURE                 0x84E0
+#define GL_VERTEX_ARRAY_BINDING           0x85B5
+#define GL_BLEND_EQUATION_ALPHA           0x883D
+#define GL_ARRAY_BUFFER                   0x8892
+#define GL_ELEMENT_ARRAY_BUFFER           0x8893
+#define GL_ARRAY_BUFFER_BINDING           0x8894
+#define GL_STREAM_DRAW                    0x88E0
+#define GL_SAMPLER_BINDING                0x8919
+#define GL_FRAGMENT_SHADER                0x8B30
+#define GL_VERTEX_SHADER                  0x8B31
+#define GL_COMPILE_STATUS                 0x8B81
+#define GL_LINK_STATUS                    0x8B82
+#define GL_INFO_LOG_LENGTH                0x8B84
+#define GL_CURRENT_PROGRAM                0x8B8D
+#define GL_TEXTURE_SWIZZLE_RGBA           0x8E46
+#define GL_PRIMITIVE_RESTART              0x8F9D
+
+// X(return type, name, argument list)
+// Functions used to save and restore GL state (see `GLStateBackup`).
+#define SLIMGUI_GL_STATE_FUNCTIONS(X) \
+    X(void, glActiveTexture, (GLenum texture)) \
+    X(void, glBindBuffer, (GLenum target, GLuint buffer)) \
+    X(void, glBindSampler, (GLuint unit, GLuint sampler)) \
+    X(void, glBindTexture, (GLenum target, GLuint texture)) \
+    X(void, glBindVertexArray, (GLuint array)) \
+    X(void, glBlendEquationSeparate, (GLenum modeRGB, GLenum modeAlpha)) \
+    X(void, glBlendFuncSeparate, (GLenum sfactorRGB, GLenum dfactorRGB, GLenum sfactorAlpha, GLenum dfactorAlpha)) \
+    X(void, glDisable, (GLenum cap)) \
+    X(void, glEnable, (GLenum cap)) \
+    X(void, glGetIntegerv, (GLenum pname, GLint* data)) \
+    X(GLboolean, glIsEnabled, (GLenum cap)) \
+    X(GLboolean, glIsProgram, (GLuint program)) \
+    X(void, glPolygonMode, (GLenum face, GLenum mode)) \
+    X(void, glScissor, (GLint x, GLint y, GLsizei width, GLsizei height)) \
+    X(void, glUseProgram, (GLuint program)) \
+    X(void, glViewport, (GLint x, GLint y, GLsizei width, GLsizei height))
+
+// The rest of the functions used by the renderer.
+#define SLIMGUI_GL_RENDERER_FUNCTIONS(X) \
+    X(void, glAttachShader, (GLuint program, GLuint shader)) \
+    X(void, glBlendEquation, (GLenum mode)) \
+    X(void, glBufferData, (GLenum target, GLsizeiptr size, const void* data, GLenum usage)) \
+    X(void, glCompileShader, (GLuint shader)) \
+    X(GLuint, glCreateProgram, (void)) \
+    X(GLuint, glCreateShader, (GLenum type)) \
+    X(void, glDeleteBuffers, (GLsizei n, const GLuint* buffers)) \
+    X(void, glDeleteProgram, (GLuint program)) \
+    X(void, glDeleteShader, (GLuint shader)) \
+    X(void, glDeleteTextures, (GLsizei n, const GLuint* textures)) \
+    X(void, glDeleteVertexArrays, (GLsizei n, const GLuint* arrays)) \
+    X(void, glDetachShader, (GLuint program, GLuint shader)) \
+    X(void, glDrawElementsBaseVertex, (GLenum mode, GLsizei count, GLenum type, const void* indices, GLint basevertex)) \
+    X(void, glEnableVertexAttribArray, (GLuint index)) \
+    X(void, glGenBuffers, (GLsizei n, GLuint* buffers)) \
+    X(void, glGenTextures, (GLsizei n, GLuint* textures)) \
+    X(void, glGenVertexArrays, (GLsizei n, GLuint* arrays)) \
+    X(GLint, glGetAttribLocation, (GLuint program, const GLchar* name)) \
+    X(void, glGetProgramInfoLog, (GLuint program, GLsizei bufSize, GLsizei* length, GLchar* infoLog)) \
+    X(void, glGetProgramiv, (GLuint program, GLenum pname, GLint* params)) \
+    X(void, glGetShaderInfoLog, (GLuint shader, GLsizei bufSize, GLsizei* length, GLchar* infoLog)) \
+    X(void, glGetShaderiv, (GLuint shader, GLenum pname, GLint* params)) \
+    X(GLint, glGetUniformLocation, (GLuint program, const GLchar* name)) \
+    X(void, glLinkProgram, (GLuint program)) \
+    X(void, glPixelStorei, (GLenum pname, GLint param)) \
+    X(void, glShaderSource, (GLuint shader, GLsizei count, const GLchar* const* string, const GLint* length)) \
+    X(void, glTexImage2D, (GLenum target, GLint level, GLint internalformat, GLsizei width, GLsizei height, GLint border, GLenum format, GLenum type, const void* pixels)) \
+    X(void, glTexParameteri, (GLenum target, GLenum pname, GLint param)) \
+    X(void, glTexParameteriv, (GLenum target, GLenum pname, const GLint* params)) \
+    X(void, glTexSubImage2D, (GLenum target, GLint level, GLint xoffset, GLint yoffset, GLsizei width, GLsizei height, GLenum format, GLenum type, const void* pixels)) \
+    X(void, glUniform1i, (GLint location, GLint v0)) \
+    X(void, glUniformMatrix4fv, (GLint location, GLsizei count, GLboolean transpose, const GLfloat* value)) \
+    X(void, glVertexAttribPointer, (GLuint index, GLint size, GLenum type, GLboolean normalized, GLsizei stride, const void* pointer))
+
+#define SLIMGUI_GL_FUNCTIONS(X) \
+    SLIMGUI_GL_STATE_FUNCTIONS(X) \
+    SLIMGUI_GL_RENDERER_FUNCTIONS(X)
+
+#define SLIMGUI_GL_LOAD(ret, name, args) \
+    name = (ret (SLIMGUI_APIENTRY*) args)get_proc_address(#name); \
+    if (!name) return #name;
+
+struct GLFunctions {
+#define SLIMGUI_GL_DECLARE(ret, name, args) ret (SLIMGUI_APIENTRY* name) args = nullptr;
+    SLIMGUI_GL_FUNCTIONS(SLIMGUI_GL_DECLARE)
+#undef SLIMGUI_GL_DECLARE
+
+    // Resolve all functions with `get_proc_address(name) -> void*`.
+    // Returns the name of the first function that couldn't be resolved or nullptr on success.
+    template<typename GetProcAddress>
+    const char* load(GetProcAddress&& get_proc_address) {
+        if (const char* missing = loadState(get_proc_address))
+            return missing;
+        SLIMGUI_GL_RENDERER_FUNCTIONS(SLIMGUI_GL_LOAD)
+        return nullptr;
+    }
+
+    // Resolve only the functions in `SLIMGUI_GL_STATE_FUNCTIONS`.
+    template<typename GetProcAddress>
+    const char* loadState(GetProcAddress&& get_proc_address) {
+        SLIMGUI_GL_STATE_FUNCTIONS(SLIMGUI_GL_LOAD)
+        return nullptr;
+    }
+};
+
+#undef SLIMGUI_GL_LOAD
@@ -0,0 +1,336 @@
+#include <stdexcept>
+#include <string>
+
+#include "gl_renderer.h"
+
+static const char* vertex_shader_src = R"(
+#version 330
+
+uniform mat4 ProjMtx;
+in vec2 Position;
+in vec2 UV;
+in vec4 Color;
+out vec2 Frag_UV;
+out vec4 Frag_Color;
+
+void main() {
+    Frag_UV = UV;
+    Frag_Color = Color;
+
+    gl_Position = ProjMtx * vec4(Position.xy, 0, 1);
+}
+)";
+
+static const char* fragment_shader_src = R"(
+#version 330
+
+uniform sampler2D Texture;
+in vec2 Frag_UV;
+in vec4 Frag_Color;
+out vec4 Out_Color;
+
+void main() {
+    Out_Color = Frag_Color * texture(Texture, Frag_UV.st);
+}
+)";
+
+static void check_shader(const GLFunctions& gl, GLuint handle, const char* desc) {
+    GLint status = 0, log_length = 0;
+    gl.glGetShaderiv(handle, GL_COMPILE_STATUS, &status);
+    if (status == GL_FALSE) {
+        gl.glGetShaderiv(handle, GL_INFO_LOG_LENGTH, &log_length);
+        std::string log(log_length > 1 ? log_length : 1, '\0');
+        gl.glGetShaderInfoLog(handle, (GLsizei)log.size(), nullptr, log.data());
+        throw std::runtime_error(std::string("Failed to compile ") + desc + ": " + log.c_str());
+    }
+}
+
+static void check_program(const GLFunctions& gl, GLuint handle) {
+    GLint status = 0, log_length = 0;
+    gl.glGetProgramiv(handle, GL_LINK_STATUS, &status);
+    if (status == GL_FALSE) {
+        gl.glGetProgramiv(handle, GL_INFO_LOG_LENGTH, &log_length);
+        std::string log(log_length > 1 ? log_length : 1, '\0');
+        gl.glGetProgramInfoLog(handle, (GLsizei)log.size(), nullptr, log.data());
+        throw std::runtime_error(std::string("Failed to link shader program: ") + log.c_str());
+    }
+}
+
+void GLRenderer::createDeviceObjects() {
+    // Backup GL state
+    GLint last_texture, last_array_buffer, last_vertex_array;
+    gl.glGetIntegerv(GL_TEXTURE_BINDING_2D, &last_texture);
+    gl.glGetIntegerv(GL_ARRAY_BUFFER_BINDING, &last_array_buffer);
+    gl.glGetIntegerv(GL_VERTEX_ARRAY_BINDING, &last_vertex_array);
+
+    GLuint vert_handle = gl.glCreateShader(GL_VERTEX_SHADER);
+    gl.glShaderSource(vert_handle, 1, &vertex_shader_src, nullptr);
+    gl.glCompileShader(vert_handle);
+    GLuint frag_handle = gl.glCreateShader(GL_FRAGMENT_SHADER);
+    gl.glShaderSource(frag_handle, 1, &fragment_shader_src, nullptr);
+    gl.glCompileShader(frag_handle);
+    try {
+        check_shader(gl, vert_handle, "vertex shader");
+        check_shader(gl, frag_handle, "fragment shader");
+        shader_handle = gl.glCreateProgram();
+        gl.glAttachShader(shader_handle, vert_handle);
+        gl.glAttachShader(shader_handle, frag_handle);
+        gl.glLinkProgram(shader_handle);
+        check_program(gl, shader_handle);
+    } catch (...) {
+        gl.glDeleteShader(vert_handle);
+        gl.glDeleteShader(frag_handle);
+        if (shader_handle) {
+            gl.glDeleteProgram(shader_handle);
+            shader_handle = 0;
+        }
+        throw;
+    }
+    gl.glDetachShader(shader_handle, vert_handle);
+    gl.glDetachShader(shader_handle, frag_handle);
+    gl.glDeleteShader(vert_handle);
+    gl.glDeleteShader(frag_handle);
+
+    attrib_location_tex = gl.glGetUniformLocation(shader_handle, "Texture");
+    attrib_location_proj_mtx = gl.glGetUniformLocation(shader_handle, "ProjMtx");
+    attrib_location_vtx_pos = (GLuint)gl.glGetAttribLocation(shader_handle, "Position");
+    attrib_location_vtx_uv = (GLuint)gl.glGetAttribLocation(shader_handle, "UV");
+    attrib_location_vtx_color = (GLuint)gl.glGetAttribLocation(shader_handle, "Color");
+
+    gl.glGenBuffers(1, &vbo_handle);
+    gl.glGenBuffers(1, &elements_handle);
+    gl.glGenVertexArrays(1, &vao_handle);
+    gl.glGetIntegerv(GL_MAX_TEXTURE_SIZE, &max_texture_size);
+
+    // Restore modified GL state
+    gl.glBindTexture(GL_TEXTURE_2D, last_texture);
+    gl.glBindBuffer(GL_ARRAY_BUFFER, last_array_buffer);
+    gl.glBindVertexArray(last_vertex_array);
+}
+
+void GLRenderer::destroyDeviceObjects() {
+    if (vao_handle) { gl.glDeleteVertexArrays(1, &vao_handle); vao_handle = 0; }
+    if (vbo_handle) { gl.glDeleteBuffers(1, &vbo_handle); vbo_handle = 0; }
+    if (elements_handle) { gl.glDeleteBuffers(1, &elements_handle); elements_handle = 0; }
+    if (shader_handle) { gl.glDeleteProgram(shader_handle); shader_handle = 0; }
+}
+
+static GLint texture_internal_format(ImTextureFormat format) {
+    return format == ImTextureFormat_Alpha8 ? GL_R8 : GL_RGBA8;
+}
+
+static GLenum texture_pixel_format(ImTextureFormat format) {
+    return format == ImTextureFormat_Alpha8 ? GL_RED : GL_RGBA;
+}
+
+void GLRenderer::destroyTexture(ImTextureData* tex) {
+    GLuint gl_tex_id = (GLuint)(intptr_t)tex->TexID;
+    gl.glDeleteTextures(1, &gl_tex_id);
+    tex->SetTexID(ImTextureID_Invalid);
+    tex->SetStatus(ImTextureStatus_Destroyed);
+}
+
+void GLRenderer::updateTexture(ImTextureData* tex) {
+    if (tex->Status == ImTextureStatus_WantCreate) {
+        IM_ASSERT(tex->TexID == ImTextureID_Invalid && tex->BackendUserData == nullptr);
+        GLint last_texture;
+        gl.glGetIntegerv(GL_TEXTURE_BINDING_2D, &last_texture);
+
+        // Upload texture to graphics system
+        // (Bilinear sampling is required by default. Set 'io.Fonts->Flags |= ImFontAtlasFlags_NoBakedLines' or 'style.AntiAliasedLinesUseTex = false' to allow point/nearest sampling)
+        GLuint gl_tex_id = 0;
+        gl.glGenTextures(1, &gl_tex_id);
+        gl.glBindTexture(GL_TEXTURE_2D, gl_tex_id);
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR);
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR);
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE);
+        gl.glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE);
+        if (tex->Format == ImTextureFormat_Alpha8) {
+            // Single channel texture, sample it as (1, 1, 1, alpha) like an RGBA32 font atlas.
+            const GLint swizzle[4] = { GL_ONE, GL_ONE, GL_ONE, GL_RED };
+            gl.glTexParameteriv(GL_TEXTURE_2D, GL_TEXTURE_SWIZZLE_RGBA, swizzle);
+        }
+        gl.glPixelStorei(GL_UNPACK_ALIGNMENT, 1);
+        gl.glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+        gl.glTexImage2D(GL_TEXTURE_2D, 0, texture_internal_format(tex->Format), tex->Width, tex->Height, 0, texture_pixel_format(tex->Format), GL_UNSIGNED_BYTE, tex->GetPixels());
+
+        tex->SetTexID((ImTextureID)(intptr_t)gl_tex_id);
+        tex->SetStatus(ImTextureStatus_OK);
+        gl.glBindTexture(GL_TEXTURE_2D, last_texture);
+    } else if (tex->Status == ImTextureStatus_WantUpdates) {
+        GLint last_texture;
+        gl.glGetIntegerv(GL_TEXTURE_BINDING_2D, &last_texture);
+
+        // Update selected blocks. We only ever write to textures regions which have never been used before!
+        gl.glBindTexture(GL_TEXTURE_2D, (GLuint)(intptr_t)tex->TexID);
+        gl.glPixelStorei(GL_UNPACK_ALIGNMENT, 1);
+        gl.glPixelStorei(GL_UNPACK_ROW_LENGTH, tex->Width);
+        for (const ImTextureRect& r : tex->Updates) {
+            gl.glTexSubImage2D(GL_TEXTURE_2D, 0, r.x, r.y, r.w, r.h, texture_pixel_format(tex->Format), GL_UNSIGNED_BYTE, tex->GetPixelsAt(r.x, r.y));
+        }
+        gl.glPixelStorei(GL_UNPACK_ROW_LENGTH, 0);
+        tex->SetStatus(ImTextureStatus_OK);
+        gl.glBindTexture(GL_TEXTURE_2D, last_texture);
+    } else if (tex->Status == ImTextureStatus_WantDestroy && tex->UnusedFrames > 0) {
+        destroyTexture(tex);
+    }
+}
+
+void GLRenderer::setupRenderState(ImDrawData* draw_data, int fb_width, int fb_height) {
+    // Alpha blending enabled, no face culling, no depth testing, scissor enabled, polygon fill.
+    // Blend function matches `OpenGLRenderer` so that both renderers produce identical output.
+    gl.glEnable(GL_BLEND);
+    gl.glBlendEquation(GL_FUNC_ADD);
+    gl.glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA);
+    gl.glDisable(GL_CULL_FACE);
+    gl.glDisable(GL_DEPTH_TEST);
+    gl.glDisable(GL_STENCIL_TEST);
+    gl.glEnable(GL_SCISSOR_TEST);
+    gl.glDisable(GL_PRIMITIVE_RESTART);
+    gl.glPolygonMode(GL_FRONT_AND_BACK, GL_FILL);
+
+    // Our visible imgui space lies from draw_data->DisplayPos (top left) to draw_data->DisplayPos+data_data->DisplaySize (bottom right).
+    gl.glViewport(0, 0, (GLsizei)fb_width, (GLsizei)fb_height);
+    float L = draw_data->DisplayPos.x;
+    float R = draw_data->DisplayPos.x + draw_data->DisplaySize.x;
+    float T = draw_data->DisplayPos.y;
+    float B = draw_data->DisplayPos.y + draw_data->DisplaySize.y;
+    const float ortho_projection[4][4] = {
+        { 2.0f/(R-L),   0.0f,         0.0f,   0.0f },
+        { 0.0f,         2.0f/(T-B),   0.0f,   0.0f },
+        { 0.0f,         0.0f,        -1.0f,   0.0f },
+        { (R+L)/(L-R),  (T+B)/(B-T),  0.0f,   1.0f },
+    };
+    gl.glUseProgram(shader_handle);
+    gl.glUniform1i(attrib_location_tex, 0);
+    gl.glUniformMatrix4fv(attrib_location_proj_mtx, 1, GL_FALSE, &ortho_projection[0][0]);
+    gl.glActiveTexture(GL_TEXTURE0);
+    gl.glBindSampler(0, 0);
+
+    gl.glBindVertexArray(vao_handle);
+    gl.glBindBuffer(GL_ARRAY_BUFFER, vbo_handle);
+    gl.glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, elements_handle);
+    gl.glEnableVertexAttribArray(attrib_location_vtx_pos);
+    gl.glEnableVertexAttribArray(attrib_location_vtx_uv);
+    gl.glEnableVertexAttribArray(attrib_location_vtx_color);
+    gl.glVertexAttribPointer(attrib_location_vtx_pos, 2, GL_FLOAT, GL_FALSE, sizeof(ImDrawVert), (void*)offsetof(ImDrawVert, pos));
+    gl.glVertexAttribPointer(attrib_location_vtx_uv, 2, GL_FLOAT, GL_FALSE, sizeof(ImDrawVert), (void*)offsetof(ImDrawVert, uv));
+    gl.glVertexAttribPointer(attrib_location_vtx_color, 4, GL_UNSIGNED_BYTE, GL_TRUE, sizeof(ImDrawVert), (void*)offsetof(ImDrawVert, col));
+}
+
+void GLStateBackup::save(const GLFunctions& gl, GLStatePolicy policy_) {
+    policy = policy_;
+    if (policy == GLStatePolicy::None)
+        return;
+    gl.glGetIntegerv(GL_ACTIVE_TEXTURE, &active_texture);
+    gl.glActiveTexture(GL_TEXTURE0);
+    gl.glGetIntegerv(GL_CURRENT_PROGRAM, &program);
+    gl.glGetIntegerv(GL_TEXTURE_BINDING_2D, &texture);
+    gl.glGetIntegerv(GL_ARRAY_BUFFER_BINDING, &array_buffer);
+    gl.glGetIntegerv(GL_VERTEX_ARRAY_BINDING, &vertex_array);
+    enable_blend = gl.glIsEnabled(GL_BLEND);
+    enable_cull_face = gl.glIsEnabled(GL_CULL_FACE);
+    enable_depth_test = gl.glIsEnabled(GL_DEPTH_TEST);
+    enable_stencil_test = gl.glIsEnabled(GL_STENCIL_TEST);
+    enable_scissor_test = gl.glIsEnabled(GL_SCISSOR_TEST);
+    if (policy == GLStatePolicy::Minimal)
+        return;
+    gl.glGetIntegerv(GL_SAMPLER_BINDING, &sampler);
+    gl.glGetIntegerv(GL_POLYGON_MODE, polygon_mode);
+    gl.glGetIntegerv(GL_VIEWPORT, viewport);
+    gl.glGetIntegerv(GL_SCISSOR_BOX, scissor_box);
+    gl.glGetIntegerv(GL_BLEND_SRC_RGB, &blend_src_rgb);
+    gl.glGetIntegerv(GL_BLEND_DST_RGB, &blend_dst_rgb);
+    gl.glGetIntegerv(GL_BLEND_SRC_ALPHA, &blend_src_alpha);
+    gl.glGetIntegerv(GL_BLEND_DST_ALPHA, &blend_dst_alpha);
+    gl.glGetIntegerv(GL_BLEND_EQUATION_RGB, &blend_equation_rgb);
+    gl.glGetIntegerv(GL_BLEND_EQUATION_ALPHA, &blend_equation_alpha);
+    enable_primitive_restart = gl.glIsEnabled(GL_PRIMITIVE_RESTART);
+}
+
+static void set_enabled(const GLFunctions& gl, GLenum cap, GLboolean enabled) {
+    if (enabled) gl.glEnable(cap); else gl.glDisable(cap);
+}
+
+void GLStateBackup::restore(const GLFunctions& gl) const {
+    if (policy == GLStatePolicy::None)
+        return;
+    // The glIsProgram() check is required because if the program is "pending deletion" at the time of
+    // binding backup, it will have been deleted by now.  See ocornut/imgui#6220.
+    if (program == 0 || gl.glIsProgram((GLuint)program)) gl.glUseProgram((GLuint)program);
+    gl.glActiveTexture(GL_TEXTURE0);
+    gl.glBindTexture(GL_TEXTURE_2D, (GLuint)texture);
+    if (policy == GLStatePolicy::Full)
+        gl.glBindSampler(0, (GLuint)sampler);
+    gl.glActiveTexture((GLenum)active_texture);
+    gl.glBindVertexArray((GLuint)vertex_array);
+    gl.glBindBuffer(GL_ARRAY_BUFFER, (GLuint)array_buffer);
+    set_enabled(gl, GL_BLEND, enable_blend);
+    set_enabled(gl, GL_CULL_FACE, enable_cull_face);
+    set_enabled(gl, GL_DEPTH_TEST, enable_depth_test);
+    set_enabled(gl, GL_STENCIL_TEST, enable_stencil_test);
+    set_enabled(gl, GL_SCISSOR_TEST, enable_scissor_test);
+    if (policy == GLStatePolicy::Minimal)
+        return;
+    gl.glBlendEquationSeparate((GLenum)blend_equation_rgb, (GLenum)blend_equation_alpha);
+    gl.glBlendFuncSeparate((GLenum)blend_src_rgb, (GLenum)blend_dst_rgb, (GLenum)blend_src_alpha, (GLenum)blend_dst_alpha);
+    set_enabled(gl, GL_PRIMITIVE_RESTART, enable_primitive_restart);
+    gl.glPolygonMode(GL_FRONT_AND_BACK, (GLenum)polygon_mode[0]);
+    gl.glViewport(viewport[0], viewport[1], (GLsizei)viewport[2], (GLsizei)viewport[3]);
+    gl.glScissor(scissor_box[0], scissor_box[1], (GLsizei)scissor_box[2], (GLsizei)scissor_box[3]);
+}
+
+void GLRenderer::render(ImDrawData* draw_data) {
+    // Avoid rendering when minimized, scale coordinates for retina displays (screen coordinates != framebuffer coordinates)
+    int fb_width = (int)(draw_data->DisplaySize.x * draw_data->FramebufferScale.x);
+    int fb_height = (int)(draw_data->DisplaySize.y * draw_data->FramebufferScale.y);
+    if (fb_width <= 0 || fb_height <= 0)
+        return;
+
+    // Catch up with texture updates.  Most of the time the list only contains textures with status OK.
+    if (draw_data->Textures != nullptr) {
+        for (ImTextureData* tex : *draw_data->Textures) {
+            if (tex->Status != ImTextureStatus_OK)
+                updateTexture(tex);
+        }
+    }
+
+    GLStateBackup backup;
+    backup.save(gl, state_policy);
+    setupRenderState(draw_data, fb_width, fb_height);
+
+    // Will project scissor/clipping rectangles into framebuffer space
+    ImVec2 clip_off = draw_data->DisplayPos;         // (0,0) unless using multi-viewports
+    ImVec2 clip_scale = draw_data->FramebufferScale; // (1,1) unless using retina display which are often (2,2)
+    const GLenum idx_type = sizeof(ImDrawIdx) == 2 ? GL_UNSIGNED_SHORT : GL_UNSIGNED_INT;
+
+    for (const ImDrawList* draw_list : draw_data->CmdLists) {
+        gl.glBufferData(GL_ARRAY_BUFFER, (GLsizeiptr)draw_list->VtxBuffer.size_in_bytes(), draw_list->VtxBuffer.Data, GL_STREAM_DRAW);
+        gl.glBufferData(GL_ELEMENT_ARRAY_BUFFER, (GLsizeiptr)draw_list->IdxBuffer.size_in_bytes(), draw_list->IdxBuffer.Data, GL_STREAM_DRAW);
+
+        for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+            if (cmd.UserCallback != nullptr) {
+                // User callback, registered via ImDrawList::AddCallback().  Python callbacks go through
+                // drawlist_callback_py_wrapper and behave like DrawListCallbackResult.CALLBACK.
+                if (cmd.UserCallback == ImDrawCallback_ResetRenderState)
+                    setupRenderState(draw_data, fb_width, fb_height);
+                else
+                    cmd.UserCallback(draw_list, &cmd);
+                continue;
+            }
+
+            // Project scissor/clipping rectangles into framebuffer space
+            ImVec2 clip_min((cmd.ClipRect.x - clip_off.x) * clip_scale.x, (cmd.ClipRect.y - clip_off.y) * clip_scale.y);
+            ImVec2 clip_max((cmd.ClipRect.z - clip_off.x) * clip_scale.x, (cmd.ClipRect.w - clip_off.y) * clip_scale.y);
+            if (clip_max.x <= clip_min.x || clip_max.y <= clip_min.y)
+                continue;
+
+            // Apply scissor/clipping rectangle (Y is inverted in OpenGL)
+            gl.glScissor((int)clip_min.x, (int)((float)fb_height - clip_max.y), (int)(clip_max.x - clip_min.x), (int)(clip_max.y - clip_min.y));
+            gl.glBindTexture(GL_TEXTURE_2D, (GLuint)(intptr_t)cmd.GetTexID());
+            gl.glDrawElementsBaseVertex(GL_TRIANGLES, (GLsizei)cmd.ElemCount, idx_type, (void*)(intptr_t)(cmd.IdxOffset * sizeof(ImDrawIdx)), (GLint)cmd.VtxOffset);
+        }
+    }
+
+    backup.restore(gl);
+}
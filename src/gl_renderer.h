@@ -0,0 +1,110 @@
+// Native OpenGL 3.3 core renderer for Dear ImGui draw data.
+//
+// Mirrors `slimgui.integrations.opengl.OpenGLRenderer` but runs the whole
+// render loop (state setup, texture updates, buffer uploads and draw calls)
+// in C++.  GL entry points are resolved through `GLFunctions`.
+#pragma once
+
+#include <functional>
+#include <stdexcept>
+#include <string>
+
+#include "imgui.h"
+#include "gl_loader.h"
+
+// How much GL state is saved before rendering and restored afterwards.
+enum class GLStatePolicy {
+    // All state the renderer changes (like imgui_impl_opengl3).
+    Full,
+    // Object bindings and enable caps only.  Blend function, viewport, scissor box and polygon mode
+    // are left as set by the renderer.
+    Minimal,
+    // Nothing, for applications where the UI owns the GL context.
+    None,
+};
+
+struct GLStateBackup {
+    GLStatePolicy policy = GLStatePolicy::None;
+    GLint program;
+    GLint texture;
+    GLint active_texture;
+    GLint sampler;
+    GLint array_buffer;
+    GLint vertex_array;
+    GLint polygon_mode[2];
+    GLint viewport[4];
+    GLint scissor_box[4];
+    GLint blend_src_rgb, blend_dst_rgb, blend_src_alpha, blend_dst_alpha;
+    GLint blend_equation_rgb, blend_equation_alpha;
+    GLboolean enable_blend, enable_cull_face, enable_depth_test, enable_stencil_test;
+    GLboolean enable_scissor_test, enable_primitive_restart;
+
+    void save(const GLFunctions& gl, GLStatePolicy policy);
+    void restore(const GLFunctions& gl) const;
+};
+
+// Throws if `missing` names a GL function that couldn't be loaded.
+inline void check_gl_functions(const char* missing) {
+    if (missing) {
+        throw std::runtime_error(std::string("Could not load OpenGL function ") + missing);
+    }
+}
+
+// Saves and restores GL state with a single call, for renderers implemented in Python.
+class GLStateSaver {
+public:
+    // Only the functions used by `GLStateBackup` are loaded.
+    explicit GLStateSaver(const std::function<void*(const char*)>& get_proc_address) {
+        check_gl_functions(gl.loadState(get_proc_address));
+    }
+
+    void save(GLStatePolicy policy) { backup.save(gl, policy); }
+    void restore() { backup.restore(gl); }
+    // GL_SCISSOR_TEST at the last save(), unless nothing was saved.
+    bool scissorTestEnabled() const { return backup.policy != GLStatePolicy::None && backup.enable_scissor_test; }
+
+private:
+    GLFunctions gl;
+    GLStateBackup backup;
+};
+
+class GLRenderer {
+public:
+    // `get_proc_address` resolves a GL function name to its address (or nullptr).
+    explicit GLRenderer(const std::function<void*(const char*)>& get_proc_address) {
+        check_gl_functions(gl.load(get_proc_address));
+        createDeviceObjects();
+    }
+    // No GL calls: the renderer may be destroyed (e.g., garbage collected) without its context
+    // current.  Call destroyDeviceObjects() to release the GL objects.
+    ~GLRenderer() = default;
+
+    GLRenderer(const GLRenderer&) = delete;
+    GLRenderer& operator=(const GLRenderer&) = delete;
+
+    void render(ImDrawData* draw_data);
+    void updateTexture(ImTextureData* tex);
+    void destroyTexture(ImTextureData* tex);
+    // Release GL objects.  Must be called with the renderer's GL context current.
+    void destroyDeviceObjects();
+
+    int maxTextureSize() const { return max_texture_size; }
+
+    GLStatePolicy state_policy = GLStatePolicy::Full;
+
+private:
+    void createDeviceObjects();
+    void setupRenderState(ImDrawData* draw_data, int fb_width, int fb_height);
+
+    GLFunctions gl;
+    GLuint shader_handle = 0;
+    GLint attrib_location_tex = 0;
+    GLint attrib_location_proj_mtx = 0;
+    GLuint attrib_location_vtx_pos = 0;
+    GLuint attrib_location_vtx_uv = 0;
+    GLuint attrib_location_vtx_color = 0;
+    GLuint vbo_handle = 0;
+    GLuint elements_handle = 0;
+    GLuint vao_handle = 0;
+    int max_texture_size = 0;
+};
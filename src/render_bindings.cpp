@@ -0,0 +1,182 @@
+#include <nanobind/nanobind.h>
+#include <nanobind/stl/optional.h>
+#include <nanobind/stl/string.h>
+#include <nanobind/stl/tuple.h>
+#include <nanobind/stl/vector.h>
+#include <nanobind/ndarray.h>
+#include <functional>
+#include <algorithm>
+#include <stdexcept>
+#include <string.h>
+#include <string>
+
+#include "imgui.h"
+#include "gl_renderer.h"
+#include "sw_renderer.h"
+#include "damage_tracker.h"
+#include "draw_recording.h"
+
+namespace nb = nanobind;
+using namespace nb::literals;
+
+using GetProcAddressCallable = nb::typed<nb::callable, std::optional<uintptr_t>(std::string)>;
+using ImageArray = nb::ndarray<nb::numpy, uint8_t, nb::shape<-1, -1, 4>, nb::c_contig>;
+
+static void sw_render(SWRenderer& renderer, ImDrawData* draw_data, uint8_t* dst, int width, int height) {
+    renderer.prepare(draw_data, width, height);
+    nb::gil_scoped_release release;
+    renderer.rasterize(dst);
+}
+
+static std::function<void*(const char*)> make_get_proc_address(GetProcAddressCallable& get_proc_address) {
+    return [&](const char* name) -> void* {
+        nb::object addr = get_proc_address(name);
+        return addr.is_none() ? nullptr : (void*)nb::cast<uintptr_t>(addr);
+    };
+}
+
+void render_bindings(nb::module_& m) {
+    nb::enum_<GLStatePolicy>(m, "GLStatePolicy", "How much GL state is saved before rendering and restored afterwards.")
+        .value("FULL", GLStatePolicy::Full, "All state changed by the renderer.")
+        .value("MINIMAL", GLStatePolicy::Minimal, "Program, texture, vertex array and array buffer bindings and the blend, cull face, depth, stencil and scissor test enables.  Blend function, viewport, scissor box and polygon mode are left as set by the renderer.")
+        .value("NONE", GLStatePolicy::None, "Nothing, for applications where the UI owns the GL context.");
+
+    nb::class_<GLStateSaver>(m, "GLStateSaver",
+        "Save and restore GL state natively, one extension call each instead of a `glGet*` round trip\n"
+        "per state variable.  Holds a single backup.")
+        .def("__init__", [](GLStateSaver* self, GetProcAddressCallable get_proc_address) {
+            new (self) GLStateSaver(make_get_proc_address(get_proc_address));
+        }, "get_proc_address"_a,
+        "`get_proc_address` maps an OpenGL function name to its address, e.g., `glfw.get_proc_address`.")
+        .def("save", &GLStateSaver::save, "policy"_a = GLStatePolicy::Full, "Save the GL state selected by `policy`.")
+        .def("restore", &GLStateSaver::restore, "Restore the state saved by the last `save()` call.")
+        .def_prop_ro("scissor_test_enabled", &GLStateSaver::scissorTestEnabled,
+            "Whether `GL_SCISSOR_TEST` was enabled at the last `save()` call.  `False` if the policy was `NONE`.");
+
+    nb::class_<GLRenderer>(m, "OpenGLRenderer",
+        "Native OpenGL 3.3 core renderer.  The whole render loop runs in C++, GL functions are resolved\n"
+        "with the `get_proc_address` function passed to the constructor.  Requires a current GL context\n"
+        "for all methods.  Deleting the renderer makes no GL calls, call `destroy_device_objects()` with its\n"
+        "context current to release its GL objects.\n\n"
+        "See `slimgui.integrations.opengl_native.NativeOpenGLRenderer` for a `BaseRenderer` wrapper.")
+        .def("__init__", [](GLRenderer* self, GetProcAddressCallable get_proc_address) {
+            new (self) GLRenderer(make_get_proc_address(get_proc_address));
+        }, "get_proc_address"_a,
+        "Create the renderer's shader and buffer objects.  `get_proc_address` maps an OpenGL function name to its address, e.g., `glfw.get_proc_address`.")
+        .def_prop_ro("max_texture_size", &GLRenderer::maxTextureSize, "Value of `GL_MAX_TEXTURE_SIZE`.")
+        .def_rw("state_policy", &GLRenderer::state_policy, "GL state saved and restored around `render()`, `GLStatePolicy.FULL` by default.")
+        .def("render", &GLRenderer::render, "draw_data"_a, nb::call_guard<nb::gil_scoped_release>(),
+            "Update textures and render `draw_data` into the currently bound framebuffer.  The GIL is released\n"
+            "while rendering, so a `DrawDataSnapshot` can be submitted on a render thread while Python builds\n"
+            "the next frame.\n\n"
+            "Callbacks added with `DrawList.add_callback()` are called in order, `DRAW_CALLBACK_RESET_RENDER_STATE` resets the render state.")
+        .def("update_texture", &GLRenderer::updateTexture, "tex"_a, "Create, update or destroy `tex` according to its `TextureData.status`.")
+        .def("destroy_texture", &GLRenderer::destroyTexture, "tex"_a, "Delete the GL texture of `tex` and mark it as destroyed.")
+        .def("destroy_device_objects", &GLRenderer::destroyDeviceObjects, "Delete the renderer's shader and buffer objects.");
+
+    nb::class_<SWRenderer>(m, "SoftwareRenderer",
+        "CPU rasterizer for ImGui draw data.  Renders textured, vertex colored triangles with scissor\n"
+        "rectangles into RGBA8 images.  The image is split into `tile_size` x `tile_size` tiles that are\n"
+        "rasterized in parallel on `num_threads` threads (0 = all hardware threads) with the GIL released.\n\n"
+        "See `slimgui.integrations.software.SoftwareRenderer` for a `BaseRenderer` wrapper.")
+        .def(nb::init<int, int>(), "num_threads"_a = 0, "tile_size"_a = 64)
+        .def_prop_ro("num_threads", &SWRenderer::numThreads, "Number of rasterizer threads.")
+        .def_prop_ro("tile_size", &SWRenderer::tileSize, "Width and height of the rasterizer tiles in pixels.")
+        .def("render", [](SWRenderer& self, ImDrawData* draw_data, std::tuple<float, float, float, float> clear_color) {
+            int width = std::max(0, (int)(draw_data->DisplaySize.x * draw_data->FramebufferScale.x));
+            int height = std::max(0, (int)(draw_data->DisplaySize.y * draw_data->FramebufferScale.y));
+            size_t num_pixels = (size_t)width * height;
+            uint8_t* pixels = new uint8_t[num_pixels * 4];
+            nb::capsule owner(pixels, [](void* p) noexcept { delete[] (uint8_t*)p; });
+            const float rgba[4] = { std::get<0>(clear_color), std::get<1>(clear_color), std::get<2>(clear_color), std::get<3>(clear_color) };
+            uint8_t clear[4];
+            for (int c = 0; c < 4; c++)
+                clear[c] = (uint8_t)(std::clamp(rgba[c], 0.0f, 1.0f) * 255.0f + 0.5f);
+            for (size_t i = 0; i < num_pixels; i++)
+                memcpy(&pixels[i * 4], clear, 4);
+            sw_render(self, draw_data, pixels, width, height);
+            return ImageArray(pixels, { (size_t)height, (size_t)width, 4 }, owner);
+        }, "draw_data"_a, "clear_color"_a = std::make_tuple(0.f, 0.f, 0.f, 0.f),
+            "Update textures and render `draw_data` into a new `(height, width, 4)` uint8 RGBA image cleared to `clear_color`.\n\n"
+            "The image size is `DrawData.display_size * DrawData.framebuffer_scale`.  Callbacks added with `DrawList.add_callback()` are called in order before rasterization.")
+        .def("render_into", [](SWRenderer& self, ImDrawData* draw_data, ImageArray out) {
+            sw_render(self, draw_data, out.data(), (int)out.shape(1), (int)out.shape(0));
+        }, "draw_data"_a, "out"_a,
+            "Update textures and render `draw_data` over the contents of `out`, a C-contiguous `(height, width, 4)` uint8 RGBA array.")
+        .def("update_texture", &SWRenderer::updateTexture, "tex"_a, "Create, update or destroy `tex` according to its `TextureData.status`.")
+        .def("destroy_texture", &SWRenderer::destroyTexture, "tex"_a, "Release the renderer's copy of `tex` and mark it as destroyed.");
+
+    auto damage_tracker = nb::class_<DamageTracker>(m, "DamageTracker",
+        "Compute the regions of the framebuffer that changed between consecutive frames (damage).\n\n"
+        "Draw commands are compared by content hash and pixel bounds, draw lists whose `DrawList.content_hash()`\n"
+        "didn't change are skipped.  Redrawing a frame clipped to its damage rectangles (e.g., with\n"
+        "`OpenGLRenderer.render(draw_data, damage=...)`) over the previous frame gives the same pixels as a full\n"
+        "redraw.  Draw callbacks can't be diffed, their clip rectangles are damaged on every frame.\n\n"
+        "Doesn't use any graphics API.")
+        .def(nb::init<int>(), "max_rects"_a = 16,
+            "Damage is reported as at most `max_rects` rectangles, more are merged into bounding boxes.")
+        .def_prop_ro("max_rects", &DamageTracker::maxRects, "Maximum number of rectangles returned by `update()`.")
+        .def("update", [](DamageTracker& self, const ImDrawData* draw_data, int buffer_age) {
+            std::vector<std::tuple<int, int, int, int>> rects;
+            for (const DamageRect& r : self.update(draw_data, buffer_age))
+                rects.emplace_back(r.x0, r.y0, r.x1, r.y1);
+            return rects;
+        }, "draw_data"_a, "buffer_age"_a = 1,
+            "Diff `draw_data` against the draw data passed to the previous `update()` call.  Call once per frame,\n"
+            "before or after rendering it: clip rectangles already scaled by the renderer (`DrawData.scale_clip_rects()`)\n"
+            "are converted back to display coordinates.\n\n"
+            "`buffer_age` is the age of the framebuffer contents that will be drawn over, in frames: 1 if it holds\n"
+            "the previous frame (e.g., an offscreen render target), `N` for the `N`th frame back (`EGL_EXT_buffer_age`)\n"
+            "and 0 if unknown.  Unknown and too old (> `MAX_BUFFER_AGE`) contents, the first frame and display\n"
+            "size or scale changes damage the whole framebuffer.\n\n"
+            "Returns: disjoint `(x0, y0, x1, y1)` rectangles in framebuffer pixels, top-left origin, `x1` and `y1` exclusive.")
+        .def("reset", &DamageTracker::reset, "Forget previous frames, the next `update()` damages the whole framebuffer.");
+    damage_tracker.attr("MAX_BUFFER_AGE") = DamageTracker::MaxBufferAge;
+
+    nb::class_<DrawDataRecorder>(m, "DrawDataRecorder",
+        "Serialize frames into a compact binary stream for offline replay with `DrawDataReader`.\n\n"
+        "Each frame is written with its draw lists, draw commands (clip rectangles, texture references,\n"
+        "offsets) and the pixels of texture creations and updates.  Draw lists that are unchanged since the\n"
+        "previous frame (same content hash) are written as references, frames identical to the previous one as\n"
+        "a single small record.  A changed draw list is written as a delta against the previous frame's list of the\n"
+        "same window: only the vertex and index bytes that differ are stored, so small changes like a blinking\n"
+        "cursor or a counter cost tens of bytes.  User callbacks can't be serialized and are dropped,\n"
+        "`DRAW_CALLBACK_RESET_RENDER_STATE` is kept.  The stream compresses further, e.g., with `gzip.open()`.")
+        .def(nb::init<>())
+        .def("record", [](DrawDataRecorder& self, const ImDrawData* draw_data, double time) {
+            std::string data = self.record(draw_data, time);
+            return nb::bytes(data.data(), data.size());
+        }, "draw_data"_a, "time"_a = 0.0,
+            "Serialize `draw_data` and return the bytes to append to the stream, the first call also returns the\n"
+            "stream header.  `time` is stored with the frame, e.g., `imgui.get_time()`.\n\n"
+            "Call after `imgui.render()` and before the renderer processes the frame's texture requests.")
+        .def("keyframe", &DrawDataRecorder::keyframe,
+            "Make the next recorded frame self-contained: its textures and draw lists are written in full, and\n"
+            "textures that were destroyed meanwhile are destroyed.  Call after skipping `record()` for some frames,\n"
+            "e.g., when a network client falls behind, so that a reader that has read the stream so far can continue.")
+        .def_prop_ro("frame_count", &DrawDataRecorder::frameCount, "Number of frames recorded.")
+        .def_prop_ro("bytes_written", &DrawDataRecorder::bytesWritten, "Total size of the stream returned by `record()`.")
+        .def_prop_ro("lists_written", &DrawDataRecorder::listsWritten, "Number of draw lists serialized in full.")
+        .def_prop_ro("lists_delta", &DrawDataRecorder::listsDelta, "Number of draw lists written as deltas against the previous frame.")
+        .def_prop_ro("lists_referenced", &DrawDataRecorder::listsReferenced, "Number of draw lists written as references to the previous frame.");
+
+    nb::class_<DrawDataReader>(m, "DrawDataReader",
+        "Decode a stream written by `DrawDataRecorder` into `DrawData` that any renderer can draw.\n\n"
+        "Textures are recreated as `TextureData` objects owned by the reader, with the recorded create, update\n"
+        "and destroy requests.  Destroy the renderer's copies of `textures` before discarding the reader.  User\n"
+        "textures (`TextureRef` with a plain texture ID) keep their recorded IDs.")
+        .def(nb::init<>())
+        .def("feed", [](DrawDataReader& self, nb::bytes data) {
+            self.feed(data.c_str(), data.size());
+        }, "data"_a, "Append a chunk of the stream.  Chunks don't need to be aligned with records.")
+        .def("read_frame", &DrawDataReader::readFrame, nb::rv_policy::reference_internal,
+            "Decode the next frame, `None` if the data fed so far doesn't complete it.  The draw data is valid until\n"
+            "the next call, render it (or at least process its texture requests) before reading the next frame.\n"
+            "Set `IO.display_size` from `DrawData.display_size` before rendering.\n\n"
+            "Raises `ValueError` if the stream is malformed.")
+        .def_prop_ro("time", &DrawDataReader::time, "The `time` of the last frame read.")
+        .def_prop_ro("frame_count", &DrawDataReader::frameCount, "Number of frames read.")
+        .def_prop_ro("textures", [](const DrawDataReader& self) {
+            return std::vector<ImTextureData*>(self.textures().begin(), self.textures().end());
+        }, nb::rv_policy::reference_internal, "The reader's textures that haven't been destroyed.");
+}
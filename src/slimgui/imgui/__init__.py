@@ -61,6 +61,62 @@ class DrawList:
     @property
     def commands(self) -> Iterator[imgui_ext.DrawCmd]: return self._dl.commands
 
+    def vtx_buffer_array(self) -> NDArray[Any]:
+        """
+        NumPy view of the vertex buffer without copying, a structured array with fields `pos` (2 x float32),
+        `uv` (2 x float32) and `col` (uint32, packed ABGR).
+
+        The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that
+        raises `RuntimeError`.  Use `copy()` to keep the vertices.  Adding primitives to the list may move its
+        buffers, so take the view once the list is complete, e.g., after `render()`.
+        """
+        return self._dl.vtx_buffer_array()
+
+    def idx_buffer_array(self) -> NDArray[Any]:
+        """
+        NumPy view of the index buffer without copying, uint16 or uint32 elements depending on `INDEX_SIZE`.
+
+        The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that
+        raises `RuntimeError`.  Use `copy()` to keep the indices.  Adding primitives to the list may move its
+        buffers, so take the view once the list is complete, e.g., after `render()`.
+        """
+        return self._dl.idx_buffer_array()
+
+    def commands_array(self, draw_list_index: int = 0) -> NDArray[Any]:
+        """
+        All draw commands as a NumPy structured array with one record per `DrawCmd`.  Fields:
+
+        - `tex_id` (uint64): texture identifier, 0 if the texture hasn't been created yet
+        - `clip_rect` (4 x float32): clipping rectangle (x1, y1, x2, y2)
+        - `vtx_offset`, `idx_offset`, `elem_count` (uint32): same as in `DrawCmd`
+        - `has_callback` (bool): the command is a callback, see `DrawCmd.run_callback()`
+        - `draw_list_index` (int32): index of the command's `DrawList` in `DrawData.commands_lists`
+
+        The array is a copy and stays valid after the frame ends.
+        """
+        return self._dl.commands_array(draw_list_index)
+
+    def content_hash(self) -> int:
+        """
+        64-bit hash of the list's vertices, indices and draw commands (clip rectangles, texture IDs, offsets,
+        element counts and callbacks).  Lists with equal hashes render the same pixels.
+        """
+        return self._dl.content_hash()
+
+    def multi_draw_batches(self, vtx_base: int = 0, idx_base: int = 0) -> tuple[NDArray[Any], NDArray[Any], NDArray[Any], NDArray[Any]]:
+        """
+        Group the draw commands into runs that can each be submitted with a single `glMultiDrawElementsBaseVertex` call.
+        Consecutive commands with the same texture and clip rectangle form a run, callback commands are runs of their own
+        and zero-element commands are dropped.  `vtx_base` and `idx_base` are added to the command vertex and index offsets,
+        for when the list's geometry isn't at the start of the GPU buffers.
+
+        Returns: `(counts, offsets, base_vertices, runs)` where the first three are the per-command arrays for
+        `glMultiDrawElementsBaseVertex` (`offsets` in bytes).  `runs` is a structured array with fields `tex_id`,
+        `clip_rect`, `draw_start`, `draw_count` (slice of the per-command arrays, `draw_count == 0` for callbacks) and
+        `cmd_index` (index of the run's first command in `commands`).
+        """
+        return self._dl.multi_draw_batches(vtx_base, idx_base)
+
     def _clear_callback_refs(self):
         self._callback_refs.clear()
 
@@ -0,0 +1,77 @@
+from typing import Any
+
+import numpy as np
+
+class FrameArray(np.ndarray):
+    """
+    NumPy view of memory that's only valid for the duration of an ImGui frame.  Raises `RuntimeError`
+    when read or written after `frame.valid` has been cleared by `imgui.new_frame()`.
+
+    Slices, field views and other views taken from the array are checked too.  The results of computations
+    (e.g., `arr["pos"] * 2`) are regular arrays.  Converting the view to a plain array with `np.asarray()`
+    bypasses the check, but such a view keeps reading the frame's data: the buffers are moved out of ImGui
+    into `frame` when the frame ends.
+    """
+
+    _frame: Any = None
+
+    @staticmethod
+    def view_of(array: np.ndarray, frame: Any) -> "FrameArray":
+        view = array.view(FrameArray)
+        view._frame = frame
+        return view
+
+    def __array_finalize__(self, obj):
+        # Views of the memory are checked, copies (e.g., `copy()` or `astype()`) own their data.
+        self._frame = getattr(obj, "_frame", None) if self.base is not None else None
+
+    def _check(self):
+        if self._frame is not None and not self._frame.valid:
+            raise RuntimeError("draw list buffer view used after imgui.new_frame()")
+
+    def _unwrap(self) -> np.ndarray:
+        self._check()
+        return self.view(np.ndarray)
+
+    # Every `ndarray` attribute other than the array's shape and type is checked, so methods like `sum()`,
+    # `astype()` or `dot()` raise before reading the memory.  Raising later from `__array_ufunc__` on the
+    # `ndarray.sum()` etc. code path leaks a reference to the array.
+    _UNCHECKED = frozenset((
+        "_frame", "_check", "_unwrap", "__class__", "__dict__",
+        "shape", "dtype", "ndim", "size", "itemsize", "nbytes", "strides", "flags", "base",
+    ))
+
+    def __getattribute__(self, name: str):
+        if name not in FrameArray._UNCHECKED:
+            object.__getattribute__(self, "_check")()
+        return super().__getattribute__(name)
+
+    def __getitem__(self, key):
+        self._check()
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._check()
+        super().__setitem__(key, value)
+
+    def __iter__(self):
+        return iter(self._unwrap())
+
+    def __repr__(self):
+        return repr(self._unwrap())
+
+    def __str__(self):
+        return str(self._unwrap())
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        inputs = tuple(x._unwrap() if isinstance(x, FrameArray) else x for x in inputs)
+        if "out" in kwargs:
+            kwargs["out"] = tuple(x._unwrap() if isinstance(x, FrameArray) else x for x in kwargs["out"])
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        self._check()
+        for arg in args:
+            if isinstance(arg, FrameArray):
+                arg._check()
+        return super().__array_function__(func, types, args, kwargs)
@@ -0,0 +1,286 @@
+"""
+Headless ImGui rendering with EGL.
+
+`EglRenderer` creates an offscreen OpenGL context with EGL (no window system needed, Mesa's
+llvmpipe works without a GPU), renders into a framebuffer object and reads the frames back
+into NumPy arrays.
+
+PyOpenGL picks its platform when `OpenGL` is first imported.  This module selects EGL (and Mesa's
+surfaceless EGL platform) unless configured otherwise, so import it before anything else imports
+`OpenGL`, or set `PYOPENGL_PLATFORM=egl` in the environment.
+"""
+import ctypes
+import os
+import time
+from collections import deque
+
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+import numpy as np
+import OpenGL.EGL as egl
+import OpenGL.GL as gl
+from numpy.typing import NDArray
+from slimgui import imgui
+
+from .opengl import OpenGLRenderer
+from .opengl_native import NativeOpenGLRenderer
+
+class EglRenderer:
+    """
+    Render ImGui frames into an offscreen framebuffer and read them back as NumPy arrays.
+
+    Creates an OpenGL 3.3 core context with EGL and makes it current.  A surfaceless context is
+    used where supported (`EGL_KHR_surfaceless_context`), otherwise a 1x1 pbuffer surface is
+    created for the context.  All drawing goes into an RGBA8 framebuffer object of size
+    `(width, height)`.
+
+    Readback is asynchronous: `render()` queues a `glReadPixels` into one of `readback_buffers`
+    pixel pack buffers and returns the frame that was queued `readback_buffers` frames earlier
+    (or `None` while the queue is filling up), so reading a frame doesn't wait for the
+    GPU to finish the frame that was just submitted.  Call `flush()` to get the remaining frames.
+    Frames are `(height, width, 4)` uint8 RGBA arrays with the top row first.
+
+        egl_renderer = EglRenderer(640, 480)
+        for state in states:
+            egl_renderer.new_frame()
+            imgui.new_frame()
+            build_ui(state)
+            imgui.render()
+            if (frame := egl_renderer.render(imgui.get_draw_data())) is not None:
+                save(frame)
+        for frame in egl_renderer.flush():
+            save(frame)
+        egl_renderer.shutdown()
+
+    Note: most methods assume the current imgui context is set.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        renderer: OpenGLRenderer | NativeOpenGLRenderer | None = None,
+        readback_buffers: int = 2,
+        clear_color: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0),
+        font_atlas_format: imgui.TextureFormat | None = None,
+    ):
+        if readback_buffers < 1:
+            raise ValueError("readback_buffers must be at least 1")
+        self.clear_color = clear_color
+        self.width = 0
+        self.height = 0
+        self._display = egl.EGL_NO_DISPLAY
+        self._context = egl.EGL_NO_CONTEXT
+        self._surface = egl.EGL_NO_SURFACE
+        self._create_context()
+
+        self._fbo = gl.glGenFramebuffers(1)
+        self._rbo = gl.glGenRenderbuffers(1)
+        self._pbos = [int(h) for h in np.atleast_1d(gl.glGenBuffers(readback_buffers))]
+        # Queued readbacks as (pbo index, fence) tuples, oldest first.
+        self._pending: deque[tuple[int, object]] = deque()
+        self._next_pbo = 0
+        self._resize_framebuffer(width, height)
+
+        # Create the renderer only after the context is current, it allocates its GL objects immediately.
+        self.renderer = renderer if renderer is not None else OpenGLRenderer()
+
+        self.io = imgui.get_io()
+        self.io.display_size = width, height
+        self.io.display_framebuffer_scale = 1.0, 1.0
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+        # Only override the atlas format when asked, keep one the application already set on `FontAtlas`.
+        if font_atlas_format is not None:
+            self.io.fonts.tex_desired_format = font_atlas_format
+
+        plat_io = imgui.get_platform_io()
+        plat_io.renderer_texture_max_height = self.renderer.max_texture_size
+        plat_io.renderer_texture_max_width = self.renderer.max_texture_size
+
+        self._gui_time: float | None = None
+
+    def _create_context(self):
+        display = egl.eglGetDisplay(egl.EGL_DEFAULT_DISPLAY)
+        if display == egl.EGL_NO_DISPLAY:
+            raise RuntimeError("Could not get an EGL display")
+        major, minor = ctypes.c_int32(), ctypes.c_int32()
+        if not egl.eglInitialize(display, major, minor):
+            raise RuntimeError("Could not initialize EGL")
+        if not egl.eglBindAPI(egl.EGL_OPENGL_API):
+            raise RuntimeError("EGL implementation doesn't support desktop OpenGL")
+
+        config_attribs = [
+            egl.EGL_RENDERABLE_TYPE, egl.EGL_OPENGL_BIT,
+            egl.EGL_SURFACE_TYPE, egl.EGL_PBUFFER_BIT,
+            egl.EGL_NONE,
+        ]
+        configs = (egl.EGLConfig * 1)()
+        num_configs = ctypes.c_int32()
+        if not egl.eglChooseConfig(display, config_attribs, configs, 1, num_configs) or num_configs.value < 1:
+            raise RuntimeError("No EGL config with OpenGL and pbuffer support")
+        config = configs[0]
+
+        ctx_attribs = [
+            egl.EGL_CONTEXT_MAJOR_VERSION, 3,
+            egl.EGL_CONTEXT_MINOR_VERSION, 3,
+            egl.EGL_CONTEXT_OPENGL_PROFILE_MASK, egl.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            egl.EGL_NONE,
+        ]
+        context = egl.eglCreateContext(display, config, egl.EGL_NO_CONTEXT, ctx_attribs)
+        if context == egl.EGL_NO_CONTEXT:
+            raise RuntimeError("Could not create an OpenGL 3.3 core context")
+        self._display = display
+        self._context = context
+
+        # Prefer a surfaceless context, fall back to a dummy pbuffer surface.
+        if not egl.eglMakeCurrent(display, egl.EGL_NO_SURFACE, egl.EGL_NO_SURFACE, context):
+            surface = egl.eglCreatePbufferSurface(display, config, [egl.EGL_WIDTH, 1, egl.EGL_HEIGHT, 1, egl.EGL_NONE])
+            if surface == egl.EGL_NO_SURFACE:
+                self._destroy_context()
+                raise RuntimeError("Could not create an EGL pbuffer surface")
+            self._surface = surface
+            if not egl.eglMakeCurrent(display, surface, surface, context):
+                self._destroy_context()
+                raise RuntimeError("Could not make the EGL context current")
+
+    def _destroy_context(self):
+        egl.eglMakeCurrent(self._display, egl.EGL_NO_SURFACE, egl.EGL_NO_SURFACE, egl.EGL_NO_CONTEXT)
+        if self._surface != egl.EGL_NO_SURFACE:
+            egl.eglDestroySurface(self._display, self._surface)
+            self._surface = egl.EGL_NO_SURFACE
+        egl.eglDestroyContext(self._display, self._context)
+        self._context = egl.EGL_NO_CONTEXT
+        # The display is shared by all EGL users in the process, so it's not terminated.
+
+    def _resize_framebuffer(self, width: int, height: int):
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid framebuffer size {width}x{height}")
+        self.width = width
+        self.height = height
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, self._rbo)
+        gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, width, height)
+        gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, 0)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._fbo)
+        gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_RENDERBUFFER, self._rbo)
+        if gl.glCheckFramebufferStatus(gl.GL_FRAMEBUFFER) != gl.GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError("Offscreen framebuffer is incomplete")
+        for pbo in self._pbos:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+            gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, width * height * 4, None, gl.GL_STREAM_READ)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+    def make_current(self):
+        """Make this renderer's GL context current on the calling thread."""
+        surface = self._surface
+        if not egl.eglMakeCurrent(self._display, surface, surface, self._context):
+            raise RuntimeError("Could not make the EGL context current")
+
+    @property
+    def pending_frames(self) -> int:
+        """Number of rendered frames whose readback hasn't been returned yet."""
+        return len(self._pending)
+
+    def resize(self, width: int, height: int):
+        """Resize the offscreen framebuffer.  Frames still pending readback are discarded."""
+        self._discard_pending()
+        self._resize_framebuffer(width, height)
+        self.io.display_size = width, height
+
+    def new_frame(self):
+        """Update `io.display_size` and `io.delta_time`.  Call before `imgui.new_frame()`."""
+        self.io.display_size = self.width, self.height
+        self.io.display_framebuffer_scale = 1.0, 1.0
+
+        current_time = time.perf_counter()
+        if self._gui_time:
+            self.io.delta_time = current_time - self._gui_time
+        else:
+            self.io.delta_time = 1.0 / 60.0
+        if self.io.delta_time <= 0.0:
+            self.io.delta_time = 1.0 / 1000.0
+        self._gui_time = current_time
+
+    def render(self, draw_data: imgui.DrawData, capture: bool = True) -> NDArray[np.uint8] | None:
+        """
+        Clear the framebuffer, render `draw_data` into it and queue its readback if `capture` is set.
+
+        Returns the oldest queued frame if all readback buffers are in use, otherwise `None`.
+        """
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._fbo)
+        gl.glViewport(0, 0, self.width, self.height)
+        gl.glClearColor(*self.clear_color)
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        self.renderer.render(draw_data)
+        if not capture:
+            return None
+
+        frame = None
+        if len(self._pending) == len(self._pbos):
+            frame = self._read_oldest()
+        pbo = self._next_pbo
+        self._next_pbo = (self._next_pbo + 1) % len(self._pbos)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._pbos[pbo])
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(0))
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        fence = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        # Make sure the readback gets submitted, the fence is waited on only when the buffer is needed.
+        gl.glFlush()
+        self._pending.append((pbo, fence))
+        return frame
+
+    def flush(self) -> list[NDArray[np.uint8]]:
+        """Wait for all queued readbacks and return their frames, oldest first."""
+        frames = []
+        while self._pending:
+            frames.append(self._read_oldest())
+        return frames
+
+    def read_pixels(self) -> NDArray[np.uint8]:
+        """Synchronously read the current framebuffer contents, bypassing the readback queue."""
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self._fbo)
+        gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+        pixels = gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        image = np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 4)
+        return np.ascontiguousarray(image[::-1])
+
+    def _read_oldest(self) -> NDArray[np.uint8]:
+        pbo, fence = self._pending.popleft()
+        while gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000_000) == gl.GL_TIMEOUT_EXPIRED:
+            pass
+        gl.glDeleteSync(fence)
+
+        size = self.width * self.height * 4
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self._pbos[pbo])
+        ptr = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, size, gl.GL_MAP_READ_BIT)
+        if not ptr:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+            raise RuntimeError("Could not map the pixel pack buffer")
+        try:
+            mapped = np.frombuffer((ctypes.c_uint8 * size).from_address(ptr), dtype=np.uint8)
+            # GL rows are bottom-up, flip while copying out of the mapped buffer.
+            image = np.ascontiguousarray(mapped.reshape(self.height, self.width, 4)[::-1])
+        finally:
+            gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        return image
+
+    def _discard_pending(self):
+        while self._pending:
+            _, fence = self._pending.popleft()
+            gl.glDeleteSync(fence)
+
+    def shutdown(self):
+        """Shut down the renderer, delete the offscreen framebuffer and destroy the GL context."""
+        if self._context == egl.EGL_NO_CONTEXT:
+            return
+        self.make_current()
+        self._discard_pending()
+        self.renderer.shutdown()
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, 0)
+        gl.glDeleteFramebuffers(1, [self._fbo])
+        gl.glDeleteRenderbuffers(1, [self._rbo])
+        gl.glDeleteBuffers(len(self._pbos), self._pbos)
+        self._destroy_context()
@@ -1,9 +1,12 @@
+import ctypes
+from dataclasses import dataclass
 from typing import Any, Callable
 
 import glfw
 from slimgui import imgui
 
 from .opengl import OpenGLRenderer
+from .opengl_native import NativeOpenGLRenderer
 
 class GlfwRenderer:
     def __init__(
@@ -17,8 +20,15 @@ class GlfwRenderer:
         prev_mouse_button_callback: Callable[[Any, int, int, int], None] | None = None,
         prev_scroll_callback: Callable[[Any, float, float], None] | None = None,
         prev_window_focus_callback: Callable[[Any, int], None] | None = None,
+        renderer: OpenGLRenderer | NativeOpenGLRenderer | None = None,
+        font_atlas_format: imgui.TextureFormat | None = None,
+        share_with: "GlfwRenderer | None" = None,
     ):
-        self.renderer = OpenGLRenderer()
+        # With `share_with`, the `OpenGLRenderer` of a window created with `glfw.create_window(..., share=other_window)`
+        # reuses the other window's shader program and buffers, see `SharedDeviceObjects`.
+        if renderer is None:
+            renderer = OpenGLRenderer(shared=share_with.renderer.device_objects if share_with is not None else None)
+        self.renderer = renderer
         self.window = window
         self.mouse_wheel_multiplier = mouse_wheel_multiplier
 
@@ -42,14 +52,23 @@ class GlfwRenderer:
         self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
         self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
         self.io.backend_flags |= imgui.BackendFlags.HAS_MOUSE_CURSORS
+        # The OpenGL renderers support both RGBA32 and ALPHA8 textures.  ALPHA8 font atlases use a
+        # quarter of the texture memory.  Only override the format when asked, keep one the application
+        # already set on `FontAtlas`.
+        if font_atlas_format is not None:
+            self.io.fonts.tex_desired_format = font_atlas_format
 
         plat_io = imgui.get_platform_io()
         plat_io.renderer_texture_max_height = self.renderer.max_texture_size
         plat_io.renderer_texture_max_width = self.renderer.max_texture_size
 
+        # Number of input events received through the callbacks, see `IdleFrameDriver`.
+        self.input_events = 0
+
         self._cursors: dict[imgui.MouseCursor, glfw._GLFWcursor] = {}
         self._alloc_cursors()
         self._gui_time = None
+        self._egl_swap_state: _EglSwap | bool | None = None  # None until checked, False if not available
         # FIXME nurpax
         # self.io.get_clipboard_text_fn = self._get_clipboard_text
         # self.io.set_clipboard_text_fn = self._set_clipboard_text
@@ -151,6 +170,7 @@ class GlfwRenderer:
     def keyboard_callback(self, window, key, scancode, action, mods):
         if self._prev_key_callback is not None:
             self._prev_key_callback(window, key, scancode, action, mods)
+        self.input_events += 1
         if action not in [glfw.PRESS, glfw.RELEASE]:
             return
         self._update_mod_keys(window)
@@ -161,22 +181,26 @@ class GlfwRenderer:
     def char_callback(self, window, char):
         if self._prev_char_callback is not None:
             self._prev_char_callback(window, char)
+        self.input_events += 1
         self.io.add_input_character(char)
 
     def mouse_pos_callback(self, window, x, y):
         if self._prev_cursor_pos_callback is not None:
             self._prev_cursor_pos_callback(window, x, y)
+        self.input_events += 1
         self.io.add_mouse_pos_event(x, y)
 
     def mouse_button_callback(self, window, btn, action, mods):
         if self._prev_mouse_button_callback is not None:
             self._prev_mouse_button_callback(window, btn, action, mods)
+        self.input_events += 1
         self._update_mod_keys(window)
         self.io.add_mouse_button_event(btn, action != 0)
 
     def scroll_callback(self, window, x_offset, y_offset):
         if self._prev_scroll_callback is not None:
             self._prev_scroll_callback(window, x_offset, y_offset)
+        self.input_events += 1
         x_offset *= self.mouse_wheel_multiplier
         y_offset *= self.mouse_wheel_multiplier
         self.io.add_mouse_wheel_event(x_offset, y_offset)
@@ -184,6 +208,7 @@ class GlfwRenderer:
     def window_focus_callback(self, window, focused: int):
         if self._prev_window_focus_callback is not None:
             self._prev_window_focus_callback(window, focused)
+        self.input_events += 1
         self.io.add_focus_event(focused != 0)
 
     def new_frame(self):
@@ -213,3 +238,231 @@ class GlfwRenderer:
 
     def render(self, draw_data: imgui.DrawData):
         self.renderer.render(draw_data)
+
+    def _egl_swap(self) -> "_EglSwap | None":
+        if self._egl_swap_state is None:
+            self._egl_swap_state = _EglSwap.create(self.window) or False
+        return self._egl_swap_state or None
+
+    def buffer_age(self) -> int:
+        """
+        Age of the back buffer contents in frames (`EGL_EXT_buffer_age`), for `render.DamageTracker.update()`.
+        Query after making the window's context current and before drawing.  0 (unknown, redraw everything)
+        unless the window has an EGL context (`glfw.CONTEXT_CREATION_API` hint set to `glfw.EGL_CONTEXT_API`)
+        and the EGL implementation supports the extension.
+        """
+        egl_swap = self._egl_swap()
+        return egl_swap.buffer_age() if egl_swap is not None else 0
+
+    def swap_buffers(self, damage: list[tuple[int, int, int, int]] | None = None):
+        """
+        Swap the window's front and back buffers.
+
+        `damage` is a list of `(x0, y0, x1, y1)` framebuffer rectangles with a top-left origin, e.g., from
+        `render.DamageTracker.update()`.  When the window has an EGL context and the EGL implementation supports
+        `EGL_KHR_swap_buffers_with_damage` or `EGL_EXT_swap_buffers_with_damage`, the rectangles are passed to
+        `eglSwapBuffersWithDamage`, so that the compositor only updates the changed regions.  Otherwise the whole
+        buffer is swapped with `glfw.swap_buffers()`.
+        """
+        egl_swap = self._egl_swap() if damage is not None else None
+        if egl_swap is None or egl_swap.swap_with_damage is None:
+            glfw.swap_buffers(self.window)
+            return
+        _, fb_height = glfw.get_framebuffer_size(self.window)
+        egl_swap.swap(_egl_damage_rects(damage, fb_height))
+
+def _egl_damage_rects(damage: list[tuple[int, int, int, int]], fb_height: int) -> list[int]:
+    # eglSwapBuffersWithDamage takes flattened (x, y, width, height) rectangles with a bottom-left origin.
+    rects = []
+    for x0, y0, x1, y1 in damage:
+        rects += (x0, fb_height - y1, x1 - x0, y1 - y0)
+    return rects
+
+class _EglSwap:
+    """Damage-aware swaps and buffer age queries of a GLFW window's EGL surface."""
+
+    def __init__(self, display, surface, extensions: set[bytes]):
+        import OpenGL.EGL as egl
+        self._egl = egl
+        self.display = display
+        self.surface = surface
+        self.swap_with_damage = None
+        if b"EGL_KHR_swap_buffers_with_damage" in extensions:
+            from OpenGL.raw.EGL.KHR.swap_buffers_with_damage import eglSwapBuffersWithDamageKHR
+            self.swap_with_damage = eglSwapBuffersWithDamageKHR
+        elif b"EGL_EXT_swap_buffers_with_damage" in extensions:
+            from OpenGL.raw.EGL.EXT.swap_buffers_with_damage import eglSwapBuffersWithDamageEXT
+            self.swap_with_damage = eglSwapBuffersWithDamageEXT
+        self.has_buffer_age = b"EGL_EXT_buffer_age" in extensions
+
+    @staticmethod
+    def create(window) -> "_EglSwap | None":
+        """None unless `window` has an EGL context and PyOpenGL can load EGL."""
+        if glfw.get_window_attrib(window, glfw.CONTEXT_CREATION_API) != glfw.EGL_CONTEXT_API:
+            return None
+        try:
+            import OpenGL.EGL as egl
+            # pyGLFW returns the handles as plain addresses.
+            display = ctypes.cast(ctypes.c_void_p(glfw.get_egl_display()), egl.EGLDisplay)
+            surface = ctypes.cast(ctypes.c_void_p(glfw.get_egl_surface(window)), egl.EGLSurface)
+            extensions = egl.eglQueryString(display, egl.EGL_EXTENSIONS) or b""
+        except (ImportError, AttributeError, glfw.GLFWError):
+            return None
+        return _EglSwap(display, surface, set(extensions.split()))
+
+    def buffer_age(self) -> int:
+        if not self.has_buffer_age:
+            return 0
+        from OpenGL.raw.EGL.EXT.buffer_age import EGL_BUFFER_AGE_EXT
+        age = ctypes.c_int(0)
+        if not self._egl.eglQuerySurface(self.display, self.surface, EGL_BUFFER_AGE_EXT, ctypes.byref(age)):
+            return 0
+        return age.value
+
+    def swap(self, rects: list[int]):
+        assert self.swap_with_damage is not None
+        self.swap_with_damage(self.display, self.surface, (ctypes.c_int * len(rects))(*rects), len(rects) // 4)
+
+@dataclass
+class FrameDriverStats:
+    """Frame counts of an `IdleFrameDriver`."""
+    frames_rendered: int = 0    # number of `wait()` calls, i.e., frames the application rendered
+    frames_skipped: int = 0     # frames that would have been rendered at `frame_rate` while idle
+    idle_seconds: float = 0.0   # time spent blocked waiting for events
+
+def _wait_glfw_events(timeout: float | None):
+    if timeout is None:
+        glfw.wait_events()
+    else:
+        glfw.wait_events_timeout(timeout)
+
+class IdleFrameDriver:
+    """
+    Render frames only when something may have changed, and sleep in `glfw.wait_events_timeout()` otherwise.
+
+    Call `wait()` at the top of the main loop instead of `glfw.poll_events()`:
+
+        driver = IdleFrameDriver(impl)
+        while not glfw.window_should_close(window):
+            driver.wait()
+            impl.new_frame()
+            imgui.new_frame()
+            ...
+            imgui.render()
+            impl.render(imgui.get_draw_data())
+            glfw.swap_buffers(window)
+
+    `wait()` returns immediately when a frame is needed:
+
+    - input arrived through the `GlfwRenderer` callbacks, or the window was resized,
+    - `request_redraw()` was called, e.g., by a thread that received new data,
+    - fewer than `settle_frames` frames were rendered since the last of the above (ImGui needs a few
+      frames to settle after input, e.g., new windows and popups are hidden on their first frame),
+    - a mouse button is held down (dragging, repeat buttons),
+    - a timer is due: tooltip hover delays while an item is hovered, the text cursor blink while
+      text input is active, and `idle_timeout` since the last frame (if set).
+
+    Otherwise it blocks until one of these happens.  `stats` counts frames rendered and skipped.
+
+    `clock` (seconds) and `wait_events` (block for events, up to a timeout in seconds or indefinitely with
+    `None`) default to GLFW's and can be replaced, e.g., with a simulated clock in tests.
+    """
+
+    # Interval of frames while a text input is active, the cursor blinks in 0.4 and 0.8 second phases.
+    TEXT_CURSOR_INTERVAL = 0.2
+
+    def __init__(
+        self,
+        impl: GlfwRenderer,
+        settle_frames: int = 3,
+        idle_timeout: float | None = 1.0,
+        frame_rate: float | None = None,
+        clock: Callable[[], float] = glfw.get_time,
+        wait_events: Callable[[float | None], None] | None = None,
+    ):
+        self.impl = impl
+        self._clock = clock
+        self._wait_events = wait_events if wait_events is not None else _wait_glfw_events
+        self.settle_frames = settle_frames
+        self.idle_timeout = idle_timeout
+        if frame_rate is None:
+            monitor = glfw.get_primary_monitor()
+            mode = glfw.get_video_mode(monitor) if monitor else None
+            frame_rate = float(mode.refresh_rate) if mode and mode.refresh_rate > 0 else 60.0
+        self.frame_rate = frame_rate
+        self.stats = FrameDriverStats()
+
+        self._redraw_requests = 0
+        self._settle = settle_frames
+        self._input_events = impl.input_events
+        self._window_size = glfw.get_framebuffer_size(impl.window)
+        self._last_frame_time = clock()
+        self._last_input_time = self._last_frame_time
+
+    def request_redraw(self, frames: int = 1):
+        """
+        Render at least `frames` more frames, e.g., after a background update to data shown in the UI.
+
+        Can be called from any thread, wakes up a blocked `wait()`.
+        """
+        self._redraw_requests = max(self._redraw_requests, frames)
+        glfw.post_empty_event()
+
+    def _deadline(self) -> float | None:
+        """Time when the next frame is due without further input, `None` if no timer is pending."""
+        deadlines = []
+        if self.idle_timeout is not None:
+            deadlines.append(self._last_frame_time + self.idle_timeout)
+        io = imgui.get_io()
+        if io.want_text_input and io.config_input_text_cursor_blink:
+            deadlines.append(self._last_frame_time + self.TEXT_CURSOR_INTERVAL)
+        if imgui.is_any_item_hovered():
+            # Tooltips appear once the mouse has been still over an item for the hover delay.
+            style = imgui.get_style()
+            tooltip_time = self._last_input_time + max(style.hover_delay_normal, style.hover_stationary_delay)
+            if tooltip_time > self._last_frame_time:
+                deadlines.append(tooltip_time)
+        return min(deadlines) if deadlines else None
+
+    def _frame_needed(self, now: float) -> bool:
+        if self.impl.input_events != self._input_events:
+            self._input_events = self.impl.input_events
+            self._last_input_time = now
+            self._settle = self.settle_frames
+            return True
+        window_size = glfw.get_framebuffer_size(self.impl.window)
+        if window_size != self._window_size:
+            self._window_size = window_size
+            self._settle = self.settle_frames
+            return True
+        if self._redraw_requests > 0:
+            self._redraw_requests -= 1
+            return True
+        if self._settle > 0:
+            self._settle -= 1
+            return True
+        if any(imgui.is_mouse_down(button) for button in (imgui.MouseButton.LEFT, imgui.MouseButton.RIGHT, imgui.MouseButton.MIDDLE)):
+            return True
+        deadline = self._deadline()
+        if deadline is not None and now >= deadline:
+            if imgui.is_any_item_hovered():
+                # Tooltips are windows, they're hidden on their first frame.
+                self._settle = self.settle_frames - 1
+            return True
+        return False
+
+    def wait(self):
+        """Process pending events and block until the next frame should be rendered."""
+        glfw.poll_events()
+        now = idle_start = self._clock()
+        waited = False
+        while not self._frame_needed(now):
+            deadline = self._deadline()
+            self._wait_events(None if deadline is None else max(deadline - now, 0.0))
+            now = self._clock()
+            waited = True
+        if waited:
+            self.stats.idle_seconds += now - idle_start
+            self.stats.frames_skipped = int(self.stats.idle_seconds * self.frame_rate)
+        self.stats.frames_rendered += 1
+        self._last_frame_time = now
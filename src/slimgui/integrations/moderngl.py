@@ -0,0 +1,274 @@
+import ctypes
+import struct
+from typing import Callable
+
+import moderngl
+from slimgui import imgui
+from slimgui.slimgui_ext import render
+
+from .base import BaseRenderer
+from .opengl_native import STATE_POLICIES, StateBackupPolicy, pyopengl_get_proc_address
+
+_TEXTURE_COMPONENTS = {
+    imgui.TextureFormat.RGBA32: 4,
+    imgui.TextureFormat.ALPHA8: 1,
+}
+
+def _context_get_proc_address(ctx: moderngl.Context) -> Callable[[str], int | None]:
+    """Resolve GL functions with the loader of the context's glcontext backend, or PyOpenGL if there's none."""
+    loader = getattr(getattr(ctx.mglo, "_context", None), "load", None)
+    if loader is None:
+        return pyopengl_get_proc_address
+    return lambda name: loader(name) or None
+
+def _memory_at(address: int, size: int):
+    """Buffer protocol view of `size` bytes at `address`, passed to moderngl without copying."""
+    return (ctypes.c_char * size).from_address(address)
+
+class ModernGLRenderer(BaseRenderer):
+    """
+    Renderer for applications that draw with [moderngl](https://github.com/moderngl/moderngl).
+
+    Renders into the context's currently bound framebuffer.  Vertex and index data are written to
+    moderngl buffers straight from the draw lists' memory, textures are `moderngl.Texture` objects
+    whose GL names are used as ImGui texture IDs.  Use `register_texture()` to draw your own
+    moderngl textures with `imgui.image()`.
+
+    `state_backup` selects how much GL state is saved and restored around `render()`, see
+    `StateBackupPolicy`.  moderngl can't read back enable flags or blend state, so the state is saved
+    natively with `render.GLStateSaver`.  GL functions are resolved with `get_proc_address` if given,
+    otherwise with the loader moderngl created the context with.
+    """
+
+    VERTEX_SHADER_SRC = """
+    #version 330
+
+    uniform mat4 ProjMtx;
+    in vec2 Position;
+    in vec2 UV;
+    in vec4 Color;
+    out vec2 Frag_UV;
+    out vec4 Frag_Color;
+
+    void main() {
+        Frag_UV = UV;
+        Frag_Color = Color;
+
+        gl_Position = ProjMtx * vec4(Position.xy, 0, 1);
+    }
+    """
+
+    FRAGMENT_SHADER_SRC = """
+    #version 330
+
+    uniform sampler2D Texture;
+    in vec2 Frag_UV;
+    in vec4 Frag_Color;
+    out vec4 Out_Color;
+
+    void main() {
+        Out_Color = Frag_Color * texture(Texture, Frag_UV.st);
+    }
+    """
+
+    # Initial size of the vertex and index buffers, grown on demand.
+    INITIAL_VTX_BUFFER_SIZE = 64 * 1024 * imgui.VERTEX_SIZE
+    INITIAL_IDX_BUFFER_SIZE = 3 * 64 * 1024 * imgui.INDEX_SIZE
+
+    def __init__(
+        self,
+        ctx: moderngl.Context | None = None,
+        state_backup: StateBackupPolicy = "full",
+        get_proc_address: Callable[[str], int | None] | None = None,
+    ):
+        super().__init__()
+        self.ctx = ctx if ctx is not None else moderngl.get_context()
+        self.state_backup = state_backup
+        self._state_saver = render.GLStateSaver(get_proc_address or _context_get_proc_address(self.ctx))
+        self._prog = self.ctx.program(vertex_shader=self.VERTEX_SHADER_SRC, fragment_shader=self.FRAGMENT_SHADER_SRC)
+        self._prog["Texture"].value = 0
+        self._vbo = self.ctx.buffer(reserve=self.INITIAL_VTX_BUFFER_SIZE, dynamic=True)
+        self._ibo = self.ctx.buffer(reserve=self.INITIAL_IDX_BUFFER_SIZE, dynamic=True)
+        self._vao = self.ctx.vertex_array(
+            self._prog,
+            [(self._vbo, "2f 2f 4f1", "Position", "UV", "Color")],
+            index_buffer=self._ibo,
+            index_element_size=imgui.INDEX_SIZE,
+        )
+        # ImGui texture ID (GL texture name) -> texture, for textures created by this renderer.
+        self._textures: dict[int, moderngl.Texture] = {}
+        # Textures registered with `register_texture()`, owned by the application.
+        self._user_textures: dict[int, moderngl.Texture] = {}
+        self.max_texture_size = self.ctx.info["GL_MAX_TEXTURE_SIZE"]
+
+    #--------------------------------------------------------------------
+
+    def register_texture(self, texture: moderngl.Texture) -> int:
+        """Make `texture` drawable by ImGui, returns its texture ID.  The texture isn't released by `shutdown()`."""
+        self._user_textures[texture.glo] = texture
+        return texture.glo
+
+    def unregister_texture(self, texture: moderngl.Texture):
+        self._user_textures.pop(texture.glo, None)
+
+    #--------------------------------------------------------------------
+
+    def _destroy_texture(self, tex: imgui.TextureData):
+        texture = self._textures.pop(tex.get_tex_id(), None)
+        if texture is not None:
+            texture.release()
+        tex.set_tex_id(0)   # imgui.h: ((ImTextureID)0)
+        tex.set_status(imgui.TextureStatus.DESTROYED)
+
+    def _update_textures(self, textures):
+        for tex in textures:
+            if tex.status == imgui.TextureStatus.WANT_CREATE:
+                assert tex.get_tex_id() == 0
+                # (Bilinear sampling is required by default.
+                # Set 'io.Fonts->Flags |= ImFontAtlasFlags_NoBakedLines' or 'style.AntiAliasedLinesUseTex = false' to allow point/nearest sampling)
+                texture = self.ctx.texture((tex.width, tex.height), _TEXTURE_COMPONENTS[tex.format], data=tex.get_pixels(), alignment=1)
+                texture.filter = (moderngl.LINEAR, moderngl.LINEAR)
+                texture.repeat_x = False
+                texture.repeat_y = False
+                if tex.format == imgui.TextureFormat.ALPHA8:
+                    # Single channel texture, sample it as (1, 1, 1, alpha) like an RGBA32 font atlas.
+                    texture.swizzle = "111R"
+                self._textures[texture.glo] = texture
+                tex.set_tex_id(texture.glo)
+                tex.set_status(imgui.TextureStatus.OK)
+
+            elif tex.status == imgui.TextureStatus.WANT_UPDATES:
+                texture = self._textures[tex.get_tex_id()]
+                for r in tex.get_coalesced_updates():
+                    size = r.w * r.h * tex.bytes_per_pixel
+                    pixels = ctypes.create_string_buffer(size)
+                    tex.copy_pixels(r.x, r.y, r.w, r.h, ctypes.addressof(pixels), size)
+                    texture.write(pixels, viewport=(r.x, r.y, r.w, r.h), alignment=1)
+                tex.set_status(imgui.TextureStatus.OK)
+
+            elif tex.status == imgui.TextureStatus.WANT_DESTROY and tex.unused_frames > 0:
+                self._destroy_texture(tex)
+
+    #--------------------------------------------------------------------
+
+    def _reset_render_state(self, fb_width: int, fb_height: int):
+        ctx = self.ctx
+        ctx.enable(moderngl.BLEND)
+        ctx.disable(moderngl.DEPTH_TEST | moderngl.CULL_FACE)
+        ctx.blend_equation = moderngl.FUNC_ADD
+        ctx.blend_func = moderngl.SRC_ALPHA, moderngl.ONE_MINUS_SRC_ALPHA
+        ctx.wireframe = False
+        ctx.viewport = (0, 0, fb_width, fb_height)
+
+        io = imgui.get_io()
+        display_width, display_height = io.display_size
+        self._prog["ProjMtx"].write(struct.pack(
+            "16f",
+             2.0/display_width, 0.0,                   0.0, 0.0,
+             0.0,               2.0/-display_height,   0.0, 0.0,
+             0.0,               0.0,                  -1.0, 0.0,
+            -1.0,               1.0,                   0.0, 1.0,
+        ))  # fmt: skip
+
+    def _write_buffer(self, buffer: moderngl.Buffer, address: int, size: int):
+        if size > buffer.size:
+            # Grow geometrically so that buffers are reallocated only rarely.
+            buffer.orphan(max(size, 2 * buffer.size))
+        else:
+            # Detach the storage the GPU may still be reading from the previous draw list.
+            buffer.orphan()
+        if size > 0:
+            buffer.write(_memory_at(address, size))
+
+    def _upload_vertices(self, drawlist: imgui.DrawList, vtx_offset: int):
+        # moderngl has no base vertex draw calls: commands with a vertex offset (only used for draw
+        # lists with more than 64k vertices with 16-bit indices) get the vertices from their offset on.
+        vtx_count = drawlist.vtx_buffer_size - vtx_offset
+        self._write_buffer(self._vbo, drawlist.vtx_buffer_data + vtx_offset * imgui.VERTEX_SIZE, vtx_count * imgui.VERTEX_SIZE)
+
+    def _texture(self, tex_id: int) -> moderngl.Texture:
+        texture = self._textures.get(tex_id)
+        if texture is None:
+            texture = self._user_textures[tex_id]
+        return texture
+
+    def render(self, draw_data: imgui.DrawData):
+        display_width, display_height = imgui.get_io().display_size
+        fb_scale = draw_data.framebuffer_scale
+        fb_width, fb_height = int(display_width * fb_scale[0]), int(display_height * fb_scale[1])
+        if fb_width == 0 or fb_height == 0:
+            return
+
+        if draw_data.textures is not None:
+            self._update_textures(draw_data.textures)
+
+        draw_data.scale_clip_rects(fb_scale)
+
+        ctx = self.ctx
+        # moderngl caches these, restore them through the context so that the cached values stay in sync
+        # with GL.  The native restore runs last so that it has the final say over GL state.
+        last_viewport = ctx.viewport
+        last_scissor = ctx.scissor
+        last_wireframe = ctx.wireframe
+        self._state_saver.save(STATE_POLICIES[self.state_backup])
+        self._reset_render_state(fb_width, fb_height)
+
+        # Texture and scissor state set by the previous draw command, used to skip redundant calls.
+        # `None` means unknown, e.g., after a callback which may have changed state.
+        bound_texture = None
+        scissor_box = None
+        for drawlist in draw_data.commands_lists:
+            self._write_buffer(self._ibo, drawlist.idx_buffer_data, drawlist.idx_buffer_size * imgui.INDEX_SIZE)
+            uploaded_vtx_offset = None
+
+            for cmd in drawlist.commands:
+                match cmd.run_callback(drawlist):
+                    case imgui.DrawListCallbackResult.CALLBACK:
+                        # callback was called, nothing further needed.  It may have changed GL state though.
+                        bound_texture = scissor_box = None
+                    case imgui.DrawListCallbackResult.DRAW:
+                        x, y, z, w = cmd.clip_rect
+                        if z <= x or w <= y:
+                            continue
+                        if cmd.vtx_offset != uploaded_vtx_offset:
+                            self._upload_vertices(drawlist, cmd.vtx_offset)
+                            uploaded_vtx_offset = cmd.vtx_offset
+                        tex_id = cmd.tex_ref.get_tex_id()
+                        if tex_id != bound_texture:
+                            self._texture(tex_id).use(0)
+                            bound_texture = tex_id
+                        box = (int(x), int(fb_height - w), int(z - x), int(w - y))
+                        if box != scissor_box:
+                            ctx.scissor = box
+                            scissor_box = box
+                        self._vao.render(moderngl.TRIANGLES, vertices=cmd.elem_count, first=cmd.idx_offset)
+                    case imgui.DrawListCallbackResult.RESET_RENDER_STATE:
+                        self._reset_render_state(fb_width, fb_height)
+                        bound_texture = scissor_box = None
+
+        if self.state_backup == "full":
+            ctx.viewport = last_viewport
+            ctx.scissor = last_scissor
+            ctx.wireframe = last_wireframe
+        if self.state_backup != "none" and not self._state_saver.scissor_test_enabled:
+            # Setting `ctx.scissor` enables GL_SCISSOR_TEST, and moderngl enables it again for later
+            # clears and draws until the scissor is reset.
+            ctx.scissor = None
+        self._state_saver.restore()
+
+    #--------------------------------------------------------------------
+
+    def shutdown(self):
+        self._vao.release()
+        self._vbo.release()
+        self._ibo.release()
+        self._prog.release()
+        self._user_textures.clear()
+
+        # Destroy all textures
+        for tex in imgui.get_platform_io().textures:
+            if tex.ref_count == 1 and tex.get_tex_id() in self._textures:
+                self._destroy_texture(tex)
+        for texture in self._textures.values():
+            texture.release()
+        self._textures.clear()
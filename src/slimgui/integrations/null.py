@@ -18,6 +18,17 @@ class NullRenderer(BaseRenderer):
     def render(self, draw_data):
         io = imgui.get_io()
         display_width, display_height = io.display_size
+        if io.backend_flags & imgui.BackendFlags.RENDERER_HAS_TEXTURES and draw_data.textures is not None:
+            # Acknowledge texture requests without creating anything.
+            for tex in draw_data.textures:
+                if tex.status == imgui.TextureStatus.WANT_CREATE:
+                    tex.set_tex_id(DUMMY_ID)
+                    tex.set_status(imgui.TextureStatus.OK)
+                elif tex.status == imgui.TextureStatus.WANT_UPDATES:
+                    tex.set_status(imgui.TextureStatus.OK)
+                elif tex.status == imgui.TextureStatus.WANT_DESTROY and tex.unused_frames > 0:
+                    tex.set_tex_id(0)
+                    tex.set_status(imgui.TextureStatus.DESTROYED)
 
     def shutdown(self):
         pass
@@ -1,16 +1,429 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Literal
+import time
+
 import OpenGL.GL as gl
 from slimgui import imgui
+from slimgui.slimgui_ext import render
 import ctypes
 
 from .base import BaseRenderer
+from .opengl_native import STATE_POLICIES, StateBackupPolicy, pyopengl_get_proc_address
+
+BufferUploadMode = Literal["per_list", "single", "persistent"]
+
+_IDX_TYPE = gl.GL_UNSIGNED_SHORT if imgui.INDEX_SIZE == 2 else gl.GL_UNSIGNED_INT
+
+# Internal format and pixel format for each supported `TextureData.format`.
+_TEXTURE_FORMATS = {
+    imgui.TextureFormat.RGBA32: (gl.GL_RGBA8, gl.GL_RGBA),
+    imgui.TextureFormat.ALPHA8: (gl.GL_R8, gl.GL_RED),
+}
+
+@dataclass
+class RenderStats:
+    """Statistics for the last frame rendered with `OpenGLRenderer.render()`."""
+    buffer_uploads: int = 0       # number of glBufferData calls
+    upload_bytes: int = 0         # vertex + index bytes uploaded
+    upload_seconds: float = 0.0   # CPU time spent in vertex/index uploads
+    draw_calls: int = 0           # number of glDrawElementsBaseVertex/glMultiDrawElementsBaseVertex calls
+    draw_commands: int = 0        # number of DrawCmds drawn
+    texture_uploads: int = 0      # number of glTexSubImage2D calls (after merging adjacent TextureRects)
+    texture_upload_bytes: int = 0 # texture bytes streamed through the pixel unpack buffer
+    texture_binds_elided: int = 0 # glBindTexture calls skipped because the texture was already bound
+    scissors_elided: int = 0      # glScissor calls skipped because the scissor box was unchanged
+    cached_frame: bool = False    # `render_to_texture()` skipped drawing, the target already held the frame
+
+@dataclass
+class DrawListGpuStats:
+    """GPU time and work submitted for one `DrawList`, see `GpuFrameStats.draw_lists`."""
+    gpu_seconds: float = 0.0
+    draw_calls: int = 0
+    vtx_count: int = 0
+    idx_count: int = 0
+
+@dataclass
+class GpuFrameStats:
+    """GPU timings of a frame rendered with `OpenGLRenderer(gpu_timing=True)`."""
+    frame: int = 0                 # index of the frame, counted from the renderer's first `render()` call
+    gpu_seconds: float = 0.0       # total GPU time of the frame, including texture uploads
+    setup_gpu_seconds: float = 0.0 # GPU time spent in texture uploads and render state setup
+    draw_lists: list[DrawListGpuStats] = field(default_factory=list)
+
+    @property
+    def draw_calls(self) -> int:
+        return sum(dl.draw_calls for dl in self.draw_lists)
+
+    @property
+    def vtx_count(self) -> int:
+        return sum(dl.vtx_count for dl in self.draw_lists)
+
+class GpuTimer:
+    """
+    Measure GPU time with `GL_TIME_ELAPSED` queries without ever waiting for the GPU.
+
+    Each frame is split into consecutive query sections (`begin_section()`).  Query results are
+    read back only once `GL_QUERY_RESULT_AVAILABLE` says they're ready, typically one frame later,
+    so frames in flight keep their own query objects and at least two frames are buffered.
+    Completed frames are appended to `history`, a ring of the last `history_size` frames.
+    """
+
+    def __init__(self, history_size: int = 120):
+        self.history: deque[GpuFrameStats] = deque(maxlen=history_size)
+        self._free_queries: list[int] = []
+        # Frames whose results haven't been read back yet, oldest first.
+        self._pending: deque[tuple[GpuFrameStats, list[int]]] = deque()
+        self._frame: GpuFrameStats | None = None
+        self._queries: list[int] = []
+        self._frame_index = 0
+
+    @property
+    def latest(self) -> GpuFrameStats | None:
+        """Most recent frame with available results or `None` if there's none yet."""
+        return self.history[-1] if self.history else None
+
+    def mean_gpu_seconds(self) -> float:
+        """Average GPU time per frame over `history`."""
+        return sum(f.gpu_seconds for f in self.history) / len(self.history) if self.history else 0.0
+
+    def _gen_query(self) -> int:
+        if not self._free_queries:
+            self._free_queries.extend(int(q) for q in gl.glGenQueries(16))
+        return self._free_queries.pop()
+
+    def begin_frame(self):
+        self.collect()
+        self._frame = GpuFrameStats(frame=self._frame_index)
+        self._frame_index += 1
+        self._queries = []
+
+    def begin_section(self):
+        """End the current query section (if any) and start timing a new one."""
+        if self._queries:
+            gl.glEndQuery(gl.GL_TIME_ELAPSED)
+        query = self._gen_query()
+        gl.glBeginQuery(gl.GL_TIME_ELAPSED, query)
+        self._queries.append(query)
+
+    def end_frame(self, draw_lists: list[DrawListGpuStats]):
+        """
+        Stop timing the frame.  The first section is the frame setup, the rest must correspond to
+        `draw_lists`.
+        """
+        assert self._frame is not None and len(self._queries) == len(draw_lists) + 1
+        gl.glEndQuery(gl.GL_TIME_ELAPSED)
+        self._frame.draw_lists = draw_lists
+        self._pending.append((self._frame, self._queries))
+        self._frame = None
+        self._queries = []
+
+    def collect(self, wait: bool = False):
+        """
+        Move frames whose query results are available into `history`.  With `wait=True`, block until
+        all submitted frames are done (e.g., for tests or before shutdown).
+        """
+        result = ctypes.c_uint64()
+        while self._pending:
+            frame, queries = self._pending[0]
+            # Queries complete in submission order, so the last one tells about the whole frame.
+            if not wait and not gl.glGetQueryObjectiv(queries[-1], gl.GL_QUERY_RESULT_AVAILABLE):
+                break
+            self._pending.popleft()
+            seconds = []
+            for query in queries:
+                gl.glGetQueryObjectui64v(query, gl.GL_QUERY_RESULT, ctypes.byref(result))
+                seconds.append(result.value * 1e-9)
+            frame.setup_gpu_seconds = seconds[0]
+            for dl, dl_seconds in zip(frame.draw_lists, seconds[1:]):
+                dl.gpu_seconds = dl_seconds
+            frame.gpu_seconds = sum(seconds)
+            self.history.append(frame)
+            self._free_queries.extend(queries)
+
+    def destroy(self):
+        if self._queries:
+            gl.glEndQuery(gl.GL_TIME_ELAPSED)
+        queries = self._free_queries + self._queries + [q for _, qs in self._pending for q in qs]
+        if queries:
+            gl.glDeleteQueries(len(queries), queries)
+        self._free_queries = []
+        self._queries = []
+        self._pending.clear()
+
+def has_buffer_storage() -> bool:
+    """Return `True` if the current context supports `glBufferStorage` (OpenGL 4.4 or `GL_ARB_buffer_storage`)."""
+    major = int(gl.glGetIntegerv(gl.GL_MAJOR_VERSION))
+    minor = int(gl.glGetIntegerv(gl.GL_MINOR_VERSION))
+    if (major, minor) >= (4, 4):
+        return True
+    num_extensions = int(gl.glGetIntegerv(gl.GL_NUM_EXTENSIONS))
+    return any(gl.glGetStringi(gl.GL_EXTENSIONS, i) == b"GL_ARB_buffer_storage" for i in range(num_extensions))
+
+class StreamingBuffer:
+    """
+    Persistently mapped OpenGL buffer split into `num_slices` frame slices.
+
+    Every frame writes into the next slice of the ring.  A fence is inserted once the frame's
+    draw calls have been submitted and it's waited on before the slice gets reused, so the CPU
+    never overwrites data that the GPU is still reading.  The buffer is reallocated (with all
+    slices idle) if a frame doesn't fit into a slice.
+
+    Requires OpenGL 4.4 or `GL_ARB_buffer_storage`, see `has_buffer_storage()`.
+    """
+
+    _FLAGS = gl.GL_MAP_WRITE_BIT | gl.GL_MAP_PERSISTENT_BIT | gl.GL_MAP_COHERENT_BIT
+
+    def __init__(self, slice_size: int, num_slices: int = 3, alignment: int = 1):
+        self.num_slices = num_slices
+        self.alignment = alignment
+        self.handle = 0
+        self.slice_size = 0
+        self._mapped_ptr = 0
+        self._fences: list = [None] * num_slices
+        self._slice = 0
+        self._allocate(slice_size)
+
+    def _wait_fence(self, index: int):
+        fence = self._fences[index]
+        if fence is None:
+            return
+        while gl.glClientWaitSync(fence, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000_000) == gl.GL_TIMEOUT_EXPIRED:
+            pass
+        gl.glDeleteSync(fence)
+        self._fences[index] = None
+
+    def _allocate(self, slice_size: int):
+        for i in range(self.num_slices):
+            self._wait_fence(i)
+        self._delete_buffer()
+        # Slices must start at a multiple of the element size.
+        self.slice_size = (slice_size + self.alignment - 1) // self.alignment * self.alignment
+        self.handle = gl.glGenBuffers(1)
+        # Use the copy binding point so that the ELEMENT_ARRAY_BUFFER binding of the current VAO stays intact.
+        last_copy_buffer = gl.glGetIntegerv(gl.GL_COPY_WRITE_BUFFER_BINDING)
+        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, self.handle)
+        total_size = self.slice_size * self.num_slices
+        gl.glBufferStorage(gl.GL_COPY_WRITE_BUFFER, total_size, None, self._FLAGS)
+        self._mapped_ptr = gl.glMapBufferRange(gl.GL_COPY_WRITE_BUFFER, 0, total_size, self._FLAGS)
+        gl.glBindBuffer(gl.GL_COPY_WRITE_BUFFER, last_copy_buffer)
+        self._slice = 0
+
+    def _delete_buffer(self):
+        if self.handle:
+            # Deleting a buffer implicitly unmaps it.
+            gl.glDeleteBuffers(1, [self.handle])
+            self.handle = 0
+
+    def map_slice(self, size: int) -> tuple[int, int]:
+        """
+        Advance to the next slice and wait until the GPU is done with it.
+
+        Returns: `(address, offset)` tuple, where `address` is the CPU pointer to the slice and `offset`
+        is the byte offset of the slice in the buffer.  Note that `handle` changes if the buffer had to
+        be grown.
+        """
+        if size > self.slice_size:
+            self._allocate(max(size, 2 * self.slice_size))
+        else:
+            self._slice = (self._slice + 1) % self.num_slices
+        self._wait_fence(self._slice)
+        offset = self._slice * self.slice_size
+        return self._mapped_ptr + offset, offset
+
+    def fence(self):
+        """Mark the end of GPU use of the current slice.  Call after submitting the frame's draw calls."""
+        self._fences[self._slice] = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+    def destroy(self):
+        for i in range(self.num_slices):
+            self._wait_fence(i)
+        self._delete_buffer()
+
+def _scissor_boxes(clip_rect: tuple[float, float, float, float], fb_height: int, damage: list[tuple[int, int, int, int]] | None) -> list[tuple[int, int, int, int]]:
+    """`glScissor` boxes of a draw command's framebuffer space `clip_rect`, intersected with the damage rectangles."""
+    x, y, z, w = clip_rect
+    if damage is None:
+        return [(int(x), int(fb_height - w), int(z - x), int(w - y))]
+    boxes = []
+    for dx0, dy0, dx1, dy1 in damage:
+        x0, y0, x1, y1 = max(x, dx0), max(y, dy0), min(z, dx1), min(w, dy1)
+        if x0 < x1 and y0 < y1:
+            boxes.append((int(x0), int(fb_height - y1), int(x1 - x0), int(y1 - y0)))
+    return boxes
+
+class RenderTarget:
+    """
+    Framebuffer object with an RGBA8 color texture, see `OpenGLRenderer.render_to_texture()`.
+
+    With `texture`, renders into a caller-owned 2D texture of size `(width, height)`, otherwise a texture
+    is allocated and owned by the render target.  Rows are in OpenGL order, bottom row first.
+
+    `content_hash` is the `DrawData.content_hash()` of the frame held in the texture and `damage_tracker`
+    tracks the changes to it.  Call `invalidate()` after drawing into the texture by other means or if draw
+    callbacks render something different for the same draw data.
+    """
+
+    def __init__(self, width: int, height: int, texture: int | None = None):
+        self.width = width
+        self.height = height
+        self.content_hash: int | None = None
+        self.damage_tracker = render.DamageTracker()
+        self._owns_texture = texture is None
+        last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
+        if texture is None:
+            texture = gl.glGenTextures(1)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, width, height, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+            gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
+        self.texture = int(texture)
+
+        self.fbo = gl.glGenFramebuffers(1)
+        last_fbo = gl.glGetIntegerv(gl.GL_FRAMEBUFFER_BINDING)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, self.fbo)
+        gl.glFramebufferTexture2D(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_TEXTURE_2D, self.texture, 0)
+        status = gl.glCheckFramebufferStatus(gl.GL_FRAMEBUFFER)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, last_fbo)
+        if status != gl.GL_FRAMEBUFFER_COMPLETE:
+            self.destroy()
+            raise RuntimeError(f"Render target framebuffer is incomplete (status 0x{status:x})")
+
+    def invalidate(self):
+        """Force the next `render_to_texture()` into this target to redraw everything."""
+        self.content_hash = None
+        self.damage_tracker.reset()
+
+    def resize(self, width: int, height: int):
+        """Reallocate the owned texture with a new size."""
+        if not self._owns_texture:
+            raise ValueError("Can't resize a render target with a caller-supplied texture")
+        last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, self.texture)
+        gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, width, height, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
+        self.width = width
+        self.height = height
+        self.invalidate()
+
+    def destroy(self):
+        """Delete the framebuffer object, and the texture if owned by the render target."""
+        if self.fbo:
+            gl.glDeleteFramebuffers(1, [self.fbo])
+            self.fbo = 0
+        if self._owns_texture and self.texture:
+            gl.glDeleteTextures([self.texture])
+        self.texture = 0
+        self.invalidate()
+
+class SharedDeviceObjects:
+    """
+    Shader program and buffers of `OpenGLRenderer`s, shared by renderers whose OpenGL contexts share
+    objects (e.g., GLFW windows created with `share=`, or pyglet windows by default).
+
+    Pass a renderer's `device_objects` to the next renderer's `shared` argument, the objects are
+    deleted when the last renderer using them shuts down.  Each renderer still creates its own
+    vertex array object, those can't be shared between contexts.
+
+    Textures need no sharing: give each window's ImGui context the same font atlas with
+    `imgui.create_context(shared_font_atlas)` and the atlas textures are uploaded once by whichever
+    renderer sees them first.  They're destroyed when `TextureData.ref_count` shows that the
+    shutting down renderer's ImGui context is the last one using them.
+    """
+    def __init__(self, vertex_shader_src: str, fragment_shader_src: str):
+        self.ref_count = 0
+
+        self.program = gl.glCreateProgram()
+        # note: no need to store shader parts handles after linking
+        vertex_shader = gl.glCreateShader(gl.GL_VERTEX_SHADER)
+        fragment_shader = gl.glCreateShader(gl.GL_FRAGMENT_SHADER)
+
+        gl.glShaderSource(vertex_shader, vertex_shader_src)
+        gl.glShaderSource(fragment_shader, fragment_shader_src)
+        gl.glCompileShader(vertex_shader)
+        gl.glCompileShader(fragment_shader)
+
+        gl.glAttachShader(self.program, vertex_shader)
+        gl.glAttachShader(self.program, fragment_shader)
+
+        gl.glLinkProgram(self.program)
+
+        # note: after linking shaders can be removed
+        gl.glDeleteShader(vertex_shader)
+        gl.glDeleteShader(fragment_shader)
+
+        self.location_tex = gl.glGetUniformLocation(self.program, "Texture")
+        self.location_proj_mtx = gl.glGetUniformLocation(self.program, "ProjMtx")
+        self.location_position = gl.glGetAttribLocation(self.program, "Position")
+        self.location_uv = gl.glGetAttribLocation(self.program, "UV")
+        self.location_color = gl.glGetAttribLocation(self.program, "Color")
+
+        self.vbo = gl.glGenBuffers(1)
+        self.elements = gl.glGenBuffers(1)
+        self.pbo = gl.glGenBuffers(1)
+
+    def acquire(self) -> "SharedDeviceObjects":
+        if self.program == 0:
+            raise RuntimeError("SharedDeviceObjects were already deleted")
+        self.ref_count += 1
+        return self
+
+    def release(self):
+        """Drop a reference, deletes the GL objects with the last one.  Needs a context that shares them to be current."""
+        assert self.ref_count > 0
+        self.ref_count -= 1
+        if self.ref_count == 0:
+            gl.glDeleteBuffers(3, [self.vbo, self.elements, self.pbo])
+            gl.glDeleteProgram(self.program)
+            self.vbo = self.elements = self.pbo = self.program = 0
 
 class OpenGLRenderer(BaseRenderer):
     """
     ImGui OpenGL renderer using programmable pipeline.
 
+    `buffer_upload` selects how vertex and index data is sent to the GPU:
+
+    - `"per_list"`: upload each `DrawList` separately before drawing it (default).
+    - `"single"`: gather all `DrawList`s into one contiguous staging region and upload
+      it with a single `glBufferData` call per buffer per frame.
+    - `"persistent"`: copy all `DrawList`s directly into a persistently mapped ring buffer
+      (see `StreamingBuffer`), avoiding buffer orphaning altogether.  Falls back to `"single"`
+      on contexts without `glBufferStorage` support.
+
+    Consecutive draw commands that use the same texture or clip rectangle don't re-issue
+    `glBindTexture` or `glScissor`.
+
+    `render_to_texture()` renders into a texture instead, skipping frames whose draw data didn't
+    change since the last one, so that a host application redrawing at a higher rate can
+    composite the cached UI texture.
+
+    With `multi_draw=True`, runs of consecutive draw commands that share texture and clip rectangle
+    are submitted with a single `glMultiDrawElementsBaseVertex` call (see `DrawList.multi_draw_batches()`).
+
+    Both `TextureFormat.RGBA32` and `TextureFormat.ALPHA8` textures are supported.  Set
+    `FontAtlas.tex_desired_format` to `ALPHA8` to store font atlases in a single channel.
+
+    Texture updates (e.g., glyphs baked on demand by dynamic fonts) are merged into as few rectangles
+    as possible and streamed through a pixel buffer object, see `_upload_texture_rects()`.
+
+    Renderers in OpenGL contexts that share objects can share their shader program and buffers, see
+    `SharedDeviceObjects`.
+
+    `state_backup` selects how much GL state is saved and restored around `render()` (see
+    `StateBackupPolicy`).  The state is saved and restored natively with `render.GLStateSaver`, or
+with PyOpenGL `glGet*` calls (`PyOpenGLStateSaver`) if its GL functions can't be loaded.
+
+    Per-frame upload costs and the number of elided GL calls are available in `OpenGLRenderer.stats`.
+
+    With `gpu_timing=True`, the frame and each `DrawList` are timed on the GPU with `GL_TIME_ELAPSED`
+    queries, see `GpuTimer`.  Results arrive a frame or more later in `OpenGLRenderer.gpu_timer.history`.
+
     Note: most methods assume the current imgui context is set.
     """
 
@@ -45,8 +458,29 @@ class OpenGLRenderer(BaseRenderer):
     }
     """
 
-    def __init__(self):
+    # Initial per-frame capacity of the "persistent" buffer upload mode, grown on demand.
+    STREAMING_VTX_SLICE_SIZE = 64 * 1024 * imgui.VERTEX_SIZE
+    STREAMING_IDX_SLICE_SIZE = 3 * 64 * 1024 * imgui.INDEX_SIZE
+
+    def __init__(
+        self,
+        buffer_upload: BufferUploadMode = "per_list",
+        multi_draw: bool = False,
+        gpu_timing: bool = False,
+        state_backup: StateBackupPolicy = "full",
+        shared: "SharedDeviceObjects | None" = None,
+    ):
         super().__init__()
+        self.buffer_upload = buffer_upload
+        self.multi_draw = multi_draw
+        self.state_backup = state_backup
+        self._state_saver: render.GLStateSaver | PyOpenGLStateSaver
+        try:
+            self._state_saver = render.GLStateSaver(pyopengl_get_proc_address)
+        except RuntimeError:
+            self._state_saver = PyOpenGLStateSaver()
+        self.stats = RenderStats()
+        self.gpu_timer = GpuTimer() if gpu_timing else None
         self._shader_handle = 0
         self._vert_handle = None
         self._fragment_handle = None
@@ -60,53 +494,49 @@ class OpenGLRenderer(BaseRenderer):
         self._vbo_handle = 0
         self._elements_handle = 0
         self._vao_handle = 0
-        self._create_device_objects()
+        self._pbo_handle = 0
+        self._vtx_staging = ctypes.create_string_buffer(0)
+        self._idx_staging = ctypes.create_string_buffer(0)
+        self._vtx_stream: StreamingBuffer | None = None
+        self._idx_stream: StreamingBuffer | None = None
+        self._premultiplied_alpha = False
+        # Render target managed by `render_to_texture()`.
+        self.render_target: RenderTarget | None = None
+        # Redraw only the damaged regions of render targets.
+        self.partial_redraw = True
+        self._create_device_objects(shared)
         self.max_texture_size = gl.glGetIntegerv(gl.GL_MAX_TEXTURE_SIZE)
 
-    #--------------------------------------------------------------------
-
-    def _create_device_objects(self):
-        # save state
-        last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
-        last_array_buffer = gl.glGetIntegerv(gl.GL_ARRAY_BUFFER_BINDING)
-
-        last_vertex_array = gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING)
-
-        self._shader_handle = gl.glCreateProgram()
-        # note: no need to store shader parts handles after linking
-        vertex_shader = gl.glCreateShader(gl.GL_VERTEX_SHADER)
-        fragment_shader = gl.glCreateShader(gl.GL_FRAGMENT_SHADER)
-
-        gl.glShaderSource(vertex_shader, self.VERTEX_SHADER_SRC)
-        gl.glShaderSource(fragment_shader, self.FRAGMENT_SHADER_SRC)
-        gl.glCompileShader(vertex_shader)
-        gl.glCompileShader(fragment_shader)
+        if buffer_upload == "persistent":
+            if has_buffer_storage():
+                # Use the streaming vertex and index buffers instead of the (possibly shared) regular ones.
+                self._vtx_stream = StreamingBuffer(self.STREAMING_VTX_SLICE_SIZE, alignment=imgui.VERTEX_SIZE)
+                self._idx_stream = StreamingBuffer(self.STREAMING_IDX_SLICE_SIZE, alignment=imgui.INDEX_SIZE)
+                self._vbo_handle = self._vtx_stream.handle
+                self._elements_handle = self._idx_stream.handle
+            else:
+                self.buffer_upload = "single"
 
-        gl.glAttachShader(self._shader_handle, vertex_shader)
-        gl.glAttachShader(self._shader_handle, fragment_shader)
-
-        gl.glLinkProgram(self._shader_handle)
-
-        # note: after linking shaders can be removed
-        gl.glDeleteShader(vertex_shader)
-        gl.glDeleteShader(fragment_shader)
-
-        self._attrib_location_tex = gl.glGetUniformLocation(self._shader_handle, "Texture")
-        self._attrib_proj_mtx = gl.glGetUniformLocation(self._shader_handle, "ProjMtx")
-        self._attrib_location_position = gl.glGetAttribLocation(self._shader_handle, "Position")
-        self._attrib_location_uv = gl.glGetAttribLocation(self._shader_handle, "UV")
-        self._attrib_location_color = gl.glGetAttribLocation(self._shader_handle, "Color")
-
-        self._vbo_handle = gl.glGenBuffers(1)
-        self._elements_handle = gl.glGenBuffers(1)
+    #--------------------------------------------------------------------
 
+    def _create_device_objects(self, shared: "SharedDeviceObjects | None"):
+        if shared is None:
+            shared = SharedDeviceObjects(self.VERTEX_SHADER_SRC, self.FRAGMENT_SHADER_SRC)
+        self.device_objects = shared.acquire()
+
+        self._shader_handle = shared.program
+        self._attrib_location_tex = shared.location_tex
+        self._attrib_proj_mtx = shared.location_proj_mtx
+        self._attrib_location_position = shared.location_position
+        self._attrib_location_uv = shared.location_uv
+        self._attrib_location_color = shared.location_color
+        self._vbo_handle = shared.vbo
+        self._elements_handle = shared.elements
+        self._pbo_handle = shared.pbo
+
+        # Vertex array objects aren't shared between contexts.
         self._vao_handle = gl.glGenVertexArrays(1)
 
-        # restore state
-        gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, last_array_buffer)
-        gl.glBindVertexArray(last_vertex_array)
-
     #--------------------------------------------------------------------
 
     def _destroy_texture(self, tex: imgui.TextureData):
@@ -116,46 +546,81 @@ class OpenGLRenderer(BaseRenderer):
 
     #--------------------------------------------------------------------
 
-    def _update_texture(self, tex: imgui.TextureData):
-        if tex.status == imgui.TextureStatus.WANT_CREATE:
-            assert tex.get_tex_id() == 0
-            assert tex.format == imgui.TextureFormat.RGBA32
-
-            last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
-
-            # Upload texture to graphics system
-            # (Bilinear sampling is required by default.
-            # Set 'io.Fonts->Flags |= ImFontAtlasFlags_NoBakedLines' or 'style.AntiAliasedLinesUseTex = false' to allow point/nearest sampling)
-            tex_id = gl.glGenTextures(1)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
-            gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
-            gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1) # TODO state save restore?
-            gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, 0) # TODO state save restore?
-            gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA, tex.width, tex.height, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, tex.get_pixels())
-            tex.set_tex_id(tex_id)
-            tex.set_status(imgui.TextureStatus.OK)
+    def _update_textures(self, textures):
+        # Textures created or updated this frame along with their (x, y, w, h) rectangles to upload.
+        uploads: list[tuple[imgui.TextureData, list[tuple[int, int, int, int]]]] = []
+        for tex in textures:
+            if tex.status == imgui.TextureStatus.WANT_CREATE:
+                assert tex.get_tex_id() == 0
+                internal_format, pixel_format = _TEXTURE_FORMATS[tex.format]
+
+                last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
+
+                # Allocate texture storage, the pixels are uploaded with the other updates below.
+                # (Bilinear sampling is required by default.
+                # Set 'io.Fonts->Flags |= ImFontAtlasFlags_NoBakedLines' or 'style.AntiAliasedLinesUseTex = false' to allow point/nearest sampling)
+                tex_id = gl.glGenTextures(1)
+                gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MIN_FILTER, gl.GL_LINEAR)
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_MAG_FILTER, gl.GL_LINEAR)
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_S, gl.GL_CLAMP_TO_EDGE)
+                gl.glTexParameteri(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_WRAP_T, gl.GL_CLAMP_TO_EDGE)
+                if tex.format == imgui.TextureFormat.ALPHA8:
+                    # Single channel texture, sample it as (1, 1, 1, alpha) like an RGBA32 font atlas.
+                    gl.glTexParameteriv(gl.GL_TEXTURE_2D, gl.GL_TEXTURE_SWIZZLE_RGBA, [gl.GL_ONE, gl.GL_ONE, gl.GL_ONE, gl.GL_RED])
+                gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, internal_format, tex.width, tex.height, 0, pixel_format, gl.GL_UNSIGNED_BYTE, None)
+                tex.set_tex_id(tex_id)
+                gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
+                uploads.append((tex, [(0, 0, tex.width, tex.height)]))
+
+            elif tex.status == imgui.TextureStatus.WANT_UPDATES:
+                # We only ever write to textures regions which have never been used before!
+                uploads.append((tex, [(r.x, r.y, r.w, r.h) for r in tex.get_coalesced_updates()]))
+
+            elif tex.status == imgui.TextureStatus.WANT_DESTROY and tex.unused_frames > 0:
+                self._destroy_texture(tex)
 
-            # Restore state.
-            gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
+        if uploads:
+            self._upload_texture_rects(uploads)
 
-        elif tex.status == imgui.TextureStatus.WANT_UPDATES:
-            last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
+    def _upload_texture_rects(self, uploads: list[tuple[imgui.TextureData, list[tuple[int, int, int, int]]]]):
+        """
+        Stream texture rectangles through a pixel buffer object.
 
-            # Update selected blocks. We only ever write to textures regions which have never been used before!
-            # This backend choose to use tex->Updates[] but you can use tex->UpdateRect to upload a single region.
+        All rectangles are packed into one orphaned PBO so that `glTexSubImage2D` returns without waiting
+        for the transfer and the CPU never waits for the GPU to finish reading the previous frame's uploads.
+        """
+        total_size = sum(w * h * tex.bytes_per_pixel for tex, rects in uploads for _, _, w, h in rects)
+        last_texture = gl.glGetIntegerv(gl.GL_TEXTURE_BINDING_2D)
+        last_unpack_buffer = gl.glGetIntegerv(gl.GL_PIXEL_UNPACK_BUFFER_BINDING)
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, self._pbo_handle)
+
+        if total_size > 0:
+            # Orphan the previous contents, the driver hands out fresh storage if the GPU still uses it.
+            gl.glBufferData(gl.GL_PIXEL_UNPACK_BUFFER, total_size, None, gl.GL_STREAM_DRAW)
+            ptr = gl.glMapBufferRange(gl.GL_PIXEL_UNPACK_BUFFER, 0, total_size, gl.GL_MAP_WRITE_BIT | gl.GL_MAP_INVALIDATE_BUFFER_BIT)
+            offset = 0
+            for tex, rects in uploads:
+                for x, y, w, h in rects:
+                    offset += tex.copy_pixels(x, y, w, h, ptr + offset, total_size - offset)
+            gl.glUnmapBuffer(gl.GL_PIXEL_UNPACK_BUFFER)
+
+        gl.glPixelStorei(gl.GL_UNPACK_ALIGNMENT, 1) # TODO state save restore?
+        gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, 0) # TODO state save restore?
+        offset = 0
+        for tex, rects in uploads:
             gl.glBindTexture(gl.GL_TEXTURE_2D, tex.get_tex_id())
-            gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, tex.width)
-            for r in tex.updates:
-                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, r.x, r.y, r.w, r.h, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, tex.get_pixels_at(r.x, r.y))
-            gl.glPixelStorei(gl.GL_UNPACK_ROW_LENGTH, 0)
+            _, pixel_format = _TEXTURE_FORMATS[tex.format]
+            for x, y, w, h in rects:
+                gl.glTexSubImage2D(gl.GL_TEXTURE_2D, 0, x, y, w, h, pixel_format, gl.GL_UNSIGNED_BYTE, ctypes.c_void_p(offset))
+                offset += w * h * tex.bytes_per_pixel
+            self.stats.texture_uploads += len(rects)
             tex.set_status(imgui.TextureStatus.OK)
-            gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
+        self.stats.texture_upload_bytes += total_size
 
-        elif tex.status == imgui.TextureStatus.WANT_DESTROY and tex.unused_frames > 0:
-            self._destroy_texture(tex)
+        # Restore state.
+        gl.glBindBuffer(gl.GL_PIXEL_UNPACK_BUFFER, last_unpack_buffer)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, last_texture)
 
     #--------------------------------------------------------------------
 
@@ -194,7 +659,11 @@ class OpenGLRenderer(BaseRenderer):
 
         gl.glEnable(gl.GL_BLEND)
         gl.glBlendEquation(gl.GL_FUNC_ADD)
-        gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
+        if self._premultiplied_alpha:
+            # Accumulate coverage in alpha so that the render target can be composited with premultiplied alpha.
+            gl.glBlendFuncSeparate(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA, gl.GL_ONE, gl.GL_ONE_MINUS_SRC_ALPHA)
+        else:
+            gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
         gl.glDisable(gl.GL_CULL_FACE)
         gl.glDisable(gl.GL_DEPTH_TEST)
         gl.glEnable(gl.GL_SCISSOR_TEST)
@@ -220,93 +689,306 @@ class OpenGLRenderer(BaseRenderer):
 
     #--------------------------------------------------------------------
 
-    def render(self, draw_data: imgui.DrawData):
-        # perf: local for faster access
-        io = imgui.get_io()
+    def _upload_buffer(self, target: int, size: int, data: int):
+        gl.glBufferData(target, size, ctypes.c_void_p(data), gl.GL_STREAM_DRAW)
+        self.stats.buffer_uploads += 1
+        self.stats.upload_bytes += size
 
-        display_width, display_height = io.display_size
-        fb_scale = draw_data.framebuffer_scale
-        fb_width = int(display_width * fb_scale[0])
-        fb_height = int(display_height * fb_scale[1])
+    def _upload_draw_list(self, drawlist: imgui.DrawList):
+        t0 = time.perf_counter()
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vbo_handle)
+        self._upload_buffer(gl.GL_ARRAY_BUFFER, drawlist.vtx_buffer_size * imgui.VERTEX_SIZE, drawlist.vtx_buffer_data)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._elements_handle)
+        self._upload_buffer(gl.GL_ELEMENT_ARRAY_BUFFER, drawlist.idx_buffer_size * imgui.INDEX_SIZE, drawlist.idx_buffer_data)
+        self.stats.upload_seconds += time.perf_counter() - t0
+
+    def _upload_draw_data(self, draw_data: imgui.DrawData):
+        t0 = time.perf_counter()
+        vtx_size = draw_data.total_vtx_count * imgui.VERTEX_SIZE
+        idx_size = draw_data.total_idx_count * imgui.INDEX_SIZE
+        # Grow staging buffers geometrically so that they're reallocated only rarely.
+        if len(self._vtx_staging) < vtx_size:
+            self._vtx_staging = ctypes.create_string_buffer(max(vtx_size, 2 * len(self._vtx_staging)))
+        if len(self._idx_staging) < idx_size:
+            self._idx_staging = ctypes.create_string_buffer(max(idx_size, 2 * len(self._idx_staging)))
+        vtx_ptr = ctypes.addressof(self._vtx_staging)
+        idx_ptr = ctypes.addressof(self._idx_staging)
+        draw_data.copy_vtx_buffers(vtx_ptr, len(self._vtx_staging))
+        draw_data.copy_idx_buffers(idx_ptr, len(self._idx_staging))
+
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vbo_handle)
+        self._upload_buffer(gl.GL_ARRAY_BUFFER, vtx_size, vtx_ptr)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._elements_handle)
+        self._upload_buffer(gl.GL_ELEMENT_ARRAY_BUFFER, idx_size, idx_ptr)
+        self.stats.upload_seconds += time.perf_counter() - t0
+
+    def _stream_draw_data(self, draw_data: imgui.DrawData, fb_width: int, fb_height: int) -> tuple[int, int]:
+        """
+        Copy all draw lists into the persistently mapped ring buffers.
+
+        Returns: base vertex and base index of this frame's data in the streaming buffers.
+        """
+        assert self._vtx_stream is not None and self._idx_stream is not None
+        t0 = time.perf_counter()
+        vtx_size = draw_data.total_vtx_count * imgui.VERTEX_SIZE
+        idx_size = draw_data.total_idx_count * imgui.INDEX_SIZE
+        vtx_ptr, vtx_offset = self._vtx_stream.map_slice(vtx_size)
+        idx_ptr, idx_offset = self._idx_stream.map_slice(idx_size)
+        draw_data.copy_vtx_buffers(vtx_ptr, self._vtx_stream.slice_size)
+        draw_data.copy_idx_buffers(idx_ptr, self._idx_stream.slice_size)
+        self.stats.upload_bytes += vtx_size + idx_size
+
+        if self._vbo_handle != self._vtx_stream.handle:
+            # Vertex buffer was reallocated, point the VAO's attributes to the new one.
+            self._vbo_handle = self._vtx_stream.handle
+            self._reset_gl_render_state(fb_width, fb_height)
+        self._elements_handle = self._idx_stream.handle
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._elements_handle)
+        self.stats.upload_seconds += time.perf_counter() - t0
+        return vtx_offset // imgui.VERTEX_SIZE, idx_offset // imgui.INDEX_SIZE
+
+    #--------------------------------------------------------------------
 
+    def _framebuffer_size(self, draw_data: imgui.DrawData) -> tuple[int, int]:
+        display_width, display_height = imgui.get_io().display_size
+        fb_scale = draw_data.framebuffer_scale
+        return int(display_width * fb_scale[0]), int(display_height * fb_scale[1])
+
+    def render(self, draw_data: imgui.DrawData, damage: list[tuple[int, int, int, int]] | None = None):
+        """
+        Render `draw_data` into the current framebuffer.
+
+        With `damage`, a list of disjoint `(x0, y0, x1, y1)` framebuffer rectangles (top-left origin, see
+        `render.DamageTracker`), only the pixels inside the rectangles are drawn and commands outside
+        all of them are skipped.  The caller is responsible for clearing the damaged area first.
+        """
+        self.stats = RenderStats()
+        self._render_draw_data(draw_data, damage)
+
+    def render_to_texture(self, draw_data: imgui.DrawData, target: "RenderTarget | None" = None) -> "RenderTarget":
+        """
+        Render `draw_data` into the color texture of `target` instead of the current framebuffer.
+
+        Without `target`, renders into `render_target`, which is created (and resized) to match the
+        framebuffer size of `draw_data`.  If the draw data's `content_hash()` equals the hash of the frame
+        last rendered into the target, the texture already holds the right pixels and rendering is skipped
+        (`stats.cached_frame` is set).  Texture creation and updates requested by ImGui are processed either way.
+        Otherwise, with `partial_redraw` set, only the regions that changed since the previous frame (as computed
+        by the target's `damage_tracker`) are cleared and redrawn.
+
+        The texture is cleared to transparent black and holds premultiplied alpha: composite it over
+        the scene with `glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)`.
+
+        Returns: the render target.
+        """
+        fb_width, fb_height = self._framebuffer_size(draw_data)
+        if target is None:
+            if self.render_target is None:
+                self.render_target = RenderTarget(fb_width, fb_height)
+            elif (self.render_target.width, self.render_target.height) != (fb_width, fb_height):
+                self.render_target.resize(fb_width, fb_height)
+            target = self.render_target
+        elif (target.width, target.height) != (fb_width, fb_height):
+            raise ValueError(f"Render target size {target.width}x{target.height} doesn't match the framebuffer size {fb_width}x{fb_height}")
+
+        self.stats = RenderStats()
+        if draw_data.textures is not None:
+            self._update_textures(draw_data.textures)
+        # Hash after the texture updates so that newly created textures have their final IDs.
+        content_hash = draw_data.content_hash()
+        if content_hash == target.content_hash:
+            self.stats.cached_frame = True
+            return target
+
+        # The target still holds the previous frame, redraw only what changed.
+        damage = target.damage_tracker.update(draw_data) if self.partial_redraw else None
+
+        last_draw_fbo = gl.glGetIntegerv(gl.GL_DRAW_FRAMEBUFFER_BINDING)
+        last_read_fbo = gl.glGetIntegerv(gl.GL_READ_FRAMEBUFFER_BINDING)
+        last_scissor_test = gl.glIsEnabled(gl.GL_SCISSOR_TEST)
+        last_scissor_box = gl.glGetIntegerv(gl.GL_SCISSOR_BOX)
+        gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, target.fbo)
+        transparent = (ctypes.c_float * 4)(0.0, 0.0, 0.0, 0.0)
+        if damage is None:
+            gl.glDisable(gl.GL_SCISSOR_TEST)
+            gl.glClearBufferfv(gl.GL_COLOR, 0, transparent)
+        else:
+            gl.glEnable(gl.GL_SCISSOR_TEST)
+            for x0, y0, x1, y1 in damage:
+                gl.glScissor(x0, target.height - y1, x1 - x0, y1 - y0)
+                gl.glClearBufferfv(gl.GL_COLOR, 0, transparent)
+        gl.glScissor(*last_scissor_box)
+        if last_scissor_test:
+            gl.glEnable(gl.GL_SCISSOR_TEST)
+        else:
+            gl.glDisable(gl.GL_SCISSOR_TEST)
+        self._premultiplied_alpha = True
+        try:
+            self._render_draw_data(draw_data, damage, update_textures=False)
+        finally:
+            self._premultiplied_alpha = False
+            gl.glBindFramebuffer(gl.GL_DRAW_FRAMEBUFFER, last_draw_fbo)
+            gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, last_read_fbo)
+        target.content_hash = content_hash
+        return target
+
+    def _render_draw_data(
+        self,
+        draw_data: imgui.DrawData,
+        damage: list[tuple[int, int, int, int]] | None = None,
+        update_textures: bool = True,
+    ):
+        # `update_textures=False` when the caller already processed the frame's texture requests.
+        fb_width, fb_height = self._framebuffer_size(draw_data)
         if fb_width == 0 or fb_height == 0:
             return
 
-        if draw_data.textures is not None:
-            for tex_data in draw_data.textures:
-                self._update_texture(tex_data)
+        fb_scale = draw_data.framebuffer_scale
+        gpu_timer = self.gpu_timer
+        draw_list_stats: list[DrawListGpuStats] = []
+        if gpu_timer is not None:
+            gpu_timer.begin_frame()
+            gpu_timer.begin_section()
+        if update_textures and draw_data.textures is not None:
+            self._update_textures(draw_data.textures)
 
         draw_data.scale_clip_rects(fb_scale)
 
         # backup GL state
-        # todo: provide cleaner version of this backup-restore code
-        common_gl_state_tuple = get_common_gl_state()
-        last_program = gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM)
-        last_active_texture = gl.glGetIntegerv(gl.GL_ACTIVE_TEXTURE)
-        last_array_buffer = gl.glGetIntegerv(gl.GL_ARRAY_BUFFER_BINDING)
-        last_element_array_buffer = gl.glGetIntegerv(gl.GL_ELEMENT_ARRAY_BUFFER_BINDING)
-        last_vertex_array = gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING)
+        self._state_saver.save(STATE_POLICIES[self.state_backup])
 
         self._reset_gl_render_state(int(fb_width), int(fb_height))
 
+        # Offsets of the current draw list in the shared vertex/index buffers.
+        vtx_base = 0
+        idx_base = 0
+        single_upload = self.buffer_upload != "per_list"
+        if self._vtx_stream is not None:
+            vtx_base, idx_base = self._stream_draw_data(draw_data, fb_width, fb_height)
+        elif single_upload:
+            self._upload_draw_data(draw_data)
+
+        # Texture and scissor state set by the previous draw command, used to skip redundant GL calls.
+        # `None` means unknown, e.g., after a callback which may have changed GL state.
+        bound_texture = None
+        scissor_box = None
+        stats = self.stats
         for drawlist in draw_data.commands_lists:
-            gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self._vbo_handle)
-            gl.glBufferData(
-                gl.GL_ARRAY_BUFFER,
-                drawlist.vtx_buffer_size * imgui.VERTEX_SIZE,
-                ctypes.c_void_p(drawlist.vtx_buffer_data),
-                gl.GL_STREAM_DRAW,
-            )
-
-            gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, self._elements_handle)
-            gl.glBufferData(
-                gl.GL_ELEMENT_ARRAY_BUFFER,
-                drawlist.idx_buffer_size * imgui.INDEX_SIZE,
-                ctypes.c_void_p(drawlist.idx_buffer_data),
-                gl.GL_STREAM_DRAW,
-            )
+            if gpu_timer is not None:
+                gpu_timer.begin_section()
+                draw_list_stats.append(DrawListGpuStats(draw_calls=stats.draw_calls, vtx_count=drawlist.vtx_buffer_size, idx_count=drawlist.idx_buffer_size))
+            if not single_upload:
+                self._upload_draw_list(drawlist)
+
+            if self.multi_draw:
+                counts, offsets, base_vertices, runs = drawlist.multi_draw_batches(vtx_base, idx_base)
+                commands = None
+                for tex_id, clip_rect, draw_start, draw_count, cmd_index in runs.tolist():
+                    if draw_count == 0:
+                        # Callback command, fetch the DrawCmd objects only when needed.
+                        if commands is None:
+                            commands = list(drawlist.commands)
+                        if commands[cmd_index].run_callback(drawlist) == imgui.DrawListCallbackResult.RESET_RENDER_STATE:
+                            self._reset_gl_render_state(fb_width, fb_height)
+                        bound_texture = scissor_box = None
+                        continue
+                    if tex_id != bound_texture:
+                        gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
+                        bound_texture = tex_id
+                    else:
+                        stats.texture_binds_elided += 1
+                    draw_end = draw_start + draw_count
+                    boxes = _scissor_boxes(clip_rect, fb_height, damage)
+                    for box in boxes:
+                        if box != scissor_box:
+                            gl.glScissor(*box)
+                            scissor_box = box
+                        else:
+                            stats.scissors_elided += 1
+                        gl.glMultiDrawElementsBaseVertex(gl.GL_TRIANGLES, counts[draw_start:draw_end], _IDX_TYPE, offsets[draw_start:draw_end], draw_count, base_vertices[draw_start:draw_end])
+                        stats.draw_calls += 1
+                    if boxes:
+                        stats.draw_commands += draw_count
+                if single_upload:
+                    vtx_base += drawlist.vtx_buffer_size
+                    idx_base += drawlist.idx_buffer_size
+                if gpu_timer is not None:
+                    draw_list_stats[-1].draw_calls = stats.draw_calls - draw_list_stats[-1].draw_calls
+                continue
 
             # todo: allow to iterate over _CmdList
-            idx_type = gl.GL_UNSIGNED_SHORT if imgui.INDEX_SIZE == 2 else gl.GL_UNSIGNED_INT
             for cmd in drawlist.commands:
                 match cmd.run_callback(drawlist):
                     case imgui.DrawListCallbackResult.CALLBACK:
-                        # callback was called, nothing further needed
-                        pass
+                        # callback was called, nothing further needed.  It may have changed GL state though.
+                        bound_texture = scissor_box = None
                     case imgui.DrawListCallbackResult.DRAW:
                         # no callback, just draw
-                        gl.glBindTexture(gl.GL_TEXTURE_2D, cmd.tex_ref.get_tex_id())
-                        x, y, z, w = cmd.clip_rect
-                        gl.glScissor(int(x), int(fb_height - w), int(z - x), int(w - y))
-                        gl.glDrawElementsBaseVertex(gl.GL_TRIANGLES, cmd.elem_count, idx_type, ctypes.c_void_p(cmd.idx_offset * imgui.INDEX_SIZE), cmd.vtx_offset)
+                        tex_id = cmd.tex_ref.get_tex_id()
+                        if tex_id != bound_texture:
+                            gl.glBindTexture(gl.GL_TEXTURE_2D, tex_id)
+                            bound_texture = tex_id
+                        else:
+                            stats.texture_binds_elided += 1
+                        boxes = _scissor_boxes(cmd.clip_rect, fb_height, damage)
+                        for box in boxes:
+                            if box != scissor_box:
+                                gl.glScissor(*box)
+                                scissor_box = box
+                            else:
+                                stats.scissors_elided += 1
+                            gl.glDrawElementsBaseVertex(gl.GL_TRIANGLES, cmd.elem_count, _IDX_TYPE, ctypes.c_void_p((idx_base + cmd.idx_offset) * imgui.INDEX_SIZE), vtx_base + cmd.vtx_offset)
+                            stats.draw_calls += 1
+                        if boxes:
+                            stats.draw_commands += 1
                     case imgui.DrawListCallbackResult.RESET_RENDER_STATE:
                         self._reset_gl_render_state(fb_width, fb_height)
+                        bound_texture = scissor_box = None
 
-        # restore modified GL state
-        restore_common_gl_state(common_gl_state_tuple)
+            if single_upload:
+                vtx_base += drawlist.vtx_buffer_size
+                idx_base += drawlist.idx_buffer_size
+            if gpu_timer is not None:
+                draw_list_stats[-1].draw_calls = stats.draw_calls - draw_list_stats[-1].draw_calls
 
-        gl.glUseProgram(last_program)
-        gl.glActiveTexture(last_active_texture)
-        gl.glBindVertexArray(last_vertex_array)
-        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, last_array_buffer)
-        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, last_element_array_buffer)
+        if gpu_timer is not None:
+            gpu_timer.end_frame(draw_list_stats)
+
+        if self._vtx_stream is not None and self._idx_stream is not None:
+            self._vtx_stream.fence()
+            self._idx_stream.fence()
+
+        # restore modified GL state
+        self._state_saver.restore()
 
     #--------------------------------------------------------------------
 
     def shutdown(self):
         gl.glDeleteVertexArrays(1, [self._vao_handle])
         self._vao_handle = 0
-        gl.glDeleteBuffers(1, [self._vbo_handle])
+        if self._vtx_stream is not None and self._idx_stream is not None:
+            self._vtx_stream.destroy()
+            self._idx_stream.destroy()
+            self._vtx_stream = self._idx_stream = None
         self._vbo_handle = 0
-        gl.glDeleteBuffers(1, [self._elements_handle])
         self._elements_handle = 0
+        self._pbo_handle = 0
+
+        if self.gpu_timer is not None:
+            self.gpu_timer.destroy()
+        if self.render_target is not None:
+            self.render_target.destroy()
+            self.render_target = None
 
-        gl.glDeleteProgram(self._shader_handle)
+        self.device_objects.release()
         self._shader_handle = 0
 
-        # Destroy all textures
+        self.destroy_textures()
+
+    def destroy_textures(self):
+        """Destroy the current ImGui context's textures, e.g., before destroying the context when the renderer is still used by others."""
         for tex in imgui.get_platform_io().textures:
-            if tex.ref_count == 1:
+            if tex.ref_count == 1 and tex.get_tex_id() != 0:
                 self._destroy_texture(tex)
 
 #------------------------------------------------------------------------
@@ -394,3 +1076,48 @@ def restore_common_gl_state(common_gl_state_tuple):
 
     gl.glScissor(last_scissor_box[0], last_scissor_box[1], last_scissor_box[2], last_scissor_box[3])
     gl.glViewport(last_viewport[0], last_viewport[1], last_viewport[2], last_viewport[3])
+
+
+class PyOpenGLStateSaver:
+    """
+    `render.GLStateSaver` implemented with PyOpenGL `glGet*` calls.
+
+    Used by `OpenGLRenderer` when the native state saver can't load its GL functions.  Saves the same
+    state for both the `"full"` and `"minimal"` policies.
+    """
+
+    def __init__(self):
+        self._state = None
+
+    def save(self, policy: render.GLStatePolicy = render.GLStatePolicy.FULL):
+        if policy == render.GLStatePolicy.NONE:
+            self._state = None
+            return
+        self._state = (
+            get_common_gl_state(),
+            gl.glGetIntegerv(gl.GL_CURRENT_PROGRAM),
+            gl.glGetIntegerv(gl.GL_ACTIVE_TEXTURE),
+            gl.glGetIntegerv(gl.GL_ARRAY_BUFFER_BINDING),
+            gl.glGetIntegerv(gl.GL_ELEMENT_ARRAY_BUFFER_BINDING),
+            gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING),
+        )
+
+    def restore(self):
+        if self._state is None:
+            return
+        (
+            common_gl_state_tuple,
+            last_program,
+            last_active_texture,
+            last_array_buffer,
+            last_element_array_buffer,
+            last_vertex_array,
+        ) = self._state
+        restore_common_gl_state(common_gl_state_tuple)
+        # The program may have been deleted while it was bound, see ocornut/imgui#6220.
+        if last_program == 0 or gl.glIsProgram(last_program):
+            gl.glUseProgram(last_program)
+        gl.glActiveTexture(last_active_texture)
+        gl.glBindVertexArray(last_vertex_array)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, last_array_buffer)
+        gl.glBindBuffer(gl.GL_ELEMENT_ARRAY_BUFFER, last_element_array_buffer)
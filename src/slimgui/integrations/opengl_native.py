@@ -0,0 +1,79 @@
+import ctypes
+from typing import Callable, Literal
+
+from slimgui import imgui
+from slimgui.slimgui_ext import render
+
+from .base import BaseRenderer
+
+# How much GL state the renderers save before rendering and restore afterwards:
+#
+# - `"full"`: all state the renderer changes (default).
+# - `"minimal"`: object bindings and enable caps only, see `render.GLStatePolicy.MINIMAL`.
+# - `"none"`: nothing, for applications where the UI owns the GL context.
+StateBackupPolicy = Literal["full", "minimal", "none"]
+
+STATE_POLICIES: dict[str, render.GLStatePolicy] = {
+    "full": render.GLStatePolicy.FULL,
+    "minimal": render.GLStatePolicy.MINIMAL,
+    "none": render.GLStatePolicy.NONE,
+}
+
+def pyopengl_get_proc_address(name: str) -> int | None:
+    """
+    Resolve an OpenGL function address through PyOpenGL's platform layer (GLX, EGL, WGL, ...).
+
+    Functions the platform's extension loader doesn't resolve are looked up in the GL library itself.
+    macOS has no extension loader, and `wglGetProcAddress` returns NULL for the GL 1.1 functions
+    exported by opengl32.dll.
+    """
+    from OpenGL import platform
+
+    get_extension_procedure = getattr(platform.PLATFORM, "getExtensionProcedure", None)
+    if get_extension_procedure is not None:
+        proc = get_extension_procedure(name.encode())
+        addr = proc if isinstance(proc, int) or proc is None else ctypes.cast(proc, ctypes.c_void_p).value
+        # Some WGL drivers return small sentinel values instead of NULL.
+        if addr and addr not in (1, 2, 3, -1, 0xFFFFFFFF, 0xFFFFFFFFFFFFFFFF):
+            return addr
+    try:
+        return ctypes.cast(getattr(platform.PLATFORM.GL, name), ctypes.c_void_p).value
+    except AttributeError:
+        return None
+
+class NativeOpenGLRenderer(BaseRenderer):
+    """
+    ImGui OpenGL 3.3 core renderer implemented in C++.
+
+    Drop-in replacement for `OpenGLRenderer`: textures, buffer uploads, state backup/restore and draw
+    calls are all handled natively in a single `render()` call, so the per-command Python overhead is
+    gone.  `DrawList.add_callback()` callbacks are still called and `DRAW_CALLBACK_RESET_RENDER_STATE`
+    resets the render state.
+
+    `get_proc_address` maps GL function names to addresses, e.g., `glfw.get_proc_address`.  If not
+    given, functions are resolved with PyOpenGL.
+
+    `state_backup` selects how much GL state is saved and restored around `render()`, see
+    `StateBackupPolicy`.
+
+    GL objects are only released by `shutdown()`, call it with the renderer's GL context current.
+
+    Note: most methods assume the current imgui context is set.
+    """
+
+    def __init__(self, get_proc_address: Callable[[str], int | None] | None = None, state_backup: StateBackupPolicy = "full"):
+        super().__init__()
+        self._renderer = render.OpenGLRenderer(get_proc_address or pyopengl_get_proc_address)
+        self._renderer.state_policy = STATE_POLICIES[state_backup]
+        self.max_texture_size = self._renderer.max_texture_size
+
+    def render(self, draw_data: imgui.DrawData):
+        self._renderer.render(draw_data)
+
+    def shutdown(self):
+        self._renderer.destroy_device_objects()
+
+        # Destroy all textures
+        for tex in imgui.get_platform_io().textures:
+            if tex.ref_count == 1 and tex.get_tex_id() != 0:
+                self._renderer.destroy_texture(tex)
@@ -0,0 +1,310 @@
+import time
+import weakref
+
+import pyglet
+from pyglet.window import key, mouse
+from slimgui import imgui
+
+from .opengl import OpenGLRenderer, SharedDeviceObjects
+from .opengl_native import NativeOpenGLRenderer
+
+# Largest float, passed to `add_mouse_pos_event()` when the mouse leaves the window.
+_FLT_MAX = 3.402823466e38
+
+def _build_key_map() -> dict[int, imgui.Key]:
+    Key = imgui.Key
+    key_map = {
+        key.TAB: Key.KEY_TAB,
+        key.LEFT: Key.KEY_LEFT_ARROW,
+        key.RIGHT: Key.KEY_RIGHT_ARROW,
+        key.UP: Key.KEY_UP_ARROW,
+        key.DOWN: Key.KEY_DOWN_ARROW,
+        key.PAGEUP: Key.KEY_PAGE_UP,
+        key.PAGEDOWN: Key.KEY_PAGE_DOWN,
+        key.HOME: Key.KEY_HOME,
+        key.END: Key.KEY_END,
+        key.INSERT: Key.KEY_INSERT,
+        key.DELETE: Key.KEY_DELETE,
+        key.BACKSPACE: Key.KEY_BACKSPACE,
+        key.SPACE: Key.KEY_SPACE,
+        key.RETURN: Key.KEY_ENTER,
+        key.ENTER: Key.KEY_ENTER,
+        key.ESCAPE: Key.KEY_ESCAPE,
+        key.APOSTROPHE: Key.KEY_APOSTROPHE,
+        key.COMMA: Key.KEY_COMMA,
+        key.MINUS: Key.KEY_MINUS,
+        key.PERIOD: Key.KEY_PERIOD,
+        key.SLASH: Key.KEY_SLASH,
+        key.SEMICOLON: Key.KEY_SEMICOLON,
+        key.EQUAL: Key.KEY_EQUAL,
+        key.BRACKETLEFT: Key.KEY_LEFT_BRACKET,
+        key.BACKSLASH: Key.KEY_BACKSLASH,
+        key.BRACKETRIGHT: Key.KEY_RIGHT_BRACKET,
+        key.GRAVE: Key.KEY_GRAVE_ACCENT,
+        key.CAPSLOCK: Key.KEY_CAPS_LOCK,
+        key.SCROLLLOCK: Key.KEY_SCROLL_LOCK,
+        key.NUMLOCK: Key.KEY_NUM_LOCK,
+        key.PRINT: Key.KEY_PRINT_SCREEN,
+        key.PAUSE: Key.KEY_PAUSE,
+        key.NUM_DECIMAL: Key.KEY_KEYPAD_DECIMAL,
+        key.NUM_DIVIDE: Key.KEY_KEYPAD_DIVIDE,
+        key.NUM_MULTIPLY: Key.KEY_KEYPAD_MULTIPLY,
+        key.NUM_SUBTRACT: Key.KEY_KEYPAD_SUBTRACT,
+        key.NUM_ADD: Key.KEY_KEYPAD_ADD,
+        key.NUM_ENTER: Key.KEY_KEYPAD_ENTER,
+        key.NUM_EQUAL: Key.KEY_KEYPAD_EQUAL,
+        # Keypad keys with num lock off.
+        key.NUM_LEFT: Key.KEY_LEFT_ARROW,
+        key.NUM_RIGHT: Key.KEY_RIGHT_ARROW,
+        key.NUM_UP: Key.KEY_UP_ARROW,
+        key.NUM_DOWN: Key.KEY_DOWN_ARROW,
+        key.NUM_PAGE_UP: Key.KEY_PAGE_UP,
+        key.NUM_PAGE_DOWN: Key.KEY_PAGE_DOWN,
+        key.NUM_HOME: Key.KEY_HOME,
+        key.NUM_END: Key.KEY_END,
+        key.NUM_INSERT: Key.KEY_INSERT,
+        key.NUM_DELETE: Key.KEY_DELETE,
+        key.LSHIFT: Key.KEY_LEFT_SHIFT,
+        key.LCTRL: Key.KEY_LEFT_CTRL,
+        key.LALT: Key.KEY_LEFT_ALT,
+        key.LWINDOWS: Key.KEY_LEFT_SUPER,
+        key.LCOMMAND: Key.KEY_LEFT_SUPER,
+        key.RSHIFT: Key.KEY_RIGHT_SHIFT,
+        key.RCTRL: Key.KEY_RIGHT_CTRL,
+        key.RALT: Key.KEY_RIGHT_ALT,
+        key.RWINDOWS: Key.KEY_RIGHT_SUPER,
+        key.RCOMMAND: Key.KEY_RIGHT_SUPER,
+        key.MENU: Key.KEY_MENU,
+    }
+    for i in range(26):
+        key_map[key.A + i] = Key(Key.KEY_A + i)
+    for i in range(10):
+        key_map[key._0 + i] = Key(Key.KEY_0 + i)
+        key_map[key.NUM_0 + i] = Key(Key.KEY_KEYPAD0 + i)
+    for i in range(24):
+        key_map[key.F1 + i] = Key(Key.KEY_F1 + i)
+    return key_map
+
+KEY_MAP = _build_key_map()
+
+# pyglet mouse button bits to ImGui mouse buttons.
+MOUSE_BUTTONS = {
+    mouse.LEFT: 0,
+    mouse.RIGHT: 1,
+    mouse.MIDDLE: 2,
+    mouse.MOUSE4: 3,
+    mouse.MOUSE5: 4,
+}
+
+# Device objects of the `OpenGLRenderer`s in each pyglet object space (a set of GL contexts that share objects).
+# Entries go away with their object space, so a window closed without `shutdown()` can't hand its objects to
+# the contexts of an unrelated object space.
+_shared_objects: "weakref.WeakKeyDictionary[pyglet.gl.base.ObjectSpace, SharedDeviceObjects]" = weakref.WeakKeyDictionary()
+
+class PygletRenderer:
+    """
+    Platform integration for [pyglet](https://pyglet.org) windows.
+
+    Mouse motion is coalesced: all motion events received between two frames (or before a button,
+    key or text event) become a single `add_mouse_pos_event()`, no matter how high the mouse's
+    polling rate is.  Scroll events are summed the same way.
+
+    Unless a `renderer` is given, the `OpenGLRenderer`s of windows whose GL contexts share objects
+    (pyglet's default) share their shaders and buffers, see `SharedDeviceObjects`.
+    """
+    def __init__(
+        self,
+        window: pyglet.window.Window,
+        attach_handlers: bool = True,
+        mouse_wheel_multiplier: float = 1.0,
+        renderer: OpenGLRenderer | NativeOpenGLRenderer | None = None,
+        font_atlas_format: imgui.TextureFormat | None = None,
+    ):
+        self.window = window
+        self.mouse_wheel_multiplier = mouse_wheel_multiplier
+        window.switch_to()
+
+        if renderer is not None:
+            self.renderer = renderer
+        else:
+            object_space = window.context.object_space
+            self.renderer = OpenGLRenderer(shared=_shared_objects.get(object_space))
+            _shared_objects[object_space] = self.renderer.device_objects
+
+        self.io = imgui.get_io()
+        self.io.display_size = window.get_size()
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+        self.io.backend_flags |= imgui.BackendFlags.HAS_MOUSE_CURSORS
+        # Only override the atlas format when asked, keep one the application already set on `FontAtlas`.
+        if font_atlas_format is not None:
+            self.io.fonts.tex_desired_format = font_atlas_format
+
+        plat_io = imgui.get_platform_io()
+        plat_io.renderer_texture_max_height = self.renderer.max_texture_size
+        plat_io.renderer_texture_max_width = self.renderer.max_texture_size
+
+        # Number of input events received from pyglet (before coalescing), see `GlfwRenderer.input_events`.
+        self.input_events = 0
+        # Coalesced mouse position (ImGui coordinates) and scroll, not yet passed to ImGui.
+        self._mouse_pos: tuple[float, float] | None = None
+        self._wheel = (0.0, 0.0)
+        self._cursors: dict[imgui.MouseCursor, pyglet.window.MouseCursor | None] = {}
+        self._last_cursor = None
+        self._gui_time = None
+
+        if attach_handlers:
+            window.push_handlers(
+                self.on_key_press,
+                self.on_key_release,
+                self.on_text,
+                self.on_mouse_motion,
+                self.on_mouse_drag,
+                self.on_mouse_press,
+                self.on_mouse_release,
+                self.on_mouse_scroll,
+                self.on_mouse_leave,
+                self.on_activate,
+                self.on_deactivate,
+            )
+
+    def _update_mouse_cursor(self):
+        imgui_cursor = imgui.get_mouse_cursor()
+        if imgui_cursor == self._last_cursor:
+            return
+        self._last_cursor = imgui_cursor
+        if imgui_cursor == imgui.MouseCursor.NONE or self.io.mouse_draw_cursor:
+            self.window.set_mouse_visible(False)
+            return
+        if imgui_cursor not in self._cursors:
+            w = self.window
+            name = {
+                imgui.MouseCursor.TEXT_INPUT: w.CURSOR_TEXT,
+                imgui.MouseCursor.RESIZE_ALL: w.CURSOR_SIZE,
+                imgui.MouseCursor.RESIZE_NS: w.CURSOR_SIZE_UP_DOWN,
+                imgui.MouseCursor.RESIZE_EW: w.CURSOR_SIZE_LEFT_RIGHT,
+                imgui.MouseCursor.RESIZE_NESW: w.CURSOR_SIZE_UP_RIGHT,
+                imgui.MouseCursor.RESIZE_NWSE: w.CURSOR_SIZE_UP_LEFT,
+                imgui.MouseCursor.HAND: w.CURSOR_HAND,
+                imgui.MouseCursor.NOT_ALLOWED: w.CURSOR_NO,
+            }.get(imgui_cursor)
+            self._cursors[imgui_cursor] = w.get_system_mouse_cursor(name) if name is not None else None
+        self.window.set_mouse_cursor(self._cursors[imgui_cursor])
+        self.window.set_mouse_visible(True)
+
+    def _flush_mouse(self):
+        if self._mouse_pos is not None:
+            self.io.add_mouse_pos_event(*self._mouse_pos)
+            self._mouse_pos = None
+        if self._wheel != (0.0, 0.0):
+            self.io.add_mouse_wheel_event(*self._wheel)
+            self._wheel = (0.0, 0.0)
+
+    def _update_mod_keys(self, mods: int):
+        self.io.add_key_event(imgui.Key.MOD_CTRL, (mods & key.MOD_CTRL) != 0)
+        self.io.add_key_event(imgui.Key.MOD_SHIFT, (mods & key.MOD_SHIFT) != 0)
+        self.io.add_key_event(imgui.Key.MOD_ALT, (mods & key.MOD_ALT) != 0)
+        self.io.add_key_event(imgui.Key.MOD_SUPER, (mods & (key.MOD_COMMAND | key.MOD_WINDOWS)) != 0)
+
+    def _mouse_motion(self, x: float, y: float):
+        self.input_events += 1
+        if self._wheel != (0.0, 0.0):
+            self._flush_mouse()
+        # pyglet's origin is the bottom-left corner.
+        self._mouse_pos = (float(x), float(self.window.height - y))
+
+    def on_key_press(self, symbol, modifiers):
+        self.input_events += 1
+        self._flush_mouse()
+        self._update_mod_keys(modifiers)
+        k = KEY_MAP.get(symbol)
+        if k is not None:
+            self.io.add_key_event(k, True)
+
+    def on_key_release(self, symbol, modifiers):
+        self.input_events += 1
+        self._flush_mouse()
+        self._update_mod_keys(modifiers)
+        k = KEY_MAP.get(symbol)
+        if k is not None:
+            self.io.add_key_event(k, False)
+
+    def on_text(self, text):
+        self.input_events += 1
+        self._flush_mouse()
+        self.io.add_input_characters_utf8(text)
+
+    def on_mouse_motion(self, x, y, dx, dy):
+        self._mouse_motion(x, y)
+
+    def on_mouse_drag(self, x, y, dx, dy, buttons, modifiers):
+        self._mouse_motion(x, y)
+
+    def on_mouse_press(self, x, y, button, modifiers):
+        self._mouse_motion(x, y)
+        self._flush_mouse()
+        self._update_mod_keys(modifiers)
+        if button in MOUSE_BUTTONS:
+            self.io.add_mouse_button_event(MOUSE_BUTTONS[button], True)
+
+    def on_mouse_release(self, x, y, button, modifiers):
+        self._mouse_motion(x, y)
+        self._flush_mouse()
+        self._update_mod_keys(modifiers)
+        if button in MOUSE_BUTTONS:
+            self.io.add_mouse_button_event(MOUSE_BUTTONS[button], False)
+
+    def on_mouse_scroll(self, x, y, scroll_x, scroll_y):
+        self.input_events += 1
+        if self._mouse_pos is not None:
+            self._flush_mouse()
+        # pyglet's positive x scrolls right, ImGui's scrolls left.
+        wheel_x, wheel_y = self._wheel
+        self._wheel = (wheel_x - scroll_x * self.mouse_wheel_multiplier, wheel_y + scroll_y * self.mouse_wheel_multiplier)
+
+    def on_mouse_leave(self, x, y):
+        self.input_events += 1
+        self._flush_mouse()
+        self.io.add_mouse_pos_event(-_FLT_MAX, -_FLT_MAX)
+
+    def on_activate(self):
+        self.input_events += 1
+        self._flush_mouse()
+        self.io.add_focus_event(True)
+
+    def on_deactivate(self):
+        self.input_events += 1
+        self._flush_mouse()
+        self.io.add_focus_event(False)
+
+    def new_frame(self):
+        self._flush_mouse()
+
+        w, h = self.window.get_size()
+        fb_w, fb_h = self.window.get_framebuffer_size()
+        self.io.display_size = w, h
+        if w > 0 and h > 0:
+            self.io.display_framebuffer_scale = float(fb_w) / float(w), float(fb_h) / float(h)
+
+        current_time = time.perf_counter()
+        if self._gui_time:
+            self.io.delta_time = current_time - self._gui_time
+        else:
+            self.io.delta_time = 1.0 / 60.0
+        if self.io.delta_time <= 0.0:
+            self.io.delta_time = 1.0 / 1000.0
+        self._gui_time = current_time
+
+        # Mouse cursor style changes
+        self._update_mouse_cursor()
+
+    def shutdown(self):
+        self.window.switch_to()
+        self.renderer.shutdown()
+        for object_space, objects in list(_shared_objects.items()):
+            if objects.ref_count == 0:
+                del _shared_objects[object_space]
+
+    def render(self, draw_data: imgui.DrawData):
+        self.window.switch_to()
+        self.renderer.render(draw_data)
@@ -0,0 +1,394 @@
+"""
+Remote UI over a TCP or Unix domain socket.
+
+`RemoteServer` runs in the process that builds the UI (e.g., on a headless compute node) in place
+of a renderer: it streams each frame's draw data to a connected `RemoteClient`, which draws the
+frames with any renderer and sends input events back into the server's `IO`.
+
+Frames are encoded with `render.DrawDataRecorder`: draw lists that didn't change since the previous
+frame are sent as references, changed lists as deltas against the previous frame, texture creations
+and updates as pixel payloads, so a static UI costs a few bytes per frame.
+
+Messages in both directions are a 1-byte type and a 4-byte payload length followed by the payload.
+"""
+
+import os
+import select
+import socket
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from slimgui import imgui
+from slimgui.slimgui_ext.render import DrawDataReader, DrawDataRecorder
+
+from .base import BaseRenderer
+
+Address = str | tuple[str, int]
+
+# Server -> client
+_MSG_FRAME = 1          # frame number, mouse cursor, DrawDataRecorder bytes
+
+# Client -> server
+_MSG_FRAME_ACK = 16     # frame number, sent after the client has rendered the frame
+_MSG_DISPLAY = 17       # display size, framebuffer scale
+_MSG_MOUSE_POS = 18
+_MSG_MOUSE_BUTTON = 19
+_MSG_MOUSE_WHEEL = 20
+_MSG_KEY = 21
+_MSG_TEXT = 22
+_MSG_FOCUS = 23
+
+_HEADER = struct.Struct("<BI")
+_FRAME = struct.Struct("<Ii")
+_FRAME_ACK = struct.Struct("<I")
+_DISPLAY = struct.Struct("<4f")
+_VEC2 = struct.Struct("<2f")
+_BUTTON = struct.Struct("<iB")
+
+def _socket_for(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+def _configure(sock: socket.socket):
+    if sock.family == socket.AF_INET:
+        # Input events and frame acks are tiny, don't let Nagle's algorithm hold them back.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+class _Connection:
+    """
+    Message framing on a connected non-blocking socket.  Messages that don't fit in the socket's send
+    buffer are queued and sent by later `send()` and `receive()` calls, so a slow peer never blocks the caller.
+    """
+
+    def __init__(self, sock: socket.socket):
+        _configure(sock)
+        sock.setblocking(False)
+        self.sock = sock
+        self._buffer = bytearray()
+        self._pending = bytearray()
+        self.closed = False
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def send(self, msg_type: int, *payload: bytes):
+        if self.closed:
+            return
+        self._pending += _HEADER.pack(msg_type, sum(len(p) for p in payload))
+        for p in payload:
+            self._pending += p
+        self.flush()
+
+    def flush(self):
+        while self._pending and not self.closed:
+            try:
+                sent = self.sock.send(self._pending)
+            except BlockingIOError:
+                break
+            except OSError:
+                self.close()
+                break
+            del self._pending[:sent]
+
+    def receive(self, timeout: float = 0.0) -> list[tuple[int, bytes]]:
+        """Read the data that's available (waiting up to `timeout` seconds for some) and return the complete messages."""
+        self.flush()
+        while not self.closed:
+            readable, _, _ = select.select([self.sock], [], [], timeout)
+            if not readable:
+                break
+            try:
+                data = self.sock.recv(1 << 20)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.close()
+                break
+            self._buffer += data
+            timeout = 0.0
+
+        messages = []
+        pos = 0
+        while len(self._buffer) - pos >= _HEADER.size:
+            msg_type, size = _HEADER.unpack_from(self._buffer, pos)
+            if len(self._buffer) - pos - _HEADER.size < size:
+                break
+            start = pos + _HEADER.size
+            messages.append((msg_type, bytes(self._buffer[start:start + size])))
+            pos = start + size
+        del self._buffer[:pos]
+        return messages
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.sock.close()
+
+@dataclass
+class FrameStats:
+    """Transfer statistics of a frame sent by `RemoteServer`."""
+    frame: int
+    bytes: int
+    # Seconds from sending the frame to receiving the client's acknowledgement that it was rendered,
+    # `None` until the acknowledgement arrives.
+    latency: float | None = None
+
+class RemoteServer(BaseRenderer):
+    """
+    Integration for serving the UI to a `RemoteClient` over a socket.  Use it in place of a platform
+    integration and renderer: call `new_frame()` before `imgui.new_frame()` to apply the client's input and
+    `render(imgui.get_draw_data())` to send the frame.
+
+    `address` is a `(host, port)` tuple for TCP (port 0 picks a free port, see `address`) or a path
+    for a Unix domain socket.  One client is served at a time, a new connection replaces the previous
+    client.  Without a client, frames are discarded and texture requests are acknowledged like a
+    renderer would.
+
+    Frames are skipped while the client falls behind: when more than `max_pending_bytes` wait to be sent
+    or `max_unacked_frames` frames haven't been acknowledged yet.  Once it has caught up, the next frame is
+    sent as a keyframe (see `DrawDataRecorder.keyframe()`).  `frames_skipped` counts the frames not sent.
+
+    `stats` holds the size and round-trip latency of the last `stats_history` frames sent.
+    """
+
+    def __init__(self, address: Address, display_size: tuple[float, float] = (1280, 720), stats_history: int = 600,
+                 max_pending_bytes: int = 1 << 20, max_unacked_frames: int = 10):
+        super().__init__()
+        self._listener = _socket_for(address)
+        if self._listener.family == socket.AF_INET:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(address)
+        self._listener.listen(1)
+        self._listener.setblocking(False)
+        self.address: Address = self._listener.getsockname()
+
+        self.client: _Connection | None = None
+        self._recorder = DrawDataRecorder()
+        self._frame = 0
+        self._next_tex_id = 1
+        self._sent: dict[int, tuple[float, FrameStats]] = {}
+        self.stats: deque[FrameStats] = deque(maxlen=stats_history)
+        self.bytes_sent = 0
+        self.max_pending_bytes = max_pending_bytes
+        self.max_unacked_frames = max_unacked_frames
+        self.frames_skipped = 0
+        self._keyframe = False
+        self._gui_time: float | None = None
+
+        self.io = imgui.get_io()
+        self.io.display_size = display_size
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+
+    #--------------------------------------------------------------------
+
+    def wait_for_client(self, timeout: float | None = None) -> bool:
+        """Block until a client connects or `timeout` seconds have passed.  Returns True if a client is connected."""
+        readable, _, _ = select.select([self._listener], [], [], timeout)
+        if readable:
+            self._accept()
+        return self.client is not None
+
+    def _accept(self):
+        try:
+            sock, _ = self._listener.accept()
+        except BlockingIOError:
+            return
+        if self.client is not None:
+            self.client.close()
+        self.client = _Connection(sock)
+        # The new client needs the stream header and every texture from scratch.
+        self._recorder = DrawDataRecorder()
+        self._sent.clear()
+        self._keyframe = False
+
+    #--------------------------------------------------------------------
+
+    def _handle_message(self, msg_type: int, payload: bytes):
+        io = self.io
+        if msg_type == _MSG_FRAME_ACK:
+            (frame,) = _FRAME_ACK.unpack(payload)
+            sent = self._sent.pop(frame, None)
+            if sent is not None:
+                send_time, stats = sent
+                stats.latency = time.perf_counter() - send_time
+        elif msg_type == _MSG_DISPLAY:
+            w, h, fb_x, fb_y = _DISPLAY.unpack(payload)
+            io.display_size = w, h
+            io.display_framebuffer_scale = fb_x, fb_y
+        elif msg_type == _MSG_MOUSE_POS:
+            io.add_mouse_pos_event(*_VEC2.unpack(payload))
+        elif msg_type == _MSG_MOUSE_BUTTON:
+            button, down = _BUTTON.unpack(payload)
+            io.add_mouse_button_event(button, bool(down))
+        elif msg_type == _MSG_MOUSE_WHEEL:
+            io.add_mouse_wheel_event(*_VEC2.unpack(payload))
+        elif msg_type == _MSG_KEY:
+            key, down = _BUTTON.unpack(payload)
+            io.add_key_event(imgui.Key(key), bool(down))
+        elif msg_type == _MSG_TEXT:
+            io.add_input_characters_utf8(payload.decode("utf-8"))
+        elif msg_type == _MSG_FOCUS:
+            io.add_focus_event(bool(payload[0]))
+
+    def process_events(self, timeout: float = 0.0):
+        """Accept a pending connection and apply the input events received from the client, waiting up to `timeout` seconds for some."""
+        self._accept()
+        if self.client is None:
+            return
+        for msg_type, payload in self.client.receive(timeout):
+            self._handle_message(msg_type, payload)
+        if self.client.closed:
+            self.client = None
+
+    def new_frame(self):
+        self.process_events()
+        current_time = time.perf_counter()
+        if self._gui_time is not None:
+            self.io.delta_time = max(current_time - self._gui_time, 1.0 / 1000.0)
+        else:
+            self.io.delta_time = 1.0 / 60.0
+        self._gui_time = current_time
+
+    #--------------------------------------------------------------------
+
+    def _acknowledge_textures(self, draw_data: imgui.DrawData):
+        # There's no GPU on this end: texture contents are sent to the client with the frame.
+        if draw_data.textures is None:
+            return
+        for tex in draw_data.textures:
+            if tex.status == imgui.TextureStatus.WANT_CREATE:
+                tex.set_tex_id(self._next_tex_id)
+                self._next_tex_id += 1
+                tex.set_status(imgui.TextureStatus.OK)
+            elif tex.status == imgui.TextureStatus.WANT_UPDATES:
+                tex.set_status(imgui.TextureStatus.OK)
+            elif tex.status == imgui.TextureStatus.WANT_DESTROY and tex.unused_frames > 0:
+                tex.set_tex_id(0)
+                tex.set_status(imgui.TextureStatus.DESTROYED)
+
+    def _client_behind(self) -> bool:
+        assert self.client is not None
+        self.client.flush()
+        return self.client.pending_bytes > self.max_pending_bytes or len(self._sent) >= self.max_unacked_frames
+
+    def render(self, draw_data: imgui.DrawData):
+        if self.client is not None and self._client_behind():
+            # The texture requests are acknowledged below without reaching the client, so it needs
+            # a keyframe once it has caught up.
+            self.frames_skipped += 1
+            self._keyframe = True
+        elif self.client is not None:
+            if self._keyframe:
+                self._recorder.keyframe()
+                self._keyframe = False
+            data = self._recorder.record(draw_data, imgui.get_time())
+            self._frame += 1
+            stats = FrameStats(self._frame, _HEADER.size + _FRAME.size + len(data))
+            self._sent[self._frame] = (time.perf_counter(), stats)
+            self.client.send(_MSG_FRAME, _FRAME.pack(self._frame, int(imgui.get_mouse_cursor())), data)
+            self.stats.append(stats)
+            self.bytes_sent += stats.bytes
+            # Forget frames the client will never acknowledge.
+            if len(self._sent) > self.stats.maxlen:
+                del self._sent[min(self._sent)]
+            if self.client.closed:
+                self.client = None
+        self._acknowledge_textures(draw_data)
+
+    def shutdown(self):
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        self._listener.close()
+        if isinstance(self.address, str):
+            try:
+                os.unlink(self.address)
+            except FileNotFoundError:
+                pass
+
+class RemoteClient:
+    """
+    Thin client for a `RemoteServer`: draws the frames it receives with `renderer` and sends input events
+    to the server.  Forward your window's events with the `send_*()` methods.
+
+    The renderer must belong to the current ImGui context, which only serves to render: `update()` sets its
+    `IO.display_size` from the frames.  Textures are owned by the stream, they're created and destroyed by the
+    renderer as the server requests.
+    """
+
+    def __init__(self, address: Address, renderer: BaseRenderer, timeout: float | None = 10.0):
+        sock = _socket_for(address)
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.settimeout(None)
+        self._connection = _Connection(sock)
+        self.renderer = renderer
+        self._reader = DrawDataReader()
+        self.draw_data: imgui.DrawData | None = None
+        # Frame number of `draw_data` and the mouse cursor the server's UI wants.
+        self.frame = 0
+        self.mouse_cursor = imgui.MouseCursor.ARROW
+
+    @property
+    def connected(self) -> bool:
+        return not self._connection.closed
+
+    def update(self, timeout: float = 0.0) -> int:
+        """
+        Receive frames, waiting up to `timeout` seconds for data, and render them.  Every frame is rendered so
+        that its texture requests are processed, the last one is left in the framebuffer.  Returns the number of
+        frames rendered.
+        """
+        frames = 0
+        for msg_type, payload in self._connection.receive(timeout):
+            if msg_type != _MSG_FRAME:
+                continue
+            frame, cursor = _FRAME.unpack_from(payload)
+            self._reader.feed(payload[_FRAME.size:])
+            while (draw_data := self._reader.read_frame()) is not None:
+                imgui.get_io().display_size = draw_data.display_size
+                self.renderer.render(draw_data)
+                self.draw_data = draw_data
+                frames += 1
+            self.frame = frame
+            self.mouse_cursor = imgui.MouseCursor(cursor)
+            self._connection.send(_MSG_FRAME_ACK, _FRAME_ACK.pack(frame))
+        return frames
+
+    def render(self):
+        """Render the latest frame again, e.g., after the window was exposed."""
+        if self.draw_data is not None:
+            self.renderer.render(self.draw_data)
+
+    #--------------------------------------------------------------------
+
+    def send_display_size(self, size: tuple[float, float], framebuffer_scale: tuple[float, float] = (1.0, 1.0)):
+        self._connection.send(_MSG_DISPLAY, _DISPLAY.pack(*size, *framebuffer_scale))
+
+    def send_mouse_pos(self, x: float, y: float):
+        self._connection.send(_MSG_MOUSE_POS, _VEC2.pack(x, y))
+
+    def send_mouse_button(self, button: int, down: bool):
+        self._connection.send(_MSG_MOUSE_BUTTON, _BUTTON.pack(button, down))
+
+    def send_mouse_wheel(self, wheel_x: float, wheel_y: float):
+        self._connection.send(_MSG_MOUSE_WHEEL, _VEC2.pack(wheel_x, wheel_y))
+
+    def send_key(self, key: imgui.Key, down: bool):
+        self._connection.send(_MSG_KEY, _BUTTON.pack(int(key), down))
+
+    def send_text(self, text: str):
+        self._connection.send(_MSG_TEXT, text.encode("utf-8"))
+
+    def send_focus(self, focused: bool):
+        self._connection.send(_MSG_FOCUS, bytes([focused]))
+
+    def close(self):
+        self._connection.close()
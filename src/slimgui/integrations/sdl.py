@@ -0,0 +1,339 @@
+import ctypes
+import struct
+
+import sdl2
+from slimgui import imgui
+
+from .opengl import OpenGLRenderer
+from .opengl_native import NativeOpenGLRenderer
+from .base import BaseRenderer
+
+# Largest float, passed to `add_mouse_pos_event()` when the mouse leaves the window.
+_FLT_MAX = 3.402823466e38
+
+# Events fetched from the SDL event queue per `SDL_PeepEvents()` call.
+_EVENT_BATCH_SIZE = 256
+
+# Record of `IO.add_input_events()`: type, down, value, x, y.
+_INPUT_EVENT = struct.Struct("<HHiff")
+
+_MOD_KEYS = (
+    (sdl2.KMOD_CTRL, imgui.Key.MOD_CTRL),
+    (sdl2.KMOD_SHIFT, imgui.Key.MOD_SHIFT),
+    (sdl2.KMOD_ALT, imgui.Key.MOD_ALT),
+    (sdl2.KMOD_GUI, imgui.Key.MOD_SUPER),
+)
+
+def _build_key_map() -> dict[int, imgui.Key]:
+    Key = imgui.Key
+    key_map = {
+        sdl2.SDLK_TAB: Key.KEY_TAB,
+        sdl2.SDLK_LEFT: Key.KEY_LEFT_ARROW,
+        sdl2.SDLK_RIGHT: Key.KEY_RIGHT_ARROW,
+        sdl2.SDLK_UP: Key.KEY_UP_ARROW,
+        sdl2.SDLK_DOWN: Key.KEY_DOWN_ARROW,
+        sdl2.SDLK_PAGEUP: Key.KEY_PAGE_UP,
+        sdl2.SDLK_PAGEDOWN: Key.KEY_PAGE_DOWN,
+        sdl2.SDLK_HOME: Key.KEY_HOME,
+        sdl2.SDLK_END: Key.KEY_END,
+        sdl2.SDLK_INSERT: Key.KEY_INSERT,
+        sdl2.SDLK_DELETE: Key.KEY_DELETE,
+        sdl2.SDLK_BACKSPACE: Key.KEY_BACKSPACE,
+        sdl2.SDLK_SPACE: Key.KEY_SPACE,
+        sdl2.SDLK_RETURN: Key.KEY_ENTER,
+        sdl2.SDLK_ESCAPE: Key.KEY_ESCAPE,
+        sdl2.SDLK_QUOTE: Key.KEY_APOSTROPHE,
+        sdl2.SDLK_COMMA: Key.KEY_COMMA,
+        sdl2.SDLK_MINUS: Key.KEY_MINUS,
+        sdl2.SDLK_PERIOD: Key.KEY_PERIOD,
+        sdl2.SDLK_SLASH: Key.KEY_SLASH,
+        sdl2.SDLK_SEMICOLON: Key.KEY_SEMICOLON,
+        sdl2.SDLK_EQUALS: Key.KEY_EQUAL,
+        sdl2.SDLK_LEFTBRACKET: Key.KEY_LEFT_BRACKET,
+        sdl2.SDLK_BACKSLASH: Key.KEY_BACKSLASH,
+        sdl2.SDLK_RIGHTBRACKET: Key.KEY_RIGHT_BRACKET,
+        sdl2.SDLK_BACKQUOTE: Key.KEY_GRAVE_ACCENT,
+        sdl2.SDLK_CAPSLOCK: Key.KEY_CAPS_LOCK,
+        sdl2.SDLK_SCROLLLOCK: Key.KEY_SCROLL_LOCK,
+        sdl2.SDLK_NUMLOCKCLEAR: Key.KEY_NUM_LOCK,
+        sdl2.SDLK_PRINTSCREEN: Key.KEY_PRINT_SCREEN,
+        sdl2.SDLK_PAUSE: Key.KEY_PAUSE,
+        sdl2.SDLK_KP_0: Key.KEY_KEYPAD0,
+        sdl2.SDLK_KP_PERIOD: Key.KEY_KEYPAD_DECIMAL,
+        sdl2.SDLK_KP_DIVIDE: Key.KEY_KEYPAD_DIVIDE,
+        sdl2.SDLK_KP_MULTIPLY: Key.KEY_KEYPAD_MULTIPLY,
+        sdl2.SDLK_KP_MINUS: Key.KEY_KEYPAD_SUBTRACT,
+        sdl2.SDLK_KP_PLUS: Key.KEY_KEYPAD_ADD,
+        sdl2.SDLK_KP_ENTER: Key.KEY_KEYPAD_ENTER,
+        sdl2.SDLK_KP_EQUALS: Key.KEY_KEYPAD_EQUAL,
+        sdl2.SDLK_LSHIFT: Key.KEY_LEFT_SHIFT,
+        sdl2.SDLK_LCTRL: Key.KEY_LEFT_CTRL,
+        sdl2.SDLK_LALT: Key.KEY_LEFT_ALT,
+        sdl2.SDLK_LGUI: Key.KEY_LEFT_SUPER,
+        sdl2.SDLK_RSHIFT: Key.KEY_RIGHT_SHIFT,
+        sdl2.SDLK_RCTRL: Key.KEY_RIGHT_CTRL,
+        sdl2.SDLK_RALT: Key.KEY_RIGHT_ALT,
+        sdl2.SDLK_RGUI: Key.KEY_RIGHT_SUPER,
+        sdl2.SDLK_APPLICATION: Key.KEY_MENU,
+        sdl2.SDLK_AC_BACK: Key.KEY_APP_BACK,
+        sdl2.SDLK_AC_FORWARD: Key.KEY_APP_FORWARD,
+    }
+    for i in range(26):
+        key_map[sdl2.SDLK_a + i] = Key(Key.KEY_A + i)
+    for i in range(10):
+        key_map[sdl2.SDLK_0 + i] = Key(Key.KEY_0 + i)
+    for i in range(9):
+        key_map[sdl2.SDLK_KP_1 + i] = Key(Key.KEY_KEYPAD1 + i)
+    for i in range(12):
+        key_map[sdl2.SDLK_F1 + i] = Key(Key.KEY_F1 + i)
+        key_map[sdl2.SDLK_F13 + i] = Key(Key.KEY_F13 + i)
+    return key_map
+
+_KEY_MAP = _build_key_map()
+
+# SDL mouse buttons (1-based) to ImGui mouse buttons.
+_MOUSE_BUTTONS = {
+    sdl2.SDL_BUTTON_LEFT: 0,
+    sdl2.SDL_BUTTON_RIGHT: 1,
+    sdl2.SDL_BUTTON_MIDDLE: 2,
+    sdl2.SDL_BUTTON_X1: 3,
+    sdl2.SDL_BUTTON_X2: 4,
+}
+
+class SdlRenderer:
+    """
+    Platform integration for [PySDL2](https://github.com/py-sdl/py-sdl2) windows.
+
+    Unlike `GlfwRenderer`, which feeds ImGui from per-event callbacks, the SDL event queue is drained
+    once per frame in `process_events()`: events are fetched in batches with `SDL_PeepEvents()`, runs of
+    mouse motion and wheel events are coalesced, and the frame's events are handed to `imgui.IO` with a
+    single `IO.add_input_events()` call.
+
+    Works with `SDL_VIDEODRIVER=dummy` and a renderer that doesn't need a GL context (e.g.,
+    `NullRenderer` or `SoftwareRenderer`) for headless testing.
+    """
+    def __init__(
+        self,
+        window,
+        mouse_wheel_multiplier: float = 1.0,
+        renderer: OpenGLRenderer | NativeOpenGLRenderer | BaseRenderer | None = None,
+        font_atlas_format: imgui.TextureFormat | None = None,
+    ):
+        self.renderer = renderer if renderer is not None else OpenGLRenderer()
+        self.window = window
+        self.mouse_wheel_multiplier = mouse_wheel_multiplier
+
+        self.io = imgui.get_io()
+        self.io.display_size = self._window_size()
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        self.io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+        self.io.backend_flags |= imgui.BackendFlags.HAS_MOUSE_CURSORS
+        # Only override the atlas format when asked, keep one the application already set on `FontAtlas`.
+        if font_atlas_format is not None:
+            self.io.fonts.tex_desired_format = font_atlas_format
+
+        max_texture_size = getattr(self.renderer, "max_texture_size", None)
+        if max_texture_size is not None:
+            plat_io = imgui.get_platform_io()
+            plat_io.renderer_texture_max_height = max_texture_size
+            plat_io.renderer_texture_max_width = max_texture_size
+
+        # Number of input events handed to ImGui (before coalescing), see `GlfwRenderer.input_events`.
+        self.input_events = 0
+        self._window_id = sdl2.SDL_GetWindowID(window)
+        self._frequency = sdl2.SDL_GetPerformanceFrequency()
+        self._gui_time = None
+        # Modifier keys last sent to ImGui (KMOD_* mask), only changes are sent.
+        self._key_mods = 0
+
+        self._cursors: dict[imgui.MouseCursor, ctypes.c_void_p] = {}
+        self._last_cursor = None
+        self._alloc_cursors()
+
+    def _alloc_cursors(self):
+        for imgui_cursor, sdl_cursor in (
+            (imgui.MouseCursor.ARROW, sdl2.SDL_SYSTEM_CURSOR_ARROW),
+            (imgui.MouseCursor.TEXT_INPUT, sdl2.SDL_SYSTEM_CURSOR_IBEAM),
+            (imgui.MouseCursor.RESIZE_ALL, sdl2.SDL_SYSTEM_CURSOR_SIZEALL),
+            (imgui.MouseCursor.RESIZE_NS, sdl2.SDL_SYSTEM_CURSOR_SIZENS),
+            (imgui.MouseCursor.RESIZE_EW, sdl2.SDL_SYSTEM_CURSOR_SIZEWE),
+            (imgui.MouseCursor.RESIZE_NESW, sdl2.SDL_SYSTEM_CURSOR_SIZENESW),
+            (imgui.MouseCursor.RESIZE_NWSE, sdl2.SDL_SYSTEM_CURSOR_SIZENWSE),
+            (imgui.MouseCursor.HAND, sdl2.SDL_SYSTEM_CURSOR_HAND),
+            (imgui.MouseCursor.NOT_ALLOWED, sdl2.SDL_SYSTEM_CURSOR_NO),
+        ):
+            cursor = sdl2.SDL_CreateSystemCursor(sdl_cursor)
+            if cursor:
+                self._cursors[imgui_cursor] = cursor
+
+    def _dealloc_cursors(self):
+        for cursor in self._cursors.values():
+            sdl2.SDL_FreeCursor(cursor)
+        self._cursors.clear()
+
+    def _update_mouse_cursor(self):
+        imgui_cursor = imgui.get_mouse_cursor()
+        if imgui_cursor == self._last_cursor:
+            return
+        self._last_cursor = imgui_cursor
+        if imgui_cursor == imgui.MouseCursor.NONE or self.io.mouse_draw_cursor:
+            sdl2.SDL_ShowCursor(sdl2.SDL_DISABLE)
+        else:
+            cursor = self._cursors.get(imgui_cursor, self._cursors.get(imgui.MouseCursor.ARROW))
+            if cursor is not None:
+                sdl2.SDL_SetCursor(cursor)
+            sdl2.SDL_ShowCursor(sdl2.SDL_ENABLE)
+
+    def _window_size(self) -> tuple[int, int]:
+        w, h = ctypes.c_int(), ctypes.c_int()
+        sdl2.SDL_GetWindowSize(self.window, ctypes.byref(w), ctypes.byref(h))
+        return w.value, h.value
+
+    def _framebuffer_size(self) -> tuple[int, int]:
+        w, h = ctypes.c_int(), ctypes.c_int()
+        sdl2.SDL_GetWindowSizeInPixels(self.window, ctypes.byref(w), ctypes.byref(h))
+        return w.value, h.value
+
+    def _add_mod_keys(self, out: bytearray, mod: int):
+        changed = mod ^ self._key_mods
+        self._key_mods = mod
+        if changed:
+            for sdl_mod, key in _MOD_KEYS:
+                if changed & sdl_mod:
+                    out += _INPUT_EVENT.pack(imgui.IO.INPUT_EVENT_KEY, (mod & sdl_mod) != 0, key, 0.0, 0.0)
+
+    def _drain_events(self) -> list[sdl2.SDL_Event]:
+        sdl2.SDL_PumpEvents()
+        events: list[sdl2.SDL_Event] = []
+        while True:
+            # A fresh array per batch: the returned events are views into it.
+            batch = (sdl2.SDL_Event * _EVENT_BATCH_SIZE)()
+            n = sdl2.SDL_PeepEvents(batch, _EVENT_BATCH_SIZE, sdl2.SDL_GETEVENT, sdl2.SDL_FIRSTEVENT, sdl2.SDL_LASTEVENT)
+            if n <= 0:
+                return events
+            events.extend(batch[:n])
+            if n < _EVENT_BATCH_SIZE:
+                return events
+
+    def process_events(self) -> list[sdl2.SDL_Event]:
+        """
+        Drain the SDL event queue and pass input events to ImGui.
+
+        Call once per frame before `imgui.new_frame()`.  Consecutive mouse motion events are
+        collapsed into their last position and consecutive wheel events are summed, so that a burst
+        of events from a high polling rate mouse becomes a single ImGui input event.  Mouse button,
+        key and text events keep their order relative to the motion.  Modifier keys are only sent
+        when they change.  All of the frame's events are passed to ImGui with one native call.
+
+        Returns: all drained events, for the application's own handling (e.g., `SDL_QUIT`).
+        """
+        events = self._drain_events()
+        IO = imgui.IO
+        pack = _INPUT_EVENT.pack
+        out = bytearray()
+        # Pending coalesced mouse motion or wheel (never both), flushed before any other event.
+        mouse_pos: tuple[float, float] | None = None
+        wheel_x = wheel_y = 0.0
+
+        def flush_mouse():
+            nonlocal mouse_pos, wheel_x, wheel_y
+            if mouse_pos is not None:
+                out.extend(pack(IO.INPUT_EVENT_MOUSE_POS, 0, 0, *mouse_pos))
+                mouse_pos = None
+            if wheel_x != 0.0 or wheel_y != 0.0:
+                out.extend(pack(IO.INPUT_EVENT_MOUSE_WHEEL, 0, 0, wheel_x, wheel_y))
+                wheel_x = wheel_y = 0.0
+
+        for event in events:
+            t = event.type
+            if t == sdl2.SDL_MOUSEMOTION:
+                if event.motion.windowID != self._window_id:
+                    continue
+                if wheel_x != 0.0 or wheel_y != 0.0:
+                    flush_mouse()
+                mouse_pos = (float(event.motion.x), float(event.motion.y))
+            elif t == sdl2.SDL_MOUSEWHEEL:
+                if event.wheel.windowID != self._window_id:
+                    continue
+                if mouse_pos is not None:
+                    flush_mouse()
+                # SDL's positive x scrolls right, ImGui's scrolls left.
+                wheel_x -= event.wheel.preciseX * self.mouse_wheel_multiplier
+                wheel_y += event.wheel.preciseY * self.mouse_wheel_multiplier
+            elif t in (sdl2.SDL_MOUSEBUTTONDOWN, sdl2.SDL_MOUSEBUTTONUP):
+                button = _MOUSE_BUTTONS.get(event.button.button)
+                if event.button.windowID != self._window_id or button is None:
+                    continue
+                flush_mouse()
+                source = imgui.MouseSource.TOUCH_SCREEN if event.button.which == sdl2.SDL_TOUCH_MOUSEID else imgui.MouseSource.MOUSE
+                out += pack(IO.INPUT_EVENT_MOUSE_SOURCE, 0, source, 0.0, 0.0)
+                out += pack(IO.INPUT_EVENT_MOUSE_BUTTON, t == sdl2.SDL_MOUSEBUTTONDOWN, button, 0.0, 0.0)
+            elif t in (sdl2.SDL_KEYDOWN, sdl2.SDL_KEYUP):
+                if event.key.windowID != self._window_id:
+                    continue
+                # ImGui handles key repeat itself.
+                if event.key.repeat:
+                    self.input_events += 1
+                    continue
+                flush_mouse()
+                self._add_mod_keys(out, event.key.keysym.mod)
+                key = _KEY_MAP.get(event.key.keysym.sym)
+                if key is not None:
+                    out += pack(IO.INPUT_EVENT_KEY, t == sdl2.SDL_KEYDOWN, key, 0.0, 0.0)
+            elif t == sdl2.SDL_TEXTINPUT:
+                if event.text.windowID != self._window_id:
+                    continue
+                flush_mouse()
+                for char in event.text.text.decode("utf-8", errors="replace"):
+                    out += pack(IO.INPUT_EVENT_CHAR, 0, ord(char), 0.0, 0.0)
+            elif t == sdl2.SDL_WINDOWEVENT:
+                if event.window.windowID != self._window_id:
+                    continue
+                window_event = event.window.event
+                if window_event == sdl2.SDL_WINDOWEVENT_LEAVE:
+                    flush_mouse()
+                    out += pack(IO.INPUT_EVENT_MOUSE_POS, 0, 0, -_FLT_MAX, -_FLT_MAX)
+                elif window_event in (sdl2.SDL_WINDOWEVENT_FOCUS_GAINED, sdl2.SDL_WINDOWEVENT_FOCUS_LOST):
+                    flush_mouse()
+                    out += pack(IO.INPUT_EVENT_FOCUS, window_event == sdl2.SDL_WINDOWEVENT_FOCUS_GAINED, 0, 0.0, 0.0)
+                    if window_event == sdl2.SDL_WINDOWEVENT_FOCUS_LOST:
+                        # ImGui releases all keys when focus is lost, modifiers held on return must be sent again.
+                        self._key_mods = 0
+                else:
+                    continue
+            else:
+                continue
+            self.input_events += 1
+        flush_mouse()
+        if out:
+            self.io.add_input_events(bytes(out))
+        return events
+
+    def new_frame(self):
+        w, h = self._window_size()
+        fb_w, fb_h = self._framebuffer_size()
+        self.io.display_size = w, h
+        if w > 0 and h > 0:
+            self.io.display_framebuffer_scale = float(fb_w) / float(w), float(fb_h) / float(h)
+
+        current_time = sdl2.SDL_GetPerformanceCounter()
+        if self._gui_time:
+            self.io.delta_time = (current_time - self._gui_time) / self._frequency
+        else:
+            self.io.delta_time = 1.0 / 60.0
+        if self.io.delta_time <= 0.0:
+            self.io.delta_time = 1.0 / 1000.0
+        self._gui_time = current_time
+
+        # Mouse cursor style changes
+        self._update_mouse_cursor()
+
+    def shutdown(self):
+        self.renderer.shutdown()
+        self._dealloc_cursors()
+
+    def render(self, draw_data: imgui.DrawData):
+        self.renderer.render(draw_data)
+
+    def swap_buffers(self):
+        sdl2.SDL_GL_SwapWindow(self.window)
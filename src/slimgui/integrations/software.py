@@ -0,0 +1,43 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from slimgui import imgui
+from slimgui.slimgui_ext import render
+
+from .base import BaseRenderer
+
+class SoftwareRenderer(BaseRenderer):
+    """
+    ImGui renderer that rasterizes draw data on the CPU into NumPy images, no GPU or GL context needed.
+
+    Useful for headless screenshots, server-side rendering and UI regression tests.  Each `render()`
+    call returns an `(height, width, 4)` uint8 RGBA array (top row first) and stores it in `image`.
+    Triangles are rasterized natively in parallel tiles, see `render.SoftwareRenderer`.
+
+    The output closely matches the OpenGL renderers but isn't guaranteed to be bit-identical
+    (GPU rasterizers differ in interpolation precision).
+
+    Note: most methods assume the current imgui context is set.
+    """
+
+    def __init__(self, num_threads: int = 0, tile_size: int = 64, clear_color: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 1.0)):
+        super().__init__()
+        self.clear_color = clear_color
+        self.image: NDArray[np.uint8] | None = None
+        self._renderer = render.SoftwareRenderer(num_threads, tile_size)
+        # Textures are plain memory, limit them only by what ImGui supports.
+        self.max_texture_size = 16384
+
+        io = imgui.get_io()
+        io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+
+    def render(self, draw_data: imgui.DrawData) -> NDArray[np.uint8]:
+        self.image = self._renderer.render(draw_data, self.clear_color)
+        return self.image
+
+    def shutdown(self):
+        # Destroy all textures
+        for tex in imgui.get_platform_io().textures:
+            if tex.ref_count == 1:
+                self._renderer.destroy_texture(tex)
@@ -1 +1 @@
-from . import imgui as imgui, implot as implot
+from . import imgui as imgui, implot as implot, render as render
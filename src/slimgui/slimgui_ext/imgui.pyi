@@ -140,6 +140,15 @@ class FontAtlas:
 
     def clear_tex_data(self) -> None: ...
 
+    @property
+    def tex_desired_format(self) -> TextureFormat:
+        """
+        Texture format of the atlas, `TextureFormat.RGBA32` (default) or `TextureFormat.ALPHA8`.  `ALPHA8` uses a quarter of the memory but requires renderer support and can't hold colored glyphs.  Set before the atlas is built.
+        """
+
+    @tex_desired_format.setter
+    def tex_desired_format(self, arg: TextureFormat, /) -> None: ...
+
     def get_tex_data_as_rgba32(self) -> tuple[int, int, bytes]: ...
 
     @property
@@ -554,6 +563,22 @@ class IO:
         Set master flag for accepting key/mouse/text events (default to true).  Useful if you have native dialog boxes that are interrupting your application loop/refresh, and you want to disable events being queued while your app is frozen.
         """
 
+    def add_input_events(self, events: bytes) -> None:
+        """
+        Queue a batch of input events with a single call, e.g., a frame's worth of events from a platform event
+        queue.  `events` is an array of 16-byte little-endian records `struct.Struct("<HHiff")`:
+        `(type, down, value, x, y)`, with `type` one of the `IO.INPUT_EVENT_*` constants:
+
+        - `INPUT_EVENT_MOUSE_POS`, `INPUT_EVENT_MOUSE_WHEEL`: `x`, `y`
+        - `INPUT_EVENT_MOUSE_BUTTON`: `value` is the button, `down`
+        - `INPUT_EVENT_MOUSE_SOURCE`: `value` is a `MouseSource`
+        - `INPUT_EVENT_KEY`: `value` is a `Key`, `down`
+        - `INPUT_EVENT_CHAR`: `value` is a Unicode code point
+        - `INPUT_EVENT_FOCUS`: `down` is the focus state
+
+        Unused fields are ignored.  Events are queued in order, like the corresponding `add_*_event()` calls.
+        """
+
     def clear_events_queue(self) -> None:
         """Clear all incoming events."""
 
@@ -889,6 +914,20 @@ class IO:
     @property
     def key_super(self) -> bool: ...
 
+    INPUT_EVENT_MOUSE_POS: int = 1
+
+    INPUT_EVENT_MOUSE_WHEEL: int = 2
+
+    INPUT_EVENT_MOUSE_BUTTON: int = 3
+
+    INPUT_EVENT_MOUSE_SOURCE: int = 4
+
+    INPUT_EVENT_KEY: int = 5
+
+    INPUT_EVENT_CHAR: int = 6
+
+    INPUT_EVENT_FOCUS: int = 7
+
 class PlatformIO:
     @property
     def renderer_texture_max_width(self) -> int: ...
@@ -970,6 +1009,19 @@ class TextureData:
         Get texture data as an `ndarray` starting at `x, y` corner.  Note that the pixel stride is the same as in the original texture.
         """
 
+    def get_coalesced_updates(self) -> list[TextureRect]:
+        """
+        Like `updates`, but overlapping or nearby rectangles are merged to reduce the number of uploads.  Merged rectangles
+        may include pixels that weren't updated, but at least half of each merged rectangle consists of updated pixels.
+        """
+
+    def copy_pixels(self, x: int, y: int, w: int, h: int, dst: int, dst_size: int) -> int:
+        """
+        Copy the pixels of rectangle `x, y, w, h` tightly packed (row stride `w * bytes_per_pixel`) into memory at address `dst`.
+
+        Returns: number of bytes written.
+        """
+
     def get_tex_id(self) -> int:
         """Backend-specific texture identifier."""
 
@@ -1019,6 +1071,17 @@ class DrawCmd:
         Returns: `DrawListCallbackResult` which the backend should always handle.  See docs for `DrawListCallbackResult`.
         """
 
+class DrawListBuffers:
+    """
+    Owner of the NumPy views returned by `DrawList.vtx_buffer_array()` and `idx_buffer_array()`.  When the
+    frame ends, the viewed buffers are moved out of ImGui's draw lists into this object, so views used after
+    `new_frame()` never point to freed memory.
+    """
+
+    @property
+    def valid(self) -> bool:
+        """False once the frame the views were taken in has ended."""
+
 class DrawList:
     @property
     def vtx_buffer_size(self) -> int: ...
@@ -1035,6 +1098,57 @@ class DrawList:
     @property
     def commands(self) -> Iterator[DrawCmd]: ...
 
+    def vtx_buffer_array(self) -> NDArray[Any]:
+        """
+        NumPy view of the vertex buffer without copying, a structured array with fields `pos` (2 x float32),
+        `uv` (2 x float32) and `col` (uint32, packed ABGR).
+
+        The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that
+        raises `RuntimeError`.  Use `copy()` to keep the vertices.  Adding primitives to the list may move its
+        buffers, so take the view once the list is complete, e.g., after `render()`.
+        """
+
+    def idx_buffer_array(self) -> NDArray[Any]:
+        """
+        NumPy view of the index buffer without copying, uint16 or uint32 elements depending on `INDEX_SIZE`.
+
+        The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that
+        raises `RuntimeError`.  Use `copy()` to keep the indices.  Adding primitives to the list may move its
+        buffers, so take the view once the list is complete, e.g., after `render()`.
+        """
+
+    def commands_array(self, draw_list_index: int = 0) -> NDArray[Any]:
+        """
+        All draw commands as a NumPy structured array with one record per `DrawCmd`.  Fields:
+
+        - `tex_id` (uint64): texture identifier, 0 if the texture hasn't been created yet
+        - `clip_rect` (4 x float32): clipping rectangle (x1, y1, x2, y2)
+        - `vtx_offset`, `idx_offset`, `elem_count` (uint32): same as in `DrawCmd`
+        - `has_callback` (bool): the command is a callback, see `DrawCmd.run_callback()`
+        - `draw_list_index` (int32): index of the command's `DrawList` in `DrawData.commands_lists`
+
+        The array is a copy and stays valid after the frame ends.
+        """
+
+    def multi_draw_batches(self, vtx_base: int = 0, idx_base: int = 0) -> tuple[NDArray[Any], NDArray[Any], NDArray[Any], NDArray[Any]]:
+        """
+        Group the draw commands into runs that can each be submitted with a single `glMultiDrawElementsBaseVertex` call.
+        Consecutive commands with the same texture and clip rectangle form a run, callback commands are runs of their own
+        and zero-element commands are dropped.  `vtx_base` and `idx_base` are added to the command vertex and index offsets,
+        for when the list's geometry isn't at the start of the GPU buffers.
+
+        Returns: `(counts, offsets, base_vertices, runs)` where the first three are the per-command arrays for
+        `glMultiDrawElementsBaseVertex` (`offsets` in bytes).  `runs` is a structured array with fields `tex_id`,
+        `clip_rect`, `draw_start`, `draw_count` (slice of the per-command arrays, `draw_count == 0` for callbacks) and
+        `cmd_index` (index of the run's first command in `commands`).
+        """
+
+    def content_hash(self) -> int:
+        """
+        64-bit hash of the list's vertices, indices and draw commands (clip rectangles, texture IDs, offsets,
+        element counts and callbacks).  Lists with equal hashes render the same pixels.
+        """
+
     def ptr(self) -> int:
         """Internal function for reference book keeping."""
 
@@ -1154,8 +1268,72 @@ class DrawList:
 
     def add_callback(self, callable: int | Callable[[DrawList, DrawCmd, int | bytes], None], userdata: int | bytes) -> None: ...
 
+class DrawListStats:
+    """Geometry and command counts of a `DrawList`, see `DrawData.stats()`."""
+
+    @property
+    def owner_name(self) -> str:
+        """
+        Name of the window that owns the draw list (`##Background` and `##Foreground` for the viewport's lists), empty if it has no owner.
+        """
+
+    @property
+    def vtx_count(self) -> int: ...
+
+    @property
+    def idx_count(self) -> int: ...
+
+    @property
+    def cmd_count(self) -> int: ...
+
+    @property
+    def callback_count(self) -> int:
+        """Commands with a user callback, including render state resets."""
+
+    @property
+    def texture_count(self) -> int:
+        """Distinct textures referenced by the drawing commands."""
+
+    @property
+    def clip_rect_area(self) -> float:
+        """
+        Sum of the areas of the drawing commands' clip rectangles, clamped to the display rectangle.  Overlapping
+        rectangles are counted once per command, so this can exceed the display area.  The area is in display
+        coordinates, also after a renderer scaled the clip rectangles with `DrawData.scale_clip_rects()`.
+        """
+
+class DrawDataStats:
+    """Per-`DrawList` statistics of a frame, returned by `DrawData.stats()`."""
+
+    @property
+    def total(self) -> DrawListStats:
+        """
+        Sums over all draw lists.  `texture_count` is the number of distinct textures in the frame.
+        """
+
+    @property
+    def lists(self) -> list[DrawListStats]:
+        """Statistics of each `DrawList` in `DrawData.commands_lists` order."""
+
 class DrawData:
-    def scale_clip_rects(self, fb_scale: tuple[float, float]) -> None: ...
+    def scale_clip_rects(self, fb_scale: tuple[float, float]) -> None:
+        """
+        Scale the clip rectangles of all draw lists in place, e.g., by `framebuffer_scale` to convert them to
+        framebuffer pixels.  The draw lists are marked as scaled, so that `render.DamageTracker` reads them
+        correctly afterwards.
+        """
+
+    @property
+    def display_pos(self) -> tuple[float, float]:
+        """
+        Top-left position of the viewport to render (== top-left of the orthogonal projection matrix to use) (== `Viewport.pos` for the main viewport, == (0,0) in most single-viewport applications).
+        """
+
+    @property
+    def display_size(self) -> tuple[float, float]:
+        """
+        Size of the viewport to render (== `Viewport.size` for the main viewport, == `IO.display_size` in most single-viewport applications).
+        """
 
     @property
     def framebuffer_scale(self) -> tuple[float, float]:
@@ -1163,12 +1341,105 @@ class DrawData:
         Amount of pixels for each unit of `display_size`. Copied from `Viewport.framebuffer_scale` (`== IO.display_framebuffer_scale` for main viewport). Generally (1,1) on normal display, (2,2) on OSX with Retina display.
         """
 
+    @property
+    def cmd_lists_count(self) -> int:
+        """Number of `DrawList`s to render."""
+
+    @property
+    def total_idx_count(self) -> int:
+        """For convenience, sum of all `DrawList.idx_buffer_size`."""
+
+    @property
+    def total_vtx_count(self) -> int:
+        """For convenience, sum of all `DrawList.vtx_buffer_size`."""
+
+    def copy_vtx_buffers(self, dst: int, dst_size: int) -> int:
+        """
+        Copy the vertex buffers of all `DrawList`s back to back into memory at address `dst`.
+        `dst_size` must be at least `total_vtx_count * VERTEX_SIZE` bytes.
+
+        Returns: number of bytes written.
+        """
+
+    def copy_idx_buffers(self, dst: int, dst_size: int) -> int:
+        """
+        Copy the index buffers of all `DrawList`s back to back into memory at address `dst`.
+        `dst_size` must be at least `total_idx_count * INDEX_SIZE` bytes.  Indices are not rebased, use
+        per-list vertex offsets (e.g., with `glDrawElementsBaseVertex`) when drawing.
+
+        Returns: number of bytes written.
+        """
+
+    def content_hash(self) -> int:
+        """
+        64-bit hash of all `DrawList`s (see `DrawList.content_hash()`), the display rectangle and
+        `framebuffer_scale`.  Equal hashes mean the draw data renders the same pixels as long as texture contents
+        in use didn't change.  Texture IDs are part of the hash, compute it after the renderer has created
+        the frame's textures (`TextureData.status == WANT_CREATE`).
+        """
+
+    def commands_array(self) -> NDArray[Any]:
+        """
+        All draw commands as a NumPy structured array with one record per `DrawCmd`.  Fields:
+
+        - `tex_id` (uint64): texture identifier, 0 if the texture hasn't been created yet
+        - `clip_rect` (4 x float32): clipping rectangle (x1, y1, x2, y2)
+        - `vtx_offset`, `idx_offset`, `elem_count` (uint32): same as in `DrawCmd`
+        - `has_callback` (bool): the command is a callback, see `DrawCmd.run_callback()`
+        - `draw_list_index` (int32): index of the command's `DrawList` in `DrawData.commands_lists`
+
+        The array is a copy and stays valid after the frame ends.
+        """
+
     @property
     def commands_lists(self) -> Iterator[DrawList]: ...
 
     @property
     def textures(self) -> Iterator[TextureData] | None: ...
 
+    def stats(self) -> DrawDataStats:
+        """
+        Vertex, index, command, callback and texture counts and clip rectangle area of each `DrawList`, with its
+        owner window's name.  Use it to find out which windows produce the geometry counted in
+        `IO.metrics_render_vertices`.  Computed when called, there's no cost otherwise.
+        """
+
+    def merge_commands(self) -> int:
+        """
+        Merge adjacent draw commands in place, call after `render()` and before the renderer.  Commands with
+        the same texture, vertex offset and contiguous indices are merged if their clip rectangles are equal
+        or if the union of the rectangles clips the same pixels (the geometry lies at least one unit inside
+        its own rectangle).  Commands without elements are dropped, callbacks are never merged.
+
+        Returns: number of commands removed.
+        """
+
+    def snapshot(self) -> DrawDataSnapshot:
+        """
+        Deep copy of the draw lists, see `DrawDataSnapshot`.  The copy is made with the GIL released into
+        buffers recycled from snapshots that have been garbage collected, so taking one snapshot per frame
+        doesn't allocate once the buffers have grown to the frame's size.
+        """
+
+class DrawDataSnapshot(DrawData):
+    """
+    Copy of a frame's `DrawData` returned by `DrawData.snapshot()`.  Stays valid after `new_frame()`,
+    so it can be rendered on another thread while the next frame is built.  The copy's buffers are
+    returned to a pool for later snapshots when it's garbage collected.  The snapshot holds references
+    to the callables passed to `DrawList.add_callback()`, so its callbacks can still be run.
+
+    Textures aren't copied: `textures` lists the `TextureData` objects that had pending requests when
+    the snapshot was taken (see `has_texture_requests`).
+    """
+
+    @property
+    def has_texture_requests(self) -> bool:
+        """
+        True if textures needed to be created, updated or destroyed when the snapshot was taken.  Render
+        such a snapshot before calling `new_frame()` again, as the texture requests are processed on the
+        shared `TextureData` objects.
+        """
+
 class Payload:
     """
     Data payload for Drag and Drop operations: `accept_drag_drop_payload()`, `get_drag_drop_payload()`
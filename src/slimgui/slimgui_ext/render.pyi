@@ -0,0 +1,260 @@
+"""Native renderer backends"""
+
+from collections.abc import Callable
+import enum
+from typing import Annotated, Any
+
+import numpy
+from numpy.typing import NDArray
+
+import slimgui_ext.imgui
+
+
+class GLStatePolicy(enum.Enum):
+    """How much GL state is saved before rendering and restored afterwards."""
+
+    FULL = 0
+    """All state changed by the renderer."""
+
+    MINIMAL = 1
+    """
+    Program, texture, vertex array and array buffer bindings and the blend, cull face, depth, stencil and scissor test enables.  Blend function, viewport, scissor box and polygon mode are left as set by the renderer.
+    """
+
+    NONE = 2
+    """Nothing, for applications where the UI owns the GL context."""
+
+class GLStateSaver:
+    """
+    Save and restore GL state natively, one extension call each instead of a `glGet*` round trip
+    per state variable.  Holds a single backup.
+    """
+
+    def __init__(self, get_proc_address: Callable[[str], int | None]) -> None:
+        """
+        `get_proc_address` maps an OpenGL function name to its address, e.g., `glfw.get_proc_address`.
+        """
+
+    def save(self, policy: GLStatePolicy = GLStatePolicy.FULL) -> None:
+        """Save the GL state selected by `policy`."""
+
+    def restore(self) -> None:
+        """Restore the state saved by the last `save()` call."""
+
+    @property
+    def scissor_test_enabled(self) -> bool:
+        """
+        Whether `GL_SCISSOR_TEST` was enabled at the last `save()` call.  `False` if the policy was `NONE`.
+        """
+
+class OpenGLRenderer:
+    """
+    Native OpenGL 3.3 core renderer.  The whole render loop runs in C++, GL functions are resolved
+    with the `get_proc_address` function passed to the constructor.  Requires a current GL context
+    for all methods.  Deleting the renderer makes no GL calls, call `destroy_device_objects()` with its
+    context current to release its GL objects.
+
+    See `slimgui.integrations.opengl_native.NativeOpenGLRenderer` for a `BaseRenderer` wrapper.
+    """
+
+    def __init__(self, get_proc_address: Callable[[str], int | None]) -> None:
+        """
+        Create the renderer's shader and buffer objects.  `get_proc_address` maps an OpenGL function name to its address, e.g., `glfw.get_proc_address`.
+        """
+
+    @property
+    def max_texture_size(self) -> int:
+        """Value of `GL_MAX_TEXTURE_SIZE`."""
+
+    @property
+    def state_policy(self) -> GLStatePolicy:
+        """
+        GL state saved and restored around `render()`, `GLStatePolicy.FULL` by default.
+        """
+
+    @state_policy.setter
+    def state_policy(self, arg: GLStatePolicy, /) -> None: ...
+
+    def render(self, draw_data: slimgui_ext.imgui.DrawData) -> None:
+        """
+        Update textures and render `draw_data` into the currently bound framebuffer.  The GIL is released
+        while rendering, so a `DrawDataSnapshot` can be submitted on a render thread while Python builds
+        the next frame.
+
+        Callbacks added with `DrawList.add_callback()` are called in order, `DRAW_CALLBACK_RESET_RENDER_STATE` resets the render state.
+        """
+
+    def update_texture(self, tex: slimgui_ext.imgui.TextureData) -> None:
+        """Create, update or destroy `tex` according to its `TextureData.status`."""
+
+    def destroy_texture(self, tex: slimgui_ext.imgui.TextureData) -> None:
+        """Delete the GL texture of `tex` and mark it as destroyed."""
+
+    def destroy_device_objects(self) -> None:
+        """Delete the renderer's shader and buffer objects."""
+
+class SoftwareRenderer:
+    """
+    CPU rasterizer for ImGui draw data.  Renders textured, vertex colored triangles with scissor
+    rectangles into RGBA8 images.  The image is split into `tile_size` x `tile_size` tiles that are
+    rasterized in parallel on `num_threads` threads (0 = all hardware threads) with the GIL released.
+
+    See `slimgui.integrations.software.SoftwareRenderer` for a `BaseRenderer` wrapper.
+    """
+
+    def __init__(self, num_threads: int = 0, tile_size: int = 64) -> None: ...
+
+    @property
+    def num_threads(self) -> int:
+        """Number of rasterizer threads."""
+
+    @property
+    def tile_size(self) -> int:
+        """Width and height of the rasterizer tiles in pixels."""
+
+    def render(self, draw_data: slimgui_ext.imgui.DrawData, clear_color: tuple[float, float, float, float] = (0.0, 0.0, 0.0, 0.0)) -> Annotated[NDArray[numpy.uint8], dict(shape=(None, None, 4), order='C')]:
+        """
+        Update textures and render `draw_data` into a new `(height, width, 4)` uint8 RGBA image cleared to `clear_color`.
+
+        The image size is `DrawData.display_size * DrawData.framebuffer_scale`.  Callbacks added with `DrawList.add_callback()` are called in order before rasterization.
+        """
+
+    def render_into(self, draw_data: slimgui_ext.imgui.DrawData, out: Annotated[NDArray[numpy.uint8], dict(shape=(None, None, 4), order='C')]) -> None:
+        """
+        Update textures and render `draw_data` over the contents of `out`, a C-contiguous `(height, width, 4)` uint8 RGBA array.
+        """
+
+    def update_texture(self, tex: slimgui_ext.imgui.TextureData) -> None:
+        """Create, update or destroy `tex` according to its `TextureData.status`."""
+
+    def destroy_texture(self, tex: slimgui_ext.imgui.TextureData) -> None:
+        """Release the renderer's copy of `tex` and mark it as destroyed."""
+
+class DamageTracker:
+    """
+    Compute the regions of the framebuffer that changed between consecutive frames (damage).
+
+    Draw commands are compared by content hash and pixel bounds, draw lists whose `DrawList.content_hash()`
+    didn't change are skipped.  Redrawing a frame clipped to its damage rectangles (e.g., with
+    `OpenGLRenderer.render(draw_data, damage=...)`) over the previous frame gives the same pixels as a full
+    redraw.  Draw callbacks can't be diffed, their clip rectangles are damaged on every frame.
+
+    Doesn't use any graphics API.
+    """
+
+    def __init__(self, max_rects: int = 16) -> None:
+        """
+        Damage is reported as at most `max_rects` rectangles, more are merged into bounding boxes.
+        """
+
+    @property
+    def max_rects(self) -> int:
+        """Maximum number of rectangles returned by `update()`."""
+
+    def update(self, draw_data: slimgui_ext.imgui.DrawData, buffer_age: int = 1) -> list[tuple[int, int, int, int]]:
+        """
+        Diff `draw_data` against the draw data passed to the previous `update()` call.  Call once per frame,
+        before or after rendering it: clip rectangles already scaled by the renderer (`DrawData.scale_clip_rects()`)
+        are converted back to display coordinates.
+
+        `buffer_age` is the age of the framebuffer contents that will be drawn over, in frames: 1 if it holds
+        the previous frame (e.g., an offscreen render target), `N` for the `N`th frame back (`EGL_EXT_buffer_age`)
+        and 0 if unknown.  Unknown and too old (> `MAX_BUFFER_AGE`) contents, the first frame and display
+        size or scale changes damage the whole framebuffer.
+
+        Returns: disjoint `(x0, y0, x1, y1)` rectangles in framebuffer pixels, top-left origin, `x1` and `y1` exclusive.
+        """
+
+    def reset(self) -> None:
+        """
+        Forget previous frames, the next `update()` damages the whole framebuffer.
+        """
+
+    MAX_BUFFER_AGE: int = 4
+
+class DrawDataRecorder:
+    """
+    Serialize frames into a compact binary stream for offline replay with `DrawDataReader`.
+
+    Each frame is written with its draw lists, draw commands (clip rectangles, texture references,
+    offsets) and the pixels of texture creations and updates.  Draw lists that are unchanged since the
+    previous frame (same content hash) are written as references, frames identical to the previous one as
+    a single small record.  A changed draw list is written as a delta against the previous frame's list of the
+    same window: only the vertex and index bytes that differ are stored, so small changes like a blinking
+    cursor or a counter cost tens of bytes.  User callbacks can't be serialized and are dropped,
+    `DRAW_CALLBACK_RESET_RENDER_STATE` is kept.  The stream compresses further, e.g., with `gzip.open()`.
+    """
+
+    def __init__(self) -> None: ...
+
+    def record(self, draw_data: slimgui_ext.imgui.DrawData, time: float = 0.0) -> bytes:
+        """
+        Serialize `draw_data` and return the bytes to append to the stream, the first call also returns the
+        stream header.  `time` is stored with the frame, e.g., `imgui.get_time()`.
+
+        Call after `imgui.render()` and before the renderer processes the frame's texture requests.
+        """
+
+    def keyframe(self) -> None:
+        """
+        Make the next recorded frame self-contained: its textures and draw lists are written in full, and
+        textures that were destroyed meanwhile are destroyed.  Call after skipping `record()` for some frames,
+        e.g., when a network client falls behind, so that a reader that has read the stream so far can continue.
+        """
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames recorded."""
+
+    @property
+    def bytes_written(self) -> int:
+        """Total size of the stream returned by `record()`."""
+
+    @property
+    def lists_written(self) -> int:
+        """Number of draw lists serialized in full."""
+
+    @property
+    def lists_delta(self) -> int:
+        """Number of draw lists written as deltas against the previous frame."""
+
+    @property
+    def lists_referenced(self) -> int:
+        """Number of draw lists written as references to the previous frame."""
+
+class DrawDataReader:
+    """
+    Decode a stream written by `DrawDataRecorder` into `DrawData` that any renderer can draw.
+
+    Textures are recreated as `TextureData` objects owned by the reader, with the recorded create, update
+    and destroy requests.  Destroy the renderer's copies of `textures` before discarding the reader.  User
+    textures (`TextureRef` with a plain texture ID) keep their recorded IDs.
+    """
+
+    def __init__(self) -> None: ...
+
+    def feed(self, data: bytes) -> None:
+        """
+        Append a chunk of the stream.  Chunks don't need to be aligned with records.
+        """
+
+    def read_frame(self) -> slimgui_ext.imgui.DrawData:
+        """
+        Decode the next frame, `None` if the data fed so far doesn't complete it.  The draw data is valid until
+        the next call, render it (or at least process its texture requests) before reading the next frame.
+        Set `IO.display_size` from `DrawData.display_size` before rendering.
+
+        Raises `ValueError` if the stream is malformed.
+        """
+
+    @property
+    def time(self) -> float:
+        """The `time` of the last frame read."""
+
+    @property
+    def frame_count(self) -> int:
+        """Number of frames read."""
+
+    @property
+    def textures(self) -> list[slimgui_ext.imgui.TextureData]:
+        """The reader's textures that haven't been destroyed."""
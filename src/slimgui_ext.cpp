@@ -8,6 +8,8 @@
 #include <nanobind/stl/string.h>
 #include <nanobind/stl/optional.h>
 #include <nanobind/stl/variant.h>
+#include <algorithm>
+#include <cstring>
 #include <iterator>
 #include <vector>
 #include <array>
@@ -19,8 +21,14 @@ namespace nb = nanobind;
 using namespace nb::literals;
 
 extern void implot_bindings(nb::module_& implot);  // implot_bindings.cpp
+extern void render_bindings(nb::module_& render);  // render_bindings.cpp
 
 #include "type_casts.h"
+#include "draw_hash.h"
+#include "draw_snapshot.h"
+#include "draw_stats.h"
+#include "draw_merge.h"
+#include "draw_scale.h"
 
 using DrawListCallbackCallable = nb::typed<nb::callable, void(ImDrawList*, ImDrawCmd*, std::variant<int64_t, nb::bytes>)>;
 
@@ -96,13 +104,75 @@ static int InputTextCallback(ImGuiInputTextCallbackData* data)
     return 0;
 }
 
+struct DrawListBuffers;
+
 struct ContextBackendData {
     struct SizeConstraints {
         void* callable_ptr;
         uint64_t int_user_data;
     } size_constraints;
+    // Buffers of the context's draw lists that have live NumPy views, see `DrawListBuffers`.
+    std::vector<DrawListBuffers*> viewed_buffers;
 };
 
+// Owner (NumPy base object) of the views returned by `DrawList.vtx_buffer_array()` and
+// `idx_buffer_array()`.  NewFrame() reuses or frees the buffers of the context's draw
+// lists, so before that `detach_viewed_buffers()` moves the viewed buffers out of the
+// lists into their owners.  Views that outlive the frame keep pointing to the frame's
+// data for as long as they're alive, even with `np.asarray()` or the buffer protocol,
+// while `valid` is cleared for the checks of `slimgui.imgui.FrameArray`.
+struct DrawListBuffers {
+    ImDrawList* list;                   // nullptr once detached
+    ContextBackendData* context;        // nullptr if not registered with a context
+    ImVector<ImDrawVert> vtx;           // the list's buffers after they're detached
+    ImVector<ImDrawIdx> idx;
+    bool valid = true;
+
+    DrawListBuffers(ImDrawList* list, ContextBackendData* context) : list(list), context(context) {
+        if (context)
+            context->viewed_buffers.push_back(this);
+    }
+
+    ~DrawListBuffers() {
+        if (context)
+            context->viewed_buffers.erase(std::find(context->viewed_buffers.begin(), context->viewed_buffers.end(), this));
+    }
+
+    void detach() {
+        vtx.swap(list->VtxBuffer);
+        idx.swap(list->IdxBuffer);
+        list = nullptr;
+        context = nullptr;
+        valid = false;
+    }
+};
+
+// Called before the context's draw lists are reset or destroyed.
+static void detach_viewed_buffers(ContextBackendData* context) {
+    for (DrawListBuffers* buffers : context->viewed_buffers)
+        buffers->detach();
+    context->viewed_buffers.clear();
+}
+
+// Owner of `list`'s views, shared by all views of the list taken during a frame.  Only the
+// current context's lists are registered: other lists, e.g., those of a `DrawDataSnapshot`,
+// aren't reset by NewFrame().
+static nb::object draw_list_buffers(ImDrawList* list) {
+    ContextBackendData* context = nullptr;
+    if (ImGui::GetCurrentContext() != nullptr && list->_Data == ImGui::GetDrawListSharedData()) {
+        context = static_cast<ContextBackendData*>(ImGui::GetIO().BackendLanguageUserData);
+        for (DrawListBuffers* buffers : context->viewed_buffers)
+            if (buffers->list == list)
+                return nb::borrow(nb::find(buffers));
+    }
+    return nb::cast(new DrawListBuffers(list, context), nb::rv_policy::take_ownership);
+}
+
+// Wrap a view of a draw list buffer in `slimgui.imgui.FrameArray`.
+static nb::object frame_array(nb::object view, nb::handle buffers) {
+    return nb::module_::import_("slimgui.imgui._frame_array").attr("FrameArray").attr("view_of")(view, buffers);
+}
+
 static void window_size_constraints_callback_py_wrapper(ImGuiSizeCallbackData* cb_data) {
     ContextBackendData* userdata = static_cast<ContextBackendData*>(cb_data->UserData);
     auto callable_ptr = static_cast<PyObject*>(userdata->size_constraints.callable_ptr);
@@ -121,6 +191,8 @@ static void window_size_constraints_callback_py_wrapper(ImGuiSizeCallbackData* c
 
 
 static void drawlist_callback_py_wrapper(const ImDrawList* parent_list, const ImDrawCmd* cmd) {
+    // Renderers may call this with the GIL released, e.g., `GLRenderer.render()` on a render thread.
+    nb::gil_scoped_acquire acquire;
     auto callable_ptr = static_cast<PyObject*>(((void**)cmd->UserCallbackData)[0]);
     try {
         // callable ptr is used to mark userdata data variant (raw int or Python bytes)
@@ -153,6 +225,27 @@ static void drawlist_callback_py_wrapper(const ImDrawList* parent_list, const Im
 }
 
 
+// `DrawDataSnapshot` that owns references to the Python callables of its
+// `DrawList.add_callback()` commands.  The draw lists only store borrowed pointers,
+// the references that keep them alive (`DrawList._callback_refs`) are dropped by
+// the next `new_frame()`, which a snapshot outlives.
+struct PyDrawDataSnapshot : DrawDataSnapshot {
+    explicit PyDrawDataSnapshot(const ImDrawData* src) : DrawDataSnapshot(src) {}
+
+    // Called with the GIL held, after the copy has been made without it.
+    void retainCallables() {
+        for (const ImDrawList* draw_list : CmdLists)
+            for (const ImDrawCmd& cmd : draw_list->CmdBuffer)
+                if (cmd.UserCallback == &drawlist_callback_py_wrapper) {
+                    uintptr_t callable_ptr = (uintptr_t)((void**)cmd.UserCallbackData)[0] & ~(uintptr_t)1;
+                    callables.push_back(nb::borrow((PyObject*)callable_ptr));
+                }
+    }
+
+    // Released when nanobind destroys the snapshot, which happens with the GIL held.
+    std::vector<nb::object> callables;
+};
+
 // Used as the type for nanobind instead of binding ImGuiContext directly.  Binding
 // ImGuiContext directly triggers ocornut/imgui#7676
 struct Context {
@@ -167,6 +260,255 @@ struct Context {
     }
 };
 
+// Copy the vertex or index buffers of every draw list in `draw_data` back to
+// back into `dst`.  Used by renderers that upload all geometry with a single
+// buffer upload per frame.
+template<typename T>
+static size_t copy_draw_data_buffers(const ImDrawData* draw_data, ImVector<T> ImDrawList::*buffer, uintptr_t dst, size_t dst_size) {
+    size_t total_bytes = 0;
+    for (const ImDrawList* draw_list : draw_data->CmdLists) {
+        total_bytes += (draw_list->*buffer).size_in_bytes();
+    }
+    if (total_bytes > dst_size) {
+        throw std::length_error("`dst_size` is too small to hold the draw data buffers.");
+    }
+    uint8_t* out = (uint8_t*)dst;
+    for (const ImDrawList* draw_list : draw_data->CmdLists) {
+        const ImVector<T>& src = draw_list->*buffer;
+        memcpy(out, src.Data, src.size_in_bytes());
+        out += src.size_in_bytes();
+    }
+    return total_bytes;
+}
+
+// Record of the packed input event arrays passed to `IO.add_input_events()`.
+struct InputEventRecord {
+    uint16_t type;
+    uint16_t down;  // button/key down, focused
+    int32_t value;  // button, key, mouse source or character code point
+    float x, y;     // mouse position or wheel
+};
+static_assert(sizeof(InputEventRecord) == 16, "InputEventRecord must be packed");
+
+enum InputEventType : uint16_t {
+    InputEvent_MousePos = 1,
+    InputEvent_MouseWheel = 2,
+    InputEvent_MouseButton = 3,
+    InputEvent_MouseSource = 4,
+    InputEvent_Key = 5,
+    InputEvent_Char = 6,
+    InputEvent_Focus = 7,
+};
+
+static void add_input_events(ImGuiIO* io, nb::bytes data) {
+    if (data.size() % sizeof(InputEventRecord) != 0)
+        throw std::invalid_argument("Input event data size must be a multiple of 16 bytes.");
+    size_t count = data.size() / sizeof(InputEventRecord);
+    for (size_t i = 0; i < count; i++) {
+        InputEventRecord e;
+        memcpy(&e, (const char*)data.c_str() + i * sizeof(e), sizeof(e));
+        switch (e.type) {
+        case InputEvent_MousePos: io->AddMousePosEvent(e.x, e.y); break;
+        case InputEvent_MouseWheel: io->AddMouseWheelEvent(e.x, e.y); break;
+        case InputEvent_MouseButton: io->AddMouseButtonEvent(e.value, e.down != 0); break;
+        case InputEvent_MouseSource: io->AddMouseSourceEvent((ImGuiMouseSource)e.value); break;
+        case InputEvent_Key: io->AddKeyEvent((ImGuiKey)e.value, e.down != 0); break;
+        case InputEvent_Char: io->AddInputCharacter((unsigned int)e.value); break;
+        case InputEvent_Focus: io->AddFocusEvent(e.down != 0); break;
+        default:
+            throw std::invalid_argument("Unknown input event type " + std::to_string(e.type) + ".");
+        }
+    }
+}
+
+// Record layout of the NumPy structured arrays returned by `commands_array()`.
+struct DrawCmdRecord {
+    uint64_t tex_id;
+    float clip_rect[4];
+    uint32_t vtx_offset;
+    uint32_t idx_offset;
+    uint32_t elem_count;
+    bool has_callback;
+    int32_t draw_list_index;
+};
+
+static nb::object draw_cmd_dtype() {
+    nb::dict spec;
+    spec["names"] = nb::make_tuple("tex_id", "clip_rect", "vtx_offset", "idx_offset", "elem_count", "has_callback", "draw_list_index");
+    spec["formats"] = nb::make_tuple("u8", "(4,)f4", "u4", "u4", "u4", "?", "i4");
+    spec["offsets"] = nb::make_tuple(
+        offsetof(DrawCmdRecord, tex_id), offsetof(DrawCmdRecord, clip_rect), offsetof(DrawCmdRecord, vtx_offset),
+        offsetof(DrawCmdRecord, idx_offset), offsetof(DrawCmdRecord, elem_count), offsetof(DrawCmdRecord, has_callback),
+        offsetof(DrawCmdRecord, draw_list_index));
+    spec["itemsize"] = sizeof(DrawCmdRecord);
+    return nb::module_::import_("numpy").attr("dtype")(spec);
+}
+
+static void fill_draw_cmd_records(const ImDrawList* draw_list, int draw_list_index, DrawCmdRecord* out) {
+    for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+        // Don't use ImDrawCmd::GetTexID() here, it asserts on textures that the backend hasn't created yet.
+        out->tex_id = (uint64_t)(cmd.TexRef._TexData ? cmd.TexRef._TexData->TexID : cmd.TexRef._TexID);
+        out->clip_rect[0] = cmd.ClipRect.x;
+        out->clip_rect[1] = cmd.ClipRect.y;
+        out->clip_rect[2] = cmd.ClipRect.z;
+        out->clip_rect[3] = cmd.ClipRect.w;
+        out->vtx_offset = cmd.VtxOffset;
+        out->idx_offset = cmd.IdxOffset;
+        out->elem_count = cmd.ElemCount;
+        out->has_callback = cmd.UserCallback != nullptr;
+        out->draw_list_index = draw_list_index;
+        out++;
+    }
+}
+
+// Build a structured array of `count` records of type `Record`.  `fill` writes the records.
+template<typename Record, typename Fill>
+static nb::object make_record_array(size_t count, nb::handle dtype, Fill&& fill) {
+    Record* records = new Record[count]();
+    nb::capsule owner(records, [](void* p) noexcept { delete[] (Record*)p; });
+    fill(records);
+    nb::object bytes = nb::cast(nb::ndarray<nb::numpy, uint8_t, nb::ndim<1>>(records, { count * sizeof(Record) }, owner));
+    return bytes.attr("view")(dtype);
+}
+
+template<typename Fill>
+static nb::object make_draw_cmd_array(size_t count, Fill&& fill) {
+    return make_record_array<DrawCmdRecord>(count, draw_cmd_dtype(), fill);
+}
+
+static nb::object draw_vert_dtype() {
+    nb::dict spec;
+    spec["names"] = nb::make_tuple("pos", "uv", "col");
+    spec["formats"] = nb::make_tuple("(2,)f4", "(2,)f4", "u4");
+    spec["offsets"] = nb::make_tuple(offsetof(ImDrawVert, pos), offsetof(ImDrawVert, uv), offsetof(ImDrawVert, col));
+    spec["itemsize"] = sizeof(ImDrawVert);
+    return nb::module_::import_("numpy").attr("dtype")(spec);
+}
+
+// Move `v` into a 1D NumPy array without copying.
+template<typename T>
+static nb::ndarray<nb::numpy, T, nb::ndim<1>> vector_to_ndarray(std::vector<T>&& v) {
+    auto* data = new std::vector<T>(std::move(v));
+    nb::capsule owner(data, [](void* p) noexcept { delete (std::vector<T>*)p; });
+    return nb::ndarray<nb::numpy, T, nb::ndim<1>>(data->data(), { data->size() }, owner);
+}
+
+// A run of draw commands that share texture and clip rectangle, used for
+// `glMultiDrawElementsBaseVertex` style batching.  Runs with `draw_count == 0`
+// are callback commands.
+struct DrawRunRecord {
+    uint64_t tex_id;
+    float clip_rect[4];
+    int32_t draw_start;
+    int32_t draw_count;
+    int32_t cmd_index;
+};
+
+static nb::object draw_run_dtype() {
+    nb::dict spec;
+    spec["names"] = nb::make_tuple("tex_id", "clip_rect", "draw_start", "draw_count", "cmd_index");
+    spec["formats"] = nb::make_tuple("u8", "(4,)f4", "i4", "i4", "i4");
+    spec["offsets"] = nb::make_tuple(
+        offsetof(DrawRunRecord, tex_id), offsetof(DrawRunRecord, clip_rect), offsetof(DrawRunRecord, draw_start),
+        offsetof(DrawRunRecord, draw_count), offsetof(DrawRunRecord, cmd_index));
+    spec["itemsize"] = sizeof(DrawRunRecord);
+    return nb::module_::import_("numpy").attr("dtype")(spec);
+}
+
+static nb::tuple build_multi_draw_batches(const ImDrawList* draw_list, int vtx_base, int idx_base) {
+    std::vector<int32_t> counts;
+    std::vector<uintptr_t> offsets;
+    std::vector<int32_t> base_vertices;
+    std::vector<DrawRunRecord> runs;
+    counts.reserve(draw_list->CmdBuffer.Size);
+    offsets.reserve(draw_list->CmdBuffer.Size);
+    base_vertices.reserve(draw_list->CmdBuffer.Size);
+
+    for (int i = 0; i < draw_list->CmdBuffer.Size; i++) {
+        const ImDrawCmd& cmd = draw_list->CmdBuffer[i];
+        uint64_t tex_id = (uint64_t)(cmd.TexRef._TexData ? cmd.TexRef._TexData->TexID : cmd.TexRef._TexID);
+        if (cmd.UserCallback == nullptr) {
+            if (cmd.ElemCount == 0)
+                continue;
+            DrawRunRecord* last = runs.empty() ? nullptr : &runs.back();
+            bool extends_last = last && last->draw_count > 0 && last->tex_id == tex_id &&
+                memcmp(last->clip_rect, &cmd.ClipRect, sizeof(last->clip_rect)) == 0;
+            if (!extends_last) {
+                runs.push_back({ tex_id, { cmd.ClipRect.x, cmd.ClipRect.y, cmd.ClipRect.z, cmd.ClipRect.w }, (int32_t)counts.size(), 0, i });
+            }
+            runs.back().draw_count++;
+            counts.push_back((int32_t)cmd.ElemCount);
+            offsets.push_back((uintptr_t)(idx_base + cmd.IdxOffset) * sizeof(ImDrawIdx));
+            base_vertices.push_back((int32_t)(vtx_base + cmd.VtxOffset));
+        } else {
+            runs.push_back({ tex_id, { cmd.ClipRect.x, cmd.ClipRect.y, cmd.ClipRect.z, cmd.ClipRect.w }, (int32_t)counts.size(), 0, i });
+        }
+    }
+
+    nb::object runs_array = make_record_array<DrawRunRecord>(runs.size(), draw_run_dtype(), [&](DrawRunRecord* out) {
+        if (!runs.empty())
+            memcpy(out, runs.data(), runs.size() * sizeof(DrawRunRecord));
+    });
+    return nb::make_tuple(vector_to_ndarray(std::move(counts)), vector_to_ndarray(std::move(offsets)), vector_to_ndarray(std::move(base_vertices)), runs_array);
+}
+
+static const char* commands_array_doc =
+    "All draw commands as a NumPy structured array with one record per `DrawCmd`.  Fields:\n"
+    "\n"
+    "- `tex_id` (uint64): texture identifier, 0 if the texture hasn't been created yet\n"
+    "- `clip_rect` (4 x float32): clipping rectangle (x1, y1, x2, y2)\n"
+    "- `vtx_offset`, `idx_offset`, `elem_count` (uint32): same as in `DrawCmd`\n"
+    "- `has_callback` (bool): the command is a callback, see `DrawCmd.run_callback()`\n"
+    "- `draw_list_index` (int32): index of the command's `DrawList` in `DrawData.commands_lists`\n"
+    "\n"
+    "The array is a copy and stays valid after the frame ends.";
+
+// Merge overlapping or nearby texture update rectangles (e.g., glyphs baked
+// next to each other on the same atlas row) to reduce the number of texture
+// upload calls.  Rectangles at most `max_gap` pixels apart are merged as long
+// as at least half of the merged bounding box consists of updated pixels.
+// Uploading the extra pixels is harmless as the CPU-side copy of the texture
+// is always up to date.
+//
+// A single sweep over the rectangles sorted by row: each one is merged into a
+// previous result that it can still reach vertically, so a burst of hundreds
+// of glyph uploads stays cheap.
+static std::vector<ImTextureRect> coalesce_texture_rects(const ImVector<ImTextureRect>& updates, int max_gap = 2) {
+    std::vector<ImTextureRect> sorted(updates.begin(), updates.end());
+    std::sort(sorted.begin(), sorted.end(), [](const ImTextureRect& a, const ImTextureRect& b) {
+        return a.y != b.y ? a.y < b.y : a.x < b.x;
+    });
+    std::vector<ImTextureRect> rects;
+    std::vector<int> updated_pixels;
+    std::vector<size_t> active; // indices of results that rectangles further down can still reach
+    for (const ImTextureRect& b : sorted) {
+        active.erase(std::remove_if(active.begin(), active.end(), [&](size_t i) {
+            return rects[i].y + rects[i].h + max_gap < b.y;
+        }), active.end());
+        bool merged = false;
+        // The most recent results are the likeliest neighbors, e.g., the previous glyph on the same row.
+        for (auto it = active.rbegin(); it != active.rend() && !merged; ++it) {
+            ImTextureRect& a = rects[*it];
+            if (a.x > b.x + b.w + max_gap || b.x > a.x + a.w + max_gap || a.y > b.y + b.h + max_gap || b.y > a.y + a.h + max_gap)
+                continue;
+            int x0 = ImMin(a.x, b.x), y0 = ImMin(a.y, b.y);
+            int x1 = ImMax(a.x + a.w, b.x + b.w), y1 = ImMax(a.y + a.h, b.y + b.h);
+            int pixels = updated_pixels[*it] + b.w * b.h;
+            if ((x1 - x0) * (y1 - y0) > 2 * pixels)
+                continue;
+            a = ImTextureRect{ (unsigned short)x0, (unsigned short)y0, (unsigned short)(x1 - x0), (unsigned short)(y1 - y0) };
+            updated_pixels[*it] = pixels;
+            merged = true;
+        }
+        if (!merged) {
+            active.push_back(rects.size());
+            rects.push_back(b);
+            updated_pixels.push_back(b.w * b.h);
+        }
+    }
+    return rects;
+}
+
 enum DrawListCallbackResult
 {
     DRAW = 0,
@@ -234,6 +576,9 @@ NB_MODULE(slimgui_ext, top) {
             return fonts->AddFontFromMemoryTTF(data, font_data.size(), size_pixels, &cfg, nullptr);
         }, nb::rv_policy::reference_internal, "font_data"_a, "size_pixels"_a = 0.f, nb::arg("font_cfg").none() = std::nullopt)
         .def("clear_tex_data", &ImFontAtlas::ClearTexData)
+        .def_rw("tex_desired_format", &ImFontAtlas::TexDesiredFormat,
+            "Texture format of the atlas, `TextureFormat.RGBA32` (default) or `TextureFormat.ALPHA8`.  `ALPHA8` uses a "
+            "quarter of the memory but requires renderer support and can't hold colored glyphs.  Set before the atlas is built.")
         .def("get_tex_data_as_rgba32", [](ImFontAtlas* fonts) {
             int tex_w, tex_h;
             unsigned char* tex_pixels = nullptr;
@@ -336,7 +681,7 @@ NB_MODULE(slimgui_ext, top) {
         .def_rw("hover_flags_for_tooltip_nav", &ImGuiStyle::HoverFlagsForTooltipNav)
         .def("scale_all_sizes", &ImGuiStyle::ScaleAllSizes, "scale_factor"_a);
 
-    nb::class_<ImGuiIO>(m, "IO")
+    auto io_class = nb::class_<ImGuiIO>(m, "IO")
         .def("add_mouse_pos_event", &ImGuiIO::AddMousePosEvent, "x"_a, "y"_a)
         .def("add_mouse_button_event", &ImGuiIO::AddMouseButtonEvent, "button"_a, "down"_a)
         .def("add_mouse_wheel_event", &ImGuiIO::AddMouseWheelEvent, "wheel_x"_a, "wheel_y"_a)
@@ -347,6 +692,19 @@ NB_MODULE(slimgui_ext, top) {
         .def("add_key_analog_event", &ImGuiIO::AddKeyAnalogEvent, "key"_a, "down"_a, "v"_a, "Queue a new key down/up event for analog values (e.g. `Key.KEY_GAMEPAD_*` values). Dead-zones should be handled by the backend.")
         .def("add_mouse_source_event", &ImGuiIO::AddMouseSourceEvent, "source"_a, "Queue a mouse source change (Mouse/TouchScreen/Pen).")
         .def("set_app_accepting_events", &ImGuiIO::SetAppAcceptingEvents, "accepting_events"_a, "Set master flag for accepting key/mouse/text events (default to true).  Useful if you have native dialog boxes that are interrupting your application loop/refresh, and you want to disable events being queued while your app is frozen.")
+        .def("add_input_events", &add_input_events, "events"_a,
+            "Queue a batch of input events with a single call, e.g., a frame's worth of events from a platform event\n"
+            "queue.  `events` is an array of 16-byte little-endian records `struct.Struct(\"<HHiff\")`:\n"
+            "`(type, down, value, x, y)`, with `type` one of the `IO.INPUT_EVENT_*` constants:\n"
+            "\n"
+            "- `INPUT_EVENT_MOUSE_POS`, `INPUT_EVENT_MOUSE_WHEEL`: `x`, `y`\n"
+            "- `INPUT_EVENT_MOUSE_BUTTON`: `value` is the button, `down`\n"
+            "- `INPUT_EVENT_MOUSE_SOURCE`: `value` is a `MouseSource`\n"
+            "- `INPUT_EVENT_KEY`: `value` is a `Key`, `down`\n"
+            "- `INPUT_EVENT_CHAR`: `value` is a Unicode code point\n"
+            "- `INPUT_EVENT_FOCUS`: `down` is the focus state\n"
+            "\n"
+            "Unused fields are ignored.  Events are queued in order, like the corresponding `add_*_event()` calls.")
         .def("clear_events_queue", &ImGuiIO::ClearEventsQueue, "Clear all incoming events.")
         .def("clear_input_keys", &ImGuiIO::ClearInputKeys, "Clear current keyboard/gamepad state + current frame text input buffer.  Equivalent to releasing all keys/buttons.")
         .def("clear_input_mouse", &ImGuiIO::ClearInputMouse, "Clear current mouse state.")
@@ -455,6 +813,13 @@ NB_MODULE(slimgui_ext, top) {
         .def_ro("key_shift", &ImGuiIO::KeyShift)
         .def_ro("key_alt", &ImGuiIO::KeyAlt)
         .def_ro("key_super", &ImGuiIO::KeySuper);
+    io_class.attr("INPUT_EVENT_MOUSE_POS") = (int)InputEvent_MousePos;
+    io_class.attr("INPUT_EVENT_MOUSE_WHEEL") = (int)InputEvent_MouseWheel;
+    io_class.attr("INPUT_EVENT_MOUSE_BUTTON") = (int)InputEvent_MouseButton;
+    io_class.attr("INPUT_EVENT_MOUSE_SOURCE") = (int)InputEvent_MouseSource;
+    io_class.attr("INPUT_EVENT_KEY") = (int)InputEvent_Key;
+    io_class.attr("INPUT_EVENT_CHAR") = (int)InputEvent_Char;
+    io_class.attr("INPUT_EVENT_FOCUS") = (int)InputEvent_Focus;
 
     nb::class_<ImGuiPlatformIO>(m, "PlatformIO")
         .def_rw("renderer_texture_max_width", &ImGuiPlatformIO::Renderer_TextureMaxWidth)
@@ -490,6 +855,27 @@ NB_MODULE(slimgui_ext, top) {
             uintptr_t pixels_end = (uintptr_t)texData->GetPixels() + total_bytes;
             return nb::ndarray<nb::numpy, uint8_t, nb::ndim<1>>(texData->GetPixelsAt(x, y), { pixels_end - (uintptr_t)pixels_start });
         }, nb::rv_policy::reference_internal, "Get texture data as an `ndarray` starting at `x, y` corner.  Note that the pixel stride is the same as in the original texture.")
+        .def("get_coalesced_updates", [](ImTextureData* texData) {
+            return coalesce_texture_rects(texData->Updates);
+        }, "Like `updates`, but overlapping or nearby rectangles are merged to reduce the number of uploads.  Merged rectangles\n"
+        "may include pixels that weren't updated, but at least half of each merged rectangle consists of updated pixels.")
+        .def("copy_pixels", [](ImTextureData* texData, int x, int y, int w, int h, uintptr_t dst, size_t dst_size) {
+            if (x < 0 || y < 0 || w < 0 || h < 0 || x + w > texData->Width || y + h > texData->Height) {
+                throw std::invalid_argument("Rectangle is outside of the texture.");
+            }
+            size_t row_bytes = (size_t)w * texData->BytesPerPixel;
+            if (row_bytes * h > dst_size) {
+                throw std::length_error("`dst_size` is too small to hold the rectangle.");
+            }
+            uint8_t* out = (uint8_t*)dst;
+            for (int row = 0; row < h; row++, out += row_bytes) {
+                memcpy(out, texData->GetPixelsAt(x, y + row), row_bytes);
+            }
+            return row_bytes * h;
+        }, "x"_a, "y"_a, "w"_a, "h"_a, "dst"_a, "dst_size"_a,
+        "Copy the pixels of rectangle `x, y, w, h` tightly packed (row stride `w * bytes_per_pixel`) into memory at address `dst`.\n"
+        "\n"
+        "Returns: number of bytes written.")
         .def("get_tex_id", &ImTextureData::GetTexID, "Backend-specific texture identifier.")
         .def("set_tex_id", &ImTextureData::SetTexID, "Call after creating or destroying the texture.")
         .def("set_status", &ImTextureData::SetStatus, "Call after honoring a request. Never modify `TextureData.status` directly!");
@@ -520,6 +906,12 @@ NB_MODULE(slimgui_ext, top) {
         "\n"
         "Returns: `DrawListCallbackResult` which the backend should always handle.  See docs for `DrawListCallbackResult`.");
 
+    nb::class_<DrawListBuffers>(m, "DrawListBuffers",
+        "Owner of the NumPy views returned by `DrawList.vtx_buffer_array()` and `idx_buffer_array()`.  When the\n"
+        "frame ends, the viewed buffers are moved out of ImGui's draw lists into this object, so views used after\n"
+        "`new_frame()` never point to freed memory.")
+        .def_ro("valid", &DrawListBuffers::valid, "False once the frame the views were taken in has ended.");
+
     nb::class_<ImDrawList>(m, "DrawList")
         .def_prop_ro("vtx_buffer_size", [](const ImDrawList* drawList) {
             return drawList->VtxBuffer.Size;
@@ -536,6 +928,49 @@ NB_MODULE(slimgui_ext, top) {
         .def_prop_ro("commands", [](const ImDrawList* drawList) {
             return nb::make_iterator(nb::type<const ImDrawList*>(), "iterator", drawList->CmdBuffer.begin(), drawList->CmdBuffer.end());
         }, nb::keep_alive<0, 1>())
+        .def("vtx_buffer_array", [](ImDrawList* drawList) {
+            nb::object buffers = draw_list_buffers(drawList);
+            ImVector<ImDrawVert>& vtx = drawList->VtxBuffer;
+            nb::ndarray<nb::numpy, uint8_t, nb::ndim<1>> bytes((uint8_t*)vtx.Data, { (size_t)vtx.size_in_bytes() }, buffers);
+            return frame_array(nb::cast(bytes).attr("view")(draw_vert_dtype()), buffers);
+        }, nb::sig("def vtx_buffer_array(self) -> NDArray[Any]"),
+        "NumPy view of the vertex buffer without copying, a structured array with fields `pos` (2 x float32),\n"
+        "`uv` (2 x float32) and `col` (uint32, packed ABGR).\n"
+        "\n"
+        "The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that\n"
+        "raises `RuntimeError`.  Use `copy()` to keep the vertices.  Adding primitives to the list may move its\n"
+        "buffers, so take the view once the list is complete, e.g., after `render()`.")
+        .def("idx_buffer_array", [](ImDrawList* drawList) {
+            nb::object buffers = draw_list_buffers(drawList);
+            ImVector<ImDrawIdx>& idx = drawList->IdxBuffer;
+            nb::ndarray<nb::numpy, ImDrawIdx, nb::ndim<1>> view(idx.Data, { (size_t)idx.Size }, buffers);
+            return frame_array(nb::cast(view), buffers);
+        }, nb::sig("def idx_buffer_array(self) -> NDArray[Any]"),
+        "NumPy view of the index buffer without copying, uint16 or uint32 elements depending on `INDEX_SIZE`.\n"
+        "\n"
+        "The view points to ImGui's memory and is only valid until the next `new_frame()`: using it after that\n"
+        "raises `RuntimeError`.  Use `copy()` to keep the indices.  Adding primitives to the list may move its\n"
+        "buffers, so take the view once the list is complete, e.g., after `render()`.")
+        .def("commands_array", [](const ImDrawList* drawList, int draw_list_index) {
+            return make_draw_cmd_array(drawList->CmdBuffer.Size, [&](DrawCmdRecord* out) {
+                fill_draw_cmd_records(drawList, draw_list_index, out);
+            });
+        }, "draw_list_index"_a = 0, nb::sig("def commands_array(self, draw_list_index: int = 0) -> NDArray[Any]"), commands_array_doc)
+        .def("multi_draw_batches", &build_multi_draw_batches, "vtx_base"_a = 0, "idx_base"_a = 0,
+            nb::sig("def multi_draw_batches(self, vtx_base: int = 0, idx_base: int = 0) -> tuple[NDArray[Any], NDArray[Any], NDArray[Any], NDArray[Any]]"),
+            "Group the draw commands into runs that can each be submitted with a single `glMultiDrawElementsBaseVertex` call.\n"
+            "Consecutive commands with the same texture and clip rectangle form a run, callback commands are runs of their own\n"
+            "and zero-element commands are dropped.  `vtx_base` and `idx_base` are added to the command vertex and index offsets,\n"
+            "for when the list's geometry isn't at the start of the GPU buffers.\n"
+            "\n"
+            "Returns: `(counts, offsets, base_vertices, runs)` where the first three are the per-command arrays for\n"
+            "`glMultiDrawElementsBaseVertex` (`offsets` in bytes).  `runs` is a structured array with fields `tex_id`,\n"
+            "`clip_rect`, `draw_start`, `draw_count` (slice of the per-command arrays, `draw_count == 0` for callbacks) and\n"
+            "`cmd_index` (index of the run's first command in `commands`).")
+        .def("content_hash", [](const ImDrawList* drawList) {
+            return hash_draw_list(drawList);
+        }, "64-bit hash of the list's vertices, indices and draw commands (clip rectangles, texture IDs, offsets,\n"
+           "element counts and callbacks).  Lists with equal hashes render the same pixels.")
         .def("ptr", [](const ImDrawList* drawList) {
             return reinterpret_cast<uintptr_t>(drawList);
         }, "Internal function for reference book keeping.")
@@ -661,9 +1096,69 @@ NB_MODULE(slimgui_ext, top) {
             }
         }, "callable"_a, "userdata"_a);
 
+    nb::class_<DrawListStats>(m, "DrawListStats", "Geometry and command counts of a `DrawList`, see `DrawData.stats()`.")
+        .def_ro("owner_name", &DrawListStats::owner_name, "Name of the window that owns the draw list (`##Background` and `##Foreground` for the viewport's lists), empty if it has no owner.")
+        .def_ro("vtx_count", &DrawListStats::vtx_count)
+        .def_ro("idx_count", &DrawListStats::idx_count)
+        .def_ro("cmd_count", &DrawListStats::cmd_count)
+        .def_ro("callback_count", &DrawListStats::callback_count, "Commands with a user callback, including render state resets.")
+        .def_ro("texture_count", &DrawListStats::texture_count, "Distinct textures referenced by the drawing commands.")
+        .def_ro("clip_rect_area", &DrawListStats::clip_rect_area,
+            "Sum of the areas of the drawing commands' clip rectangles, clamped to the display rectangle.  Overlapping\n"
+            "rectangles are counted once per command, so this can exceed the display area.  The area is in display\n"
+            "coordinates, also after a renderer scaled the clip rectangles with `DrawData.scale_clip_rects()`.");
+
+    nb::class_<DrawDataStats>(m, "DrawDataStats", "Per-`DrawList` statistics of a frame, returned by `DrawData.stats()`.")
+        .def_ro("total", &DrawDataStats::total, "Sums over all draw lists.  `texture_count` is the number of distinct textures in the frame.")
+        .def_ro("lists", &DrawDataStats::lists, "Statistics of each `DrawList` in `DrawData.commands_lists` order.");
+
     nb::class_<ImDrawData>(m, "DrawData")
-        .def("scale_clip_rects", &ImDrawData::ScaleClipRects, "fb_scale"_a)
+        .def("scale_clip_rects", &scale_clip_rects, "fb_scale"_a,
+            "Scale the clip rectangles of all draw lists in place, e.g., by `framebuffer_scale` to convert them to\n"
+            "framebuffer pixels.  The draw lists are marked as scaled, so that `render.DamageTracker` reads them\n"
+            "correctly afterwards.")
+        .def_ro("display_pos", &ImDrawData::DisplayPos, "Top-left position of the viewport to render (== top-left of the orthogonal projection matrix to use) (== `Viewport.pos` for the main viewport, == (0,0) in most single-viewport applications).")
+        .def_ro("display_size", &ImDrawData::DisplaySize, "Size of the viewport to render (== `Viewport.size` for the main viewport, == `IO.display_size` in most single-viewport applications).")
         .def_ro("framebuffer_scale", &ImDrawData::FramebufferScale, "Amount of pixels for each unit of `display_size`. Copied from `Viewport.framebuffer_scale` (`== IO.display_framebuffer_scale` for main viewport). Generally (1,1) on normal display, (2,2) on OSX with Retina display.")
+        .def_prop_ro("cmd_lists_count", [](const ImDrawData* drawData) {
+            return drawData->CmdLists.Size;
+        }, "Number of `DrawList`s to render.")
+        .def_ro("total_idx_count", &ImDrawData::TotalIdxCount, "For convenience, sum of all `DrawList.idx_buffer_size`.")
+        .def_ro("total_vtx_count", &ImDrawData::TotalVtxCount, "For convenience, sum of all `DrawList.vtx_buffer_size`.")
+        .def("copy_vtx_buffers", [](const ImDrawData* drawData, uintptr_t dst, size_t dst_size) {
+            return copy_draw_data_buffers(drawData, &ImDrawList::VtxBuffer, dst, dst_size);
+        }, "dst"_a, "dst_size"_a,
+        "Copy the vertex buffers of all `DrawList`s back to back into memory at address `dst`.\n"
+        "`dst_size` must be at least `total_vtx_count * VERTEX_SIZE` bytes.\n"
+        "\n"
+        "Returns: number of bytes written.")
+        .def("copy_idx_buffers", [](const ImDrawData* drawData, uintptr_t dst, size_t dst_size) {
+            return copy_draw_data_buffers(drawData, &ImDrawList::IdxBuffer, dst, dst_size);
+        }, "dst"_a, "dst_size"_a,
+        "Copy the index buffers of all `DrawList`s back to back into memory at address `dst`.\n"
+        "`dst_size` must be at least `total_idx_count * INDEX_SIZE` bytes.  Indices are not rebased, use\n"
+        "per-list vertex offsets (e.g., with `glDrawElementsBaseVertex`) when drawing.\n"
+        "\n"
+        "Returns: number of bytes written.")
+        .def("content_hash", [](const ImDrawData* drawData) {
+            return hash_draw_data(drawData);
+        },
+        "64-bit hash of all `DrawList`s (see `DrawList.content_hash()`), the display rectangle and\n"
+        "`framebuffer_scale`.  Equal hashes mean the draw data renders the same pixels as long as texture contents\n"
+        "in use didn't change.  Texture IDs are part of the hash, compute it after the renderer has created\n"
+        "the frame's textures (`TextureData.status == WANT_CREATE`).")
+        .def("commands_array", [](const ImDrawData* drawData) {
+            size_t count = 0;
+            for (const ImDrawList* draw_list : drawData->CmdLists) {
+                count += draw_list->CmdBuffer.Size;
+            }
+            return make_draw_cmd_array(count, [&](DrawCmdRecord* out) {
+                for (int i = 0; i < drawData->CmdLists.Size; i++) {
+                    fill_draw_cmd_records(drawData->CmdLists[i], i, out);
+                    out += drawData->CmdLists[i]->CmdBuffer.Size;
+                }
+            });
+        }, nb::sig("def commands_array(self) -> NDArray[Any]"), commands_array_doc)
         .def_prop_ro("commands_lists", [](ImDrawData& drawData) {
             return nb::make_iterator(nb::type<ImDrawData>(), "iterator", drawData.CmdLists.begin(), drawData.CmdLists.end());
         }, nb::keep_alive<0, 1>())
@@ -672,7 +1167,44 @@ NB_MODULE(slimgui_ext, top) {
                 return std::nullopt;
             }
             return nb::make_iterator(nb::type<ImDrawData>(), "iterator", drawData.Textures->begin(), drawData.Textures->end());
-        }, nb::keep_alive<0, 1>());
+        }, nb::keep_alive<0, 1>())
+        .def("stats", &draw_data_stats,
+        "Vertex, index, command, callback and texture counts and clip rectangle area of each `DrawList`, with its\n"
+        "owner window's name.  Use it to find out which windows produce the geometry counted in\n"
+        "`IO.metrics_render_vertices`.  Computed when called, there's no cost otherwise.")
+        .def("merge_commands", [](ImDrawData* drawData) {
+            return merge_draw_commands(drawData);
+        }, nb::call_guard<nb::gil_scoped_release>(),
+        "Merge adjacent draw commands in place, call after `render()` and before the renderer.  Commands with\n"
+        "the same texture, vertex offset and contiguous indices are merged if their clip rectangles are equal\n"
+        "or if the union of the rectangles clips the same pixels (the geometry lies at least one unit inside\n"
+        "its own rectangle).  Commands without elements are dropped, callbacks are never merged.\n"
+        "\n"
+        "Returns: number of commands removed.")
+        .def("snapshot", [](const ImDrawData* drawData) {
+            PyDrawDataSnapshot* snapshot;
+            {
+                nb::gil_scoped_release release;
+                snapshot = new PyDrawDataSnapshot(drawData);
+            }
+            snapshot->retainCallables();
+            return snapshot;
+        }, nb::rv_policy::take_ownership,
+        "Deep copy of the draw lists, see `DrawDataSnapshot`.  The copy is made with the GIL released into\n"
+        "buffers recycled from snapshots that have been garbage collected, so taking one snapshot per frame\n"
+        "doesn't allocate once the buffers have grown to the frame's size.");
+
+    nb::class_<PyDrawDataSnapshot, ImDrawData>(m, "DrawDataSnapshot",
+        "Copy of a frame's `DrawData` returned by `DrawData.snapshot()`.  Stays valid after `new_frame()`,\n"
+        "so it can be rendered on another thread while the next frame is built.  The copy's buffers are\n"
+        "returned to a pool for later snapshots when it's garbage collected.  The snapshot holds references\n"
+        "to the callables passed to `DrawList.add_callback()`, so its callbacks can still be run.\n\n"
+        "Textures aren't copied: `textures` lists the `TextureData` objects that had pending requests when\n"
+        "the snapshot was taken (see `has_texture_requests`).")
+        .def_prop_ro("has_texture_requests", [](const PyDrawDataSnapshot& s) { return s.hasTextureRequests(); },
+            "True if textures needed to be created, updated or destroyed when the snapshot was taken.  Render\n"
+            "such a snapshot before calling `new_frame()` again, as the texture requests are processed on the\n"
+            "shared `TextureData` objects.");
 
 
      nb::class_<ImGuiPayload>(m, "Payload", "Data payload for Drag and Drop operations: `accept_drag_drop_payload()`, `get_drag_drop_payload()`")
@@ -747,6 +1279,7 @@ NB_MODULE(slimgui_ext, top) {
         }, nb::rv_policy::reference_internal)
         .def("new_frame_internal", [](Context* ctx) {
             auto prev = ctx->setCurrent();
+            detach_viewed_buffers(static_cast<ContextBackendData*>(ImGui::GetIO().BackendLanguageUserData));
             ImGui::NewFrame();
             ImGui::SetCurrentContext(prev);
         }, "Internal ImGui::NewFrame(), don't use directly.");
@@ -761,6 +1294,7 @@ NB_MODULE(slimgui_ext, top) {
     m.def("destroy_context_internal", [](Context* context) {
         ImGuiContext* ctx = context->ctx;
         ContextBackendData* backend_data = static_cast<ContextBackendData*>(ImGui::GetIO(ctx).BackendLanguageUserData);
+        detach_viewed_buffers(backend_data);
         delete backend_data;
         ImGui::DestroyContext(ctx);
     });
@@ -1620,4 +2154,8 @@ NB_MODULE(slimgui_ext, top) {
     // Implot
     nb::module_ implot = top.def_submodule("implot", "ImPlot bindings");
     implot_bindings(implot);
+
+    // Native renderers
+    nb::module_ render = top.def_submodule("render", "Native renderer backends");
+    render_bindings(render);
 }
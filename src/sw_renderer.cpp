@@ -0,0 +1,390 @@
+#include <algorithm>
+#include <math.h>
+#include <string.h>
+
+#include "sw_renderer.h"
+
+SWRenderer::SWRenderer(int num_threads_, int tile_size_) : num_threads(num_threads_), tile_size(tile_size_) {
+    if (num_threads <= 0)
+        num_threads = std::max(1, (int)std::thread::hardware_concurrency());
+    if (tile_size < 8)
+        tile_size = 8;
+    workers.reserve(num_threads - 1);
+    for (int i = 0; i < num_threads - 1; i++)
+        workers.emplace_back(&SWRenderer::workerLoop, this);
+}
+
+SWRenderer::~SWRenderer() {
+    {
+        std::lock_guard<std::mutex> lock(pool_mutex);
+        stopping = true;
+    }
+    job_ready.notify_all();
+    for (std::thread& t : workers)
+        t.join();
+}
+
+void SWRenderer::workerLoop() {
+    uint64_t generation = 0;
+    for (;;) {
+        uint8_t* dst;
+        {
+            std::unique_lock<std::mutex> lock(pool_mutex);
+            job_ready.wait(lock, [&] { return stopping || job_generation != generation; });
+            if (stopping)
+                return;
+            generation = job_generation;
+            dst = job_dst;
+        }
+        rasterizeTiles(dst);
+        {
+            std::lock_guard<std::mutex> lock(pool_mutex);
+            if (--workers_busy == 0)
+                job_done.notify_one();
+        }
+    }
+}
+
+void SWRenderer::copyTextureRect(Texture& dst, ImTextureData* tex, int x, int y, int w, int h) {
+    for (int row = y; row < y + h; row++) {
+        const uint8_t* src = (const uint8_t*)tex->GetPixelsAt(x, row);
+        uint8_t* out = &dst.pixels[((size_t)row * dst.width + x) * 4];
+        if (tex->Format == ImTextureFormat_RGBA32) {
+            memcpy(out, src, (size_t)w * 4);
+        } else {
+            for (int i = 0; i < w; i++, out += 4) {
+                out[0] = out[1] = out[2] = 255;
+                out[3] = src[i];
+            }
+        }
+    }
+}
+
+void SWRenderer::updateTexture(ImTextureData* tex) {
+    if (tex->Status == ImTextureStatus_WantCreate) {
+        IM_ASSERT(tex->TexID == ImTextureID_Invalid && tex->BackendUserData == nullptr);
+        ImTextureID tex_id = (ImTextureID)next_tex_id++;
+        Texture& t = textures[tex_id];
+        t.width = tex->Width;
+        t.height = tex->Height;
+        t.pixels.assign((size_t)tex->Width * tex->Height * 4, 0);
+        copyTextureRect(t, tex, 0, 0, tex->Width, tex->Height);
+        tex->SetTexID(tex_id);
+        tex->SetStatus(ImTextureStatus_OK);
+    } else if (tex->Status == ImTextureStatus_WantUpdates) {
+        auto it = textures.find(tex->TexID);
+        if (it != textures.end()) {
+            for (const ImTextureRect& r : tex->Updates)
+                copyTextureRect(it->second, tex, r.x, r.y, r.w, r.h);
+        }
+        tex->SetStatus(ImTextureStatus_OK);
+    } else if (tex->Status == ImTextureStatus_WantDestroy && tex->UnusedFrames > 0) {
+        destroyTexture(tex);
+    }
+}
+
+void SWRenderer::destroyTexture(ImTextureData* tex) {
+    textures.erase(tex->TexID);
+    tex->SetTexID(ImTextureID_Invalid);
+    tex->SetStatus(ImTextureStatus_Destroyed);
+}
+
+void SWRenderer::prepare(ImDrawData* draw_data, int width_, int height_) {
+    width = width_;
+    height = height_;
+    tiles_x = (width + tile_size - 1) / tile_size;
+    tiles_y = (height + tile_size - 1) / tile_size;
+    bins.resize((size_t)tiles_x * tiles_y);
+    for (auto& bin : bins)
+        bin.clear();
+    triangles.clear();
+
+    if (draw_data->Textures != nullptr) {
+        for (ImTextureData* tex : *draw_data->Textures) {
+            if (tex->Status != ImTextureStatus_OK)
+                updateTexture(tex);
+        }
+    }
+
+    // Same projection and scissor rounding as the OpenGL renderers.
+    ImVec2 clip_off = draw_data->DisplayPos;
+    ImVec2 clip_scale = draw_data->FramebufferScale;
+
+    for (ImDrawList* draw_list : draw_data->CmdLists) {
+        const ImDrawVert* vtx_buffer = draw_list->VtxBuffer.Data;
+        const ImDrawIdx* idx_buffer = draw_list->IdxBuffer.Data;
+        for (const ImDrawCmd& cmd : draw_list->CmdBuffer) {
+            if (cmd.UserCallback != nullptr) {
+                // There's no render state to reset, other callbacks are called like in the GPU renderers.
+                if (cmd.UserCallback != ImDrawCallback_ResetRenderState)
+                    cmd.UserCallback(draw_list, &cmd);
+                continue;
+            }
+
+            ImVec2 clip_min((cmd.ClipRect.x - clip_off.x) * clip_scale.x, (cmd.ClipRect.y - clip_off.y) * clip_scale.y);
+            ImVec2 clip_max((cmd.ClipRect.z - clip_off.x) * clip_scale.x, (cmd.ClipRect.w - clip_off.y) * clip_scale.y);
+            if (clip_max.x <= clip_min.x || clip_max.y <= clip_min.y)
+                continue;
+            // glScissor() box converted to top-down rows.
+            int sx = (int)clip_min.x;
+            int sw = (int)(clip_max.x - clip_min.x);
+            int sy = (int)((float)height - clip_max.y);
+            int sh = (int)(clip_max.y - clip_min.y);
+            int scissor_x0 = std::max(sx, 0);
+            int scissor_x1 = std::min(sx + sw, width);
+            int scissor_y0 = std::max(height - (sy + sh), 0);
+            int scissor_y1 = std::min(height - sy, height);
+            if (scissor_x1 <= scissor_x0 || scissor_y1 <= scissor_y0)
+                continue;
+
+            ImTextureID tex_id = cmd.TexRef._TexData ? cmd.TexRef._TexData->TexID : cmd.TexRef._TexID;
+            auto tex_it = textures.find(tex_id);
+            const Texture* tex = tex_it != textures.end() ? &tex_it->second : nullptr;
+
+            for (unsigned int i = 0; i + 2 < cmd.ElemCount; i += 3) {
+                Triangle tri;
+                for (int k = 0; k < 3; k++) {
+                    const ImDrawVert& v = vtx_buffer[cmd.VtxOffset + idx_buffer[cmd.IdxOffset + i + k]];
+                    tri.x[k] = (v.pos.x - clip_off.x) * clip_scale.x;
+                    tri.y[k] = (v.pos.y - clip_off.y) * clip_scale.y;
+                    tri.u[k] = v.uv.x;
+                    tri.v[k] = v.uv.y;
+                    for (int c = 0; c < 4; c++)
+                        tri.col[k][c] = (float)((v.col >> (8 * c)) & 0xFF) * (1.0f / 255.0f);
+                }
+                float area = (tri.x[1] - tri.x[0]) * (tri.y[2] - tri.y[0]) - (tri.x[2] - tri.x[0]) * (tri.y[1] - tri.y[0]);
+                if (area == 0.0f)
+                    continue;
+                if (area < 0.0f) {
+                    // Make all triangles wind the same way so that the fill rule works on shared edges.
+                    std::swap(tri.x[1], tri.x[2]);
+                    std::swap(tri.y[1], tri.y[2]);
+                    std::swap(tri.u[1], tri.u[2]);
+                    std::swap(tri.v[1], tri.v[2]);
+                    for (int c = 0; c < 4; c++)
+                        std::swap(tri.col[1][c], tri.col[2][c]);
+                }
+                // Pixels whose centers may be covered.
+                float min_x = std::min({ tri.x[0], tri.x[1], tri.x[2] });
+                float max_x = std::max({ tri.x[0], tri.x[1], tri.x[2] });
+                float min_y = std::min({ tri.y[0], tri.y[1], tri.y[2] });
+                float max_y = std::max({ tri.y[0], tri.y[1], tri.y[2] });
+                tri.x0 = std::max((int)ceilf(min_x - 0.5f), scissor_x0);
+                tri.x1 = std::min((int)floorf(max_x - 0.5f) + 1, scissor_x1);
+                tri.y0 = std::max((int)ceilf(min_y - 0.5f), scissor_y0);
+                tri.y1 = std::min((int)floorf(max_y - 0.5f) + 1, scissor_y1);
+                if (tri.x1 <= tri.x0 || tri.y1 <= tri.y0)
+                    continue;
+                tri.tex = tex;
+
+                uint32_t tri_index = (uint32_t)triangles.size();
+                triangles.push_back(tri);
+                for (int ty = tri.y0 / tile_size; ty <= (tri.y1 - 1) / tile_size; ty++)
+                    for (int tx = tri.x0 / tile_size; tx <= (tri.x1 - 1) / tile_size; tx++)
+                        bins[(size_t)ty * tiles_x + tx].push_back(tri_index);
+            }
+        }
+    }
+}
+
+// Bilinear, clamp to edge (GL_LINEAR + GL_CLAMP_TO_EDGE).
+static inline void sample_bilinear(const SWRenderer::Texture& tex, float u, float v, float out[4]) {
+    float s = u * (float)tex.width - 0.5f;
+    float t = v * (float)tex.height - 0.5f;
+    float fs = floorf(s), ft = floorf(t);
+    float ws = s - fs, wt = t - ft;
+    int x0 = std::clamp((int)fs, 0, tex.width - 1), x1 = std::clamp((int)fs + 1, 0, tex.width - 1);
+    int y0 = std::clamp((int)ft, 0, tex.height - 1), y1 = std::clamp((int)ft + 1, 0, tex.height - 1);
+    const uint8_t* p00 = &tex.pixels[((size_t)y0 * tex.width + x0) * 4];
+    const uint8_t* p10 = &tex.pixels[((size_t)y0 * tex.width + x1) * 4];
+    const uint8_t* p01 = &tex.pixels[((size_t)y1 * tex.width + x0) * 4];
+    const uint8_t* p11 = &tex.pixels[((size_t)y1 * tex.width + x1) * 4];
+    for (int c = 0; c < 4; c++) {
+        float top = p00[c] + (p10[c] - p00[c]) * ws;
+        float bottom = p01[c] + (p11[c] - p01[c]) * ws;
+        out[c] = (top + (bottom - top) * wt) * (1.0f / 255.0f);
+    }
+}
+
+static inline void to_unorm8(const float src[4], uint8_t out[4]) {
+    for (int c = 0; c < 4; c++)
+        out[c] = (uint8_t)(std::clamp(src[c], 0.0f, 1.0f) * 255.0f + 0.5f);
+}
+
+// round(x / 255) for x in [0, 255 * 255].  Blending is done in 8-bit fixed point like on the GPU:
+// glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA) for all channels.
+static inline uint8_t div255(uint32_t x) {
+    x += 128;
+    return (uint8_t)((x + (x >> 8)) >> 8);
+}
+
+// Top-left fill rule: pixel centers exactly on an edge belong to only one of the triangles sharing it.
+static inline bool edge_owns_boundary(float dx, float dy) {
+    return dy > 0.0f || (dy == 0.0f && dx < 0.0f);
+}
+
+void SWRenderer::rasterizeTile(uint8_t* dst, int tile_index) const {
+    int tile_x0 = (tile_index % tiles_x) * tile_size;
+    int tile_y0 = (tile_index / tiles_x) * tile_size;
+    int tile_x1 = std::min(tile_x0 + tile_size, width);
+    int tile_y1 = std::min(tile_y0 + tile_size, height);
+
+    for (uint32_t tri_index : bins[tile_index]) {
+        const Triangle& tri = triangles[tri_index];
+        int x0 = std::max(tri.x0, tile_x0), x1 = std::min(tri.x1, tile_x1);
+        int y0 = std::max(tri.y0, tile_y0), y1 = std::min(tri.y1, tile_y1);
+
+        // Edge k is opposite to vertex k.
+        float ex[3], ey[3];
+        bool owns[3];
+        for (int k = 0; k < 3; k++) {
+            int a = (k + 1) % 3, b = (k + 2) % 3;
+            ex[k] = tri.x[b] - tri.x[a];
+            ey[k] = tri.y[b] - tri.y[a];
+            owns[k] = edge_owns_boundary(ex[k], ey[k]);
+        }
+        float area = ex[2] * (tri.y[2] - tri.y[0]) - ey[2] * (tri.x[2] - tri.x[0]);
+        float inv_area = 1.0f / area;
+
+        // Most UI triangles (rectangles, window backgrounds, lines) sample the atlas' white pixel
+        // with a single color: shade them once instead of per pixel.
+        bool flat_uv = tri.u[0] == tri.u[1] && tri.u[0] == tri.u[2] && tri.v[0] == tri.v[1] && tri.v[0] == tri.v[2];
+        bool flat_col = memcmp(tri.col[0], tri.col[1], sizeof(tri.col[0])) == 0 && memcmp(tri.col[0], tri.col[2], sizeof(tri.col[0])) == 0;
+        float flat_texel[4] = { 1.0f, 1.0f, 1.0f, 1.0f };
+        if (flat_uv && tri.tex != nullptr)
+            sample_bilinear(*tri.tex, tri.u[0], tri.v[0], flat_texel);
+        bool flat = flat_uv && flat_col;
+        float flat_src[4];
+        for (int c = 0; c < 4; c++)
+            flat_src[c] = tri.col[0][c] * flat_texel[c];
+        if (flat && flat_src[3] <= 0.0f)
+            continue;
+
+        uint8_t flat_rgba[4];
+        to_unorm8(flat_src, flat_rgba);
+        // Blend terms of flat triangles: out = (src_term + dst * (255 - alpha)) / 255.
+        uint32_t flat_alpha = flat_rgba[3], flat_inv_alpha = 255 - flat_alpha;
+        uint32_t flat_term[4];
+        for (int c = 0; c < 4; c++)
+            flat_term[c] = flat_rgba[c] * flat_alpha;
+
+        float dcol_dx[4];
+        for (int c = 0; c < 4; c++)
+            dcol_dx[c] = -(tri.col[0][c] * ey[0] + tri.col[1][c] * ey[1] + tri.col[2][c] * ey[2]) * inv_area;
+        float du_dx = -(tri.u[0] * ey[0] + tri.u[1] * ey[1] + tri.u[2] * ey[2]) * inv_area;
+        float dv_dx = -(tri.v[0] * ey[0] + tri.v[1] * ey[1] + tri.v[2] * ey[2]) * inv_area;
+
+        for (int py = y0; py < y1; py++) {
+            float cy = (float)py + 0.5f;
+            // w_k(cx) = slope_k * cx + offset_k.  Find the conservative span of pixel centers inside
+            // all three edges, then trim it with exact tests (the covered span of a row is contiguous).
+            float slope[3], offset[3];
+            int span_x0 = x0, span_x1 = x1;
+            for (int k = 0; k < 3; k++) {
+                int a = (k + 1) % 3;
+                slope[k] = -ey[k];
+                offset[k] = ex[k] * (cy - tri.y[a]) + ey[k] * tri.x[a];
+                if (slope[k] > 0.0f)
+                    span_x0 = std::max(span_x0, (int)floorf(-offset[k] / slope[k] - 0.5f));
+                else if (slope[k] < 0.0f)
+                    span_x1 = std::min(span_x1, (int)ceilf(-offset[k] / slope[k] - 0.5f) + 1);
+                else if (offset[k] < 0.0f)
+                    span_x1 = span_x0;
+            }
+            auto covered = [&](int px) {
+                float cx = (float)px + 0.5f;
+                for (int k = 0; k < 3; k++) {
+                    int a = (k + 1) % 3;
+                    float w = ex[k] * (cy - tri.y[a]) - ey[k] * (cx - tri.x[a]);
+                    if (w < 0.0f || (w == 0.0f && !owns[k]))
+                        return false;
+                }
+                return true;
+            };
+            while (span_x0 < span_x1 && !covered(span_x0))
+                span_x0++;
+            while (span_x1 > span_x0 && !covered(span_x1 - 1))
+                span_x1--;
+            if (span_x0 >= span_x1)
+                continue;
+
+            uint8_t* out = dst + ((size_t)py * width + span_x0) * 4;
+            uint8_t* out_end = out + (size_t)(span_x1 - span_x0) * 4;
+            if (flat) {
+                if (flat_alpha == 255) {
+                    for (; out < out_end; out += 4)
+                        memcpy(out, flat_rgba, 4);
+                } else {
+                    for (; out < out_end; out += 4)
+                        for (int c = 0; c < 4; c++)
+                            out[c] = div255(flat_term[c] + out[c] * flat_inv_alpha);
+                }
+                continue;
+            }
+
+            // Attributes are affine in x: step them along the span instead of evaluating barycentrics.
+            float cx0 = (float)span_x0 + 0.5f;
+            float b0 = (slope[0] * cx0 + offset[0]) * inv_area;
+            float b1 = (slope[1] * cx0 + offset[1]) * inv_area;
+            float b2 = (slope[2] * cx0 + offset[2]) * inv_area;
+            float col[4];
+            for (int c = 0; c < 4; c++)
+                col[c] = tri.col[0][c] * b0 + tri.col[1][c] * b1 + tri.col[2][c] * b2;
+            float u = tri.u[0] * b0 + tri.u[1] * b1 + tri.u[2] * b2;
+            float v = tri.v[0] * b0 + tri.v[1] * b1 + tri.v[2] * b2;
+            for (; out < out_end; out += 4) {
+                float src[4];
+                if (flat_uv) {
+                    for (int c = 0; c < 4; c++)
+                        src[c] = col[c] * flat_texel[c];
+                } else if (tri.tex != nullptr) {
+                    float texel[4];
+                    sample_bilinear(*tri.tex, u, v, texel);
+                    for (int c = 0; c < 4; c++)
+                        src[c] = col[c] * texel[c];
+                } else {
+                    memcpy(src, col, sizeof(src));
+                }
+                for (int c = 0; c < 4; c++)
+                    col[c] += dcol_dx[c];
+                u += du_dx;
+                v += dv_dx;
+
+                uint8_t rgba[4];
+                to_unorm8(src, rgba);
+                uint32_t alpha = rgba[3];
+                if (alpha == 0)
+                    continue;
+                for (int c = 0; c < 4; c++)
+                    out[c] = div255(rgba[c] * alpha + out[c] * (255 - alpha));
+            }
+        }
+    }
+}
+
+void SWRenderer::rasterizeTiles(uint8_t* dst) {
+    int num_tiles = tiles_x * tiles_y;
+    for (int i = next_tile++; i < num_tiles; i = next_tile++)
+        rasterizeTile(dst, i);
+}
+
+void SWRenderer::rasterize(uint8_t* dst) {
+    int num_tiles = tiles_x * tiles_y;
+    if (workers.empty() || num_tiles <= 1) {
+        for (int i = 0; i < num_tiles; i++)
+            rasterizeTile(dst, i);
+        return;
+    }
+    {
+        std::lock_guard<std::mutex> lock(pool_mutex);
+        job_dst = dst;
+        next_tile = 0;
+        workers_busy = (int)workers.size();
+        job_generation++;
+    }
+    job_ready.notify_all();
+    rasterizeTiles(dst);
+    // Workers may still be finishing their last tile.
+    std::unique_lock<std::mutex> lock(pool_mutex);
+    job_done.wait(lock, [&] { return workers_busy == 0; });
+}
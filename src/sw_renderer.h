@@ -0,0 +1,86 @@
+// CPU software rasterizer for Dear ImGui draw data.
+//
+// Renders textured, vertex colored triangles with scissor rectangles into an
+// RGBA8 image.  The image is split into tiles that are rasterized in parallel,
+// each tile draws its triangles in submission order so blending matches the
+// GPU renderers.  Textures are created from `ImTextureData` like in the GPU
+// backends, texture IDs are allocated by the renderer.
+#pragma once
+
+#include <stdint.h>
+#include <atomic>
+#include <condition_variable>
+#include <mutex>
+#include <thread>
+#include <unordered_map>
+#include <vector>
+
+#include "imgui.h"
+
+class SWRenderer {
+public:
+    // `num_threads == 0` uses all hardware threads.  The `num_threads - 1`
+    // worker threads are started here and live as long as the renderer.
+    explicit SWRenderer(int num_threads = 0, int tile_size = 64);
+    ~SWRenderer();
+
+    SWRenderer(const SWRenderer&) = delete;
+    SWRenderer& operator=(const SWRenderer&) = delete;
+
+    // Update textures, then rasterize `draw_data` into `dst` (`height` rows of `width` RGBA8 pixels).
+    // `dst` must be initialized with the background, triangles are blended over it.
+    // Callbacks are called in order before rasterization.  Rasterization doesn't access Python
+    // objects, the caller may release the GIL around `rasterize()`.
+    void render(ImDrawData* draw_data, uint8_t* dst, int width, int height) {
+        prepare(draw_data, width, height);
+        rasterize(dst);
+    }
+    void prepare(ImDrawData* draw_data, int width, int height);
+    void rasterize(uint8_t* dst);
+
+    void updateTexture(ImTextureData* tex);
+    void destroyTexture(ImTextureData* tex);
+
+    int numThreads() const { return num_threads; }
+    int tileSize() const { return tile_size; }
+
+    struct Texture {
+        int width = 0;
+        int height = 0;
+        std::vector<uint8_t> pixels; // RGBA8, ALPHA8 textures are expanded to (255, 255, 255, a)
+    };
+
+    struct Triangle {
+        float x[3], y[3];
+        float u[3], v[3];
+        float col[3][4];
+        int x0, y0, x1, y1; // pixel bounds (exclusive max), clipped to the scissor rectangle
+        const Texture* tex; // nullptr samples as opaque white
+    };
+
+private:
+    void copyTextureRect(Texture& dst, ImTextureData* tex, int x, int y, int w, int h);
+    void rasterizeTile(uint8_t* dst, int tile_index) const;
+    void rasterizeTiles(uint8_t* dst);
+    void workerLoop();
+
+    int num_threads;
+    int tile_size;
+    int width = 0, height = 0;
+    int tiles_x = 0, tiles_y = 0;
+    uint64_t next_tex_id = 1;
+    std::unordered_map<ImTextureID, Texture> textures;
+    std::vector<Triangle> triangles;
+    std::vector<std::vector<uint32_t>> bins; // triangle indices per tile
+
+    // Worker pool: rasterize() publishes a job by bumping `job_generation`,
+    // the workers and the calling thread take tiles from `next_tile`.
+    std::vector<std::thread> workers;
+    std::mutex pool_mutex;
+    std::condition_variable job_ready, job_done;
+    uint64_t job_generation = 0;
+    int workers_busy = 0;
+    bool stopping = false;
+    uint8_t* job_dst = nullptr;
+    std::atomic<int> next_tile{ 0 };
+};
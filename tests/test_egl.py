@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from slimgui import imgui
+
+WIDTH, HEIGHT = 320, 200
+
+@pytest.fixture
+def imgui_context():
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    imgui.get_io().ini_filename = None
+    yield ctx
+    imgui.destroy_context(ctx)
+
+@pytest.fixture
+def egl_renderer(imgui_context):
+    try:
+        from slimgui.integrations.egl import EglRenderer
+    except ImportError:
+        pytest.skip("PyOpenGL not available")
+    try:
+        renderer = EglRenderer(WIDTH, HEIGHT, clear_color=(0.1, 0.2, 0.3, 1.0))
+    except Exception as e:
+        pytest.skip(f"EGL not available: {e}")
+    yield renderer
+    renderer.shutdown()
+
+def _build_frame(egl_renderer, x: float = 10):
+    egl_renderer.new_frame()
+    imgui.new_frame()
+    imgui.set_next_window_pos((x, 10))
+    imgui.set_next_window_size((120, 100))
+    imgui.begin("Window")
+    imgui.text("Hello")
+    imgui.button("Button")
+    imgui.end()
+    imgui.render()
+    return imgui.get_draw_data()
+
+def test_egl_render(egl_renderer):
+    assert imgui.get_io().display_size == (WIDTH, HEIGHT)
+    # New windows are hidden on their first frame.
+    egl_renderer.render(_build_frame(egl_renderer), capture=False)
+    egl_renderer.render(_build_frame(egl_renderer), capture=False)
+    image = egl_renderer.read_pixels()
+    assert image.shape == (HEIGHT, WIDTH, 4) and image.dtype == np.uint8
+    # Background is the clear color, top row first: the window is in the top-left corner.
+    assert tuple(image[-1, -1]) == (26, 51, 76, 255)
+    assert not np.array_equal(image[20, 20], image[-1, -1])
+
+def test_egl_async_readback(egl_renderer):
+    egl_renderer.render(_build_frame(egl_renderer), capture=False)
+
+    expected = []
+    frames = []
+    for i in range(5):
+        frame = egl_renderer.render(_build_frame(egl_renderer, x=10 + 30 * i))
+        expected.append(egl_renderer.read_pixels())
+        if i < 2:
+            # Frames are returned only when their readback buffer is reused.
+            assert frame is None
+        if frame is not None:
+            frames.append(frame)
+    assert egl_renderer.pending_frames == 2
+    frames.extend(egl_renderer.flush())
+    assert egl_renderer.pending_frames == 0
+    assert len(frames) == len(expected)
+    for frame, image in zip(frames, expected):
+        assert np.array_equal(frame, image)
+    assert not np.array_equal(frames[0], frames[-1])
+
+def test_egl_resize(egl_renderer):
+    egl_renderer.render(_build_frame(egl_renderer))
+    egl_renderer.resize(160, 120)
+    # Frames queued before the resize are discarded.
+    assert egl_renderer.pending_frames == 0
+    egl_renderer.render(_build_frame(egl_renderer))
+    assert imgui.get_io().display_size == (160, 120)
+    (frame,) = egl_renderer.flush()
+    assert frame.shape == (120, 160, 4)
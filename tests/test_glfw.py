@@ -0,0 +1,151 @@
+import pytest
+
+from slimgui import imgui
+
+@pytest.fixture
+def glfw_window():
+    glfw = pytest.importorskip("glfw")
+    # The null platform needs no display, but creates no GL contexts either.
+    if not hasattr(glfw, "PLATFORM_NULL"):
+        pytest.skip("GLFW 3.4 required")
+    glfw.init_hint(glfw.PLATFORM, glfw.PLATFORM_NULL)
+    if not glfw.init():
+        pytest.skip("Could not initialize GLFW")
+    glfw.window_hint(glfw.CLIENT_API, glfw.NO_API)
+    window = glfw.create_window(320, 200, "test", None, None)
+    yield window
+    glfw.destroy_window(window)
+    glfw.terminate()
+
+@pytest.fixture
+def glfw_impl(glfw_window):
+    from slimgui.integrations.glfw import GlfwRenderer
+    from slimgui.integrations.null import NullRenderer
+
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    imgui.get_io().ini_filename = None
+    renderer = NullRenderer()
+    renderer.max_texture_size = 4096
+    impl = GlfwRenderer(glfw_window, renderer=renderer)
+    yield impl
+    impl.shutdown()
+    imgui.destroy_context(ctx)
+
+class _SimulatedClock:
+    """Clock for `IdleFrameDriver` that advances by the full timeout on every wait."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def wait_events(self, timeout: float | None):
+        assert timeout is not None, "the driver would block forever"
+        self.now += timeout
+
+def test_idle_frame_driver(glfw_impl):
+    from slimgui.integrations.glfw import IdleFrameDriver
+
+    clock = _SimulatedClock()
+    driver = IdleFrameDriver(glfw_impl, settle_frames=2, idle_timeout=0.05, frame_rate=100.0, clock=clock, wait_events=clock.wait_events)
+
+    def frame() -> float:
+        t0 = clock.now
+        driver.wait()
+        elapsed = clock.now - t0
+        glfw_impl.new_frame()
+        imgui.new_frame()
+        imgui.set_next_window_pos((100, 100))
+        imgui.begin("Window")
+        imgui.text("Hello")
+        imgui.end()
+        imgui.render()
+        glfw_impl.render(imgui.get_draw_data())
+        return elapsed
+
+    # Settle frames are rendered right away, then the driver idles until the timeout.
+    assert frame() == 0.0
+    assert frame() == 0.0
+    assert driver.stats.frames_skipped == 0
+    assert frame() == pytest.approx(0.05)
+    assert driver.stats.idle_seconds == pytest.approx(0.05)
+    assert driver.stats.frames_skipped == 5
+
+    # Input and redraw requests wake the driver up.
+    glfw_impl.mouse_pos_callback(glfw_impl.window, 5.0, 5.0)
+    assert frame() == 0.0
+    assert frame() == 0.0  # settle frames
+    assert frame() == 0.0
+    assert frame() == pytest.approx(0.05)
+    driver.request_redraw(2)
+    assert frame() == 0.0
+    assert frame() == 0.0
+    assert frame() == pytest.approx(0.05)
+    assert driver.stats.frames_rendered == 10
+    assert driver.stats.idle_seconds == pytest.approx(0.15)
+    assert driver.stats.frames_skipped == 15
+
+    # A held mouse button keeps rendering.
+    glfw_impl.mouse_button_callback(glfw_impl.window, 0, 1, 0)
+    for _ in range(5):
+        assert frame() == 0.0
+
+def test_idle_frame_driver_tooltip(glfw_impl):
+    from slimgui.integrations.glfw import IdleFrameDriver
+
+    style = imgui.get_style()
+    style.hover_delay_normal = style.hover_stationary_delay = 0.1
+    clock = _SimulatedClock()
+    driver = IdleFrameDriver(glfw_impl, settle_frames=2, idle_timeout=1.0, clock=clock, wait_events=clock.wait_events)
+
+    def frame() -> float:
+        t0 = clock.now
+        driver.wait()
+        elapsed = clock.now - t0
+        glfw_impl.new_frame()
+        imgui.new_frame()
+        imgui.set_next_window_pos((0, 0))
+        imgui.begin("Window")
+        imgui.button("Button")
+        imgui.set_item_tooltip("Tooltip")
+        imgui.end()
+        imgui.render()
+        glfw_impl.render(imgui.get_draw_data())
+        return elapsed
+
+    # Settle frames, the window appears on its second frame.
+    for _ in range(2):
+        frame()
+    # Move the mouse over the button.
+    glfw_impl.mouse_pos_callback(glfw_impl.window, 20.0, 35.0)
+    for _ in range(3):
+        frame()
+    assert imgui.is_any_item_hovered()
+    # The next frame is due when the tooltip appears, not at the idle timeout.
+    assert frame() == pytest.approx(0.1)
+
+def test_glfw_swap_damage(glfw_impl):
+    from slimgui.integrations.glfw import _egl_damage_rects
+
+    # Top-left origin (x0, y0, x1, y1) to EGL's bottom-left origin (x, y, width, height).
+    assert _egl_damage_rects([(10, 20, 30, 60), (0, 0, 320, 200)], 200) == [10, 140, 20, 40, 0, 0, 320, 200]
+    # Without an EGL context the buffer age is unknown.
+    assert glfw_impl.buffer_age() == 0
+
+def test_glfw_egl_swap_with_damage(glfw_impl):
+    from slimgui.integrations.glfw import _EglSwap
+
+    swaps = []
+    egl_swap = _EglSwap("display", "surface", {b"EGL_KHR_swap_buffers_with_damage"})
+    assert egl_swap.swap_with_damage is not None and not egl_swap.has_buffer_age
+    assert egl_swap.buffer_age() == 0
+    egl_swap.swap_with_damage = lambda display, surface, rects, n: swaps.append((display, surface, list(rects), n))
+    glfw_impl._egl_swap_state = egl_swap
+
+    # The window is 320x200: rectangles are passed to eglSwapBuffersWithDamage with a bottom-left origin.
+    glfw_impl.swap_buffers([(10, 20, 30, 60), (100, 0, 110, 5)])
+    assert swaps == [("display", "surface", [10, 140, 20, 40, 100, 195, 10, 5], 2)]
+    glfw_impl.swap_buffers([])
+    assert swaps[-1] == ("display", "surface", [], 0)
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+from slimgui import imgui
+
+moderngl = pytest.importorskip("moderngl")
+
+FB_WIDTH, FB_HEIGHT = 320, 200
+
+@pytest.fixture(scope="module")
+def mgl_context():
+    try:
+        ctx = moderngl.create_standalone_context(require=330, backend="egl")
+    except Exception as e:
+        pytest.skip(f"EGL not available: {e}")
+    fbo = ctx.simple_framebuffer((FB_WIDTH, FB_HEIGHT))
+    fbo.use()
+    yield ctx, fbo
+    fbo.release()
+    ctx.release()
+
+@pytest.fixture
+def imgui_context(mgl_context):
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = FB_WIDTH, FB_HEIGHT
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    yield ctx
+    imgui.destroy_context(ctx)
+
+def _render_frame(renderer, fbo, format: imgui.TextureFormat = imgui.TextureFormat.RGBA32) -> np.ndarray:
+    imgui.get_io().fonts.tex_desired_format = format
+    imgui.new_frame()
+    for i in range(3):
+        imgui.set_next_window_pos((10 + i * 90, 10 + i * 40))
+        imgui.set_next_window_size((120, 100))
+        imgui.begin(f"Window {i}")
+        imgui.text(f"Hello {i}")
+        imgui.button("Button")
+        imgui.end()
+    imgui.render()
+    fbo.clear(0.1, 0.2, 0.3, 1.0)
+    renderer.render(imgui.get_draw_data())
+    return np.frombuffer(fbo.read(components=4), dtype=np.uint8).reshape(FB_HEIGHT, FB_WIDTH, 4)
+
+@pytest.mark.parametrize("format", [imgui.TextureFormat.RGBA32, imgui.TextureFormat.ALPHA8])
+def test_moderngl_render(mgl_context, imgui_context, format):
+    from slimgui.integrations.moderngl import ModernGLRenderer
+
+    ctx, fbo = mgl_context
+    renderer = ModernGLRenderer(ctx)
+    # New windows are hidden on their first frame.
+    _render_frame(renderer, fbo, format)
+    image = _render_frame(renderer, fbo, format)
+    background = (26, 51, 76, 255)
+    assert tuple(image[0, -1]) == background
+    # Bottom-up rows: the first window is near the top-left corner.
+    assert not np.array_equal(image[FB_HEIGHT - 40, 40], background)
+
+    assert all(tex.get_tex_id() != 0 for tex in imgui.get_platform_io().textures)
+    renderer.shutdown()
+    assert all(tex.get_tex_id() == 0 for tex in imgui.get_platform_io().textures)
+
+def test_moderngl_texture_updates(mgl_context, imgui_context):
+    from slimgui.integrations.moderngl import ModernGLRenderer
+
+    ctx, fbo = mgl_context
+    renderer = ModernGLRenderer(ctx)
+    _render_frame(renderer, fbo)
+    # Rendering text in a new font size bakes new glyphs into the atlas: WANT_UPDATES requests.
+    imgui.new_frame()
+    imgui.push_font(None, 41.0)
+    imgui.text("Large text 0123456789")
+    imgui.pop_font()
+    imgui.render()
+    statuses = {tex.status for tex in imgui.get_draw_data().textures}
+    renderer.render(imgui.get_draw_data())
+    assert imgui.TextureStatus.WANT_UPDATES in statuses or imgui.TextureStatus.WANT_CREATE in statuses
+    assert all(tex.status != imgui.TextureStatus.WANT_UPDATES for tex in imgui.get_platform_io().textures)
+    renderer.shutdown()
+
+def test_moderngl_state_restore(mgl_context, imgui_context):
+    import ctypes
+    from slimgui.integrations.moderngl import ModernGLRenderer
+
+    GL_BLEND, GL_CULL_FACE, GL_DEPTH_TEST, GL_SCISSOR_TEST = 0x0BE2, 0x0B44, 0x0B71, 0x0C11
+    GL_BLEND_SRC_RGB, GL_BLEND_DST_RGB, GL_BLEND_EQUATION_RGB, GL_POLYGON_MODE = 0x80C9, 0x80C8, 0x8009, 0x0B40
+    GL_ONE, GL_FUNC_SUBTRACT, GL_LINE = 1, 0x800A, 0x1B01
+
+    ctx, fbo = mgl_context
+    load = ctx.mglo._context.load
+    is_enabled = ctypes.CFUNCTYPE(ctypes.c_ubyte, ctypes.c_uint)(load("glIsEnabled"))
+    get_integerv = ctypes.CFUNCTYPE(None, ctypes.c_uint, ctypes.POINTER(ctypes.c_int))(load("glGetIntegerv"))
+
+    def get(pname: int) -> int:
+        value = (ctypes.c_int * 4)()
+        get_integerv(pname, value)
+        return value[0]
+
+    def state():
+        return (
+            [bool(is_enabled(cap)) for cap in (GL_BLEND, GL_CULL_FACE, GL_DEPTH_TEST, GL_SCISSOR_TEST)],
+            [get(pname) for pname in (GL_BLEND_SRC_RGB, GL_BLEND_DST_RGB, GL_BLEND_EQUATION_RGB, GL_POLYGON_MODE)],
+            ctx.viewport, ctx.wireframe,
+        )
+
+    renderer = ModernGLRenderer(ctx)
+    ctx.enable(moderngl.DEPTH_TEST | moderngl.CULL_FACE)
+    ctx.disable(moderngl.BLEND)
+    ctx.blend_func = moderngl.ONE, moderngl.ONE
+    ctx.blend_equation = moderngl.FUNC_SUBTRACT
+    ctx.wireframe = True
+    ctx.viewport = (5, 6, 70, 80)
+    before = state()
+    assert before == ([False, True, True, False], [GL_ONE, GL_ONE, GL_FUNC_SUBTRACT, GL_LINE], (5, 6, 70, 80), True)
+    _render_frame(renderer, fbo)
+    assert state() == before
+    # moderngl doesn't enable the scissor test again for later clears.
+    fbo.clear()
+    assert not is_enabled(GL_SCISSOR_TEST)
+
+    ctx.enable_only(moderngl.NOTHING)
+    ctx.blend_func = moderngl.DEFAULT_BLENDING
+    ctx.blend_equation = moderngl.FUNC_ADD
+    ctx.wireframe = False
+    ctx.viewport = (0, 0, FB_WIDTH, FB_HEIGHT)
+    renderer.shutdown()
+
+    renderer = ModernGLRenderer(ctx, state_backup="minimal")
+    _render_frame(renderer, fbo)
+    fbo.clear()
+    assert not is_enabled(GL_SCISSOR_TEST)
+    renderer.shutdown()
@@ -0,0 +1,659 @@
+import ctypes
+import os
+
+import numpy as np
+import pytest
+
+# Headless OpenGL through Mesa's surfaceless EGL platform (works with llvmpipe).
+# Must be configured before PyOpenGL is imported.
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+from slimgui import imgui
+
+FB_WIDTH, FB_HEIGHT = 320, 200
+
+@pytest.fixture(scope="module")
+def gl_context():
+    try:
+        import OpenGL.EGL as egl
+        import OpenGL.GL as gl
+    except ImportError:
+        pytest.skip("PyOpenGL not available")
+    try:
+        display = egl.eglGetDisplay(egl.EGL_DEFAULT_DISPLAY)
+        major, minor = ctypes.c_int32(), ctypes.c_int32()
+        if not egl.eglInitialize(display, major, minor):
+            pytest.skip("EGL not available")
+        egl.eglBindAPI(egl.EGL_OPENGL_API)
+        ctx_attribs = [
+            egl.EGL_CONTEXT_MAJOR_VERSION, 3,
+            egl.EGL_CONTEXT_MINOR_VERSION, 3,
+            egl.EGL_CONTEXT_OPENGL_PROFILE_MASK, egl.EGL_CONTEXT_OPENGL_CORE_PROFILE_BIT,
+            egl.EGL_NONE,
+        ]
+        context = egl.eglCreateContext(display, None, egl.EGL_NO_CONTEXT, ctx_attribs)
+        if context == egl.EGL_NO_CONTEXT or not egl.eglMakeCurrent(display, egl.EGL_NO_SURFACE, egl.EGL_NO_SURFACE, context):
+            pytest.skip("Could not create a surfaceless EGL context")
+    except Exception as e:
+        pytest.skip(f"EGL not available: {e}")
+
+    # No default framebuffer with a surfaceless context, render into an FBO instead.
+    fbo = gl.glGenFramebuffers(1)
+    gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, fbo)
+    rbo = gl.glGenRenderbuffers(1)
+    gl.glBindRenderbuffer(gl.GL_RENDERBUFFER, rbo)
+    gl.glRenderbufferStorage(gl.GL_RENDERBUFFER, gl.GL_RGBA8, FB_WIDTH, FB_HEIGHT)
+    gl.glFramebufferRenderbuffer(gl.GL_FRAMEBUFFER, gl.GL_COLOR_ATTACHMENT0, gl.GL_RENDERBUFFER, rbo)
+    assert gl.glCheckFramebufferStatus(gl.GL_FRAMEBUFFER) == gl.GL_FRAMEBUFFER_COMPLETE
+    yield
+    gl.glDeleteFramebuffers(1, [fbo])
+    gl.glDeleteRenderbuffers(1, [rbo])
+    egl.eglMakeCurrent(display, egl.EGL_NO_SURFACE, egl.EGL_NO_SURFACE, egl.EGL_NO_CONTEXT)
+    egl.eglDestroyContext(display, context)
+
+@pytest.fixture
+def imgui_context(gl_context):
+    ctx = imgui.create_context()
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = FB_WIDTH, FB_HEIGHT
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    yield ctx
+    imgui.destroy_context(ctx)
+
+def _build_frame(split_commands: bool = False):
+    imgui.new_frame()
+    for i in range(3):
+        imgui.set_next_window_pos((10 + i * 90, 10 + i * 40))
+        imgui.set_next_window_size((120, 100))
+        imgui.begin(f"Window {i}")
+        imgui.text(f"Hello {i}")
+        if split_commands:
+            imgui.get_window_draw_list().add_draw_cmd()
+        imgui.button("Button")
+        imgui.end()
+    imgui.render()
+    return imgui.get_draw_data()
+
+def _render_frame(renderer, split_commands: bool = False) -> np.ndarray:
+    import OpenGL.GL as gl
+    gl.glClearColor(0.1, 0.2, 0.3, 1.0)
+    gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+    renderer.render(_build_frame(split_commands))
+    gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+    pixels = gl.glReadPixels(0, 0, FB_WIDTH, FB_HEIGHT, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(FB_HEIGHT, FB_WIDTH, 4)
+
+def test_single_buffer_upload(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    per_list = OpenGLRenderer()
+    single = OpenGLRenderer(buffer_upload="single")
+    # First frame creates the font atlas texture.
+    _render_frame(per_list)
+
+    expected = _render_frame(per_list)
+    num_lists = imgui.get_draw_data().cmd_lists_count
+    assert num_lists >= 3
+    assert per_list.stats.buffer_uploads == 2 * num_lists
+
+    pixels = _render_frame(single)
+    assert single.stats.buffer_uploads == 2
+    assert single.stats.upload_bytes == per_list.stats.upload_bytes
+    assert np.array_equal(pixels, expected)
+
+    single.shutdown()
+    per_list.shutdown()
+
+def test_persistent_buffer_upload(imgui_context, monkeypatch):
+    from slimgui.integrations import opengl
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    reference = OpenGLRenderer()
+    _render_frame(reference)
+    expected = _render_frame(reference)
+
+    # Start with tiny slices to exercise buffer growth.
+    monkeypatch.setattr(OpenGLRenderer, "STREAMING_VTX_SLICE_SIZE", 64)
+    monkeypatch.setattr(OpenGLRenderer, "STREAMING_IDX_SLICE_SIZE", 64)
+    persistent = OpenGLRenderer(buffer_upload="persistent")
+    assert persistent.buffer_upload == "persistent"
+    for _ in range(4):  # cycle through all ring buffer slices
+        pixels = _render_frame(persistent)
+        assert persistent.stats.buffer_uploads == 0
+        assert persistent.stats.upload_bytes == reference.stats.upload_bytes
+        assert np.array_equal(pixels, expected)
+    persistent.shutdown()
+
+    # Contexts without glBufferStorage fall back to a single orphaning upload.
+    monkeypatch.setattr(opengl, "has_buffer_storage", lambda: False)
+    fallback = OpenGLRenderer(buffer_upload="persistent")
+    assert fallback.buffer_upload == "single"
+    assert np.array_equal(_render_frame(fallback), expected)
+    assert fallback.stats.buffer_uploads == 2
+    fallback.shutdown()
+    reference.shutdown()
+
+def test_native_renderer(imgui_context):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer
+    from slimgui.integrations.opengl_native import NativeOpenGLRenderer
+
+    reference = OpenGLRenderer()
+    _render_frame(reference)
+    expected = _render_frame(reference)
+    reference.shutdown()
+
+    native = NativeOpenGLRenderer()
+    assert native.max_texture_size == reference.max_texture_size
+    for _ in range(2):
+        assert np.array_equal(_render_frame(native), expected)
+
+    # Callbacks clobbering GL state followed by a render state reset must not affect the output.
+    calls = []
+    def cb(parent_list, cmd, userdata):
+        calls.append(userdata)
+        gl.glUseProgram(0)
+    def build_with_callbacks():
+        imgui.new_frame()
+        for i in range(3):
+            imgui.set_next_window_pos((10 + i * 90, 10 + i * 40))
+            imgui.set_next_window_size((120, 100))
+            imgui.begin(f"Window {i}")
+            dl = imgui.get_window_draw_list()
+            dl.add_callback(cb, i)
+            dl.add_callback(imgui.DRAW_CALLBACK_RESET_RENDER_STATE, 0)
+            imgui.text(f"Hello {i}")
+            imgui.button("Button")
+            imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+    native.render(build_with_callbacks())
+    assert calls == [0, 1, 2]
+    pixels = gl.glReadPixels(0, 0, FB_WIDTH, FB_HEIGHT, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+    assert np.array_equal(np.frombuffer(pixels, dtype=np.uint8).reshape(FB_HEIGHT, FB_WIDTH, 4), expected)
+    native.shutdown()
+
+def test_native_renderer_gl_calls_on_delete_and_shutdown(imgui_context):
+    import gc
+    from slimgui.integrations.opengl_native import NativeOpenGLRenderer, pyopengl_get_proc_address
+
+    # Record glDelete* calls and forward them to GL.
+    deleted = []
+    delete_objects = ctypes.CFUNCTYPE(None, ctypes.c_int, ctypes.POINTER(ctypes.c_uint))
+    delete_object = ctypes.CFUNCTYPE(None, ctypes.c_uint)
+
+    def recording(name, proto):
+        real = proto(pyopengl_get_proc_address(name))
+        def call(*args):
+            deleted.append(name)
+            real(*args)
+        return proto(call)
+
+    wrappers = {
+        "glDeleteBuffers": recording("glDeleteBuffers", delete_objects),
+        "glDeleteVertexArrays": recording("glDeleteVertexArrays", delete_objects),
+        "glDeleteTextures": recording("glDeleteTextures", delete_objects),
+        "glDeleteProgram": recording("glDeleteProgram", delete_object),
+    }
+
+    def get_proc_address(name):
+        wrapper = wrappers.get(name)
+        return ctypes.cast(wrapper, ctypes.c_void_p).value if wrapper is not None else pyopengl_get_proc_address(name)
+
+    # Garbage collecting a renderer makes no GL calls, its context may not be current.
+    renderer = NativeOpenGLRenderer(get_proc_address)
+    del renderer
+    gc.collect()
+    assert deleted == []
+
+    # Textures that were never created are left alone.
+    imgui.new_frame()
+    imgui.render()
+    assert all(tex.get_tex_id() == 0 for tex in imgui.get_platform_io().textures)
+    renderer = NativeOpenGLRenderer(get_proc_address)
+    renderer.shutdown()
+    assert "glDeleteProgram" in deleted and "glDeleteTextures" not in deleted
+    assert all(tex.status == imgui.TextureStatus.WANT_CREATE for tex in imgui.get_platform_io().textures)
+
+def test_redundant_state_elision(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+    from slimgui.integrations.opengl_native import NativeOpenGLRenderer
+
+    native = NativeOpenGLRenderer()
+    _render_frame(native)
+    expected = _render_frame(native)
+    native.shutdown()
+
+    renderer = OpenGLRenderer()
+    _render_frame(renderer)
+    assert np.array_equal(_render_frame(renderer), expected)
+    stats = renderer.stats
+    clip_rects = [cmd.clip_rect for dl in imgui.get_draw_data().commands_lists for cmd in dl.commands]
+    draw_calls = len(clip_rects)
+    assert stats.draw_calls == draw_calls
+    # All windows only use the font atlas texture.
+    assert stats.texture_binds_elided == draw_calls - 1
+    assert stats.scissors_elided == sum(a == b for a, b in zip(clip_rects, clip_rects[1:]))
+    renderer.shutdown()
+
+def test_multi_draw(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    # Split commands so that there are runs of commands with the same texture and clip rectangle.
+    reference = OpenGLRenderer()
+    _render_frame(reference, split_commands=True)
+    expected = _render_frame(reference, split_commands=True)
+
+    for buffer_upload in ("per_list", "single"):
+        renderer = OpenGLRenderer(buffer_upload=buffer_upload, multi_draw=True)
+        assert np.array_equal(_render_frame(renderer, split_commands=True), expected)
+        stats = renderer.stats
+        assert stats.draw_commands == reference.stats.draw_commands
+        assert stats.draw_calls == stats.draw_commands - 3
+        renderer.shutdown()
+    reference.shutdown()
+
+def test_multi_draw_batches(imgui_context):
+    def cb(parent_list, cmd, userdata):
+        pass
+
+    # New windows are hidden on their first frame, so render two frames.
+    for _ in range(2):
+        imgui.new_frame()
+        imgui.begin("Window")
+        dl = imgui.get_window_draw_list()
+        dl.add_rect_filled((0, 0), (10, 10), 0xffffffff)
+        dl.add_draw_cmd()
+        dl.add_rect_filled((10, 0), (20, 10), 0xffffffff)
+        dl.add_draw_cmd()
+        dl.add_callback(cb, 0)
+        dl.add_rect_filled((20, 0), (30, 10), 0xffffffff)
+        imgui.end()
+        imgui.render()
+
+    cmds = dl.commands_array()
+    drawn = cmds[(cmds["elem_count"] > 0) & ~cmds["has_callback"]]
+    counts, offsets, base_vertices, runs = dl.multi_draw_batches(vtx_base=100, idx_base=10)
+    assert np.array_equal(counts, drawn["elem_count"])
+    assert np.array_equal(offsets, (10 + drawn["idx_offset"].astype(np.uint64)) * imgui.INDEX_SIZE)
+    assert np.array_equal(base_vertices, 100 + drawn["vtx_offset"])
+    # Window background, the two rects split by add_draw_cmd(), the callback and the last rect.
+    assert runs["draw_count"].tolist() == [1, 2, 0, 1]
+    assert runs["draw_start"].tolist() == [0, 1, 3, 3]
+    assert cmds[runs[2]["cmd_index"]]["has_callback"]
+
+def test_texture_uploads(imgui_context):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    renderer = OpenGLRenderer()
+    _render_frame(renderer)
+    (atlas,) = imgui.get_platform_io().textures
+    assert renderer.stats.texture_uploads == 1
+    assert renderer.stats.texture_upload_bytes == atlas.get_size_in_bytes()
+    _render_frame(renderer)
+    assert renderer.stats.texture_uploads == 0
+
+    # A new font size bakes glyphs on demand, resulting in many small atlas updates.
+    def build_large_text():
+        imgui.new_frame()
+        imgui.set_next_window_pos((0, 0))
+        imgui.set_next_window_size((FB_WIDTH, FB_HEIGHT))
+        imgui.begin("Text")
+        imgui.push_font(None, 31.0)
+        imgui.text("The quick brown fox")
+        imgui.text("jumps over the lazy dog")
+        imgui.pop_font()
+        imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    def render_and_read(draw_data):
+        gl.glClear(gl.GL_COLOR_BUFFER_BIT)
+        renderer.render(draw_data)
+        pixels = gl.glReadPixels(0, 0, FB_WIDTH, FB_HEIGHT, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(FB_HEIGHT, FB_WIDTH, 4)
+
+    draw_data = build_large_text()
+    assert atlas.status == imgui.TextureStatus.WANT_UPDATES
+    updates = [(r.x, r.y, r.w, r.h) for r in atlas.updates]
+    coalesced = [(r.x, r.y, r.w, r.h) for r in atlas.get_coalesced_updates()]
+    assert len(coalesced) < len(updates)
+    # Every update must be covered by a merged rectangle.
+    for x, y, w, h in updates:
+        assert any(cx <= x and cy <= y and x + w <= cx + cw and y + h <= cy + ch for cx, cy, cw, ch in coalesced)
+    assert sum(w * h for _, _, w, h in coalesced) <= 2 * sum(w * h for _, _, w, h in updates)
+
+    render_and_read(draw_data)
+    assert renderer.stats.texture_uploads == len(coalesced)
+    assert renderer.stats.texture_upload_bytes == sum(w * h * 4 for _, _, w, h in coalesced)
+    # New windows are hidden on their first frame.
+    pixels = render_and_read(build_large_text())
+    renderer.shutdown()
+
+    # A fresh renderer uploads the complete atlas at once, the output must be the same.
+    renderer = OpenGLRenderer()
+    expected = render_and_read(build_large_text())
+    assert renderer.stats.texture_uploads == 1
+    assert np.array_equal(pixels, expected)
+    renderer.shutdown()
+
+@pytest.mark.parametrize("native", [False, True])
+def test_alpha8_font_atlas(imgui_context, native):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer
+    from slimgui.integrations.opengl_native import NativeOpenGLRenderer
+
+    def render_twice(fmt: imgui.TextureFormat):
+        ctx = imgui.create_context()
+        imgui.set_current_context(ctx)
+        io = imgui.get_io()
+        io.ini_filename = None
+        io.display_size = FB_WIDTH, FB_HEIGHT
+        io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+        io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+        io.fonts.tex_desired_format = fmt
+        renderer = NativeOpenGLRenderer() if native else OpenGLRenderer()
+        _render_frame(renderer)
+        (atlas,) = imgui.get_platform_io().textures
+        assert atlas.format == fmt
+        upload_bytes = None if native else renderer.stats.texture_upload_bytes
+        gl.glBindTexture(gl.GL_TEXTURE_2D, atlas.get_tex_id())
+        green_bits = gl.glGetTexLevelParameteriv(gl.GL_TEXTURE_2D, 0, gl.GL_TEXTURE_GREEN_SIZE)
+        gl.glBindTexture(gl.GL_TEXTURE_2D, 0)
+        # New windows are hidden on their first frame.
+        pixels = _render_frame(renderer)
+        renderer.shutdown()
+        imgui.destroy_context(ctx)
+        imgui.set_current_context(imgui_context)
+        return pixels, upload_bytes, green_bits
+
+    rgba_pixels, rgba_bytes, rgba_green_bits = render_twice(imgui.TextureFormat.RGBA32)
+    alpha_pixels, alpha_bytes, alpha_green_bits = render_twice(imgui.TextureFormat.ALPHA8)
+    # ALPHA8 is stored in a single channel texture but sampled as white + alpha.
+    assert rgba_green_bits == 8 and alpha_green_bits == 0
+    assert np.array_equal(rgba_pixels, alpha_pixels)
+    if not native:
+        assert alpha_bytes * 4 == rgba_bytes
+
+@pytest.mark.parametrize("multi_draw", [False, True])
+def test_gpu_timing(imgui_context, multi_draw):
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    renderer = OpenGLRenderer(multi_draw=multi_draw, gpu_timing=True)
+    timer = renderer.gpu_timer
+    assert timer is not None and timer.latest is None
+    num_frames = 4
+    for _ in range(num_frames):
+        _render_frame(renderer, split_commands=True)
+    # Results are read back without waiting, so some frames may still be pending.
+    assert len(timer.history) < num_frames
+    timer.collect(wait=True)
+    assert [f.frame for f in timer.history] == list(range(num_frames))
+
+    frame = timer.latest
+    assert frame is not None
+    draw_data = imgui.get_draw_data()
+    assert len(frame.draw_lists) == draw_data.cmd_lists_count
+    assert frame.draw_calls == renderer.stats.draw_calls
+    assert frame.vtx_count == draw_data.total_vtx_count
+    assert sum(dl.idx_count for dl in frame.draw_lists) == draw_data.total_idx_count
+    assert all(dl.gpu_seconds >= 0 for dl in frame.draw_lists)
+    assert frame.gpu_seconds == pytest.approx(frame.setup_gpu_seconds + sum(dl.gpu_seconds for dl in frame.draw_lists))
+    assert frame.gpu_seconds > 0
+    assert timer.mean_gpu_seconds() > 0
+    renderer.shutdown()
+
+@pytest.mark.parametrize("native", [False, True])
+def test_state_backup_policies(imgui_context, native):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer
+    from slimgui.integrations.opengl_native import NativeOpenGLRenderer
+
+    def render_with(policy):
+        def set_app_state():
+            # With "none", the scissor test stays enabled and would limit the next glClear().
+            gl.glDisable(gl.GL_SCISSOR_TEST)
+            gl.glDisable(gl.GL_BLEND)
+            gl.glBlendFunc(gl.GL_ONE, gl.GL_ZERO)
+            gl.glViewport(0, 0, FB_WIDTH // 2, FB_HEIGHT // 2)
+
+        renderer = NativeOpenGLRenderer(state_backup=policy) if native else OpenGLRenderer(state_backup=policy)
+        set_app_state()
+        _render_frame(renderer)
+        # New windows are hidden on their first frame.
+        set_app_state()
+        pixels = _render_frame(renderer)
+        state = (
+            bool(gl.glIsEnabled(gl.GL_BLEND)),
+            int(gl.glGetIntegerv(gl.GL_BLEND_SRC_RGB)),
+            tuple(gl.glGetIntegerv(gl.GL_VIEWPORT)),
+            int(gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING)),
+        )
+        renderer.shutdown()
+        gl.glDisable(gl.GL_SCISSOR_TEST)
+        gl.glViewport(0, 0, FB_WIDTH, FB_HEIGHT)
+        gl.glBindVertexArray(0)
+        return pixels, state
+
+    full_pixels, full_state = render_with("full")
+    assert full_state == (False, gl.GL_ONE, (0, 0, FB_WIDTH // 2, FB_HEIGHT // 2), 0)
+    # Bindings and enables are restored, blend function and viewport are left as set by the renderer.
+    minimal_pixels, minimal_state = render_with("minimal")
+    assert minimal_state == (False, gl.GL_SRC_ALPHA, (0, 0, FB_WIDTH, FB_HEIGHT), 0)
+    none_pixels, none_state = render_with("none")
+    assert none_state[:3] == (True, gl.GL_SRC_ALPHA, (0, 0, FB_WIDTH, FB_HEIGHT)) and none_state[3] != 0
+    # The rendered output doesn't depend on the policy.
+    assert np.array_equal(full_pixels, minimal_pixels)
+    assert np.array_equal(full_pixels, none_pixels)
+
+def test_pyopengl_get_proc_address_fallback(gl_context, monkeypatch):
+    from types import SimpleNamespace
+    from OpenGL import platform
+    from slimgui.integrations.opengl_native import pyopengl_get_proc_address
+
+    gl_library = platform.PLATFORM.GL
+    # Like wglGetProcAddress for GL 1.1 functions: resolved from the GL library instead.
+    monkeypatch.setattr(platform, "PLATFORM", SimpleNamespace(GL=gl_library, getExtensionProcedure=lambda name: None))
+    assert pyopengl_get_proc_address("glBindTexture")
+    # Like PyOpenGL's macOS platform, which has no extension loader.
+    monkeypatch.setattr(platform, "PLATFORM", SimpleNamespace(GL=gl_library))
+    assert pyopengl_get_proc_address("glBindTexture")
+    assert pyopengl_get_proc_address("glNoSuchFunction") is None
+
+def test_state_saver_fallbacks(imgui_context, monkeypatch):
+    import OpenGL.GL as gl
+    from slimgui.slimgui_ext import render
+    from slimgui.integrations import opengl
+    from slimgui.integrations.opengl_native import pyopengl_get_proc_address
+
+    # GLStateSaver only loads the functions it calls.
+    state_functions = {
+        "glActiveTexture", "glBindBuffer", "glBindSampler", "glBindTexture", "glBindVertexArray", "glBlendEquationSeparate",
+        "glBlendFuncSeparate", "glDisable", "glEnable", "glGetIntegerv", "glIsEnabled", "glIsProgram", "glPolygonMode",
+        "glScissor", "glUseProgram", "glViewport",
+    }
+    render.GLStateSaver(lambda name: pyopengl_get_proc_address(name) if name in state_functions else None)
+    with pytest.raises(RuntimeError, match="Could not load OpenGL function"):
+        render.GLStateSaver(lambda name: None)
+
+    # Without native GL functions, OpenGLRenderer saves and restores state with PyOpenGL.
+    monkeypatch.setattr(opengl, "pyopengl_get_proc_address", lambda name: None)
+    renderer = opengl.OpenGLRenderer()
+    assert isinstance(renderer._state_saver, opengl.PyOpenGLStateSaver)
+    gl.glDisable(gl.GL_BLEND)
+    gl.glViewport(0, 0, FB_WIDTH // 2, FB_HEIGHT // 2)
+    _render_frame(renderer)
+    pixels = _render_frame(renderer)
+    assert not gl.glIsEnabled(gl.GL_BLEND) and not gl.glIsEnabled(gl.GL_SCISSOR_TEST)
+    assert tuple(gl.glGetIntegerv(gl.GL_VIEWPORT)) == (0, 0, FB_WIDTH // 2, FB_HEIGHT // 2)
+    assert int(gl.glGetIntegerv(gl.GL_VERTEX_ARRAY_BINDING)) == 0
+    assert (pixels != pixels[0, 0]).any()
+    renderer.shutdown()
+    gl.glViewport(0, 0, FB_WIDTH, FB_HEIGHT)
+
+def test_software_renderer_matches_opengl(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+    from slimgui.integrations.software import SoftwareRenderer
+
+    renderer = OpenGLRenderer()
+    _render_frame(renderer)
+    # glReadPixels() returns the bottom row first.
+    expected = _render_frame(renderer)[::-1]
+    renderer.shutdown()
+
+    software = SoftwareRenderer(clear_color=(0.1, 0.2, 0.3, 1.0))
+    image = software.render(_build_frame())
+    software.shutdown()
+    # Rasterizers differ slightly in interpolation precision.
+    assert np.abs(image.astype(np.int16) - expected).max() <= 2
+
+def _read_texture_target(target) -> np.ndarray:
+    import OpenGL.GL as gl
+    last_fbo = gl.glGetIntegerv(gl.GL_READ_FRAMEBUFFER_BINDING)
+    gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, target.fbo)
+    gl.glPixelStorei(gl.GL_PACK_ALIGNMENT, 1)
+    pixels = gl.glReadPixels(0, 0, target.width, target.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+    gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, last_fbo)
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(target.height, target.width, 4)
+
+def test_render_to_texture(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    renderer = OpenGLRenderer()
+    _render_frame(renderer)
+    expected = _render_frame(renderer)
+
+    target = renderer.render_to_texture(_build_frame())
+    assert target is renderer.render_target
+    assert (target.width, target.height) == (FB_WIDTH, FB_HEIGHT)
+    assert not renderer.stats.cached_frame and renderer.stats.draw_calls > 0
+    ui = _read_texture_target(target)
+
+    # Compositing the premultiplied UI texture over the background matches rendering directly.
+    background = np.array([0.1, 0.2, 0.3, 1.0]) * 255
+    composite = ui[..., :3] + background[:3] * (1 - ui[..., 3:] / 255)
+    assert np.abs(composite - expected[..., :3]).max() <= 2
+
+    # Unchanged frames are not redrawn.
+    assert renderer.render_to_texture(_build_frame()) is target
+    assert renderer.stats.cached_frame and renderer.stats.draw_calls == 0
+    assert np.array_equal(_read_texture_target(target), ui)
+    target.invalidate()
+    renderer.render_to_texture(_build_frame())
+    assert not renderer.stats.cached_frame
+
+    # Changed frames are.  Texture requests are processed once per frame.
+    update_textures = renderer._update_textures
+    calls = []
+    renderer._update_textures = lambda textures: (calls.append(1), update_textures(textures))
+    renderer.render_to_texture(_build_frame(split_commands=True))
+    assert not renderer.stats.cached_frame
+    assert len(calls) == 1
+    del renderer._update_textures
+    renderer.shutdown()
+    assert renderer.render_target is None
+
+def test_render_to_caller_texture(imgui_context):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer, RenderTarget
+
+    renderer = OpenGLRenderer()
+    texture = gl.glGenTextures(1)
+    gl.glBindTexture(gl.GL_TEXTURE_2D, texture)
+    gl.glTexImage2D(gl.GL_TEXTURE_2D, 0, gl.GL_RGBA8, FB_WIDTH, FB_HEIGHT, 0, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, None)
+    target = RenderTarget(FB_WIDTH, FB_HEIGHT, texture=texture)
+    # New windows are hidden on their first frame.
+    renderer.render_to_texture(_build_frame(), target)
+    renderer.render_to_texture(_build_frame(), target)
+    assert renderer.render_to_texture(_build_frame(), target) is target
+    assert renderer.stats.cached_frame
+    assert renderer.render_target is None
+    assert _read_texture_target(target)[..., 3].max() == 255
+    with pytest.raises(ValueError):
+        target.resize(10, 10)
+
+    small = RenderTarget(16, 16)
+    with pytest.raises(ValueError):
+        renderer.render_to_texture(_build_frame(), small)
+    small.destroy()
+    target.destroy()
+    # Caller-supplied textures are not deleted with the render target.
+    assert gl.glIsTexture(texture)
+    gl.glDeleteTextures([texture])
+    renderer.shutdown()
+
+def test_render_to_texture_partial_redraw(imgui_context):
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    def build(label: str):
+        imgui.new_frame()
+        for i in range(3):
+            imgui.set_next_window_pos((10 + i * 100, 10 + i * 40))
+            imgui.set_next_window_size((120, 100))
+            imgui.begin(f"Window {i}")
+            imgui.text("Hello")
+            imgui.button(label if i == 1 else "Button")
+            imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    renderer = OpenGLRenderer()
+    for label in ["a", "a", "b", "c"]:
+        target = renderer.render_to_texture(build(label))
+    partial_calls = renderer.stats.draw_calls
+    partial = _read_texture_target(target)
+
+    target.invalidate()
+    renderer.render_to_texture(build("c"))
+    assert renderer.stats.draw_calls > partial_calls
+    assert np.array_equal(_read_texture_target(target), partial)
+    renderer.shutdown()
+
+def test_shared_device_objects(imgui_context):
+    import OpenGL.GL as gl
+    from slimgui.integrations.opengl import OpenGLRenderer
+
+    first = OpenGLRenderer()
+    expected = _render_frame(first)
+    expected = _render_frame(first)
+    (atlas,) = imgui.get_platform_io().textures
+    assert first.stats.texture_uploads == 0
+
+    # A second window's context: same font atlas, renderer sharing the first one's GL objects.
+    second_ctx = imgui.create_context(imgui.get_io().fonts)
+    imgui.set_current_context(second_ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = FB_WIDTH, FB_HEIGHT
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_VTX_OFFSET
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    second = OpenGLRenderer(shared=first.device_objects)
+    assert second.device_objects is first.device_objects
+    assert first.device_objects.ref_count == 2
+    vbo = first.device_objects.vbo
+
+    _render_frame(second)
+    pixels = _render_frame(second)
+    # The atlas was uploaded by the first renderer only.
+    assert second.stats.texture_uploads == 0
+    assert atlas.ref_count == 2
+    assert np.array_equal(pixels, expected)
+
+    # The first context's atlas textures outlive its renderer while the second context uses them.
+    second.shutdown()
+    assert gl.glIsBuffer(vbo)
+    assert gl.glIsTexture(atlas.get_tex_id())
+    imgui.destroy_context(second_ctx)
+    imgui.set_current_context(imgui_context)
+    assert atlas.ref_count == 1
+
+    first.shutdown()
+    assert first.device_objects.ref_count == 0
+    assert not gl.glIsBuffer(vbo)
+    assert atlas.get_tex_id() == 0
@@ -0,0 +1,132 @@
+import os
+
+import numpy as np
+import pytest
+
+# Headless OpenGL through EGL (works with llvmpipe).  Must be configured before PyOpenGL and
+# pyglet's window module are imported.
+os.environ.setdefault("PYOPENGL_PLATFORM", "egl")
+os.environ.setdefault("EGL_PLATFORM", "surfaceless")
+
+from slimgui import imgui
+
+pyglet = pytest.importorskip("pyglet")
+pyglet.options["headless"] = True
+
+@pytest.fixture
+def pyglet_windows():
+    try:
+        import OpenGL.GL  # noqa: F401
+        windows = [pyglet.window.Window(320, 200, visible=False), pyglet.window.Window(160, 100, visible=False)]
+    except Exception as e:
+        pytest.skip(f"Headless pyglet not available: {e}")
+    yield windows
+    for window in windows:
+        window.close()
+
+def _frame(impl, ctx, text: str):
+    imgui.set_current_context(ctx)
+    impl.new_frame()
+    imgui.new_frame()
+    imgui.set_next_window_pos((5, 5))
+    imgui.set_next_window_size((100, 60))
+    imgui.begin("Window")
+    imgui.text(text)
+    imgui.end()
+    imgui.render()
+    impl.window.switch_to()
+    impl.window.clear()
+    impl.render(imgui.get_draw_data())
+
+def _read_pixels(window) -> np.ndarray:
+    import OpenGL.GL as gl
+    window.switch_to()
+    w, h = window.get_framebuffer_size()
+    pixels = gl.glReadPixels(0, 0, w, h, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE)
+    return np.frombuffer(pixels, dtype=np.uint8).reshape(h, w, 4)
+
+def test_pyglet_shared_renderer(pyglet_windows):
+    from slimgui.integrations.pyglet import PygletRenderer, _shared_objects
+
+    contexts, impls = [], []
+    for window in pyglet_windows:
+        ctx = imgui.create_context()
+        imgui.set_current_context(ctx)
+        imgui.get_io().ini_filename = None
+        contexts.append(ctx)
+        impls.append(PygletRenderer(window))
+    # Windows with shared GL objects share the renderers' shader program and buffers.
+    assert impls[0].renderer.device_objects is impls[1].renderer.device_objects
+    assert impls[0].renderer.device_objects.ref_count == 2
+    assert _shared_objects[pyglet_windows[0].context.object_space] is impls[0].renderer.device_objects
+
+    # New windows are hidden on their first frame.
+    for _ in range(2):
+        for impl, ctx in zip(impls, contexts):
+            _frame(impl, ctx, "Hello")
+    for impl in impls:
+        image = _read_pixels(impl.window)
+        assert image[:, :, :3].any()
+        assert not image[0, -1, :3].any()
+
+    for impl, ctx in zip(impls, contexts):
+        imgui.set_current_context(ctx)
+        impl.shutdown()
+        imgui.destroy_context(ctx)
+
+def test_pyglet_mouse_coalescing(pyglet_windows):
+    from slimgui.integrations.pyglet import PygletRenderer
+
+    window = pyglet_windows[0]
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    imgui.get_io().ini_filename = None
+    impl = PygletRenderer(window)
+
+    calls = []
+    io = imgui.get_io()
+    add_mouse_pos_event = io.add_mouse_pos_event
+    class CountingIO:
+        def __getattr__(self, name):
+            return getattr(io, name)
+        def add_mouse_pos_event(self, x, y):
+            calls.append((x, y))
+            add_mouse_pos_event(x, y)
+    impl.io = CountingIO()
+
+    for i in range(500):
+        window.dispatch_event("on_mouse_motion", i % 300, i % 200, 1, 1)
+    window.dispatch_event("on_mouse_motion", 40, 150, 1, 1)
+    window.dispatch_events()
+    assert calls == []
+    impl.new_frame()
+    # pyglet's y axis points up.
+    assert calls == [(40.0, 50.0)]
+    assert impl.input_events == 501
+    imgui.new_frame()
+    assert imgui.get_io().mouse_pos == (40, 50)
+    imgui.end_frame()
+
+    # Motion is flushed before button events to keep the click at the right position.
+    window.dispatch_event("on_mouse_motion", 10, 190, 1, 1)
+    window.dispatch_event("on_mouse_press", 12, 188, pyglet.window.mouse.LEFT, 0)
+    window.dispatch_events()
+    assert calls[-1] == (12.0, 12.0)
+
+    impl.shutdown()
+    imgui.destroy_context(ctx)
+
+def test_pyglet_shared_objects_follow_object_space():
+    import gc
+    import types
+    from pyglet.gl.base import ObjectSpace
+    from slimgui.integrations.pyglet import _shared_objects
+
+    # The objects of an object space whose contexts are gone (e.g., windows closed without `shutdown()`)
+    # are forgotten, not handed to a later object space that happens to reuse its memory.
+    object_space = ObjectSpace()
+    objects = types.SimpleNamespace(ref_count=1)
+    _shared_objects[object_space] = objects
+    del object_space
+    gc.collect()
+    assert all(value is not objects for value in _shared_objects.values())
@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+from slimgui import imgui
+from slimgui.integrations.software import SoftwareRenderer
+from slimgui.slimgui_ext.render import DrawDataReader, DrawDataRecorder
+
+WIDTH, HEIGHT = 320, 200
+
+def _create_context():
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = WIDTH, HEIGHT
+    return ctx
+
+@pytest.fixture
+def imgui_context():
+    ctx = _create_context()
+    yield ctx
+    imgui.destroy_context(ctx)
+
+def _build_frame(label: str, font_size: float = 0.0):
+    imgui.new_frame()
+    imgui.set_next_window_pos((10, 10))
+    imgui.begin("Window")
+    imgui.text(label)
+    if font_size > 0:
+        imgui.push_font(None, font_size)
+        imgui.text("Big glyphs")
+        imgui.pop_font()
+    imgui.button("Button")
+    imgui.end()
+    imgui.render()
+    return imgui.get_draw_data()
+
+def _record(frames) -> tuple[bytes, list[np.ndarray], DrawDataRecorder]:
+    renderer = SoftwareRenderer()
+    recorder = DrawDataRecorder()
+    stream = bytearray()
+    images = []
+    for i, args in enumerate(frames):
+        draw_data = _build_frame(*args)
+        stream += recorder.record(draw_data, time=i / 60)
+        images.append(renderer.render(draw_data).copy())
+    renderer.shutdown()
+    return bytes(stream), images, recorder
+
+def _replay(stream: bytes, chunk_size: int) -> tuple[list[np.ndarray], DrawDataReader]:
+    # Replay in a context of its own, like an offline viewer would.
+    prev_ctx = imgui.get_current_context()
+    ctx = _create_context()
+    renderer = SoftwareRenderer()
+    reader = DrawDataReader()
+    images = []
+    for pos in range(0, len(stream), chunk_size):
+        reader.feed(stream[pos:pos + chunk_size])
+        while (draw_data := reader.read_frame()) is not None:
+            imgui.get_io().display_size = draw_data.display_size
+            images.append(renderer.render(draw_data).copy())
+    renderer.shutdown()
+    imgui.destroy_context(ctx)
+    imgui.set_current_context(prev_ctx)
+    return images, reader
+
+def test_record_replay(imgui_context):
+    frames = [("a",)] * 3 + [("b",)] * 3 + [("c", 40.0)] * 3 + [("c",)] * 2
+    stream, expected, recorder = _record(frames)
+    assert recorder.frame_count == len(frames) and recorder.bytes_written == len(stream)
+    # Unchanged lists and frames aren't serialized again.
+    assert recorder.lists_referenced >= 3
+    for chunk_size in (len(stream), 1000, 7):
+        images, reader = _replay(stream, chunk_size)
+        assert reader.frame_count == len(frames) and reader.time == pytest.approx((len(frames) - 1) / 60)
+        assert len(images) == len(expected)
+        for i, (image, want) in enumerate(zip(images, expected)):
+            assert np.array_equal(image, want), (chunk_size, i)
+
+def test_record_texture_updates(imgui_context):
+    stream, _, _ = _record([("a",)] * 2 + [("a", 40.0)])
+    reader = DrawDataReader()
+    reader.feed(stream)
+    statuses = []
+    while (draw_data := reader.read_frame()) is not None:
+        statuses.append([tex.status for tex in draw_data.textures])
+        # Acknowledge the requests like a renderer would.
+        for tex in draw_data.textures:
+            tex.set_tex_id(1)
+            tex.set_status(imgui.TextureStatus.OK)
+    assert statuses[0] == [imgui.TextureStatus.WANT_CREATE]
+    assert statuses[1] == [imgui.TextureStatus.OK]
+    # New glyphs were baked into the atlas.
+    assert statuses[2] == [imgui.TextureStatus.WANT_UPDATES]
+
+def test_record_static_frames_are_small(imgui_context):
+    renderer = SoftwareRenderer()
+    recorder = DrawDataRecorder()
+
+    def record(label: str, time: float) -> int:
+        draw_data = _build_frame(label)
+        size = len(recorder.record(draw_data, time))
+        renderer.render(draw_data)
+        return size
+
+    sizes = [record("static", i / 60) for i in range(100)]
+    # A repeated frame is a record type, length and time: an hour at 60 FPS is about 3 MB.
+    assert max(sizes[10:]) <= 16
+    renderer.shutdown()
+
+def test_record_small_changes_are_small(imgui_context):
+    renderer = SoftwareRenderer()
+    recorder = DrawDataRecorder()
+    stream = bytearray()
+    expected = []
+
+    def record(draw_data, time: float) -> int:
+        data = recorder.record(draw_data, time)
+        stream.extend(data)
+        expected.append(renderer.render(draw_data).copy())
+        return len(data)
+
+    # A ticking counter changes the UVs of a glyph or two.  The window appears on the second frame, its
+    # list is written in full, and the first frames bake the digits into the font atlas.
+    sizes = [record(_build_frame(f"counter {100 + i}"), i / 60) for i in range(120)]
+    assert recorder.lists_written == 1 and recorder.lists_delta == 118
+    assert sizes[1] > 2000
+    # An hour at 60 FPS is under 30 MB.
+    assert max(sizes[10:]) < 128
+
+    # A blinking text cursor.
+    def cursor_frame(visible: bool):
+        imgui.new_frame()
+        imgui.set_next_window_pos((10, 10))
+        imgui.begin("Window")
+        imgui.text("Editing")
+        if visible:
+            p = imgui.get_cursor_screen_pos()
+            imgui.get_window_draw_list().add_line(p, (p[0], p[1] + 13), 0xffffffff)
+        imgui.button("Button")
+        imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    sizes = [record(cursor_frame(i // 30 % 2 == 0), (120 + i) / 60) for i in range(120)]
+    # Showing the cursor inserts its vertices (80 bytes) and shifts the indices after them.
+    assert max(sizes[1:]) < 200 and sizes[2] <= 16
+
+    images, _ = _replay(bytes(stream), 4096)
+    assert len(images) == len(expected)
+    for i, (image, want) in enumerate(zip(images, expected)):
+        assert np.array_equal(image, want), i
+    renderer.shutdown()
+
+def test_record_malformed(imgui_context):
+    reader = DrawDataReader()
+    reader.feed(b"not a recording at all")
+    with pytest.raises(ValueError):
+        reader.read_frame()
+
+    stream, _, _ = _record([("a",)] * 2)
+    reader = DrawDataReader()
+    reader.feed(stream[:-3])
+    frames = 0
+    while reader.read_frame() is not None:
+        frames += 1
+    # The last frame is incomplete.
+    assert frames == 1
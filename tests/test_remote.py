@@ -0,0 +1,167 @@
+import numpy as np
+import pytest
+from slimgui import imgui
+from slimgui.integrations.remote import RemoteClient, RemoteServer
+from slimgui.integrations.software import SoftwareRenderer
+
+WIDTH, HEIGHT = 320, 200
+
+def _create_context():
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    imgui.get_io().ini_filename = None
+    return ctx
+
+@pytest.fixture(params=["tcp", "unix"])
+def loopback(request, tmp_path):
+    address = ("127.0.0.1", 0) if request.param == "tcp" else str(tmp_path / "slimgui.sock")
+    server_ctx = _create_context()
+    server = RemoteServer(address)
+    client_ctx = _create_context()
+    client = RemoteClient(server.address, SoftwareRenderer())
+    imgui.set_current_context(server_ctx)
+    assert server.wait_for_client(timeout=5)
+    yield server, server_ctx, client, client_ctx
+    imgui.set_current_context(client_ctx)
+    client.close()
+    client.renderer.shutdown()
+    imgui.destroy_context(client_ctx)
+    imgui.set_current_context(server_ctx)
+    server.shutdown()
+    imgui.destroy_context(server_ctx)
+
+def _server_frame(server: RemoteServer, server_ctx, clicks: list[int]):
+    imgui.set_current_context(server_ctx)
+    server.new_frame()
+    imgui.new_frame()
+    imgui.set_next_window_pos((10, 10))
+    imgui.set_next_window_size((200, 100))
+    imgui.begin("Remote")
+    imgui.text(f"clicks: {len(clicks)}")
+    if imgui.button("Click me"):
+        clicks.append(imgui.get_frame_count())
+    imgui.end()
+    imgui.render()
+    server.render(imgui.get_draw_data())
+
+def _client_frame(client: RemoteClient, client_ctx, server: RemoteServer, server_ctx) -> int:
+    # Both ends run on this thread: let the server send what didn't fit in the socket buffer.
+    for _ in range(100):
+        imgui.set_current_context(client_ctx)
+        frames = client.update(timeout=0.05)
+        if frames > 0:
+            return frames
+        imgui.set_current_context(server_ctx)
+        server.process_events()
+    return 0
+
+def test_remote_loopback(loopback):
+    server, server_ctx, client, client_ctx = loopback
+    clicks: list[int] = []
+
+    imgui.set_current_context(client_ctx)
+    client.send_display_size((WIDTH, HEIGHT))
+    for _ in range(3):
+        _server_frame(server, server_ctx, clicks)
+        assert _client_frame(client, client_ctx, server, server_ctx) == 1
+    imgui.set_current_context(client_ctx)
+    assert imgui.get_io().display_size == (WIDTH, HEIGHT)
+    image = client.renderer.image
+    assert image is not None and image.shape == (HEIGHT, WIDTH, 4)
+    # The window is drawn: its pixels differ from the background.
+    assert len(np.unique(image[15:105, 15:205].reshape(-1, 4), axis=0)) > 2
+
+    # Click the button from the client.
+    pos = (40, 55)
+    for down in (True, False):
+        client.send_mouse_pos(*pos)
+        client.send_mouse_button(0, down)
+        _server_frame(server, server_ctx, clicks)
+        _client_frame(client, client_ctx, server, server_ctx)
+    assert len(clicks) == 1
+
+    # Latency is known once the client has acknowledged a frame.
+    imgui.set_current_context(server_ctx)
+    server.process_events(timeout=0.5)
+    assert [s.frame for s in server.stats] == list(range(1, 6))
+    assert all(s.latency is not None and s.latency > 0 for s in server.stats)
+    # Frames after the first only send what changed: no atlas, and references to unchanged lists.
+    assert server.stats[0].bytes > 10000
+    assert server.stats[2].bytes < server.stats[0].bytes // 10
+    assert server.bytes_sent == sum(s.bytes for s in server.stats)
+
+def test_remote_reconnect(loopback):
+    server, server_ctx, client, client_ctx = loopback
+    clicks: list[int] = []
+    for _ in range(2):
+        _server_frame(server, server_ctx, clicks)
+        _client_frame(client, client_ctx, server, server_ctx)
+    expected = client.renderer.image.copy()
+
+    imgui.set_current_context(client_ctx)
+    client.close()
+    second = RemoteClient(server.address, client.renderer)
+    imgui.set_current_context(server_ctx)
+    assert server.wait_for_client(timeout=5)
+    # The stream starts over for the new client: header, atlas and all lists.
+    _server_frame(server, server_ctx, clicks)
+    assert _client_frame(second, client_ctx, server, server_ctx) == 1
+    assert np.array_equal(client.renderer.image, expected)
+    second.close()
+
+def _vertices(draw_data: imgui.DrawData) -> bytes:
+    return b"".join(dl.vtx_buffer_array().tobytes() for dl in draw_data.commands_lists)
+
+def _catch_up(client, client_ctx, server, server_ctx) -> int:
+    frames = 0
+    while (n := _client_frame(client, client_ctx, server, server_ctx)) > 0:
+        frames += n
+        imgui.set_current_context(server_ctx)
+        server.process_events(timeout=0.05)
+        if server.client.pending_bytes == 0 and not server._sent:
+            break
+    return frames
+
+def _check_resync(client, client_ctx, server, server_ctx, clicks: list[int]):
+    for _ in range(3):
+        _server_frame(server, server_ctx, clicks)
+        draw_data = imgui.get_draw_data()
+        expected = _vertices(draw_data)
+        # Includes the glyphs baked while frames were skipped.
+        atlas = [tex.get_pixels().copy() for tex in draw_data.textures]
+        assert _client_frame(client, client_ctx, server, server_ctx) == 1
+        assert _vertices(client.draw_data) == expected
+        textures = [tex for tex in client._reader.textures if tex.status == imgui.TextureStatus.OK]
+        assert all(np.array_equal(tex.get_pixels(), want) for tex, want in zip(textures, atlas, strict=True))
+
+def test_remote_backpressure(loopback):
+    import socket
+    server, server_ctx, client, client_ctx = loopback
+    clicks: list[int] = []
+    # A client that doesn't read: the first frame with the font atlas doesn't fit in the socket buffers,
+    # the frames after it aren't recorded while it's pending.
+    server.client.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    server.max_pending_bytes = 0
+    server.max_unacked_frames = 1000
+    _server_frame(server, server_ctx, clicks)
+    pending = server.client.pending_bytes
+    assert pending > 0
+    for _ in range(20):
+        clicks.append(0)
+        _server_frame(server, server_ctx, clicks)
+    assert server.frames_skipped == 20 and server.client.pending_bytes == pending
+
+    # Once the client has caught up, it's resynchronized with a keyframe.
+    assert _catch_up(client, client_ctx, server, server_ctx) == 1
+    _check_resync(client, client_ctx, server, server_ctx, clicks)
+
+    # A client that doesn't acknowledge frames.
+    server.max_pending_bytes = 1 << 20
+    server.max_unacked_frames = 3
+    for _ in range(10):
+        clicks.append(0)
+        _server_frame(server, server_ctx, clicks)
+    assert server.frames_skipped == 27 and len(server._sent) == 3
+    assert _catch_up(client, client_ctx, server, server_ctx) == 3
+    _check_resync(client, client_ctx, server, server_ctx, clicks)
+    assert server.frames_skipped == 27
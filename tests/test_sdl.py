@@ -0,0 +1,198 @@
+import ctypes
+import os
+
+import pytest
+
+from slimgui import imgui
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+@pytest.fixture
+def sdl_window():
+    sdl2 = pytest.importorskip("sdl2")
+    if sdl2.SDL_Init(sdl2.SDL_INIT_VIDEO | sdl2.SDL_INIT_EVENTS) != 0:
+        pytest.skip(f"Could not initialize SDL: {sdl2.SDL_GetError()}")
+    window = sdl2.SDL_CreateWindow(b"test", 0, 0, 320, 200, sdl2.SDL_WINDOW_SHOWN)
+    if not window:
+        sdl2.SDL_Quit()
+        pytest.skip(f"Could not create an SDL window: {sdl2.SDL_GetError()}")
+    yield window
+    sdl2.SDL_DestroyWindow(window)
+    sdl2.SDL_Quit()
+
+@pytest.fixture
+def sdl_impl(sdl_window):
+    from slimgui.integrations.null import NullRenderer
+    from slimgui.integrations.sdl import SdlRenderer
+
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    imgui.get_io().ini_filename = None
+    renderer = NullRenderer()
+    renderer.max_texture_size = 4096
+    impl = SdlRenderer(sdl_window, renderer=renderer)
+    yield impl
+    impl.shutdown()
+    imgui.destroy_context(ctx)
+
+def _push_mouse_motion(impl, x: int, y: int):
+    import sdl2
+    event = sdl2.SDL_Event()
+    event.type = sdl2.SDL_MOUSEMOTION
+    event.motion.windowID = impl._window_id
+    event.motion.x, event.motion.y = x, y
+    assert sdl2.SDL_PushEvent(ctypes.byref(event)) == 1
+
+def _push_mouse_button(impl, down: bool):
+    import sdl2
+    event = sdl2.SDL_Event()
+    event.type = sdl2.SDL_MOUSEBUTTONDOWN if down else sdl2.SDL_MOUSEBUTTONUP
+    event.button.windowID = impl._window_id
+    event.button.button = sdl2.SDL_BUTTON_LEFT
+    assert sdl2.SDL_PushEvent(ctypes.byref(event)) == 1
+
+def _push_key(impl, sym: int, down: bool, mod: int = 0):
+    import sdl2
+    event = sdl2.SDL_Event()
+    event.type = sdl2.SDL_KEYDOWN if down else sdl2.SDL_KEYUP
+    event.key.windowID = impl._window_id
+    event.key.keysym.sym = sym
+    event.key.keysym.mod = mod
+    assert sdl2.SDL_PushEvent(ctypes.byref(event)) == 1
+
+def _push_text(impl, text: str):
+    import sdl2
+    event = sdl2.SDL_Event()
+    event.type = sdl2.SDL_TEXTINPUT
+    event.text.windowID = impl._window_id
+    event.text.text = text.encode("utf-8")
+    assert sdl2.SDL_PushEvent(ctypes.byref(event)) == 1
+
+def _frame(impl, gui=None):
+    impl.process_events()
+    impl.new_frame()
+    imgui.new_frame()
+    imgui.set_next_window_pos((0, 0))
+    imgui.set_next_window_size((200, 150))
+    imgui.begin("Window")
+    result = gui() if gui is not None else None
+    imgui.end()
+    imgui.render()
+    impl.render(imgui.get_draw_data())
+    return result
+
+def test_sdl_mouse_coalescing(sdl_impl):
+    import sdl2
+    _frame(sdl_impl)
+    # A burst from a high polling rate mouse becomes a single position event.
+    for i in range(1000):
+        _push_mouse_motion(sdl_impl, i % 300, i % 150)
+    _push_mouse_motion(sdl_impl, 42, 24)
+    events = sdl_impl.process_events()
+    assert len(events) >= 1001
+    assert sum(e.type == sdl2.SDL_MOUSEMOTION for e in events) == 1001
+    # (Plus any window events the SDL video driver queued.)
+    assert sdl_impl.input_events >= 1001
+    sdl_impl.new_frame()
+    imgui.new_frame()
+    assert imgui.get_io().mouse_pos == (42, 24)
+    imgui.end_frame()
+
+def test_sdl_click_and_text(sdl_impl):
+    import sdl2
+    # New windows are hidden on their first frame.
+    _frame(sdl_impl)
+    _frame(sdl_impl)
+
+    clicks = []
+    def gui():
+        if imgui.button("Button"):
+            clicks.append(True)
+        return imgui.get_item_rect_min(), imgui.get_item_rect_max()
+    p_min, p_max = _frame(sdl_impl, gui)
+    x, y = int((p_min[0] + p_max[0]) / 2), int((p_min[1] + p_max[1]) / 2)
+    # Motion before the press must reach ImGui before the button event.
+    _push_mouse_motion(sdl_impl, x, y)
+    _push_mouse_button(sdl_impl, True)
+    _frame(sdl_impl, gui)
+    _push_mouse_button(sdl_impl, False)
+    _frame(sdl_impl, gui)
+    assert clicks == [True]
+
+    text = []
+    def text_gui():
+        if not text:
+            imgui.set_keyboard_focus_here()
+        _, value = imgui.input_text("##text", text[-1] if text else "")
+        text.append(value)
+    # The focused text field becomes active on the following frames.
+    for _ in range(3):
+        _frame(sdl_impl, text_gui)
+    _push_text(sdl_impl, "héllo")
+    _frame(sdl_impl, text_gui)
+    _frame(sdl_impl, text_gui)
+    assert text[-1] == "héllo"
+
+    _push_key(sdl_impl, sdl2.SDLK_BACKSPACE, True)
+    _frame(sdl_impl, text_gui)
+    assert imgui.is_key_down(imgui.Key.KEY_BACKSPACE)
+    _push_key(sdl_impl, sdl2.SDLK_BACKSPACE, False)
+    _frame(sdl_impl, text_gui)
+    assert not imgui.is_key_down(imgui.Key.KEY_BACKSPACE)
+    assert text[-1] == "héll"
+
+def test_sdl_mod_keys(sdl_impl):
+    import sdl2
+    _frame(sdl_impl)
+    batch = bytearray()
+    sdl_impl._add_mod_keys(batch, sdl2.KMOD_LCTRL)
+    # Only the modifiers that changed are sent.
+    assert len(batch) == 16
+    sdl_impl._add_mod_keys(batch, sdl2.KMOD_LCTRL)
+    sdl_impl._add_mod_keys(batch, sdl2.KMOD_LCTRL | sdl2.KMOD_LSHIFT)
+    assert len(batch) == 32
+    sdl_impl._key_mods = 0
+
+    io = imgui.get_io()
+    _push_key(sdl_impl, sdl2.SDLK_LCTRL, True, sdl2.KMOD_LCTRL)
+    _push_key(sdl_impl, sdl2.SDLK_a, True, sdl2.KMOD_LCTRL)
+    _frame(sdl_impl)
+    assert io.key_ctrl and not io.key_shift
+    assert imgui.is_key_down(imgui.Key.KEY_A)
+    _push_key(sdl_impl, sdl2.SDLK_a, False, sdl2.KMOD_LCTRL)
+    _push_key(sdl_impl, sdl2.SDLK_LCTRL, False, 0)
+    _frame(sdl_impl)
+    assert not io.key_ctrl and not imgui.is_key_down(imgui.Key.KEY_A)
+
+    # Ctrl held across a focus change is reported again with the first key event after focus returns.
+    _push_key(sdl_impl, sdl2.SDLK_LCTRL, True, sdl2.KMOD_LCTRL)
+    _frame(sdl_impl)
+    assert io.key_ctrl
+    for window_event in (sdl2.SDL_WINDOWEVENT_FOCUS_LOST, sdl2.SDL_WINDOWEVENT_FOCUS_GAINED):
+        event = sdl2.SDL_Event()
+        event.type = sdl2.SDL_WINDOWEVENT
+        event.window.windowID = sdl_impl._window_id
+        event.window.event = window_event
+        assert sdl2.SDL_PushEvent(ctypes.byref(event)) == 1
+        _frame(sdl_impl)
+    assert not io.key_ctrl
+    _push_key(sdl_impl, sdl2.SDLK_a, True, sdl2.KMOD_LCTRL)
+    _frame(sdl_impl)
+    assert io.key_ctrl
+    _push_key(sdl_impl, sdl2.SDLK_a, False, 0)
+    _frame(sdl_impl)
+
+def test_sdl_font_atlas_format(sdl_window):
+    from slimgui.integrations.null import NullRenderer
+    from slimgui.integrations.sdl import SdlRenderer
+
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    fonts = imgui.get_io().fonts
+    # A format set on the atlas before creating the integration is kept.
+    fonts.tex_desired_format = imgui.TextureFormat.ALPHA8
+    SdlRenderer(sdl_window, renderer=NullRenderer()).shutdown()
+    assert fonts.tex_desired_format == imgui.TextureFormat.ALPHA8
+    SdlRenderer(sdl_window, renderer=NullRenderer(), font_atlas_format=imgui.TextureFormat.RGBA32).shutdown()
+    assert fonts.tex_desired_format == imgui.TextureFormat.RGBA32
+    imgui.destroy_context(ctx)
@@ -343,3 +343,471 @@ def test_drawlist_callback_refcounts(frame_scope):
     assert sys.getrefcount(cb) == 2, "refcount should've decreased after new_frame()"
     assert num_cbs == 1 and num_calls == num_cbs
     assert num_draws == 1 and num_cmds == num_draws + num_cbs
+
+def test_draw_data_copy_buffers(frame_scope):
+    import ctypes
+
+    # New windows are hidden on their first frame, so render two frames.
+    for frame in range(2):
+        if frame > 0:
+            imgui.new_frame()
+        for i in range(2):
+            imgui.set_next_window_pos((10 + i * 20, 10))
+            imgui.begin(f"Window {i}")
+            imgui.text("hello")
+            imgui.end()
+        imgui.render()
+    draw_data = imgui.get_draw_data()
+    lists = list(draw_data.commands_lists)
+    assert len(lists) == 2
+    assert draw_data.cmd_lists_count == len(lists)
+    assert draw_data.total_vtx_count == sum(dl.vtx_buffer_size for dl in lists)
+    assert draw_data.total_idx_count == sum(dl.idx_buffer_size for dl in lists)
+
+    vtx_size = draw_data.total_vtx_count * imgui.VERTEX_SIZE
+    idx_size = draw_data.total_idx_count * imgui.INDEX_SIZE
+    vtx = ctypes.create_string_buffer(vtx_size)
+    idx = ctypes.create_string_buffer(idx_size)
+    assert draw_data.copy_vtx_buffers(ctypes.addressof(vtx), vtx_size) == vtx_size
+    assert draw_data.copy_idx_buffers(ctypes.addressof(idx), idx_size) == idx_size
+    expected_vtx = b"".join(ctypes.string_at(dl.vtx_buffer_data, dl.vtx_buffer_size * imgui.VERTEX_SIZE) for dl in lists)
+    expected_idx = b"".join(ctypes.string_at(dl.idx_buffer_data, dl.idx_buffer_size * imgui.INDEX_SIZE) for dl in lists)
+    assert vtx.raw == expected_vtx
+    assert idx.raw == expected_idx
+
+    with pytest.raises(ValueError):
+        draw_data.copy_vtx_buffers(ctypes.addressof(vtx), vtx_size - 1)
+
+def test_draw_data_commands_array(frame_scope):
+    import numpy as np
+
+    def cb(parent_list, cmd, userdata):
+        pass
+
+    for frame in range(2):
+        if frame > 0:
+            imgui.new_frame()
+        for i in range(2):
+            imgui.set_next_window_pos((10 + i * 20, 10))
+            imgui.begin(f"Window {i}")
+            imgui.text("hello")
+            imgui.get_window_draw_list().add_callback(cb, 0)
+            imgui.end()
+        imgui.render()
+    draw_data = imgui.get_draw_data()
+    arr = draw_data.commands_array()
+    expected = [(i, cmd) for i, dl in enumerate(draw_data.commands_lists) for cmd in dl.commands]
+    assert len(arr) == len(expected)
+    assert arr.dtype.names == ("tex_id", "clip_rect", "vtx_offset", "idx_offset", "elem_count", "has_callback", "draw_list_index")
+    for rec, (i, cmd) in zip(arr, expected):
+        assert rec["draw_list_index"] == i
+        assert tuple(rec["clip_rect"]) == pytest.approx(cmd.clip_rect)
+        assert rec["vtx_offset"] == cmd.vtx_offset
+        assert rec["idx_offset"] == cmd.idx_offset
+        assert rec["elem_count"] == cmd.elem_count
+    assert arr["has_callback"].sum() == 2
+    assert np.array_equal(arr["draw_list_index"], [i for i, _ in expected])
+
+    dl = list(draw_data.commands_lists)[1]
+    dl_arr = dl.commands_array(draw_list_index=1)
+    assert np.array_equal(dl_arr, arr[arr["draw_list_index"] == 1])
+
+def test_io_add_input_events(frame_scope):
+    import struct
+    record = struct.Struct("<HHiff")
+    IO = imgui.IO
+    io = imgui.get_io()
+    # Apply the whole batch on the next frame instead of trickling it.
+    io.config_input_trickle_event_queue = False
+    imgui.end_frame()
+    io.add_input_events(
+        record.pack(IO.INPUT_EVENT_MOUSE_POS, 0, 0, 12.0, 34.0) +
+        record.pack(IO.INPUT_EVENT_MOUSE_BUTTON, 1, 0, 0.0, 0.0) +
+        record.pack(IO.INPUT_EVENT_MOUSE_WHEEL, 0, 0, 0.0, 1.0) +
+        record.pack(IO.INPUT_EVENT_KEY, 1, imgui.Key.MOD_SHIFT, 0.0, 0.0) +
+        record.pack(IO.INPUT_EVENT_KEY, 1, imgui.Key.KEY_B, 0.0, 0.0) +
+        record.pack(IO.INPUT_EVENT_CHAR, 0, ord("x"), 0.0, 0.0)
+    )
+    imgui.new_frame()
+    assert io.mouse_pos == (12, 34) and io.mouse_down[0] and io.mouse_wheel == 1.0
+    assert io.key_shift and imgui.is_key_down(imgui.Key.KEY_B)
+    with pytest.raises(ValueError):
+        io.add_input_events(b"\0" * 15)
+    with pytest.raises(ValueError):
+        io.add_input_events(record.pack(99, 0, 0, 0.0, 0.0))
+
+def test_draw_data_stats(frame_scope):
+    def cb(parent_list, cmd, userdata):
+        pass
+
+    imgui.get_io().display_framebuffer_scale = 2, 2
+    for frame in range(2):
+        if frame > 0:
+            imgui.new_frame()
+        imgui.set_next_window_pos((10, 10))
+        imgui.set_next_window_size((100, 50))
+        imgui.begin("Small")
+        imgui.text("hi")
+        imgui.end()
+        imgui.set_next_window_pos((150, 10))
+        imgui.begin("Busy")
+        for i in range(5):
+            imgui.text(f"line {i}")
+        imgui.get_window_draw_list().add_callback(cb, 0)
+        imgui.end()
+        imgui.get_foreground_draw_list().add_rect_filled((0, 0), (1000, 1000), 0xff0000ff)
+        imgui.render()
+    draw_data = imgui.get_draw_data()
+    stats = draw_data.stats()
+    assert len(stats.lists) == draw_data.cmd_lists_count
+    by_owner = {s.owner_name: s for s in stats.lists}
+    small, busy = by_owner["Small"], by_owner["Busy"]
+    assert busy.vtx_count > small.vtx_count
+    assert busy.callback_count == 1 and small.callback_count == 0
+    assert small.texture_count == 1 and stats.total.texture_count == 1
+    # Clip rectangles are clamped to the display.
+    assert stats.lists[-1].owner_name == "##Foreground" and stats.lists[-1].clip_rect_area == pytest.approx(320 * 200)
+    assert 0 < small.clip_rect_area <= small.cmd_count * 320 * 200
+    for dl, s in zip(draw_data.commands_lists, stats.lists):
+        assert (s.vtx_count, s.idx_count, s.cmd_count) == (dl.vtx_buffer_size, dl.idx_buffer_size, len(list(dl.commands)))
+    assert stats.total.vtx_count == draw_data.total_vtx_count
+    assert stats.total.idx_count == draw_data.total_idx_count
+    assert stats.total.callback_count == 1
+    assert stats.total.clip_rect_area == pytest.approx(sum(s.clip_rect_area for s in stats.lists))
+
+    # HiDPI: the same areas after a renderer scaled the clip rectangles to framebuffer pixels.
+    draw_data.scale_clip_rects(draw_data.framebuffer_scale)
+    scaled = draw_data.stats()
+    assert [s.clip_rect_area for s in scaled.lists] == pytest.approx([s.clip_rect_area for s in stats.lists])
+
+def test_alpha8_font_atlas_memory(imgui_context, null_renderer):
+    io = imgui.get_io()
+    io.display_size = 320, 200
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+
+    def atlas_size(fmt: imgui.TextureFormat) -> tuple[int, int, int]:
+        ctx = imgui.create_context()
+        imgui.set_current_context(ctx)
+        try:
+            io = imgui.get_io()
+            io.ini_filename = None
+            io.display_size = 320, 200
+            io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+            io.fonts.tex_desired_format = fmt
+            imgui.new_frame()
+            imgui.text("Hello")
+            imgui.render()
+            null_renderer.render(imgui.get_draw_data())
+            (atlas,) = imgui.get_platform_io().textures
+            assert atlas.format == fmt
+            assert atlas.status == imgui.TextureStatus.OK
+            return atlas.width, atlas.height, atlas.get_size_in_bytes()
+        finally:
+            imgui.destroy_context(ctx)
+            imgui.set_current_context(imgui_context)
+
+    rgba_w, rgba_h, rgba_bytes = atlas_size(imgui.TextureFormat.RGBA32)
+    alpha_w, alpha_h, alpha_bytes = atlas_size(imgui.TextureFormat.ALPHA8)
+    assert (alpha_w, alpha_h) == (rgba_w, rgba_h)
+    assert alpha_bytes * 4 == rgba_bytes
+
+def test_draw_data_content_hash(frame_scope):
+    def cb(parent_list, cmd, userdata):
+        pass
+
+    def build(x: float, userdata: int):
+        for i in range(2):
+            imgui.set_next_window_pos((x + i * 100, 10))
+            imgui.begin(f"Window {i}")
+            imgui.text("hello")
+            imgui.get_window_draw_list().add_callback(cb, userdata)
+            imgui.end()
+        imgui.render()
+        draw_data = imgui.get_draw_data()
+        return draw_data.content_hash(), [dl.content_hash() for dl in draw_data.commands_lists]
+
+    # Let window auto-sizing settle.
+    for frame in range(2):
+        if frame > 0:
+            imgui.new_frame()
+        build(10, 0)
+    hashes = []
+    for x, userdata in [(10, 0), (10, 0), (20, 0), (10, 1)]:
+        imgui.new_frame()
+        hashes.append(build(x, userdata))
+    (h0, lists0), (h1, lists1), (h2, lists2), (h3, _) = hashes
+    assert h0 == h1 and lists0 == lists1
+    # Moving the windows changes every list, but not the main viewport's background list.
+    assert h2 != h0
+    assert sum(a != b for a, b in zip(lists0, lists2)) == 2
+    # Callback user data is part of the hash.
+    assert h3 != h0
+
+def test_damage_tracker(frame_scope):
+    from slimgui.slimgui_ext.render import DamageTracker
+
+    def cb(parent_list, cmd, userdata):
+        pass
+
+    def build(label: str, callback: bool = False):
+        for i in range(2):
+            imgui.set_next_window_pos((10 + i * 150, 10))
+            imgui.set_next_window_size((140, 100))
+            imgui.begin(f"Window {i}")
+            imgui.text("static")
+            imgui.button(label if i == 1 else "button")
+            if callback:
+                imgui.get_window_draw_list().add_callback(cb, 0)
+            imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    def disjoint(rects):
+        return all(a[2] <= b[0] or b[2] <= a[0] or a[3] <= b[1] or b[3] <= a[1] for i, a in enumerate(rects) for b in rects[i + 1:])
+
+    tracker = DamageTracker()
+    full = [(0, 0, 320, 200)]
+    assert tracker.update(build("a")) == full
+    # New windows are hidden on their first frame.
+    imgui.new_frame()
+    assert tracker.update(build("a"))
+    imgui.new_frame()
+    assert tracker.update(build("a")) == []
+
+    imgui.new_frame()
+    damage = tracker.update(build("b"))
+    assert damage and disjoint(damage)
+    # Only the second window's button changed.
+    for x0, y0, x1, y1 in damage:
+        assert 160 <= x0 < x1 <= 300 and 10 <= y0 < y1 <= 110
+
+    imgui.new_frame()
+    draw_data = build("b")
+    assert tracker.update(draw_data, buffer_age=1) == []
+    # The buffer from two frames back is missing the change to "b".
+    imgui.new_frame()
+    assert tracker.update(build("b"), buffer_age=3) == damage
+    imgui.new_frame()
+    assert tracker.update(build("b"), buffer_age=0) == full
+    imgui.new_frame()
+    assert tracker.update(build("b"), buffer_age=DamageTracker.MAX_BUFFER_AGE + 1) == full
+
+    # Callbacks are damaged on every frame.
+    imgui.new_frame()
+    tracker.update(build("b", callback=True))
+    imgui.new_frame()
+    damage = tracker.update(build("b", callback=True))
+    assert len(damage) == 2 and disjoint(damage)
+
+    imgui.get_io().display_size = 300, 200
+    imgui.new_frame()
+    assert tracker.update(build("b")) == [(0, 0, 300, 200)]
+    tracker.reset()
+    imgui.new_frame()
+    assert tracker.update(build("b")) == [(0, 0, 300, 200)]
+
+    small = DamageTracker(max_rects=1)
+    small.update(draw_data)
+    imgui.new_frame()
+    assert len(small.update(build("c", callback=True))) == 1
+
+
+def test_damage_tracker_scaled_clip_rects(frame_scope):
+    from slimgui.slimgui_ext.render import DamageTracker
+
+    def build(label: str):
+        imgui.set_next_window_pos((10, 10))
+        imgui.set_next_window_size((140, 100))
+        imgui.begin("Window")
+        imgui.text("static")
+        imgui.button(label)
+        imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    # HiDPI: renderers scale the clip rectangles to framebuffer pixels in place.  Damage is the same whether
+    # it's computed before or after that.
+    imgui.get_io().display_framebuffer_scale = 2, 2
+    before, after = DamageTracker(), DamageTracker()
+    for label in ("a", "a", "a", "b"):
+        draw_data = build(label)
+        damage = before.update(draw_data)
+        draw_data.scale_clip_rects(draw_data.framebuffer_scale)
+        assert after.update(draw_data) == damage
+        imgui.new_frame()
+    assert damage
+    for x0, y0, x1, y1 in damage:
+        assert 20 <= x0 < x1 <= 300 and 20 <= y0 < y1 <= 220
+
+    # Textures are told apart by identity, not by the ID the renderer assigns when it creates them.
+    build("b")
+    textures = [tex for tex in imgui.get_platform_io().textures if tex.get_tex_id() != 0]
+    for tex in textures:
+        tex.set_tex_id(tex.get_tex_id() + 1000)
+    imgui.new_frame()
+    assert before.update(build("b")) == []
+    for tex in textures:
+        tex.set_tex_id(tex.get_tex_id() - 1000)
+    imgui.get_io().display_framebuffer_scale = 1, 1
+
+def test_draw_data_snapshot(imgui_context, null_renderer):
+    def build(label: str):
+        imgui.set_next_window_pos((10, 10))
+        imgui.begin("Window")
+        imgui.text(label)
+        imgui.end()
+        imgui.render()
+        return imgui.get_draw_data()
+
+    io = imgui.get_io()
+    io.display_size = 320, 200
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    imgui.new_frame()
+    draw_data = build("a")
+    snapshot = draw_data.snapshot()
+    assert isinstance(snapshot, imgui.DrawDataSnapshot)
+    # The font atlas is created on the first frame.
+    assert snapshot.has_texture_requests and len(list(snapshot.textures)) == 1
+    null_renderer.render(snapshot)
+    for frame in range(2):
+        imgui.new_frame()
+        draw_data = build("a")
+    snapshot = draw_data.snapshot()
+    h = draw_data.content_hash()
+    assert not snapshot.has_texture_requests and snapshot.textures is None
+    assert snapshot.content_hash() == h
+    assert snapshot.cmd_lists_count == draw_data.cmd_lists_count
+    assert snapshot.total_vtx_count == draw_data.total_vtx_count
+    assert np.array_equal(snapshot.commands_array(), draw_data.commands_array())
+
+    # The snapshot isn't affected by the following frames.
+    imgui.new_frame()
+    assert build("b").content_hash() != h
+    assert snapshot.content_hash() == h
+
+def test_draw_data_snapshot_callbacks(imgui_context, null_renderer):
+    import gc
+    import weakref
+    from slimgui.integrations.software import SoftwareRenderer
+
+    io = imgui.get_io()
+    io.display_size = 320, 200
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    renderer = SoftwareRenderer()
+    calls = []
+
+    imgui.new_frame()
+    dl = imgui.get_foreground_draw_list()
+    # Callables that only the draw list and the snapshot refer to.
+    dl.add_callback(lambda parent_dl, cmd, userdata: calls.append(userdata), 7)
+    dl.add_callback(lambda parent_dl, cmd, userdata: calls.append(userdata), b"bytes")
+    imgui.render()
+    snapshot = imgui.get_draw_data().snapshot()
+    renderer.render(snapshot)
+    assert calls == [7, b"bytes"]
+
+    # The draw list drops its references on the next frame, the snapshot keeps its own.
+    imgui.new_frame()
+    imgui.render()
+    gc.collect()
+    calls.clear()
+    renderer.render(snapshot)
+    assert calls == [7, b"bytes"]
+
+    imgui.new_frame()
+    dl = imgui.get_foreground_draw_list()
+    def cb(parent_dl, cmd, userdata):
+        pass
+    ref = weakref.ref(cb)
+    dl.add_callback(cb, 0)
+    imgui.render()
+    snapshot = imgui.get_draw_data().snapshot()
+    del cb
+    imgui.new_frame()
+    imgui.render()
+    gc.collect()
+    assert ref() is not None
+    # Released with the snapshot.
+    del snapshot
+    gc.collect()
+    assert ref() is None
+    renderer.shutdown()
+
+def test_draw_list_buffer_arrays(frame_scope):
+    dl = imgui.get_background_draw_list()
+    dl.add_rect_filled((10, 20), (30, 40), 0xff0000ff)
+    imgui.render()
+
+    vtx = dl.vtx_buffer_array()
+    idx = dl.idx_buffer_array()
+    assert vtx.dtype.names == ("pos", "uv", "col") and vtx.itemsize == imgui.VERTEX_SIZE
+    assert idx.dtype == np.dtype(np.uint16 if imgui.INDEX_SIZE == 2 else np.uint32)
+    assert len(vtx) == dl.vtx_buffer_size and len(idx) == dl.idx_buffer_size
+    # Views, not copies.
+    assert vtx.ctypes.data == dl.vtx_buffer_data and idx.ctypes.data == dl.idx_buffer_data
+    assert {tuple(p) for p in vtx["pos"]} == {(10, 20), (30, 20), (30, 40), (10, 40)}
+    assert np.all(vtx["col"] == 0xff0000ff)
+    assert idx.max() < len(vtx)
+    pos = vtx["pos"]
+    pos[:, 0] += 5
+    assert dl.vtx_buffer_array()["pos"][:, 0].min() == 15
+    kept = vtx.copy()
+
+    plain_idx = np.asarray(idx)
+    expected_idx = idx.copy()
+    idx_data = dl.idx_buffer_data
+
+    imgui.new_frame()
+    for view in (vtx, idx, pos):
+        with pytest.raises(RuntimeError):
+            view[0]
+        for method in ("sum", "ptp", "astype", "tobytes", "copy"):
+            with pytest.raises(RuntimeError):
+                getattr(view, method)
+    with pytest.raises(RuntimeError):
+        idx.dot(idx)
+    with pytest.raises(RuntimeError):
+        np.concatenate([idx, idx])
+    assert len(vtx) == 4 and idx.shape == (6,)
+    assert kept["pos"][:, 0].min() == 15
+    # Unchecked views keep the ended frame's buffers, ImGui draws the new frame into new ones.
+    dl = imgui.get_background_draw_list()
+    dl.add_rect_filled((50, 60), (70, 80), 0xff00ff00)
+    imgui.render()
+    assert np.array_equal(plain_idx, expected_idx)
+    assert plain_idx.ctypes.data == idx_data and dl.idx_buffer_data != idx_data
+
+    # Views taken in renderers from the draw data are checked too.
+    native = next(iter(imgui.get_draw_data().commands_lists))
+    native_vtx = native.vtx_buffer_array()
+    assert native_vtx.ctypes.data == native.vtx_buffer_data
+    assert len(native.idx_buffer_array()) == native.idx_buffer_size
+    imgui.new_frame()
+    with pytest.raises(RuntimeError):
+        native_vtx["pos"]
+
+def test_coalesced_texture_updates_burst(imgui_context):
+    io = imgui.get_io()
+    io.display_size = 320, 200
+    io.backend_flags |= imgui.BackendFlags.RENDERER_HAS_TEXTURES
+    imgui.new_frame()
+    imgui.render()
+    (atlas,) = imgui.get_platform_io().textures
+    atlas.set_tex_id(1)
+    atlas.set_status(imgui.TextureStatus.OK)
+
+    # A large block of text in a new font size bakes a burst of glyphs.
+    imgui.new_frame()
+    imgui.push_font(None, 23.0)
+    imgui.text("".join(chr(c) for c in range(33, 127)))
+    imgui.text("".join(chr(c) for c in range(0xA1, 0x100)))
+    imgui.pop_font()
+    imgui.render()
+    assert atlas.status == imgui.TextureStatus.WANT_UPDATES
+    updates = [(r.x, r.y, r.w, r.h) for r in atlas.updates]
+    coalesced = [(r.x, r.y, r.w, r.h) for r in atlas.get_coalesced_updates()]
+    assert len(updates) > 150
+    assert len(coalesced) < len(updates) // 4
+    for x, y, w, h in updates:
+        assert any(cx <= x and cy <= y and x + w <= cx + cw and y + h <= cy + ch for cx, cy, cw, ch in coalesced)
+    assert sum(w * h for _, _, w, h in coalesced) <= 2 * sum(w * h for _, _, w, h in updates)
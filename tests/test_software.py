@@ -0,0 +1,188 @@
+import numpy as np
+import pytest
+from slimgui import imgui
+from slimgui.integrations.software import SoftwareRenderer
+
+WIDTH, HEIGHT = 320, 200
+
+@pytest.fixture
+def imgui_context():
+    ctx = imgui.create_context()
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = WIDTH, HEIGHT
+    yield ctx
+    imgui.destroy_context(ctx)
+
+def _build_frame():
+    imgui.new_frame()
+    for i in range(3):
+        imgui.set_next_window_pos((10 + i * 90, 10 + i * 40))
+        imgui.set_next_window_size((120, 100))
+        imgui.begin(f"Window {i}")
+        imgui.text(f"Hello {i}")
+        imgui.button("Button")
+        imgui.end()
+    imgui.render()
+    return imgui.get_draw_data()
+
+def _render_twice(renderer: SoftwareRenderer) -> np.ndarray:
+    renderer.render(_build_frame())
+    # New windows are hidden on their first frame.
+    return renderer.render(_build_frame())
+
+def test_software_renderer(imgui_context):
+    renderer = SoftwareRenderer(clear_color=(0.0, 0.0, 1.0, 1.0))
+    image = _render_twice(renderer)
+    assert image.shape == (HEIGHT, WIDTH, 4) and image.dtype == np.uint8
+    assert renderer.image is image
+    (atlas,) = imgui.get_platform_io().textures
+    assert atlas.status == imgui.TextureStatus.OK and atlas.get_tex_id() != 0
+    # Background outside the windows, opaque window backgrounds inside.
+    assert tuple(image[HEIGHT - 1, 0]) == (0, 0, 255, 255)
+    assert tuple(image[60, 15])[:3] != (0, 0, 255)
+    # Text is rendered from the font atlas: the title bar has pixels of more than two colors.
+    title_bar = image[12:25, 12:128].reshape(-1, 4)
+    assert len(np.unique(title_bar, axis=0)) > 2
+    renderer.shutdown()
+    # The atlas is still in use, so ImGui asks for it to be created again.
+    assert atlas.get_tex_id() == 0 and atlas.status == imgui.TextureStatus.WANT_CREATE
+
+def test_software_renderer_primitives(imgui_context):
+    renderer = SoftwareRenderer(clear_color=(0.0, 0.0, 0.0, 1.0))
+    imgui.new_frame()
+    dl = imgui.get_background_draw_list()
+    dl.add_rect_filled((10, 20), (50, 40), imgui.color_convert_float4_to_u32((1, 0, 0, 1)))
+    # Half transparent green over the red rectangle.
+    dl.add_rect_filled((30, 20), (70, 40), imgui.color_convert_float4_to_u32((0, 1, 0, 0.5)))
+    # Scissored: only x in [100, 110) may be touched.
+    dl.push_clip_rect((100, 0), (110, HEIGHT))
+    dl.add_rect_filled((90, 50), (120, 60), imgui.color_convert_float4_to_u32((1, 1, 1, 1)))
+    dl.pop_clip_rect()
+    imgui.render()
+    image = renderer.render(imgui.get_draw_data())
+
+    assert (image[20:40, 10:30] == (255, 0, 0, 255)).all()
+    # glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA), alpha 128/255.
+    assert (image[20:40, 50:70, :3] == (0, 128, 0)).all()
+    assert (image[20:40, 30:50, :3] == (127, 128, 0)).all()
+    # Edges are exact: nothing outside the rectangles.
+    assert (image[19, :] == (0, 0, 0, 255)).all() and (image[40, :] == (0, 0, 0, 255)).all()
+    assert (image[20:40, 9] == (0, 0, 0, 255)).all() and (image[20:40, 70] == (0, 0, 0, 255)).all()
+    assert (image[50:60, 100:110] == 255).all()
+    assert (image[50:60, 90:100] == (0, 0, 0, 255)).all() and (image[50:60, 110:120] == (0, 0, 0, 255)).all()
+
+    # Rendering over an existing image blends over its contents.
+    out = np.zeros((HEIGHT, WIDTH, 4), dtype=np.uint8)
+    out[..., 2:] = 255
+    renderer._renderer.render_into(imgui.get_draw_data(), out)
+    assert (out[20:40, 10:30] == (255, 0, 0, 255)).all() and (out[0, 0] == (0, 0, 255, 255)).all()
+
+def test_software_renderer_tiles(imgui_context):
+    renderer = SoftwareRenderer(num_threads=1, tile_size=WIDTH)
+    reference = _render_twice(renderer)
+    renderer.shutdown()
+    for num_threads, tile_size in [(1, 16), (4, 32), (8, 64), (0, 48)]:
+        renderer = SoftwareRenderer(num_threads=num_threads, tile_size=tile_size)
+        assert renderer._renderer.num_threads >= 1
+        image = renderer.render(_build_frame())
+        renderer.shutdown()
+        assert np.array_equal(image, reference), (num_threads, tile_size)
+
+def test_software_renderer_worker_pool(imgui_context):
+    import gc
+    import os
+
+    if not os.path.isdir("/proc/self/task"):
+        pytest.skip("needs /proc to count threads")
+
+    def num_threads() -> int:
+        return len(os.listdir("/proc/self/task"))
+
+    base = num_threads()
+    renderer = SoftwareRenderer(num_threads=4, tile_size=32)
+    # The workers are started once and reused by every frame.
+    assert num_threads() == base + 3
+    reference = _render_twice(renderer)
+    for _ in range(3):
+        assert np.array_equal(renderer.render(_build_frame()), reference)
+        assert num_threads() == base + 3
+    renderer.shutdown()
+    del renderer
+    gc.collect()
+    assert num_threads() == base
+
+def test_software_renderer_alpha8(imgui_context):
+    expected = _render_twice(SoftwareRenderer())
+    ctx = imgui.create_context()
+    imgui.set_current_context(ctx)
+    io = imgui.get_io()
+    io.ini_filename = None
+    io.display_size = WIDTH, HEIGHT
+    io.fonts.tex_desired_format = imgui.TextureFormat.ALPHA8
+    image = _render_twice(SoftwareRenderer())
+    (atlas,) = imgui.get_platform_io().textures
+    assert atlas.format == imgui.TextureFormat.ALPHA8
+    imgui.destroy_context(ctx)
+    imgui.set_current_context(imgui_context)
+    assert np.array_equal(image, expected)
+
+def test_merge_commands(imgui_context):
+    renderer = SoftwareRenderer(clear_color=(0.0, 0.0, 0.0, 1.0))
+    white = imgui.color_convert_float4_to_u32((1, 1, 1, 1))
+    calls = []
+
+    def build():
+        imgui.new_frame()
+        dl = imgui.get_background_draw_list()
+        # Geometry well inside its clip rectangle: mergeable into one command.
+        for x in (10, 40, 70):
+            dl.push_clip_rect((x, 10), (x + 20, 30))
+            dl.add_rect_filled((x + 2, 12), (x + 18, 28), white)
+            dl.pop_clip_rect()
+        dl.add_draw_cmd()
+        # Clipped geometry: merging would draw outside [100, 110).
+        dl.push_clip_rect((100, 50), (110, 70))
+        dl.add_rect_filled((90, 50), (120, 70), white)
+        dl.pop_clip_rect()
+        dl.add_callback(lambda *args: calls.append(args), 0)
+        dl.add_rect_filled((150, 50), (160, 70), white)
+        imgui.render()
+        return imgui.get_draw_data()
+
+    expected = renderer.render(build()).copy()
+    draw_data = build()
+    (dl,) = draw_data.commands_lists
+    cmds = list(dl.commands)
+    elem_count = sum(cmd.elem_count for cmd in cmds)
+    removed = draw_data.merge_commands()
+    merged = list(dl.commands)
+    assert removed > 0 and len(merged) == len(cmds) - removed
+    assert sum(cmd.elem_count for cmd in merged) == elem_count
+    assert all(cmd.elem_count > 0 for cmd in merged if cmd.run_callback(dl) == imgui.DrawListCallbackResult.DRAW)
+    assert merged[0].elem_count == 3 * 6 and tuple(merged[0].clip_rect) == (10, 10, 90, 30)
+    # The clipped rectangle keeps its command, the callback separates the next one.
+    assert tuple(merged[1].clip_rect) == (100, 50, 110, 70)
+    calls.clear()
+    assert np.array_equal(renderer.render(draw_data), expected)
+    assert len(calls) == 1
+    # Nothing is left to merge.
+    assert draw_data.merge_commands() == 0
+    renderer.shutdown()
+
+def test_render_snapshot_on_thread(imgui_context):
+    import threading
+
+    renderer = SoftwareRenderer()
+    expected = _render_twice(renderer)
+    snapshot = _build_frame().snapshot()
+    # Build the next frame while the snapshot renders on another thread.
+    images = []
+    thread = threading.Thread(target=lambda: images.append(renderer.render(snapshot).copy()))
+    thread.start()
+    imgui.new_frame()
+    imgui.text("Next frame")
+    imgui.render()
+    thread.join()
+    renderer.shutdown()
+    assert np.array_equal(images[0], expected)